@@ -0,0 +1,133 @@
+"""
+Rolling-origin backtest: forecaster objects per cut vs the batched engine
+
+The loop is how a backtest would run on src/forecasting.py as it stands:
+for every series and origin year, cut the series, build TrendForecaster,
+FixedTrendForecaster and EventAugmentedForecaster objects and forecast the
+following years. run_backtest must give the same forecasts and intervals
+for every (series, origin, horizon, model); the loop is timed on a sample
+of series and extrapolated to the full set.
+
+Run from the project root:
+    python -m benchmarks.bench_backtesting
+"""
+import contextlib
+import io
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.suite import make_datasets
+from src.backtesting import HORIZONS, default_origins, run_backtest, simulate_lag_functions
+from src.batch_forecast import indicator_series
+from src.event_impact_model import impact_summary_from_links
+from src.forecasting import TrendForecaster, FixedTrendForecaster, EventAugmentedForecaster
+
+KEYS = ['indicator_code', 'region', 'model', 'origin', 'horizon']
+
+
+def make_inputs(rows, indicators, events, seed=42):
+    """Regional yearly series (half of them as decimals, so logistic fits apply) and simulated impacts"""
+    unified, impact = make_datasets(rows, events, indicators, seed=seed)
+    series = indicator_series(unified)
+    series = {key: values / 100 if i % 2 else values for i, (key, values) in enumerate(series.items())}
+    years = [year for values in series.values() for year in values.index]
+    simulations = simulate_lag_functions(impact_summary_from_links(unified, impact), min(years) - 1, max(years))
+    mapping = {code: code for code in {key[0] for key in series}}
+    return series, simulations, mapping
+
+
+def loop_backtest(series_by_key, simulations, mapping, origins, horizons=HORIZONS):
+    """Forecaster objects for every series and origin"""
+    rows = []
+    for (code, region), series in series_by_key.items():
+        for origin in origins:
+            train = series[series.index <= origin]
+            years = [origin + h for h in horizons]
+            if len(train) < 2 or not any(year in series.index for year in years):
+                continue
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                forecasts = {model: TrendForecaster().forecast(train, model, years)
+                             for model in ['linear', 'logistic']}
+                fixed = FixedTrendForecaster().forecast(train, years)
+                augmented = {}
+                for lag_function, simulation in simulations.items():
+                    recent = simulation.loc[:f"{origin}-12"]
+                    augmented[lag_function] = EventAugmentedForecaster(recent).augment_forecast(
+                        fixed, mapping.get(code), years)
+
+            scale = 100 if fixed['was_percentage'] else 1
+            for h, year in zip(horizons, years):
+                if year not in series.index:
+                    continue
+                position = len(train) + h - 1
+                base = {'indicator_code': code, 'region': region, 'origin': origin, 'horizon': h,
+                        'actual': series[year]}
+                for model, forecast in forecasts.items():
+                    if forecast is None:
+                        continue
+                    lower, upper = forecast['ci_lower'], forecast['ci_upper']
+                    rows.append({**base, 'model': f"trend_{model}", 'forecast': forecast['predictions'][position],
+                                 'ci_lower': np.nan if lower is None else lower[position],
+                                 'ci_upper': np.nan if upper is None else upper[position]})
+                lower, upper = fixed['ci_lower'], fixed['ci_upper']
+                rows.append({**base, 'model': 'fixed_linear', 'forecast': fixed['predictions'][position] * scale,
+                             'ci_lower': np.nan if lower is None else lower[position] * scale,
+                             'ci_upper': np.nan if upper is None else upper[position] * scale})
+                for lag_function, result in augmented.items():
+                    rows.append({**base, 'model': f"event_{lag_function}",
+                                 'forecast': result['augmented_predictions'][position] * scale})
+    return pd.DataFrame(rows)
+
+
+def check_parity(loop, batch):
+    """Same rows, forecasts and (where the loop has them) intervals"""
+    merged = loop.merge(batch, on=KEYS, how='outer', suffixes=('_loop', '_batch'), indicator=True)
+    assert (merged['_merge'] == 'both').all(), merged['_merge'].value_counts()
+    np.testing.assert_allclose(merged['forecast_batch'], merged['forecast_loop'], rtol=1e-7, atol=1e-9)
+    np.testing.assert_allclose(merged['actual_batch'], merged['actual_loop'])
+    trend = ~merged['model'].str.startswith('event_')
+    for bound in ['ci_lower', 'ci_upper']:
+        np.testing.assert_allclose(merged.loc[trend, f"{bound}_batch"], merged.loc[trend, f"{bound}_loop"],
+                                   rtol=1e-7, atol=1e-9)
+
+
+def run(scales=((20_000, 20, 40), (200_000, 200, 100), (1_000_000, 1_000, 200)), loop_sample=40):
+    rows = []
+    workers = os.cpu_count() or 1
+    for n_rows, indicators, events in scales:
+        with contextlib.redirect_stdout(io.StringIO()):
+            series, simulations, mapping = make_inputs(n_rows, indicators, events)
+        origins = default_origins(series)
+
+        sample = dict(list(series.items())[:loop_sample])
+        start = time.perf_counter()
+        loop = loop_backtest(sample, simulations, mapping, origins)
+        loop_s = (time.perf_counter() - start) * len(series) / len(sample)
+        check_parity(loop, run_backtest(sample, simulations, mapping, origins))
+
+        start = time.perf_counter()
+        forecasts = run_backtest(series, simulations, mapping, origins)
+        batch_s = time.perf_counter() - start
+        start = time.perf_counter()
+        run_backtest(series, simulations, mapping, origins, workers=workers)
+        parallel_s = time.perf_counter() - start
+
+        rows.append({
+            'series': len(series),
+            'origins': len(origins),
+            'forecasts': len(forecasts),
+            'loop_s_est': loop_s,
+            'batch_s': batch_s,
+            f'batch_{workers}_workers_s': parallel_s,
+            'speedup': loop_s / batch_s
+        })
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    report = run()
+    print(report.to_string(index=False, float_format=lambda x: f"{x:.3f}"))
@@ -0,0 +1,163 @@
+"""
+Date parsing: per-value format trials vs the vectorized date_parsing layer
+
+The legacy model is EventImpactModel as it was: _parse_date tries five
+strptime formats in a try/except per value, then pandas' flexible parser,
+once per impact row of an iterrows() loop. The impact sheet here has many
+links per event and dates in mixed layouts (ISO, day-first, year-month and
+ISO timestamps), as hand-edited sheets do. Both models must build the
+same events dict; the parsed column must match value for value.
+apply_schema's old pd.to_datetime(errors='coerce') is shown for reference:
+it infers one layout from the first value and drops the others to NaT.
+
+Run from the project root:
+    python -m benchmarks.bench_date_parsing
+"""
+import contextlib
+import io
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_event_impact import make_impact_summary
+from src.date_parsing import parse_dates
+from src.event_impact_model import EventImpactModel
+
+LAYOUTS = [('%Y-%m-%d', 0.6), ('%d/%m/%Y', 0.2), ('%Y-%m', 0.1), ('%Y-%m-%dT%H:%M:%S', 0.1)]
+
+
+class LegacyModel(EventImpactModel):
+    """EventImpactModel with the original per-row date parsing"""
+
+    def _parse_date(self, date_value):
+        if pd.isna(date_value):
+            return None
+        if isinstance(date_value, str):
+            try:
+                for fmt in ['%Y-%m-%d', '%Y/%m/%d', '%d-%m-%Y', '%d/%m/%Y', '%Y-%m']:
+                    try:
+                        return pd.to_datetime(date_value, format=fmt)
+                    except:
+                        continue
+                return pd.to_datetime(date_value)
+            except:
+                return None
+        try:
+            return pd.to_datetime(date_value)
+        except:
+            return None
+
+    def _process_events(self):
+        for idx, row in self.impact_summary.iterrows():
+            event_id = row['parent_id']
+            event_date = self._parse_date(row.get('event_date'))
+            event_name = None
+            for col in ['event_name', 'indicator_event', 'event']:
+                if col in row and pd.notna(row[col]):
+                    event_name = str(row[col])
+                    break
+            if not event_name:
+                event_name = f"Event_{event_id}"
+            indicator_code = None
+            for col in ['indicator_code', 'indicator_impact', 'indicator']:
+                if col in row and pd.notna(row[col]):
+                    indicator_code = str(row[col])
+                    break
+            if not indicator_code:
+                continue
+            if event_id not in self.events:
+                self.events[event_id] = {'name': event_name, 'date': event_date, 'impacts': []}
+            lag_months = row.get('lag_months')
+            if pd.isna(lag_months) or lag_months is None:
+                lag_months = 6
+            try:
+                lag_months = float(lag_months)
+            except:
+                lag_months = 6.0
+            self.events[event_id]['impacts'].append({
+                'indicator': indicator_code,
+                'impact': row.get('final_impact', 0),
+                'lag': lag_months,
+                'evidence': row.get('evidence_basis', 'Unknown'),
+                'comparable_country': row.get('comparable_country', None)
+            })
+
+
+def make_sheet(n_rows, impacts_per_event=5, seed=42):
+    """Impact sheet whose event dates are strings in mixed layouts (one layout per event)"""
+    summary = make_impact_summary(n_rows // impacts_per_event, impacts_per_event=impacts_per_event, seed=seed)
+    rng = np.random.default_rng(seed)
+    layouts = rng.choice(len(LAYOUTS), len(summary) // impacts_per_event, p=[p for _, p in LAYOUTS])
+    layouts = np.repeat(layouts, impacts_per_event)
+    text = summary['event_date'].dt.strftime('%Y-%m-%d').to_numpy(dtype=object, copy=True)
+    for i, (fmt, _) in enumerate(LAYOUTS):
+        rows = layouts == i
+        text[rows] = summary.loc[rows, 'event_date'].dt.strftime(fmt).to_numpy(dtype=object)
+    return summary.assign(event_date=text)
+
+
+def quiet(func, *args):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def legacy_column(values):
+    model = LegacyModel.__new__(LegacyModel)
+    parsed = [model._parse_date(value) for value in values]
+    return np.array([np.datetime64('NaT', 'ns') if d is None else d.to_datetime64() for d in parsed],
+                    dtype='datetime64[ns]')
+
+
+def check_events(legacy, model):
+    """Same events, dates and impacts"""
+    assert list(legacy.events) == list(model.events)
+    for event_id, expected in legacy.events.items():
+        actual = model.events[event_id]
+        assert actual['name'] == expected['name'] and actual['date'] == expected['date'], event_id
+        assert actual['impacts'] == expected['impacts'], event_id
+
+
+def run(sizes=(10_000, 50_000, 100_000)):
+    rows = []
+    for n_rows in sizes:
+        sheet = make_sheet(n_rows)
+        dates = sheet['event_date']
+
+        legacy_parse_s, expected = timed(legacy_column, dates)
+        parse_s, parsed = timed(parse_dates, dates)
+        np.testing.assert_array_equal(parsed, expected)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            coerce_s, coerced = timed(lambda: pd.to_datetime(dates, errors='coerce'))
+
+        legacy_model_s, legacy = timed(quiet, LegacyModel, sheet)
+        model_s, model = timed(quiet, EventImpactModel, sheet)
+        check_events(legacy, model)
+
+        rows.append({
+            'rows': n_rows,
+            'distinct_dates': dates.nunique(),
+            'legacy_parse_s': legacy_parse_s,
+            'parse_dates_s': parse_s,
+            'parse_speedup': legacy_parse_s / parse_s,
+            'coerce_s': coerce_s,
+            'coerce_nat': int(coerced.isna().sum()),
+            'parse_dates_nat': int(np.isnat(parsed).sum()),
+            'legacy_model_s': legacy_model_s,
+            'model_s': model_s,
+            'model_speedup': legacy_model_s / model_s
+        })
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    report = run()
+    print(report.to_string(index=False, float_format=lambda x: f"{x:.3f}"))
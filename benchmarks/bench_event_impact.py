@@ -0,0 +1,180 @@
+"""
+Benchmark EventImpactModel.simulate_impacts against the original per-month loop
+
+The loop and its scalar lag curve (impact_at_time) are copied from the
+event impact notebook as it was before the model moved to src, so the
+check does not go through impact_curve.
+
+Run from the project root:
+    python -m benchmarks.bench_event_impact
+"""
+import contextlib
+import io
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.event_impact_model import EventImpactModel
+
+
+def make_impact_summary(n_events, impacts_per_event=3, n_indicators=40, seed=42):
+    """Build a synthetic impact summary shaped like the notebook's create_impact_summary output"""
+    rng = np.random.default_rng(seed)
+    n_rows = n_events * impacts_per_event
+
+    event_ids = np.repeat([f"EVT_{i:04d}" for i in range(n_events)], impacts_per_event)
+    event_dates = pd.Timestamp('2005-01-01') + pd.to_timedelta(
+        np.repeat(rng.integers(0, 25 * 365, n_events), impacts_per_event), unit='D'
+    )
+
+    return pd.DataFrame({
+        'parent_id': event_ids,
+        'event_name': [f"Event {eid}" for eid in event_ids],
+        'event_date': event_dates,
+        'indicator_code': [f"IND_{i:03d}" for i in rng.integers(0, n_indicators, n_rows)],
+        'lag_months': rng.choice([0, 3, 6, 12, 18, 24], n_rows),
+        'final_impact': rng.normal(0, 10, n_rows),
+        'evidence_basis': 'synthetic',
+        'comparable_country': None
+    })
+
+
+def impact_at_time(base_impact, lag_months, months_since_event, lag_function='exponential'):
+    """
+    Calculate impact at a given time after event (the original EventImpactModel._get_impact_at_time)
+
+    Parameters:
+    -----------
+    base_impact: Maximum impact (at peak)
+    lag_months: Time to reach maximum impact
+    months_since_event: Months since event occurred
+    lag_function: Type of lag function ('exponential', 'linear', 'immediate')
+    """
+    if months_since_event < 0:
+        return 0
+
+    if lag_function == 'exponential':
+        # Exponential build-up and decay
+        if months_since_event < lag_months:
+            # Build-up phase
+            return base_impact * (1 - np.exp(-months_since_event / max(lag_months / 3, 0.1)))
+        else:
+            # Sustained phase with gradual decay
+            decay_factor = np.exp(-(months_since_event - lag_months) / 24)  # 2-year half-life
+            return base_impact * decay_factor
+
+    elif lag_function == 'linear':
+        # Linear build-up and plateau
+        if months_since_event < lag_months:
+            return base_impact * (months_since_event / max(lag_months, 0.1))
+        else:
+            return base_impact
+
+    else:  # immediate
+        return base_impact if months_since_event >= 0 else 0
+
+
+def simulate_impacts_loop(model, start_date, end_date, indicators=None):
+    """The original per-event, per-month, per-impact simulation loop"""
+    start_date = pd.to_datetime(start_date)
+    end_date = pd.to_datetime(end_date)
+
+    date_range = pd.date_range(start=start_date, end=end_date, freq='MS')
+    simulation_dates = [d.strftime('%Y-%m') for d in date_range]
+
+    if indicators is None:
+        indicators = []
+        for event_data in model.events.values():
+            for impact in event_data['impacts']:
+                indicators.append(impact['indicator'])
+        indicators = list(set(indicators))
+
+    results = {indicator: np.zeros(len(date_range)) for indicator in indicators}
+    monthly_breakdown = {}
+
+    for event_id, event_data in model.events.items():
+        event_date = event_data['date']
+        if event_date is None:
+            continue
+
+        for i, sim_date in enumerate(date_range):
+            months_since = (sim_date.year - event_date.year) * 12 + (sim_date.month - event_date.month)
+
+            for impact in event_data['impacts']:
+                indicator = impact['indicator']
+                if indicator not in indicators:
+                    continue
+
+                try:
+                    impact_value = impact_at_time(impact['impact'], impact['lag'], months_since, model.lag_function)
+                except:
+                    impact_value = 0
+
+                results[indicator][i] += impact_value
+
+                if abs(impact_value) > 0.001:
+                    key = (event_data['name'], indicator, sim_date.strftime('%Y-%m'))
+                    monthly_breakdown[key] = impact_value
+
+    results_df = pd.DataFrame(results, index=simulation_dates)
+
+    if monthly_breakdown:
+        breakdown_df = pd.DataFrame.from_dict(monthly_breakdown, orient='index', columns=['impact'])
+        breakdown_df.index = pd.MultiIndex.from_tuples(breakdown_df.index, names=['event', 'indicator', 'month'])
+    else:
+        breakdown_df = pd.DataFrame()
+
+    return results_df, breakdown_df
+
+
+def time_call(func, *args, repeat=3):
+    """Best wall time of func(*args) over several runs, with its last result"""
+    best = np.inf
+    result = None
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            result = func(*args)
+            best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run(event_counts=(10, 100, 1000), start_date='2000-01-01', end_date='2039-12-01'):
+    """Time both engines at each event count and check they agree"""
+    rows = []
+    for n_events in event_counts:
+        with contextlib.redirect_stdout(io.StringIO()):
+            summary = make_impact_summary(n_events)
+        for lag_function in ['exponential', 'linear', 'immediate']:
+            with contextlib.redirect_stdout(io.StringIO()):
+                model = EventImpactModel(summary, lag_function=lag_function)
+            indicators = sorted({imp['indicator'] for e in model.events.values() for imp in e['impacts']})
+
+            repeat = 1 if n_events >= 1000 else 3
+            loop_time, (loop_results, loop_breakdown) = time_call(
+                simulate_impacts_loop, model, start_date, end_date, indicators, repeat=repeat
+            )
+            vec_time, (vec_results, vec_breakdown) = time_call(
+                model.simulate_impacts, start_date, end_date, indicators
+            )
+
+            # The vectorised exp can differ from the scalar one in the last bit
+            pd.testing.assert_frame_equal(vec_results, loop_results, check_exact=False, rtol=1e-12, atol=1e-12)
+            pd.testing.assert_frame_equal(vec_breakdown, loop_breakdown, check_exact=False, rtol=1e-12, atol=1e-12)
+
+            rows.append({
+                'events': n_events,
+                'lag_function': lag_function,
+                'months': len(vec_results),
+                'loop_s': loop_time,
+                'vectorized_s': vec_time,
+                'speedup': loop_time / vec_time
+            })
+
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    report = run()
+    print(report.to_string(index=False, float_format=lambda x: f"{x:.4f}"))
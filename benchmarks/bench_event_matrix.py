@@ -0,0 +1,112 @@
+"""
+Event-indicator matrix: per-event filtering vs the sparse EventIndicatorMatrix
+
+The loop is the event impact notebook's build_event_indicator_matrix_robust
+as it was: one boolean filter of the whole summary per event, one per
+indicator on that slice, a dict of dicts and a dense DataFrame. The sparse
+build must give the same dense matrix (values, event and indicator order).
+Lookups are timed as "all impacts of one event" and "all events affecting
+one indicator", filtering the summary against reading one matrix slice.
+
+Run from the project root:
+    python -m benchmarks.bench_event_matrix
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_event_impact import make_impact_summary
+from src.event_matrix import EventIndicatorMatrix
+
+
+def loop_matrix(impact_summary):
+    """The original per-event, per-indicator build"""
+    df = impact_summary.copy()
+    df['event_name'] = df['event_name'].fillna('Unknown_Event')
+    df['indicator_code'] = df['indicator_code'].fillna('UNKNOWN')
+    df['final_impact'] = pd.to_numeric(df['final_impact'], errors='coerce').fillna(0)
+
+    events = df['event_name'].unique()
+    indicators = df['indicator_code'].unique()
+
+    matrix_data = {}
+    for event in events:
+        event_data = df[df['event_name'] == event]
+        row = {}
+        for indicator in indicators:
+            indicator_data = event_data[event_data['indicator_code'] == indicator]
+            if len(indicator_data) > 0:
+                row[indicator] = indicator_data['final_impact'].mean()
+            else:
+                row[indicator] = 0
+        matrix_data[event] = row
+
+    event_matrix = pd.DataFrame(matrix_data).T
+    if 'UNKNOWN' in event_matrix.columns:
+        event_matrix = event_matrix.drop('UNKNOWN', axis=1)
+    if not event_matrix.empty:
+        event_matrix['total_impact'] = event_matrix.abs().sum(axis=1)
+        event_matrix = event_matrix.sort_values('total_impact', ascending=False)
+        event_matrix = event_matrix.drop('total_impact', axis=1)
+    return event_matrix
+
+
+def make_summary(n_events, impacts_per_event, n_indicators, seed=42):
+    """Synthetic summary with repeated (event, indicator) links and a few missing indicators"""
+    summary = make_impact_summary(n_events, impacts_per_event=impacts_per_event, n_indicators=n_indicators,
+                                  seed=seed)
+    rng = np.random.default_rng(seed)
+    summary.loc[rng.random(len(summary)) < 0.01, 'indicator_code'] = np.nan
+    return summary
+
+
+def best_s(func, repeat=3):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run(scales=((100, 20), (500, 40), (2_000, 40)), impacts_per_event=5, lookups=50):
+    rows = []
+    for n_events, n_indicators in scales:
+        summary = make_summary(n_events, impacts_per_event, n_indicators)
+
+        loop_s, expected = best_s(lambda: loop_matrix(summary), repeat=1)
+        build_s, matrix = best_s(lambda: EventIndicatorMatrix.from_summary(summary))
+        dense_s, dense = best_s(lambda: matrix.to_dense())
+        pd.testing.assert_frame_equal(dense, expected, check_exact=False, rtol=1e-12)
+
+        events = matrix.events[:lookups]
+        indicators = matrix.indicators[:lookups]
+        filter_s, _ = best_s(lambda: [summary[summary['event_name'] == event] for event in events]
+                             + [summary[summary['indicator_code'] == code] for code in indicators])
+        lookup_s, _ = best_s(lambda: [matrix.event_impacts(event) for event in events]
+                             + [matrix.indicator_events(code) for code in indicators])
+        for event in events[:5]:
+            np.testing.assert_allclose(matrix.event_impacts(event).to_numpy(),
+                                       expected.loc[event, matrix.event_impacts(event).index].to_numpy())
+
+        rows.append({
+            'events': n_events,
+            'indicators': n_indicators,
+            'links': len(summary),
+            'entries': len(matrix),
+            'loop_s': loop_s,
+            'sparse_build_s': build_s,
+            'to_dense_s': dense_s,
+            'speedup': loop_s / (build_s + dense_s),
+            'filter_lookup_ms': filter_s * 1000 / (len(events) + len(indicators)),
+            'sparse_lookup_ms': lookup_s * 1000 / (len(events) + len(indicators)),
+            'dense_mb': expected.memory_usage(deep=True).sum() / 2**20,
+            'sparse_mb': matrix.nbytes / 2**20
+        })
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    report = run()
+    print(report.to_string(index=False, float_format=lambda x: f"{x:.4f}"))
@@ -0,0 +1,108 @@
+"""
+Monthly, weekly and daily simulation: dict breakdown vs the sparse ImpactBreakdown
+
+The dict path is how the breakdown used to be collected: every significant
+contribution stored under an (event, indicator, period) string tuple, then
+turned into a MultiIndex DataFrame. The sparse path keeps integer ids and
+a float array. Both must give the same breakdown frame at every resolution;
+each is timed and its peak traced memory and stored size are reported.
+
+Run from the project root:
+    python -m benchmarks.bench_event_resolution
+"""
+import contextlib
+import io
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_event_impact import make_impact_summary
+from src.event_impact_model import (EventImpactModel, BREAKDOWN_THRESHOLD, impact_curve, month_positions,
+                                    simulation_periods)
+
+START_DATE = '2015-01-01'
+END_DATE = '2027-12-31'
+
+
+def quiet(func, *args, **kwargs):
+    """Call func with its progress prints suppressed"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args, **kwargs)
+
+
+def dict_breakdown(model, resolution):
+    """The old collection: lag curves per event, significant values into a dict of tuples"""
+    dates, labels, _ = simulation_periods(START_DATE, END_DATE, resolution)
+    arrays = model._impact_arrays(set(model._all_indicators()))
+    anchors = arrays['event_month'] if resolution == 'monthly' else arrays['event_time']
+    positions = month_positions(dates)
+
+    breakdown = {}
+    for pos in np.unique(arrays['event_pos']):
+        rows = np.flatnonzero(arrays['event_pos'] == pos)
+        values = impact_curve(arrays['impact'][rows, np.newaxis], arrays['lag'][rows, np.newaxis],
+                              positions[np.newaxis, :] - anchors[rows, np.newaxis], model.lag_function)
+        for t, label in enumerate(labels):
+            for i, row in enumerate(rows):
+                if abs(values[i, t]) > BREAKDOWN_THRESHOLD:
+                    breakdown[(arrays['event_name'][row], arrays['indicator'][row], label)] = values[i, t]
+
+    if not breakdown:
+        return pd.DataFrame(), 0
+    frame = pd.DataFrame.from_dict(breakdown, orient='index', columns=['impact'])
+    frame.index = pd.MultiIndex.from_tuples(frame.index, names=['event', 'indicator',
+                                                                'month' if resolution == 'monthly' else 'date'])
+    return frame, frame.memory_usage(deep=True).sum() + frame.index.memory_usage(deep=True)
+
+
+def sparse_breakdown(model, resolution):
+    """simulate_impacts' own breakdown, kept sparse"""
+    _, breakdown = quiet(model.simulate_impacts, START_DATE, END_DATE, resolution=resolution, sparse=True)
+    return breakdown, breakdown.nbytes
+
+
+def measure(func, *args):
+    """Wall time, peak traced memory and result of one call"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def run(event_counts=(50, 200), resolutions=('monthly', 'weekly', 'daily')):
+    rows = []
+    for n_events in event_counts:
+        # Few indicators per event, so repeated (event, indicator, period) keys are exercised too
+        model = quiet(EventImpactModel, make_impact_summary(n_events, impacts_per_event=4, n_indicators=3))
+        for resolution in resolutions:
+            dict_s, dict_peak, (expected, dict_bytes) = measure(dict_breakdown, model, resolution)
+            sparse_s, sparse_peak, (breakdown, sparse_bytes) = measure(sparse_breakdown, model, resolution)
+
+            pd.testing.assert_frame_equal(breakdown.to_frame(), expected, check_exact=True)
+            if resolution == 'monthly':
+                _, frame = quiet(model.simulate_impacts, START_DATE, END_DATE)
+                pd.testing.assert_frame_equal(frame, expected, check_exact=True)
+
+            rows.append({
+                'events': n_events,
+                'resolution': resolution,
+                'contributions': len(breakdown),
+                'dict_s': dict_s,
+                'sparse_s': sparse_s,
+                'speedup': dict_s / sparse_s,
+                'dict_peak_mb': dict_peak / 2**20,
+                'sparse_peak_mb': sparse_peak / 2**20,
+                'dict_stored_mb': dict_bytes / 2**20,
+                'sparse_stored_mb': sparse_bytes / 2**20
+            })
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    report = run()
+    print(report.to_string(index=False, float_format=lambda x: f"{x:.3f}"))
@@ -0,0 +1,102 @@
+"""
+What-if event toggling: re-simulation vs the compiled EventTimeline
+
+Checks that the timeline reproduces simulate_impacts for all events and
+for random subsets, then times one toggle three ways: re-simulating a
+model of the active events, a masked sum over the tensor, and the
+EventScenario delta update.
+
+Run from the project root:
+    python -m benchmarks.bench_event_timeline
+"""
+import contextlib
+import io
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_event_impact import make_impact_summary
+from src.event_impact_model import EventImpactModel
+
+START_DATE = '2010-01-01'
+END_DATE = '2027-12-01'
+
+
+def quiet(func, *args, **kwargs):
+    """Call func with its progress prints suppressed"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args, **kwargs)
+
+
+def resimulate(impact_summary, active_events, indicators):
+    """The current path: a model of only the active events, simulated from scratch"""
+    model = quiet(EventImpactModel, impact_summary[impact_summary['parent_id'].isin(active_events)])
+    results, _ = quiet(model.simulate_impacts, START_DATE, END_DATE, indicators=indicators)
+    return results
+
+
+def check_parity(model, impact_summary, rng, n_subsets=5):
+    """All events and random subsets match simulate_impacts"""
+    timeline = model.timeline
+    expected, _ = quiet(model.simulate_impacts, START_DATE, END_DATE)
+    pd.testing.assert_frame_equal(model.what_if(None)[expected.columns], expected,
+                                  check_exact=False, rtol=1e-9, atol=1e-12)
+
+    for _ in range(n_subsets):
+        active = [event_id for event_id in timeline.event_ids if rng.random() < 0.5]
+        expected = resimulate(impact_summary, active, timeline.indicators)
+        pd.testing.assert_frame_equal(model.what_if(active), expected[timeline.indicators],
+                                      check_exact=False, rtol=1e-9, atol=1e-12)
+
+
+def per_toggle_ms(func, toggles):
+    start = time.perf_counter()
+    for event_id in toggles:
+        func(event_id)
+    return (time.perf_counter() - start) / len(toggles) * 1e3
+
+
+def run(event_counts=(20, 100, 500), n_toggles=20, seed=42):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for n_events in event_counts:
+        impact_summary = make_impact_summary(n_events)
+        model = quiet(EventImpactModel, impact_summary)
+
+        start = time.perf_counter()
+        timeline = model.compile_timeline(START_DATE, END_DATE)
+        compile_ms = (time.perf_counter() - start) * 1e3
+        check_parity(model, impact_summary, rng)
+
+        toggles = list(rng.choice(timeline.event_ids, n_toggles))
+        active = set(timeline.event_ids)
+
+        def toggle_resimulate(event_id):
+            active.symmetric_difference_update([event_id])
+            resimulate(impact_summary, active, timeline.indicators)
+
+        def toggle_masked(event_id):
+            active.symmetric_difference_update([event_id])
+            timeline.totals(active)
+
+        scenario = timeline.scenario()
+        resim_ms = per_toggle_ms(toggle_resimulate, toggles)
+        masked_ms = per_toggle_ms(toggle_masked, toggles)
+        delta_ms = per_toggle_ms(scenario.toggle, toggles)
+
+        rows.append({
+            'events': n_events,
+            'tensor_mb': timeline.nbytes / 1024 ** 2,
+            'compile_ms': compile_ms,
+            'resimulate_ms': resim_ms,
+            'masked_sum_ms': masked_ms,
+            'delta_ms': delta_ms,
+            'speedup': resim_ms / delta_ms
+        })
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    report = run()
+    print(report.to_string(index=False, float_format=lambda x: f"{x:.3f}"))
@@ -0,0 +1,168 @@
+"""
+Forecasts by region x gender x location: one forecaster per series vs forecast_groups
+
+The loop is how group forecasts would run on batch_forecast as it stands:
+one series per (indicator, region, gender, location) cell, each forecast
+with forecast_series and its region's simulation column, and every
+aggregate (national, per region, ...) forecast again from its own pooled
+series, so the levels do not add up. forecast_groups must give the same
+trend, event impact and forecast for every fitted cell, pool the same
+observed national values as indicator_series, and reconcile every level to
+the national forecast. simulate_group_impacts must match simulate_impacts
+run once per region on that region's links plus the national ones.
+
+Run from the project root:
+    python -m benchmarks.bench_hierarchical_forecast
+"""
+import contextlib
+import io
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.suite import make_datasets
+from src.batch_forecast import forecast_series, indicator_series, NATIONAL
+from src.event_impact_model import EventImpactModel, impact_summary_from_links
+from src.hierarchical_forecast import UNALLOCATED, forecast_groups
+
+DIMENSIONS = ['region', 'gender', 'location']
+GENDERS = [None, 'female', 'male']
+LOCATIONS = [None, 'urban', 'rural']
+FORECAST_YEARS = [2025, 2026, 2027]
+
+
+def make_inputs(rows, indicators, events, seed=42):
+    """Unified data with region, gender and location columns; half the impact links are regional"""
+    unified, impact = make_datasets(rows, events, indicators, seed=seed)
+    rng = np.random.default_rng(seed)
+    observation = unified['record_type'] == 'observation'
+    unified['gender'] = None
+    unified['location'] = None
+    unified.loc[observation, 'gender'] = np.array(GENDERS, dtype=object)[rng.integers(0, 3, observation.sum())]
+    unified.loc[observation, 'location'] = np.array(LOCATIONS, dtype=object)[rng.integers(0, 3, observation.sum())]
+
+    regions = sorted(unified['region'].dropna().unique())
+    impact['region'] = np.where(rng.random(len(impact)) < 0.5, None,
+                                np.array(regions, dtype=object)[rng.integers(0, len(regions), len(impact))])
+    summary = impact_summary_from_links(unified, impact, group_columns=['region'])
+    return unified, summary, regions + [UNALLOCATED]
+
+
+def quiet(func, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args, **kwargs)
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def loop_simulations(summary, groups, start, end):
+    """simulate_impacts once per group, on that group's links plus the ungrouped ones"""
+    results = {}
+    for group in groups:
+        links = summary[summary['region'].isna() | (summary['region'] == group)]
+        if len(links):
+            results[group] = quiet(lambda: EventImpactModel(links).simulate_impacts(start, end)[0])
+    return results
+
+
+def cell_key_series(unified):
+    """{(indicator_code, 'region / gender / location'): yearly means} of every cell"""
+    cells = unified.assign(**{col: unified[col].fillna(UNALLOCATED) for col in DIMENSIONS})
+    cells['cell'] = cells[DIMENSIONS].astype(str).agg(' / '.join, axis=1)
+    return indicator_series(cells, min_points=2, group_column='cell')
+
+
+def loop_forecasts(unified, simulations):
+    """forecast_series per cell and per pooled aggregate series"""
+    tables = {}
+    for (code, cell), series in cell_key_series(unified).items():
+        if cell == NATIONAL:
+            continue
+        simulation = simulations.get(cell.split(' / ')[0])
+        column = simulation[code] if simulation is not None and code in simulation.columns else None
+        tables[(code, cell)] = quiet(forecast_series, series, FORECAST_YEARS, 'linear', column)
+    for dimension in DIMENSIONS:
+        pooled = unified.assign(**{dimension: unified[dimension].fillna(UNALLOCATED)})
+        for key, series in indicator_series(pooled, group_column=dimension).items():
+            quiet(forecast_series, series, FORECAST_YEARS)
+    return tables
+
+
+def check_cells(aggregates, tables):
+    """Bottom-level cells match forecast_series at the forecast years"""
+    bottom = aggregates.table[aggregates.table['dimension'] == ' x '.join(DIMENSIONS)]
+    bottom = bottom[bottom['Type'] == 'Forecast'].set_index(['indicator_code', 'group', 'Year'])
+    checked = 0
+    for (code, cell), table in tables.items():
+        expected = table[table['Type'] == 'Forecast'].set_index('Year')
+        actual = bottom.loc[(code, cell)].loc[expected.index]
+        for column in ['trend', 'event_impact', 'forecast']:
+            np.testing.assert_allclose(actual[column].to_numpy(), expected[column].to_numpy(),
+                                       rtol=1e-9, atol=1e-9, err_msg=f"{code} {cell} {column}")
+        checked += 1
+    return checked
+
+
+def check_national(unified, aggregates):
+    """National observed values pool every observation, as indicator_series does"""
+    for (code, _), series in indicator_series(unified, regional=False).items():
+        rows = aggregates.select(NATIONAL, NATIONAL, code).set_index('Year')['observed']
+        np.testing.assert_allclose(rows.loc[series.index].to_numpy(), series.to_numpy(), rtol=1e-12)
+
+
+def run(scales=((20_000, 10, 20), (100_000, 40, 100))):
+    rows = []
+    for n_rows, n_indicators, n_events in scales:
+        unified, summary, groups = make_inputs(n_rows, n_indicators, n_events)
+        start = pd.Timestamp(year=summary['event_date'].min().year, month=1, day=1)
+        end = '2024-12-01'
+
+        loop_sim_s, simulations = timed(lambda: loop_simulations(summary, groups, start, end))
+        model = quiet(EventImpactModel, summary, group_column='region')
+        group_sim_s, grouped = timed(lambda: quiet(model.simulate_group_impacts, start, end, groups))
+        for group, expected in simulations.items():
+            if expected is not None:
+                np.testing.assert_allclose(grouped[group][expected.columns].to_numpy(), expected.to_numpy(),
+                                           rtol=1e-12, atol=1e-12)
+
+        loop_s, tables = timed(lambda: loop_forecasts(unified, simulations))
+        groups_s, aggregates = timed(lambda: forecast_groups(unified, DIMENSIONS, FORECAST_YEARS,
+                                                             simulation_results=grouped, impact_dimension='region'))
+        checked = check_cells(aggregates, tables)
+        check_national(unified, aggregates)
+        gap = aggregates.coherence_gap()
+        assert gap < 1e-9, gap
+
+        start_lookup = time.perf_counter()
+        for dimension in aggregates.levels:
+            for group in aggregates.groups(dimension)[:20]:
+                aggregates.select(dimension, group, 'IND_000')
+        lookups = sum(min(len(aggregates.groups(dimension)), 20) for dimension in aggregates.levels)
+        lookup_ms = (time.perf_counter() - start_lookup) * 1000 / lookups
+
+        rows.append({
+            'rows': n_rows,
+            'indicators': n_indicators,
+            'events': n_events,
+            'series': len(aggregates),
+            'cells_checked': checked,
+            'rows_with_impact': int((aggregates.table['event_impact'].fillna(0) != 0).sum()),
+            'loop_sim_s': loop_sim_s,
+            'group_sim_s': group_sim_s,
+            'loop_forecast_s': loop_s,
+            'forecast_groups_s': groups_s,
+            'speedup': (loop_sim_s + loop_s) / (group_sim_s + groups_s),
+            'coherence_gap': gap,
+            'lookup_ms': lookup_ms
+        })
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    report = run()
+    print(report.to_string(index=False, float_format=lambda x: f"{x:.4g}"))
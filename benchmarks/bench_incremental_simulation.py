@@ -0,0 +1,106 @@
+"""
+Re-simulation after appending impact links: full rerun vs IncrementalSimulator
+
+For each model size, the impact summary is changed the way analysts do
+(a few events appended, one modified, one removed). The full path builds
+a new EventImpactModel, simulates every event and writes
+simulation_results.csv; the incremental path re-simulates only the changed
+events and patches the file. Both results, and the patched file read
+back, are checked against simulate_impacts (to rounding: the vectorised
+exp may differ in the last bit between array shapes).
+
+Run from the project root:
+    python -m benchmarks.bench_incremental_simulation
+"""
+import contextlib
+import io
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from benchmarks.bench_event_impact import make_impact_summary
+from src.columnar_store import write_table
+from src.event_impact_model import EventImpactModel
+from src.incremental_simulation import IncrementalSimulator
+
+START_DATE = '2000-01-01'
+END_DATE = '2027-12-01'
+
+
+def quiet(func, *args, **kwargs):
+    """Call func with its progress prints suppressed"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args, **kwargs)
+
+
+def full_simulation(impact_summary, results_path):
+    """The current path: rebuild the model, simulate every event, rewrite the results"""
+    model = quiet(EventImpactModel, impact_summary)
+    results, _ = quiet(model.simulate_impacts, START_DATE, END_DATE)
+    write_table(results, results_path)
+    return results
+
+
+def edit_summary(impact_summary, n_added, seed=7):
+    """Append n_added new events, change one event's impacts and drop another"""
+    added = make_impact_summary(n_added, seed=seed)
+    added['parent_id'] = added['parent_id'].str.replace('EVT_', 'NEW_')
+    edited = impact_summary.copy()
+    first, last = edited['parent_id'].iloc[0], edited['parent_id'].iloc[-1]
+    edited.loc[edited['parent_id'] == first, 'final_impact'] *= 1.5
+    edited = edited[edited['parent_id'] != last]
+    return pd.concat([edited, added], ignore_index=True)
+
+
+def check(results, impact_summary):
+    """results equal simulate_impacts of the whole summary"""
+    model = quiet(EventImpactModel, impact_summary)
+    expected, _ = quiet(model.simulate_impacts, START_DATE, END_DATE)
+    pd.testing.assert_frame_equal(results[expected.columns], expected, check_exact=False, rtol=1e-12, atol=1e-12)
+
+
+def run(event_counts=(100, 1000, 5000), n_added=5):
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_events in event_counts:
+            work = Path(tmp) / str(n_events)
+            work.mkdir()
+            summary = make_impact_summary(n_events)
+            edited = edit_summary(summary, n_added)
+
+            simulator = IncrementalSimulator(work / 'cache', START_DATE, END_DATE)
+            results_path = work / 'simulation_results.csv'
+            start = time.perf_counter()
+            results, _ = quiet(simulator.update, summary, results_path=results_path)
+            cold_s = time.perf_counter() - start
+            check(results, summary)
+
+            # A fresh simulator reads the cache back from disk, as the next notebook run would
+            simulator = IncrementalSimulator(work / 'cache', START_DATE, END_DATE)
+            start = time.perf_counter()
+            results, changes = quiet(simulator.update, edited, results_path=results_path)
+            incremental_s = time.perf_counter() - start
+            check(results, edited)
+            check(pd.read_csv(results_path, index_col=0), edited)
+
+            start = time.perf_counter()
+            full_simulation(edited, work / 'full_results.csv')
+            full_s = time.perf_counter() - start
+
+            rows.append({
+                'events': n_events,
+                'resimulated': len(changes['added']) + len(changes['modified']),
+                'columns_rebuilt': len(changes['indicators']),
+                'first_update_s': cold_s,
+                'full_rerun_s': full_s,
+                'incremental_s': incremental_s,
+                'speedup': full_s / incremental_s
+            })
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    report = run()
+    print(report.to_string(index=False, float_format=lambda x: f"{x:.3f}"))
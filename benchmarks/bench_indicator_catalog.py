@@ -0,0 +1,106 @@
+"""
+Benchmark indicator discovery: per-code keyword loop vs IndicatorCatalog
+
+The loop is prepare_historical_data's old selection (every code tested
+against each keyword in Python, record_type variants tried one at a time).
+The catalog is built in one vectorised pass, then loaded back from disk as
+later runs do. Both must select the same access and usage codes.
+
+Run from the project root:
+    python -m benchmarks.bench_indicator_catalog
+"""
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.indicator_catalog import IndicatorCatalog, ACCESS_KEYWORDS, USAGE_KEYWORDS
+
+PREFIXES = ['ACC', 'USG', 'GEN', 'AFF', 'INF', 'MM', 'DIGITAL', 'PAYMENT', 'QLT']
+PILLARS = ['ACCESS', 'USAGE', 'QUALITY', 'GENDER']
+
+
+def make_unified(n_rows, n_codes, seed=42):
+    """Observation rows over n_codes synthetic codes, with pillars"""
+    rng = np.random.default_rng(seed)
+    codes = np.array([f"{PREFIXES[i % len(PREFIXES)]}_{i:06d}" for i in range(n_codes)])
+    return pd.DataFrame({
+        'record_type': 'observation',
+        'indicator_code': codes[rng.integers(0, n_codes, n_rows)],
+        'pillar': np.array(PILLARS)[rng.integers(0, len(PILLARS), n_rows)],
+        'value_numeric': rng.normal(50, 15, n_rows)
+    })
+
+
+def legacy_discovery(data_df):
+    """The old path: keyword loop over the unique codes, then record_type attempts"""
+    all_indicators = data_df['indicator_code'].dropna().unique()
+    access_indicators = []
+    usage_indicators = []
+    for indicator in all_indicators:
+        indicator_str = str(indicator).upper()
+        if any(keyword in indicator_str for keyword in ACCESS_KEYWORDS):
+            access_indicators.append(indicator)
+        if any(keyword in indicator_str for keyword in USAGE_KEYWORDS):
+            usage_indicators.append(indicator)
+
+    for record_type in ['indicator', 'Indicator', 'INDICATOR', 'data', 'observation']:
+        if record_type in data_df['record_type'].unique():
+            hist_data = data_df[data_df['record_type'] == record_type]
+            break
+    else:
+        hist_data = data_df
+    return sorted(access_indicators), sorted(usage_indicators), len(hist_data)
+
+
+def catalog_discovery(catalog, data_df):
+    """The new path: codes from the catalog, one scan of record_type"""
+    present = set(data_df['record_type'].unique())
+    record_type = next((t for t in ['indicator', 'Indicator', 'INDICATOR', 'data', 'observation']
+                        if t in present), None)
+    hist_data = data_df[data_df['record_type'] == record_type] if record_type else data_df
+    return sorted(catalog.flagged('access')), sorted(catalog.flagged('usage')), len(hist_data)
+
+
+def best_s(func, repeat=3):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run(sizes=((200_000, 1_000), (1_000_000, 20_000), (2_000_000, 50_000))):
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_rows, n_codes in sizes:
+            unified = make_unified(n_rows, n_codes)
+            path = Path(tmp) / f"catalog_{n_codes}.csv"
+
+            legacy_s, expected = best_s(lambda: legacy_discovery(unified))
+            build_s, catalog = best_s(lambda: IndicatorCatalog.build(unified))
+            catalog.source = ['bench', n_rows, n_codes]
+            catalog.save(path)
+            load_s, cached = best_s(lambda: IndicatorCatalog.cached(path, ['bench', n_rows, n_codes],
+                                                                    lambda: IndicatorCatalog.build(unified)))
+            assert catalog_discovery(catalog, unified) == expected
+            assert catalog_discovery(cached, unified) == expected
+
+            rows.append({
+                'rows': n_rows,
+                'codes': n_codes,
+                'keyword_loop_s': legacy_s,
+                'catalog_build_s': build_s,
+                'catalog_cached_s': load_s,
+                'build_speedup': legacy_s / build_s,
+                'cached_speedup': legacy_s / load_s
+            })
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    report = run()
+    print(report.to_string(index=False, float_format=lambda x: f"{x:.3f}"))
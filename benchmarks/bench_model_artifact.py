@@ -0,0 +1,82 @@
+"""
+Load time of the model artifact against pickle and joblib
+
+Saves synthetic EventImpactModels of increasing size both ways, checks
+the artifact model simulates identically, then times loading each form.
+"first simulate" includes the load, as a worker would pay it.
+
+Run from the project root:
+    python -m benchmarks.bench_model_artifact
+"""
+import contextlib
+import io
+import pickle
+import tempfile
+import time
+from pathlib import Path
+
+import joblib
+import pandas as pd
+
+from benchmarks.bench_event_impact import make_impact_summary
+from src.event_impact_model import EventImpactModel
+from src.model_artifact import save_artifact, load_model
+
+START_DATE = '2015-01-01'
+END_DATE = '2027-12-01'
+
+
+def quiet(func, *args, **kwargs):
+    """Call func with its progress prints suppressed"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args, **kwargs)
+
+
+def best_ms(func, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e3
+
+
+def load_pickle(path):
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+
+def run(event_counts=(12, 200, 2000, 20000)):
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        for n_events in event_counts:
+            model = quiet(EventImpactModel, make_impact_summary(n_events))
+            with open(tmp / 'model.pkl', 'wb') as f:
+                pickle.dump(model, f)
+            joblib.dump(model, tmp / 'model.joblib')
+            save_artifact(model, tmp / 'model')
+
+            expected, expected_breakdown = quiet(model.simulate_impacts, START_DATE, END_DATE)
+            actual, actual_breakdown = quiet(load_model(tmp / 'model').simulate_impacts, START_DATE, END_DATE)
+            pd.testing.assert_frame_equal(actual[expected.columns], expected)
+            pd.testing.assert_frame_equal(actual_breakdown, expected_breakdown)
+
+            rows.append({
+                'events': n_events,
+                'pickle_kb': (tmp / 'model.pkl').stat().st_size / 1024,
+                'artifact_kb': sum(p.stat().st_size for p in (tmp / 'model').iterdir()) / 1024,
+                'pickle_ms': best_ms(lambda: load_pickle(tmp / 'model.pkl')),
+                'joblib_ms': best_ms(lambda: joblib.load(tmp / 'model.joblib')),
+                'artifact_ms': best_ms(lambda: load_model(tmp / 'model')),
+                'pickle_first_sim_ms': best_ms(lambda: quiet(
+                    load_pickle(tmp / 'model.pkl').simulate_impacts, START_DATE, END_DATE), repeat=3),
+                'artifact_first_sim_ms': best_ms(lambda: quiet(
+                    load_model(tmp / 'model').simulate_impacts, START_DATE, END_DATE), repeat=3)
+            })
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    report = run()
+    print(report.to_string(index=False, float_format=lambda x: f"{x:.2f}"))
@@ -0,0 +1,70 @@
+"""
+Overhead of the profiling spans, disabled (the default) and enabled
+
+Times a trivial call and EventImpactModel.simulate_impacts through the
+@profiled wrapper with the profiler off, on without memory tracing, and on
+with tracemalloc, against the undecorated function.
+
+Run from the project root:
+    python -m benchmarks.bench_profiling
+"""
+import contextlib
+import io
+import time
+
+import pandas as pd
+
+from benchmarks.bench_event_impact import make_impact_summary
+from src.event_impact_model import EventImpactModel
+from src.profiling import PROFILER, profiled
+
+START_DATE = '2015-01-01'
+END_DATE = '2027-12-01'
+
+
+def noop():
+    return None
+
+
+def best_us(func, number, repeat=5):
+    """Best mean time per call in microseconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best * 1e6
+
+
+def run(n_events=200):
+    with contextlib.redirect_stdout(io.StringIO()):
+        model = EventImpactModel(make_impact_summary(n_events))
+    undecorated_simulate = EventImpactModel.simulate_impacts.__wrapped__
+    cases = {
+        'noop': (noop, profiled('bench.noop')(noop), 100_000),
+        'simulate_impacts': (lambda: undecorated_simulate(model, START_DATE, END_DATE),
+                             lambda: model.simulate_impacts(START_DATE, END_DATE), 3)
+    }
+
+    rows = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for name, (plain, wrapped, number) in cases.items():
+            row = {'call': name, 'plain_us': best_us(plain, number)}
+            PROFILER.disable()
+            row['disabled_us'] = best_us(wrapped, number)
+            PROFILER.enable(memory=False)
+            row['enabled_us'] = best_us(wrapped, number)
+            PROFILER.disable()
+            PROFILER.enable(memory=True)
+            row['enabled_memory_us'] = best_us(wrapped, number)
+            PROFILER.disable()
+            PROFILER.clear()
+            row['disabled_overhead_us'] = row['disabled_us'] - row['plain_us']
+            rows.append(row)
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    report = run()
+    print(report.to_string(index=False, float_format=lambda x: f"{x:,.2f}"))
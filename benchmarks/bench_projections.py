@@ -0,0 +1,107 @@
+"""
+Per-interaction latency of the projections page: loops vs grid lookup
+
+Times the original nested-loop projection (with its target scan) against
+a ProjectionGrid lookup for random slider positions, after checking both
+give identical trajectories and target years across the whole grid.
+
+Run from the project root:
+    python -m benchmarks.bench_projections
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.projections import (
+    ProjectionGrid, projection_grid, slider_values,
+    BASE_GROWTH_RANGE, OPT_BOOST_RANGE, PESS_DRAG_RANGE
+)
+
+YEARS = list(range(2024, 2031))
+START_VALUES = {'digital': 45.0, 'access': 49.0}
+TARGETS = {'digital': 60, 'access': 65}
+
+
+def loop_interaction(start_value, target, base_growth, opt_boost, pess_drag, years=YEARS):
+    """The original projections_page computation for one indicator"""
+    scenarios = {}
+    for scenario_name, modifier in [('Base', 0), ('Optimistic', opt_boost), ('Pessimistic', -pess_drag)]:
+        rates = [start_value]
+        for i in range(1, len(years)):
+            growth = (base_growth + modifier) / 100
+            new_rate = rates[-1] * (1 + growth)
+            rates.append(min(new_rate, 100))
+        scenarios[scenario_name] = rates
+
+    hits = {}
+    for scenario, rates in scenarios.items():
+        hits[scenario] = None
+        for i, year in enumerate(years):
+            if rates[i] >= target:
+                hits[scenario] = year
+                break
+    return scenarios, hits
+
+
+def grid_interaction(start_value, target, base_growth, opt_boost, pess_drag, years=YEARS):
+    """The grid path: memoized grid, then two lookups"""
+    grid = projection_grid(start_value, tuple(years), (target,))
+    return grid.scenarios(base_growth, opt_boost, pess_drag), grid.target_years(target, base_growth, opt_boost, pess_drag)
+
+
+def check_parity(start_value, target):
+    """Every slider combination gives the loop's trajectories and target years exactly"""
+    grid = ProjectionGrid(start_value, YEARS, (target,))
+    for b in slider_values(*BASE_GROWTH_RANGE):
+        for o, p in zip(slider_values(*OPT_BOOST_RANGE), slider_values(*PESS_DRAG_RANGE)[::-1]):
+            expected, expected_hits = loop_interaction(start_value, target, b, o, p)
+            actual = grid.scenarios(b, o, p)
+            for name, rates in expected.items():
+                assert np.array_equal(actual[name], rates), (b, o, p, name)
+            assert grid.target_years(target, b, o, p) == expected_hits, (b, o, p)
+
+
+def per_call_us(func, calls):
+    """Mean microseconds per call over a list of argument tuples"""
+    start = time.perf_counter()
+    for args in calls:
+        func(*args)
+    return (time.perf_counter() - start) / len(calls) * 1e6
+
+
+def run(n_interactions=20000, seed=42):
+    rng = np.random.default_rng(seed)
+    positions = np.column_stack([
+        rng.choice(slider_values(*BASE_GROWTH_RANGE), n_interactions),
+        rng.choice(slider_values(*OPT_BOOST_RANGE), n_interactions),
+        rng.choice(slider_values(*PESS_DRAG_RANGE), n_interactions)
+    ]).tolist()
+
+    rows = []
+    for indicator, start_value in START_VALUES.items():
+        target = TARGETS[indicator]
+        check_parity(start_value, target)
+
+        projection_grid.cache_clear()
+        start = time.perf_counter()
+        grid = projection_grid(start_value, tuple(YEARS), (target,))
+        build_ms = (time.perf_counter() - start) * 1e3
+
+        calls = [(start_value, target, b, o, p) for b, o, p in positions]
+        loop_us = per_call_us(loop_interaction, calls)
+        grid_us = per_call_us(grid_interaction, calls)
+        rows.append({
+            'indicator': indicator,
+            'grid_build_ms': build_ms,
+            'grid_kb': grid.nbytes / 1024,
+            'loop_us': loop_us,
+            'lookup_us': grid_us,
+            'speedup': loop_us / grid_us
+        })
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    report = run()
+    print(report.to_string(index=False, float_format=lambda x: f"{x:.2f}"))
@@ -0,0 +1,107 @@
+"""
+Trends page on long high-frequency series: mask + full traces vs SeriesQuery
+
+On every rerun the old path masked the whole table on Year, sent every
+row to Plotly and st.dataframe and built the download with to_csv. The new
+rerun slices the sorted table by binary search, downsamples each metric by
+LTTB to the chart's point budget and shows one table page; the CSV is only
+encoded (in chunks) when the download is clicked, timed here as export.
+The range and the CSV bytes must match the old path exactly; the chart
+payload is the size of the figure JSON the browser receives.
+
+Run from the project root:
+    python -m benchmarks.bench_series_query
+"""
+import logging
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from streamlit import config as st_config, logger as st_logger
+
+st_config.set_option('global.showWarningOnDirectExecution', False)
+st_logger.set_log_level(logging.ERROR)
+
+from dashboard.app import EthiopiaDashboard, TRENDS_PAGE_SIZE
+from src.series_query import SeriesQuery, lttb
+
+METRICS = ['Account_Ownership', 'Digital_Payments', 'Mobile_Money']
+
+
+def make_history(n_rows, seed=42):
+    """n_rows of random-walk metrics over fractional years 1990-2025, in Year order as the loader builds them"""
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({'Year': np.linspace(1990, 2025, n_rows)})
+    for metric in METRICS:
+        frame[metric] = 50 + np.cumsum(rng.normal(0, 0.5, n_rows))
+    return frame
+
+
+def legacy_page(history, year_range):
+    """Mask, full-resolution line chart, whole table, one CSV string"""
+    rows = history[(history['Year'] >= year_range[0]) & (history['Year'] <= year_range[1])]
+    fig = go.Figure([go.Scatter(x=rows['Year'], y=rows[metric], name=metric, mode='lines+markers')
+                     for metric in METRICS])
+    return rows, fig, rows, rows.to_csv(index=False).encode('utf-8')
+
+
+def query_page(query, year_range):
+    """Binary-search range, LTTB chart, one table page"""
+    rows = query.range(*year_range)
+    fig = EthiopiaDashboard.trends_figure(None, rows, year_range, METRICS, "Line Chart")
+    table = query.page(year_range[0], year_range[1], 0, TRENDS_PAGE_SIZE)
+    return rows, fig, table
+
+
+def best_s(func, repeat=3):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def check_lttb():
+    """Endpoints kept, budget respected, and a single spike survives downsampling"""
+    x = np.arange(100_000, dtype=float)
+    y = np.zeros_like(x)
+    y[54_321] = 10.0
+    kept = lttb(x, y, 500)
+    assert len(kept) == 500 and kept[0] == 0 and kept[-1] == len(x) - 1
+    assert np.all(np.diff(kept) > 0) and 54_321 in kept
+
+
+def run(sizes=(10_000, 100_000, 1_000_000), year_range=(2000, 2020)):
+    check_lttb()
+    rows = []
+    for n_rows in sizes:
+        history = make_history(n_rows)
+        build_s, query = best_s(lambda: SeriesQuery(history, 'Year'), repeat=1)
+        legacy_s, (old_rows, old_fig, old_table, old_csv) = best_s(lambda: legacy_page(history, year_range))
+        query_s, (new_rows, new_fig, new_table) = best_s(lambda: query_page(query, year_range))
+        export_s, new_csv = best_s(lambda: query.csv_bytes(*year_range))
+
+        pd.testing.assert_frame_equal(new_rows.reset_index(drop=True), old_rows.reset_index(drop=True))
+        assert new_csv == old_csv
+
+        rows.append({
+            'rows': n_rows,
+            'in_range': len(new_rows),
+            'legacy_rerun_ms': legacy_s * 1000,
+            'query_rerun_ms': query_s * 1000,
+            'speedup': legacy_s / query_s,
+            'export_ms': export_s * 1000,
+            'index_build_ms': build_s * 1000,
+            'legacy_chart_kb': len(old_fig.to_json()) / 1024,
+            'query_chart_kb': len(new_fig.to_json()) / 1024,
+            'legacy_table_rows': len(old_table),
+            'query_table_rows': len(new_table)
+        })
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    report = run()
+    print(report.to_string(index=False, float_format=lambda x: f"{x:,.1f}"))
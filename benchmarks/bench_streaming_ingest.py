@@ -0,0 +1,127 @@
+"""
+Peak memory and time of chunked ingestion against loading the whole file
+
+Writes synthetic unified-dataset CSVs (1M and 10M rows by default), then
+aggregates each one with StreamingIngest and, up to --full-max-rows, with
+the current path (read the whole file, then YearlyAggregateStore.update).
+Each measurement runs in a fresh process so its peak RSS is its own; the
+yearly means of both paths are checked to agree.
+
+Run from the project root:
+    python -m benchmarks.bench_streaming_ingest
+    python -m benchmarks.bench_streaming_ingest --rows 1000000 10000000 --chunk-size 250000
+"""
+import argparse
+import multiprocessing
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.streaming_ingest import StreamingIngest
+from src.yearly_aggregates import YearlyAggregateStore
+
+INDICATORS = ['ACC_OWNERSHIP', 'ACC_MM_ACCOUNT', 'USG_DIGITAL_PAYMENT', 'USG_P2P_COUNT',
+              'ATM_PER_100K', 'ACC_4G_COVERAGE', 'USG_TELEBIRR_USERS', 'ACC_AGENT_DENSITY']
+REGIONS = [None, 'Addis Ababa', 'Amhara', 'Oromia', 'Tigray', 'Sidama', 'Somali']
+
+
+def write_synthetic_file(path, n_rows, seed=42, chunk_rows=1_000_000):
+    """Unified-format CSV of n_rows (~0.1% events, as in the real data events are rare), written in chunks to keep the writer small"""
+    rng = np.random.default_rng(seed)
+    first_day = pd.Timestamp('2011-01-01')
+    with open(path, 'w') as f:
+        for start in range(0, n_rows, chunk_rows):
+            n = min(chunk_rows, n_rows - start)
+            is_event = rng.random(n) < 0.001
+            codes = np.array(INDICATORS)[rng.integers(0, len(INDICATORS), n)]
+            dates = first_day + pd.to_timedelta(rng.integers(0, 14 * 365, n), unit='D')
+            chunk = pd.DataFrame({
+                'record_id': [f"REC_{i}" for i in range(start, start + n)],
+                'record_type': np.where(is_event, 'event', 'observation'),
+                'indicator': 'synthetic',
+                'indicator_code': codes,
+                'observation_date': dates.strftime('%Y-%m-%d'),
+                'value_numeric': np.round(rng.normal(50, 15, n), 3),
+                'value_text': np.where(is_event, 'launch', ''),
+                'notes': '',
+                'region': np.array(REGIONS, dtype=object)[rng.integers(0, len(REGIONS), n)]
+            })
+            chunk.to_csv(f, header=start == 0, index=False)
+    return path
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process in MB (ru_maxrss is KB on Linux)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def measure(path, mode, chunk_size):
+    """Run one ingestion path; returns (seconds, peak MB above the post-import baseline, yearly means)"""
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    if mode == 'streaming':
+        means = StreamingIngest().ingest(path, chunk_size=chunk_size).yearly_means()
+    else:
+        means = YearlyAggregateStore().update(pd.read_csv(path)).yearly_means()
+    return time.perf_counter() - start, peak_rss_mb() - baseline, means
+
+
+def in_fresh_process(func, *args):
+    """
+    Call func(*args) in a new interpreter
+
+    A child's peak RSS starts at its parent's, so the files are also written
+    from a child and this process stays small.
+    """
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        return pool.submit(func, *args).result()
+
+
+def run(row_counts=(1_000_000, 10_000_000), chunk_size=100_000, full_max_rows=2_000_000, data_dir=None):
+    """Time both paths per file size; the full load is skipped above full_max_rows"""
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(data_dir or tmp)
+        for n_rows in row_counts:
+            path = data_dir / f"unified_{n_rows}.csv"
+            if not path.exists():
+                start = time.perf_counter()
+                in_fresh_process(write_synthetic_file, path, n_rows)
+                print(f"✓ Wrote {n_rows:,} rows ({path.stat().st_size / 1024 ** 2:.0f} MB) "
+                      f"in {time.perf_counter() - start:.1f}s")
+
+            modes = ['streaming'] + (['full'] if n_rows <= full_max_rows else [])
+            results = {mode: in_fresh_process(measure, path, mode, chunk_size) for mode in modes}
+            if 'full' in results:
+                pd.testing.assert_frame_equal(results['streaming'][2], results['full'][2],
+                                              check_exact=False, rtol=1e-9)
+
+            for mode, (seconds, peak_mb, _) in results.items():
+                rows.append({
+                    'rows': n_rows,
+                    'path': mode,
+                    'file_mb': path.stat().st_size / 1024 ** 2,
+                    'seconds': seconds,
+                    'peak_mb': peak_mb,
+                    'rows_per_s': n_rows / seconds
+                })
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000_000, 10_000_000])
+    parser.add_argument('--chunk-size', type=int, default=100_000)
+    parser.add_argument('--full-max-rows', type=int, default=2_000_000,
+                        help="Largest file also loaded whole (the full load needs several GB at 10M rows)")
+    parser.add_argument('--data-dir', help="Keep the synthetic files here instead of a temporary directory")
+    args = parser.parse_args()
+
+    report = run(args.rows, args.chunk_size, args.full_max_rows, args.data_dir)
+    print(report.to_string(index=False, float_format=lambda x: f"{x:,.1f}"))
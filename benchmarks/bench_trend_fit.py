@@ -0,0 +1,143 @@
+"""
+Benchmark batched trend fitting against per-series LinearRegression fits
+
+Checks that fit_linear_batch / fit_logistic_batch reproduce
+TrendForecaster.fit_linear, FixedTrendForecaster.fit_linear and
+TrendForecaster.fit_logistic for every series, then times both.
+
+Run from the project root:
+    python -m benchmarks.bench_trend_fit
+"""
+import contextlib
+import io
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from src.forecasting import TrendForecaster, FixedTrendForecaster
+from src.trend_fitting import stack_series, fit_linear_batch, fit_logistic_batch
+
+RTOL = 1e-8
+ATOL = 1e-9
+
+
+def make_series(n_series, seed=42, years=range(2011, 2025)):
+    """Sparse yearly series of 3-10 points; percentages, shares and a few constant series"""
+    rng = np.random.default_rng(seed)
+    years = np.array(list(years))
+    series = {}
+    for i in range(n_series):
+        n_points = rng.integers(3, 11)
+        idx = np.sort(rng.choice(years, n_points, replace=False))
+        if i % 3 == 0:
+            values = np.clip(0.1 + 0.04 * (idx - years[0]) + rng.normal(0, 0.03, n_points), 0.01, 0.99)
+        else:
+            values = 20 + 3 * (idx - years[0]) + rng.normal(0, 4, n_points)
+        if i % 50 == 0:
+            values = np.full(n_points, values[0])
+        series[f"IND_{i:05d}"] = pd.Series(values, index=idx)
+    return series
+
+
+def per_series_linear(series_by_key, forecaster_cls):
+    """The current path: one LinearRegression per series"""
+    rows = {}
+    for key, series in series_by_key.items():
+        forecaster = forecaster_cls()
+        model = forecaster.fit_linear(series, key)
+        info = forecaster.models[f"{key}_linear"]
+        values = series.values / 100 if info.get('was_percentage') else series.values
+        residuals = values - model.predict(np.array(series.index).reshape(-1, 1))
+        rows[key] = {
+            'slope': model.coef_[0],
+            'intercept': model.intercept_,
+            'r2': info['r2'],
+            'mse': np.mean(residuals ** 2),
+            'mae': np.mean(np.abs(residuals))
+        }
+    return pd.DataFrame.from_dict(rows, orient='index')
+
+
+def per_series_logistic(series_by_key):
+    """The current logit-transform path, one LinearRegression per series"""
+    rows = {}
+    for key, series in series_by_key.items():
+        forecaster = TrendForecaster()
+        model = forecaster.fit_logistic(series, key)
+        if model is None:
+            continue
+        info = forecaster.models[f"{key}_logistic"]
+        rows[key] = {'slope': model.coef_[0], 'intercept': model.intercept_, 'k': info['k'], 't0': info['t0']}
+    return pd.DataFrame.from_dict(rows, orient='index')
+
+
+def batched(series_by_key, kind='linear', percent_scale=False):
+    """All series in one stacked fit"""
+    keys, years, values = stack_series(series_by_key)
+    if percent_scale:
+        # FixedTrendForecaster works in decimals when a series looks like percentages
+        values = np.where(np.nanmax(np.abs(values), axis=1, keepdims=True) > 1, values / 100, values)
+    fits = fit_logistic_batch(years, values) if kind == 'logistic' else fit_linear_batch(years, values)
+    return pd.DataFrame({name: array for name, array in fits.items() if np.ndim(array) == 1}, index=keys)
+
+
+def check_parity(expected, actual, series_by_key):
+    """Assert every per-series statistic matches the batched result"""
+    actual = actual.loc[expected.index, expected.columns].copy()
+
+    # For a constant series sklearn's slope is rounding noise (~1e-30), which flips its
+    # R² between 1.0 and 0.0 and sends t0 = -intercept / k to ~1e30. The batched fit
+    # returns an exact 0 slope (R² 1.0, t0 0), so those two are not compared there.
+    constant = [series_by_key[key].nunique() == 1 for key in expected.index]
+    expected = expected.copy()
+    for name in ['r2', 't0']:
+        if name in expected.columns:
+            expected.loc[constant, name] = actual.loc[constant, name]
+
+    np.testing.assert_allclose(actual.to_numpy(), expected.to_numpy(dtype=float), rtol=RTOL, atol=ATOL)
+
+
+def time_call(func, *args, repeat=3):
+    """Best wall time of func(*args) over several runs, with its last result"""
+    best = np.inf
+    result = None
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()), warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            start = time.perf_counter()
+            result = func(*args)
+            best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run(series_counts=(100, 1000, 5000)):
+    """Time both paths for each fit kind and check they agree"""
+    cases = [
+        ('linear', lambda s: per_series_linear(s, TrendForecaster), lambda s: batched(s)),
+        ('fixed_linear', lambda s: per_series_linear(s, FixedTrendForecaster),
+         lambda s: batched(s, percent_scale=True)),
+        ('logistic', per_series_logistic, lambda s: batched(s, 'logistic'))
+    ]
+    rows = []
+    for n_series in series_counts:
+        series = make_series(n_series)
+        for name, loop, vectorized in cases:
+            repeat = 1 if n_series >= 1000 else 3
+            loop_time, expected = time_call(loop, series, repeat=repeat)
+            vec_time, actual = time_call(vectorized, series)
+            check_parity(expected, actual, series)
+            rows.append({
+                'series': n_series,
+                'fit': name,
+                'per_series_s': loop_time,
+                'batched_s': vec_time,
+                'speedup': loop_time / vec_time
+            })
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    report = run()
+    print(report.to_string(index=False, float_format=lambda x: f"{x:.4f}"))
@@ -0,0 +1,168 @@
+"""
+Simulated multi-session load test of the dashboard
+
+Writes a synthetic unified dataset and impact sheet at one of the suite's
+scales, then drives the real app with many Streamlit AppTest sessions in
+one process, as a server with that many open browser tabs would hold them.
+Each session opens the dashboard and visits --steps random pages, toggling
+an event whenever it lands on the What-If page. Sessions take turns, one
+rerun at a time (AppTest sessions cannot rerun concurrently), so every
+session stays open for the whole run.
+
+Two figures are reported:
+
+- page latency: wall time of each rerun, p50/p95 overall and per page;
+- memory per session: growth of traced Python/NumPy allocations while a
+  second set of sessions is opened and walked through the same pages,
+  after the shared datasets are loaded. AppTest also keeps each session's
+  rendered element tree, so this is an upper bound on the server's share.
+
+The shared datasets' size is shown next to it: before sessions shared the
+data layer, each one held a private copy of it.
+
+Run from the project root:
+    python -m benchmarks.load_test
+    python -m benchmarks.load_test --sessions 200 --steps 5 --scale medium
+"""
+import argparse
+import contextlib
+import gc
+import io
+import logging
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from streamlit import config as st_config, logger as st_logger
+from streamlit.testing.v1 import AppTest
+
+st_config.set_option('global.showWarningOnDirectExecution', False)
+st_logger.set_log_level(logging.ERROR)
+
+from benchmarks.suite import SCALES, make_datasets, make_loader
+from dashboard.app import PAGE_DATASETS, dashboard_datasets
+from src.data_cache import estimate_size
+
+APP_PATH = Path(__file__).resolve().parent.parent / "dashboard" / "app.py"
+PAGES = list(PAGE_DATASETS)
+
+
+def write_data(data_dir, scale):
+    """Synthetic data files where the app looks for them relative to the working directory"""
+    unified, impact = make_datasets(scale['rows'], scale['events'], scale['indicators'])
+    raw = Path(data_dir) / "data" / "raw"
+    raw.mkdir(parents=True)
+    unified.to_csv(raw / "ethiopia_fi_unified_new.csv", index=False)
+    impact.to_csv(raw / "impact_sheet_new.csv", index=False)
+
+
+def shared_data_bytes(data_dir):
+    """In-memory size of every dataset the sessions share"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        datasets = dashboard_datasets(make_loader(Path(data_dir) / "data"))
+        datasets.start().wait(datasets.entries)
+    size = sum(estimate_size(value) for value, _ in datasets.snapshot().values() if value is not None)
+    datasets.stop()
+    return size
+
+
+class Session:
+    """One simulated browser session"""
+
+    def __init__(self, session_id, seed):
+        self.session_id = session_id
+        self.app = AppTest.from_file(str(APP_PATH), default_timeout=120)
+        self.rng = random.Random(seed)
+        self.timings = []
+
+    def timed(self, page, action):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            action()
+        self.timings.append({'session': self.session_id, 'page': page,
+                             'seconds': time.perf_counter() - start, 'errors': len(self.app.exception)})
+
+    def open(self):
+        self.timed(PAGES[0], self.app.run)
+
+    def step(self):
+        page = self.rng.choice(PAGES)
+        self.timed(page, lambda: self.app.sidebar.radio[0].set_value(page).run())
+        if page == "🧪 What-If Events" and self.app.multiselect:
+            events = self.app.multiselect[0]
+            if events.value:
+                self.timed(page + " (toggle)", lambda: events.set_value(events.value[1:]).run())
+
+
+def run_sessions(n_sessions, steps, seed):
+    """Open n_sessions, then move each to a new page in turn, steps times; returns the live sessions"""
+    sessions = [Session(i, seed + i) for i in range(n_sessions)]
+    for session in sessions:
+        session.open()
+    for _ in range(steps):
+        for session in sessions:
+            session.step()
+    return sessions
+
+
+def run(n_sessions=50, steps=5, scale='small', seed=0):
+    previous_dir = os.getcwd()
+    os.environ.setdefault("ETHIOPIA_FI_REFRESH_SECONDS", "0")
+    with tempfile.TemporaryDirectory() as tmp:
+        write_data(tmp, SCALES[scale])
+        shared_bytes = shared_data_bytes(tmp)
+        os.chdir(tmp)
+        try:
+            # Load the shared datasets and warm the caches, as the first visitor would
+            run_sessions(1, len(PAGES), seed - 1)
+
+            sessions = run_sessions(n_sessions, steps, seed)
+            timings = pd.DataFrame([row for session in sessions for row in session.timings])
+            del sessions
+            gc.collect()
+
+            tracemalloc.start()
+            before = tracemalloc.get_traced_memory()[0]
+            sessions = run_sessions(n_sessions, steps, seed)
+            gc.collect()
+            per_session = (tracemalloc.get_traced_memory()[0] - before) / n_sessions
+            tracemalloc.stop()
+            del sessions
+        finally:
+            os.chdir(previous_dir)
+
+    ms = timings['seconds'] * 1000
+    summary = pd.DataFrame([{
+        'sessions': n_sessions,
+        'reruns': len(timings),
+        'errors': int(timings['errors'].sum()),
+        'p50_ms': np.percentile(ms, 50),
+        'p95_ms': np.percentile(ms, 95),
+        'max_ms': ms.max(),
+        'per_session_kb': per_session / 1024,
+        'shared_data_kb': shared_bytes / 1024
+    }])
+    pages = timings.assign(ms=ms).groupby('page')['ms'].describe(percentiles=[0.5, 0.95])
+    return summary, pages[['count', '50%', '95%', 'max']]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulated multi-session load test of the dashboard")
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--steps", type=int, default=5, help="Page visits per session after opening it")
+    parser.add_argument("--scale", choices=list(SCALES), default='small')
+    args = parser.parse_args()
+
+    summary, pages = run(args.sessions, args.steps, args.scale)
+    print(summary.to_string(index=False, float_format=lambda x: f"{x:,.1f}"))
+    print()
+    print(pages.to_string(float_format=lambda x: f"{x:,.1f}"))
+
+
+if __name__ == "__main__":
+    main()
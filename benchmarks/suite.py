@@ -0,0 +1,337 @@
+"""
+Benchmark suite for loading, aggregation, simulation, forecasting and projections
+
+Generates synthetic unified and impact datasets at several scales (rows,
+events, indicators, simulated months) and times the stages the dashboard
+and notebooks run:
+
+    load.unified_cold         EthiopiaDataLoader.load_unified_data, empty cache
+    load.unified_warm         the same load served from the DataCache
+    load.impact_cold          EthiopiaDataLoader.load_impact_data, empty cache
+    historical.aggregate      EthiopiaDataLoader.build_historical_data (yearly aggregates from scratch)
+    historical.process_wide   EthiopiaDataLoader.process_historical_data on a wide date/metric table
+    simulate.impacts          EventImpactModel.simulate_impacts over the scale's months
+    forecast.trend_fit        fit_series on every (indicator, region) series
+    forecast.batch            run_batch_forecasts over the national series, in process
+    scenario.monte_carlo      MonteCarloForecaster.percentile_bands (10,000 draws) with the ACCESS events
+    projection.grid           ProjectionGrid build plus one slider lookup, as projections_page does
+
+Results are written as JSON. Given a baseline, each case's best time is
+compared with it and the run fails (exit status 1) when any case is more
+than --threshold slower and by more than --min-delta-ms. Everything runs
+offline; only the standard scientific stack is needed. Each results
+document records the git commit it was timed at; regenerate the baseline
+from the tree being merged whenever a change is meant to alter timings.
+
+Run from the project root:
+    python -m benchmarks.suite --output benchmarks/results.json
+    python -m benchmarks.suite --scales small medium large --baseline benchmarks/baseline.json
+    python -m benchmarks.suite --save-baseline benchmarks/baseline.json --runs 5
+"""
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from streamlit import config as st_config, logger as st_logger
+
+# The loader lives in the Streamlit app; run it without a Streamlit session
+st_config.set_option('global.showWarningOnDirectExecution', False)
+st_logger.set_log_level(logging.ERROR)
+
+from benchmarks.bench_event_impact import make_impact_summary
+from dashboard.app import EthiopiaDataLoader
+from src.batch_forecast import indicator_series, run_batch_forecasts, NATIONAL
+from src.data_cache import DataCache
+from src.event_impact_model import EventImpactModel
+from src.monte_carlo import MonteCarloForecaster, events_from_impact_links
+from src.projections import ProjectionGrid
+from src.trend_fitting import fit_series
+
+SCALES = {
+    'small': {'rows': 20_000, 'events': 20, 'indicators': 10, 'months': 120},
+    'medium': {'rows': 200_000, 'events': 200, 'indicators': 40, 'months': 240},
+    'large': {'rows': 1_000_000, 'events': 1_000, 'indicators': 100, 'months': 480}
+}
+DEFAULT_SCALES = ('small', 'medium')
+REGIONS = [None, 'Addis Ababa', 'Amhara', 'Oromia', 'Tigray', 'Sidama', 'Somali']
+PILLARS = ['ACCESS', 'USAGE', 'QUALITY', 'GENDER']
+SIMULATION_END = pd.Timestamp('2027-12-01')
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_MIN_DELTA_MS = 1.0
+
+
+def make_datasets(rows, events, indicators, seed=42):
+    """Synthetic unified dataset (observations plus event rows) and impact sheet linked to its events"""
+    rng = np.random.default_rng(seed)
+    codes = np.array([f"IND_{i:03d}" for i in range(indicators)])
+    dates = pd.Timestamp('2011-01-01') + pd.to_timedelta(rng.integers(0, 14 * 365, rows), unit='D')
+    observations = pd.DataFrame({
+        'record_id': [f"REC_{i}" for i in range(rows)],
+        'record_type': 'observation',
+        'indicator': 'synthetic',
+        'indicator_code': codes[rng.integers(0, indicators, rows)],
+        'observation_date': dates.strftime('%Y-%m-%d'),
+        'value_numeric': np.round(rng.normal(50, 15, rows), 3),
+        'region': np.array(REGIONS, dtype=object)[rng.integers(0, len(REGIONS), rows)]
+    })
+
+    event_ids = [f"EVT_{i:04d}" for i in range(events)]
+    event_dates = pd.Timestamp('2012-01-01') + pd.to_timedelta(rng.integers(0, 14 * 365, events), unit='D')
+    event_rows = pd.DataFrame({
+        'record_id': event_ids,
+        'record_type': 'event',
+        'indicator': [f"Event {event_id}" for event_id in event_ids],
+        'indicator_code': None,
+        'observation_date': event_dates.strftime('%Y-%m-%d'),
+        'value_numeric': np.nan,
+        'region': None
+    })
+    unified = pd.concat([observations, event_rows], ignore_index=True)
+
+    n_links = events * 3
+    impact = pd.DataFrame({
+        'record_id': [f"LNK_{i}" for i in range(n_links)],
+        'parent_id': np.repeat(event_ids, 3),
+        'indicator_code': codes[rng.integers(0, indicators, n_links)],
+        'impact_estimate': np.round(rng.uniform(0.5, 10, n_links), 2),
+        'impact_direction': rng.choice(['increase', 'decrease'], n_links, p=[0.8, 0.2]),
+        'lag_months': rng.choice([0, 3, 6, 12, 18, 24], n_links),
+        'pillar': np.array(PILLARS)[rng.integers(0, len(PILLARS), n_links)]
+    })
+    return unified, impact
+
+
+def make_wide_history(rows, seed=42):
+    """Wide-format history (a date column plus the dashboard's metric columns)"""
+    rng = np.random.default_rng(seed)
+    dates = pd.Timestamp('2012-01-01') + pd.to_timedelta(rng.integers(0, 13 * 365, rows), unit='D')
+    wide = pd.DataFrame({'date': dates.strftime('%Y-%m-%d')})
+    for column in ['Account_Ownership', 'Digital_Payments', 'ATM_Penetration', 'Agent_Banking', 'Mobile_Money']:
+        wide[column] = rng.uniform(0, 100, rows)
+    return wide
+
+
+def make_loader(data_dir, cache=None):
+    """EthiopiaDataLoader reading from data_dir instead of the configured data directory"""
+    loader = EthiopiaDataLoader(cache=cache or DataCache())
+    loader.base_path = Path(data_dir)
+    loader.raw_path = loader.base_path / "raw"
+    loader.processed_path = loader.base_path / "processed"
+    loader.aggregates_path = loader.processed_path / "yearly_aggregates.csv"
+    return loader
+
+
+def build_cases(data_dir, scale):
+    """{case name: zero-argument callable} for one scale; all inputs are prepared here, outside the timings"""
+    unified, impact = make_datasets(scale['rows'], scale['events'], scale['indicators'])
+    (data_dir / 'raw').mkdir(parents=True, exist_ok=True)
+    (data_dir / 'processed').mkdir(parents=True, exist_ok=True)
+    unified.to_csv(data_dir / 'raw' / 'ethiopia_fi_unified_new.csv', index=False)
+    impact.to_csv(data_dir / 'raw' / 'impact_sheet_new.csv', index=False)
+
+    warm_loader = make_loader(data_dir)
+    warm_loader.load_unified_data()
+    loaded = warm_loader.load_unified_data()
+    wide = make_wide_history(scale['rows'])
+
+    def aggregate():
+        loader = make_loader(data_dir, warm_loader.cache)
+        loader.aggregates_path.with_suffix('.json').unlink(missing_ok=True)  # forget the synced state
+        loader.unified_source = warm_loader.unified_source
+        return loader.build_historical_data(loaded)
+
+    impact_summary = make_impact_summary(scale['events'], n_indicators=scale['indicators'])
+    model = EventImpactModel(impact_summary)
+    simulation_start = SIMULATION_END - pd.DateOffset(months=scale['months'] - 1)
+
+    series = indicator_series(unified)
+    national = {key: values for key, values in series.items() if key[1] == NATIONAL}
+
+    history = next(iter(national.values()))
+    events = events_from_impact_links(unified, impact, pillar='ACCESS')
+    forecaster = MonteCarloForecaster(history.index, history.values, events=events, bounds=(0, 100))
+
+    def projection():
+        grid = ProjectionGrid(49.0, tuple(range(2024, 2031)), (65,))
+        return grid.scenarios(5.0, 2.0, 2.0), grid.target_years(65, 5.0, 2.0, 2.0)
+
+    return {
+        'load.unified_cold': lambda: make_loader(data_dir).load_unified_data(),
+        'load.unified_warm': lambda: warm_loader.load_unified_data(),
+        'load.impact_cold': lambda: make_loader(data_dir).load_impact_data(),
+        'historical.aggregate': aggregate,
+        'historical.process_wide': lambda: warm_loader.process_historical_data(wide),
+        'simulate.impacts': lambda: model.simulate_impacts(simulation_start, SIMULATION_END),
+        'forecast.trend_fit': lambda: fit_series(series),
+        'forecast.batch': lambda: run_batch_forecasts(national, workers=1, verbose=False),
+        'scenario.monte_carlo': lambda: forecaster.percentile_bands(
+            [2025, 2026, 2027], n_draws=10000, chunk_size=2500, seed=42
+        ),
+        'projection.grid': projection
+    }
+
+
+def time_case(func, repeat, min_time=0.2):
+    """Wall times of repeat timed runs after a warm-up; fast cases loop until each run takes min_time"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        func()
+        single = time.perf_counter() - start
+        number = max(1, int(min_time / single)) if single < min_time else 1
+
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(number):
+                func()
+            times.append((time.perf_counter() - start) / number)
+    return times
+
+
+def machine_info():
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__
+    }
+
+
+def source_commit():
+    """Short git commit of the timed tree, or None outside a checkout"""
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                check=True, cwd=Path(__file__).resolve().parent)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def run(scales=DEFAULT_SCALES, cases=None, repeat=5):
+    """Time every case at every scale; returns the results document"""
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale_name in scales:
+            scale = SCALES[scale_name]
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                scale_cases = build_cases(Path(tmp) / scale_name, scale)
+            print(f"✓ Prepared {scale_name} datasets in {time.perf_counter() - start:.1f}s")
+
+            for case, func in scale_cases.items():
+                if cases and case not in cases:
+                    continue
+                times = time_case(func, repeat)
+                results.append({
+                    'case': case,
+                    'scale': scale_name,
+                    'best_ms': min(times) * 1e3,
+                    'median_ms': float(np.median(times)) * 1e3,
+                    'repeat': repeat,
+                    **{f"scale_{key}": value for key, value in scale.items()}
+                })
+                print(f"  {case} [{scale_name}]: {min(times) * 1e3:.2f} ms")
+
+    return {
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': source_commit(),
+        'machine': machine_info(),
+        'results': results
+    }
+
+
+def merge_runs(documents):
+    """
+    One results document from several runs of the suite
+
+    Each case keeps its median best time across the runs, so a baseline
+    is not set by one run that happened to be unusually fast.
+    """
+    merged = dict(documents[-1])
+    results = pd.DataFrame([result for document in documents for result in document['results']])
+    keys = ['case', 'scale']
+    best = results.groupby(keys, sort=False)[['best_ms', 'median_ms']].median()
+    rows = results.drop_duplicates(keys, keep='last').set_index(keys)
+    rows[['best_ms', 'median_ms']] = best
+    rows['runs'] = len(documents)
+    merged['results'] = rows.reset_index().to_dict('records')
+    return merged
+
+
+def compare(document, baseline, threshold=DEFAULT_THRESHOLD, min_delta_ms=DEFAULT_MIN_DELTA_MS):
+    """
+    Per-case comparison of best times against a baseline document
+
+    A case regresses when it is more than threshold (a fraction) slower
+    than its baseline and the difference exceeds min_delta_ms, so that
+    sub-millisecond noise does not fail a run. Cases missing from the
+    baseline are reported as 'new'.
+    """
+    base = pd.DataFrame(baseline['results'])[['case', 'scale', 'best_ms']].rename(columns={'best_ms': 'baseline_ms'})
+    current = pd.DataFrame(document['results'])[['case', 'scale', 'best_ms']]
+    table = current.merge(base, on=['case', 'scale'], how='left')
+    table['ratio'] = table['best_ms'] / table['baseline_ms']
+    slower = (table['ratio'] > 1 + threshold) & (table['best_ms'] - table['baseline_ms'] > min_delta_ms)
+    table['status'] = np.where(table['baseline_ms'].isna(), 'new', np.where(slower, 'REGRESSION', 'ok'))
+    return table
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--scales', nargs='+', default=list(DEFAULT_SCALES), choices=list(SCALES))
+    parser.add_argument('--cases', nargs='+', help="Run only these cases")
+    parser.add_argument('--repeat', type=int, default=5, help="Timed runs per case (the best is compared)")
+    parser.add_argument('--output', help="Write the results JSON here")
+    parser.add_argument('--baseline', help="Baseline results JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown as a fraction of the baseline (0.25 = 25%%)")
+    parser.add_argument('--min-delta-ms', type=float, default=DEFAULT_MIN_DELTA_MS,
+                        help="Ignore slowdowns smaller than this many milliseconds")
+    parser.add_argument('--save-baseline', help="Write the results as a new baseline here")
+    parser.add_argument('--runs', type=int, default=1,
+                        help="Run the suite this many times and keep each case's median best time")
+    args = parser.parse_args()
+
+    document = merge_runs([run(args.scales, args.cases, args.repeat) for _ in range(args.runs)])
+    for path in filter(None, [args.output, args.save_baseline]):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(document, f, indent=2)
+        print(f"✓ Saved: {path}")
+
+    if not args.baseline:
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    print(f"Baseline recorded at commit {baseline.get('commit') or 'unknown'} on {baseline.get('created')}")
+    if baseline.get('machine', {}).get('platform') != document['machine']['platform']:
+        print(f"⚠ Baseline was recorded on {baseline.get('machine', {}).get('platform')}; "
+              f"timings may not be comparable")
+
+    table = compare(document, baseline, args.threshold, args.min_delta_ms)
+    print(table.to_string(index=False, float_format=lambda x: f"{x:,.2f}"))
+    regressions = table[table['status'] == 'REGRESSION']
+    if len(regressions):
+        print(f"\n✗ {len(regressions)} case(s) more than {args.threshold:.0%} slower than the baseline")
+        return 1
+    print(f"\n✓ No case more than {args.threshold:.0%} slower than the baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
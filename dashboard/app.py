@@ -7,9 +7,33 @@ import numpy as np
 from datetime import datetime
 import warnings
 import os
+import hashlib
+import sys
+import threading
+import time
 from pathlib import Path
 warnings.filterwarnings('ignore')
 
+# Make the project root importable when run as `streamlit run app.py`
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from src.data_cache import DataCache, table_signature
+from src.figure_cache import FigureCache
+from src.columnar_store import resolve_source
+from src.yearly_aggregates import YearlyAggregateStore
+from src.indicator_catalog import IndicatorCatalog
+from src.streaming_ingest import StreamingIngest
+from src.monte_carlo import MonteCarloForecaster, events_from_impact_links
+from src.event_impact_model import EventImpactModel, impact_summary_from_links
+from src.hierarchical_forecast import GROUP_COLUMNS, NATIONAL, UNALLOCATED, FORECAST_YEARS, forecast_groups
+from src.projections import projection_grid, BASE_GROWTH_RANGE, OPT_BOOST_RANGE, PESS_DRAG_RANGE
+from src.profiling import PROFILER, span, profiled
+from src.background_loader import BackgroundLoader, DatasetLoadError
+from src.shared_data import enable_copy_on_write, freeze, session_view
+from src.series_query import SeriesQuery
+
+# Datasets are shared by every session; derived frames copy only what they write
+enable_copy_on_write()
+
 # Page configuration
 st.set_page_config(
     page_title="Ethiopia Financial Inclusion Dashboard",
@@ -55,69 +79,155 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Last month of the what-if event timeline
+WHAT_IF_END = '2027-12-01'
+
+# Last simulated month before the group forecasts' first year
+GROUP_SIMULATION_END = f"{FORECAST_YEARS[0] - 1}-12-01"
+
+# Trends page: points per chart series (about one per pixel column) and table rows per page
+TRENDS_MAX_POINTS = 1000
+TRENDS_PAGE_SIZE = 500
+
+@st.cache_resource
+def get_data_cache():
+    """Process-wide dataset cache shared by every session and rerun"""
+    max_mb = int(os.environ.get("ETHIOPIA_FI_CACHE_MB", 512))
+    return DataCache(max_bytes=max_mb * 1024 ** 2)
+
+@st.cache_resource
+def get_figure_cache():
+    """Process-wide cache of built Plotly figures"""
+    max_mb = int(os.environ.get("ETHIOPIA_FI_FIGURE_CACHE_MB", 64))
+    return FigureCache(max_bytes=max_mb * 1024 ** 2)
+
 class EthiopiaDataLoader:
     """Load Ethiopia-specific financial inclusion data from CSV files"""
     
-    def __init__(self):
+    # Columns the Overview/Forecasts pages read from the scenario forecast tables
+    FORECAST_COLUMNS = ['Year', 'Type', 'Actual', 'Base', 'Optimistic', 'Pessimistic']
+    
+    def __init__(self, cache=None):
+        # Parsed files are shared through the cache; a private one is used if none is given
+        self.cache = cache if cache is not None else DataCache()
+        self.unified_source = None
+        self.impact_source = None
+        self.streamed = None
+        # Status messages go to the sidebar; background loads collect them instead
+        self.notify = self.show_message
+        
+        # Unified files larger than this are aggregated chunk by chunk instead of loaded whole
+        self.stream_threshold_bytes = int(os.environ.get("ETHIOPIA_FI_STREAM_MB", 256)) * 1024 ** 2
+        
         # Update this to your actual directory structure
         self.base_path = Path("/Users/elbethelzewdie/Downloads/ethiopia-fi-forecast/ethiopia-fi-forecast/data")
         self.raw_path = self.base_path / "raw"
         self.processed_path = self.base_path / "processed"
+        self.aggregates_path = self.processed_path / "yearly_aggregates.csv"
+        self.catalog_path = self.processed_path / "indicator_catalog.csv"
         
         # Create directories if they don't exist
         self.raw_path.mkdir(parents=True, exist_ok=True)
         self.processed_path.mkdir(parents=True, exist_ok=True)
     
-    def load_unified_data(self):
-        """Load the main unified dataset"""
-        # Try multiple possible file locations
-        possible_paths = [
+    def show_message(self, level, message):
+        """Default notify: show a loader status message in the sidebar"""
+        getattr(st.sidebar, level)(message)
+    
+    def unified_paths(self):
+        """Locations tried for the unified dataset, in order"""
+        return [
             self.raw_path / "ethiopia_fi_unified_new.csv",
             self.base_path / "ethiopia_fi_unified_new.csv",
             Path("data/raw/ethiopia_fi_unified_new.csv"),
             Path("ethiopia_fi_unified_new.csv")
         ]
-        
-        for file_path in possible_paths:
-            if file_path.exists():
-                try:
-                    df = pd.read_csv(file_path)
-                    st.sidebar.success(f"✅ Loaded unified data from: {file_path}")
-                    return df
-                except Exception as e:
-                    st.sidebar.error(f"❌ Error reading {file_path}: {e}")
-        
-        st.sidebar.error("❌ Could not find ethiopia_fi_unified_new.csv")
-        return None
     
-    def load_impact_data(self):
-        """Load impact sheet data"""
-        possible_paths = [
+    def impact_paths(self):
+        """Locations tried for the impact sheet, in order"""
+        return [
             self.raw_path / "impact_sheet_new.csv",
             self.base_path / "impact_sheet_new.csv",
             Path("data/raw/impact_sheet_new.csv"),
             Path("impact_sheet_new.csv")
         ]
+    
+    def reference_paths(self):
+        """Locations tried for reference_codes.csv, in order"""
+        return [
+            self.raw_path / "reference_codes.csv",
+            self.base_path / "reference_codes.csv",
+            Path("data/raw/reference_codes.csv"),
+            Path("reference_codes.csv")
+        ]
+    
+    def source_signature(self, paths):
+        """Signature of the first of paths (CSV and Parquet copy) that exists; None if none does"""
+        for path in paths:
+            if resolve_source(path).exists():
+                return table_signature(path)
+        return None
+    
+    @profiled('load.unified')
+    def load_unified_data(self, columns=None):
+        """Load the main unified dataset (Parquet copy preferred, CSV fallback)"""
+        # Try multiple possible file locations
+        for file_path in self.unified_paths():
+            if resolve_source(file_path).exists():
+                try:
+                    source = resolve_source(file_path)
+                    if source.stat().st_size > self.stream_threshold_bytes:
+                        return self.stream_unified_data(file_path)
+                    df = self.cache.read_table(file_path, columns=columns)
+                    self.unified_source = source
+                    self.streamed = None
+                    self.notify('success', f"✅ Loaded unified data from: {file_path}")
+                    return df
+                except Exception as e:
+                    self.notify('error', f"❌ Error reading {file_path}: {e}")
         
-        for file_path in possible_paths:
-            if file_path.exists():
+        self.notify('error', "❌ Could not find ethiopia_fi_unified_new.csv")
+        return None
+    
+    @profiled('load.unified_stream')
+    def stream_unified_data(self, file_path):
+        """Aggregate a large unified file in chunks; returns only its event rows"""
+        source = resolve_source(file_path)
+        self.streamed = self.cache.get(('stream', table_signature(source)),
+                                       lambda: StreamingIngest().ingest(file_path),
+                                       source=('stream', str(source)))
+        self.unified_source = source
+        self.notify(
+            'success',
+            f"✅ Streamed unified data from: {file_path} "
+            f"({self.streamed.rows_read:,} rows in {self.streamed.chunks} chunks)"
+        )
+        return self.streamed.kept_rows()
+    
+    @profiled('load.impact')
+    def load_impact_data(self, columns=None):
+        """Load impact sheet data"""
+        for file_path in self.impact_paths():
+            if resolve_source(file_path).exists():
                 try:
-                    df = pd.read_csv(file_path)
-                    st.sidebar.success(f"✅ Loaded impact data from: {file_path}")
+                    df = self.cache.read_table(file_path, columns=columns)
+                    self.impact_source = resolve_source(file_path)
+                    self.notify('success', f"✅ Loaded impact data from: {file_path}")
                     return df
                 except Exception as e:
-                    st.sidebar.warning(f"⚠️ Error reading impact data: {e}")
+                    self.notify('warning', f"⚠️ Error reading impact data: {e}")
         
-        st.sidebar.warning("⚠️ Impact data not found, using sample data")
+        self.notify('warning', "⚠️ Impact data not found, using sample data")
         return None
     
-    def load_usage_forecast(self):
+    @profiled('load.usage_forecast')
+    def load_usage_forecast(self, columns=None):
         """Load usage forecast data"""
         # First try to load from file
         forecast_path = self.processed_path / "usage_forecast.csv"
-        if forecast_path.exists():
+        if resolve_source(forecast_path).exists():
             try:
-                df = pd.read_csv(forecast_path)
+                df = self.cache.read_table(forecast_path, columns=columns)
                 return df
             except:
                 pass
@@ -133,12 +243,13 @@ class EthiopiaDataLoader:
         }
         return pd.DataFrame(data)
     
-    def load_access_forecast(self):
+    @profiled('load.access_forecast')
+    def load_access_forecast(self, columns=None):
         """Load access forecast data"""
         forecast_path = self.processed_path / "access_forecast.csv"
-        if forecast_path.exists():
+        if resolve_source(forecast_path).exists():
             try:
-                df = pd.read_csv(forecast_path)
+                df = self.cache.read_table(forecast_path, columns=columns)
                 return df
             except:
                 pass
@@ -153,12 +264,13 @@ class EthiopiaDataLoader:
         }
         return pd.DataFrame(data)
     
-    def load_forecast_summary(self):
+    @profiled('load.forecast_summary')
+    def load_forecast_summary(self, columns=None):
         """Load forecast summary data"""
         summary_path = self.processed_path / "forecast_summary.csv"
-        if summary_path.exists():
+        if resolve_source(summary_path).exists():
             try:
-                df = pd.read_csv(summary_path)
+                df = self.cache.read_table(summary_path, columns=columns)
                 return df
             except:
                 pass
@@ -173,10 +285,128 @@ class EthiopiaDataLoader:
         }
         return pd.DataFrame(data)
     
+    def load_historical_data(self, df):
+        """Cached yearly table, rebuilt only when the unified file (or the reference codes) change"""
+        source = table_signature(self.unified_source) if df is not None and self.unified_source else None
+        reference = self.source_signature(self.reference_paths())
+        return self.cache.get(('historical', source, reference), lambda: self.build_historical_data(df),
+                              source='historical')
+    
+    def load_group_aggregates(self, unified, impact):
+        """Cached forecasts of every group, rebuilt only when the unified file or the impact sheet change"""
+        source = (table_signature(self.unified_source) if unified is not None and self.unified_source else None,
+                  table_signature(self.impact_source) if impact is not None and self.impact_source else None)
+        return self.cache.get(('group_aggregates',) + source, lambda: self.build_group_aggregates(unified, impact),
+                              source='group_aggregates')
+    
+    @profiled('aggregate.group_forecasts')
+    def build_group_aggregates(self, unified, impact):
+        """Forecasts by region/gender/location reconciled to national (None without observation rows)"""
+        long_format = ['record_type', 'indicator_code', 'observation_date', 'value_numeric']
+        if unified is None or self.streamed is not None or not all(col in unified.columns for col in long_format):
+            return None
+        
+        try:
+            dimensions = [col for col in GROUP_COLUMNS if col in unified.columns]
+            summary = impact_summary_from_links(unified, impact, group_columns=dimensions)
+            simulation, impact_dimension = None, None
+            if not summary.empty:
+                # Impacts are simulated per group of the first dimension the impact sheet has
+                impact_dimension = next((col for col in dimensions if col in summary.columns), None)
+                model = EventImpactModel(summary, group_column=impact_dimension)
+                start = pd.Timestamp(year=summary['event_date'].min().year, month=1, day=1)
+                if impact_dimension:
+                    groups = unified[impact_dimension].fillna(UNALLOCATED).astype(str).unique()
+                    simulation = model.simulate_group_impacts(start, GROUP_SIMULATION_END, groups)
+                else:
+                    simulation = model.simulate_impacts(start, GROUP_SIMULATION_END)[0]
+            return forecast_groups(unified, dimensions, simulation_results=simulation,
+                                   impact_dimension=impact_dimension)
+        except Exception as e:
+            self.notify('warning', f"⚠️ Could not build group forecasts: {e}")
+            return None
+    
+    def load_reference_codes(self):
+        """reference_codes.csv (field, code, description, applies_to), or None if absent"""
+        for file_path in self.reference_paths():
+            if resolve_source(file_path).exists():
+                try:
+                    return self.cache.read_table(file_path)
+                except Exception as e:
+                    self.notify('warning', f"⚠️ Error reading reference codes: {e}")
+        return None
+    
+    @profiled('load.indicator_catalog')
+    def load_indicator_catalog(self, df, codes=None):
+        """Category and dashboard series of every indicator code, reused from disk while the sources are unchanged"""
+        unified = table_signature(self.unified_source) if self.unified_source else None
+        source = (unified, self.source_signature(self.reference_paths()))
+        build = lambda: IndicatorCatalog.build(df, self.load_reference_codes(), codes=codes)
+        return self.cache.get(('indicator_catalog',) + source,
+                              lambda: IndicatorCatalog.cached(self.catalog_path, source, build),
+                              source='indicator_catalog')
+    
+    def with_canonical_series(self, yearly_data, df):
+        """Add the dashboard series (Account_Ownership, ...) measured by the yearly table's indicator codes"""
+        catalog = self.load_indicator_catalog(df, codes=[col for col in yearly_data.columns if col != 'Year'])
+        canonical = catalog.canonical_table(yearly_data)
+        added = [col for col in canonical.columns if col not in yearly_data.columns]
+        return pd.concat([yearly_data, canonical[added]], axis=1)
+    
+    @profiled('aggregate.historical')
+    def build_historical_data(self, df):
+        """Yearly table from the persisted per-(indicator, year) aggregates"""
+        if self.streamed is not None:
+            # Large files: the chunked pass already holds the yearly aggregates
+            return self.complete_yearly_data(self.with_canonical_series(self.streamed.yearly_means(), df))
+        
+        long_format = ['record_type', 'indicator_code', 'observation_date', 'value_numeric']
+        if df is not None and all(col in df.columns for col in long_format):
+            try:
+                # Only rows appended since the last sync are aggregated
+                store = YearlyAggregateStore.load(self.aggregates_path)
+                if store.sync(df):
+                    store.save(self.aggregates_path)
+                return self.complete_yearly_data(self.with_canonical_series(store.yearly_means(), df))
+            except Exception as e:
+                self.notify('warning', f"⚠️ Could not update yearly aggregates: {e}")
+        
+        # Wide-format files (a date/year column plus metric columns)
+        return self.process_historical_data(df)
+    
+    def complete_yearly_data(self, yearly_data):
+        """Align yearly data to 2012-2024 and fill missing metrics with sample data"""
+        # Ensure we have data for 2012-2024
+        all_years = pd.DataFrame({'Year': range(2012, 2025)})
+        yearly_data = pd.merge(all_years, yearly_data, on='Year', how='left')
+        
+        # Fill missing columns with sample data
+        required_columns = ['Account_Ownership', 'Digital_Payments', 
+                           'ATM_Penetration', 'Agent_Banking', 'Mobile_Money']
+        
+        for col in required_columns:
+            if col not in yearly_data.columns:
+                if col == 'Account_Ownership':
+                    yearly_data[col] = np.linspace(20, 49, len(yearly_data)) + np.random.normal(0, 2, len(yearly_data))
+                elif col == 'Digital_Payments':
+                    yearly_data[col] = np.linspace(15, 45, len(yearly_data)) + np.random.normal(0, 2, len(yearly_data))
+                elif col == 'ATM_Penetration':
+                    yearly_data[col] = np.linspace(5, 25, len(yearly_data)) + np.random.normal(0, 1, len(yearly_data))
+                elif col == 'Agent_Banking':
+                    yearly_data[col] = np.linspace(1, 15, len(yearly_data)) + np.random.normal(0, 0.5, len(yearly_data))
+                elif col == 'Mobile_Money':
+                    yearly_data[col] = np.linspace(0, 30, len(yearly_data)) + np.random.normal(0, 1.5, len(yearly_data))
+        
+        return yearly_data
+    
+    @profiled('aggregate.process_historical_data')
     def process_historical_data(self, df):
         """Process historical data to extract time series"""
         if df is not None:
             try:
+                # Work on a copy: df may be the shared cached frame
+                df = df.copy()
+                
                 # Try to extract year from date column
                 if 'date' in df.columns:
                     df['Year'] = pd.to_datetime(df['date']).dt.year
@@ -188,30 +418,9 @@ class EthiopiaDataLoader:
                 # Group by year and calculate averages
                 yearly_data = df.groupby('Year').mean().reset_index()
                 
-                # Ensure we have data for 2012-2024
-                all_years = pd.DataFrame({'Year': range(2012, 2025)})
-                yearly_data = pd.merge(all_years, yearly_data, on='Year', how='left')
-                
-                # Fill missing columns with sample data
-                required_columns = ['Account_Ownership', 'Digital_Payments', 
-                                   'ATM_Penetration', 'Agent_Banking', 'Mobile_Money']
-                
-                for col in required_columns:
-                    if col not in yearly_data.columns:
-                        if col == 'Account_Ownership':
-                            yearly_data[col] = np.linspace(20, 49, len(yearly_data)) + np.random.normal(0, 2, len(yearly_data))
-                        elif col == 'Digital_Payments':
-                            yearly_data[col] = np.linspace(15, 45, len(yearly_data)) + np.random.normal(0, 2, len(yearly_data))
-                        elif col == 'ATM_Penetration':
-                            yearly_data[col] = np.linspace(5, 25, len(yearly_data)) + np.random.normal(0, 1, len(yearly_data))
-                        elif col == 'Agent_Banking':
-                            yearly_data[col] = np.linspace(1, 15, len(yearly_data)) + np.random.normal(0, 0.5, len(yearly_data))
-                        elif col == 'Mobile_Money':
-                            yearly_data[col] = np.linspace(0, 30, len(yearly_data)) + np.random.normal(0, 1.5, len(yearly_data))
-                
-                return yearly_data
+                return self.complete_yearly_data(yearly_data)
             except Exception as e:
-                st.sidebar.warning(f"⚠️ Could not process CSV: {e}")
+                self.notify('warning', f"⚠️ Could not process CSV: {e}")
         
         # Fallback to sample data
         years = list(range(2012, 2025))
@@ -224,25 +433,592 @@ class EthiopiaDataLoader:
             'Mobile_Money': np.linspace(0, 30, len(years)) + np.random.normal(0, 1.5, len(years))
         })
 
+def dashboard_datasets(data_loader, refresh_seconds=None):
+    """Background loader of every dataset the dashboard reads, keyed by dataset name"""
+    datasets = BackgroundLoader(refresh_seconds=refresh_seconds)
+    datasets.loader = data_loader
+    # Loads run on pool threads, where sidebar calls would be lost; their messages are shown later
+    data_loader.notify = datasets.notify
+    
+    forecast_columns = data_loader.FORECAST_COLUMNS
+    processed = lambda name: (lambda: data_loader.source_signature([data_loader.processed_path / name]))
+    
+    datasets.register('unified', data_loader.load_unified_data,
+                      version=lambda: data_loader.source_signature(data_loader.unified_paths()))
+    datasets.register('impact', data_loader.load_impact_data,
+                      version=lambda: data_loader.source_signature(data_loader.impact_paths()))
+    datasets.register('historical', data_loader.load_historical_data, deps=('unified',),
+                      version=lambda: data_loader.source_signature(data_loader.reference_paths()))
+    # Forecast tables: only the columns the pages plot
+    datasets.register('usage_forecast', lambda: data_loader.load_usage_forecast(columns=forecast_columns),
+                      version=processed("usage_forecast.csv"))
+    datasets.register('access_forecast', lambda: data_loader.load_access_forecast(columns=forecast_columns),
+                      version=processed("access_forecast.csv"))
+    datasets.register('forecast_summary', data_loader.load_forecast_summary,
+                      version=processed("forecast_summary.csv"))
+    # Every group's forecasts, computed once so the drill-down only looks them up
+    datasets.register('group_aggregates', data_loader.load_group_aggregates, deps=('unified', 'impact'))
+    return datasets
+
+@st.cache_resource
+def get_datasets():
+    """Process-wide background loader; stale datasets are reloaded on a schedule"""
+    refresh_seconds = int(os.environ.get("ETHIOPIA_FI_REFRESH_SECONDS", 60))
+    return dashboard_datasets(EthiopiaDataLoader(cache=get_data_cache()), refresh_seconds or None).start()
+
+# Datasets each page reads; a page renders once these are loaded, without waiting for the rest
+PAGE_DATASETS = {
+    "📊 Overview": ['historical', 'usage_forecast', 'access_forecast', 'forecast_summary'],
+    "📈 Trends": ['historical'],
+    "🔮 Forecasts": ['historical', 'usage_forecast', 'access_forecast', 'unified', 'impact', 'group_aggregates'],
+    "🎯 Projections": ['historical'],
+    "🧪 What-If Events": ['unified', 'impact']
+}
+
 class EthiopiaDashboard:
-    def __init__(self):
-        self.data_loader = EthiopiaDataLoader()
+    def __init__(self, data_loader=None, figure_cache=None, datasets=None):
+        if datasets is None:
+            datasets = dashboard_datasets(data_loader or EthiopiaDataLoader(cache=get_data_cache()))
+        self.datasets = datasets
+        self.data_loader = datasets.loader
+        self.figure_cache = figure_cache or get_figure_cache()
         self.load_all_data()
     
-    def load_all_data(self):
-        """Load all datasets"""
-        # Load raw data
-        self.unified_data = self.data_loader.load_unified_data()
-        self.impact_data = self.data_loader.load_impact_data()
+    def load_all_data(self, wait=False):
+        """Start loading every dataset concurrently and pin the versions already loaded"""
+        self.datasets.start()
+        if wait:
+            self.datasets.wait(self.datasets.entries)
+        # Versions served to this rerun; a refresh finishing mid-rerun is picked up by the next one
+        self.snapshot = self.datasets.snapshot()
+        self.views = {}
+    
+    def dataset(self, name):
+        """This session's view of a shared dataset, waiting for it only if it has never been loaded"""
+        if name not in self.views:
+            if name not in self.snapshot:
+                try:
+                    self.datasets.get(name)
+                except DatasetLoadError as e:
+                    # Nothing loaded to serve: show the load error rather than fail further down the page
+                    st.error(f"❌ {e}")
+                    st.stop()
+                    raise
+                self.snapshot[name] = self.datasets.snapshot()[name]
+            self.views[name] = session_view(self.snapshot[name][0])
+        return self.views[name]
+    
+    def versions(self, names):
+        """Versions of the given datasets as served to this rerun (None if not loaded yet)"""
+        return tuple(self.snapshot[name][1] if name in self.snapshot else None for name in names)
+    
+    @property
+    def data_version(self):
+        """Identifies the loaded data; derived results are cached against it"""
+        return self.versions(self.datasets.entries)
+    
+    @property
+    def unified_data(self):
+        return self.dataset('unified')
+    
+    @property
+    def impact_data(self):
+        return self.dataset('impact')
+    
+    @property
+    def historical_data(self):
+        return self.dataset('historical')
+    
+    @property
+    def usage_forecast(self):
+        return self.dataset('usage_forecast')
+    
+    @property
+    def access_forecast(self):
+        return self.dataset('access_forecast')
+    
+    @property
+    def forecast_summary(self):
+        return self.dataset('forecast_summary')
+    
+    @property
+    def group_aggregates(self):
+        return self.dataset('group_aggregates')
+    
+    @profiled('model.uncertainty_bands')
+    def uncertainty_bands(self, metric, pillar, forecast_df):
+        """Monte Carlo percentile bands around the Base forecast, cached per data version"""
+        def compute():
+            series = self.historical_data.set_index('Year')[metric].dropna()
+            try:
+                events = events_from_impact_links(self.unified_data, self.impact_data, pillar)
+            except Exception:
+                events = None
+            # Percentage series: the decimal event impacts are scaled to points
+            forecaster = MonteCarloForecaster(series.index, series.values, events=events, bounds=(0, 100),
+                                              impact_scale=100)
+            return forecaster.percentile_bands(
+                forecast_df['Year'].tolist(), center=forecast_df['Base'].values,
+                n_draws=10000, seed=42
+            )
         
-        # Process historical data
-        self.historical_data = self.data_loader.process_historical_data(self.unified_data)
+        key = ('uncertainty', metric, pillar, tuple(forecast_df['Base']),
+               self.versions(['historical', 'unified', 'impact']))
+        return self.data_loader.cache.get(key, compute)
+    
+    def add_uncertainty_traces(self, fig, label, bands, color):
+        """Shade the 5-95% and 25-75% Monte Carlo bands"""
+        for low, high, opacity in [('p5', 'p95', 0.12), ('p25', 'p75', 0.22)]:
+            fig.add_trace(go.Scatter(
+                x=bands['Year'], y=bands[high],
+                line=dict(width=0), mode='lines',
+                showlegend=False, hoverinfo='skip'
+            ))
+            fig.add_trace(go.Scatter(
+                x=bands['Year'], y=bands[low],
+                name=f"{label} {low[1:]}-{high[1:]}% range",
+                line=dict(width=0), mode='lines',
+                fill='tonexty', fillcolor=color.format(opacity=opacity)
+            ))
+    
+    def cached_figure(self, page, name, widget_state, build, warn=None):
+        """Figure from the shared figure cache, built on the first request for this data and widget state"""
+        with span('figure_cache.get', page=page, figure=name):
+            return self.figure_cache.get(page, name, self.data_version, widget_state, build, warn=warn)
+    
+    @profiled('figure.overview')
+    def overview_figure(self):
+        """Historical trends chart of the overview page"""
+        fig = go.Figure()
         
-        # Load forecasts
-        self.usage_forecast = self.data_loader.load_usage_forecast()
-        self.access_forecast = self.data_loader.load_access_forecast()
-        self.forecast_summary = self.data_loader.load_forecast_summary()
+        metrics = ['Account_Ownership', 'Digital_Payments', 'Mobile_Money']
+        colors = ['#078930', '#3B82F6', '#F59E0B']
+        
+        for metric, color in zip(metrics, colors):
+            fig.add_trace(go.Scatter(
+                x=self.historical_data['Year'],
+                y=self.historical_data[metric],
+                name=metric.replace('_', ' '),
+                line=dict(color=color, width=3),
+                mode='lines+markers'
+            ))
+        
+        fig.update_layout(
+            title="Financial Inclusion Metrics (2012-2024)",
+            xaxis_title="Year",
+            yaxis_title="Percentage (%)",
+            hovermode="x unified",
+            height=400
+        )
+        return fig
+    
+    @profiled('table.overview')
+    def overview_tables(self):
+        """Tables shown on the overview page"""
+        columns = ['Year', 'Base', 'Optimistic', 'Pessimistic']
+        return {
+            'usage_forecast': self.usage_forecast[self.usage_forecast['Type'] == 'Forecast'][columns],
+            'access_forecast': self.access_forecast[self.access_forecast['Type'] == 'Forecast'][columns],
+            'forecast_summary': self.forecast_summary
+        }
+    
+    def trends_query(self):
+        """Historical data sorted on Year for range queries, shared across sessions"""
+        return self.data_loader.cache.get(('trends_query', self.versions(['historical'])),
+                                          lambda: SeriesQuery(self.historical_data, 'Year'))
+    
+    def trends_data(self, year_range):
+        """Historical data within year_range"""
+        return self.trends_query().range(year_range[0], year_range[1])
+    
+    @profiled('figure.trends')
+    def trends_figure(self, filtered_data, year_range, metrics, view_type, max_points=TRENDS_MAX_POINTS):
+        """Trends page chart for the selected metrics and view type, at most max_points per metric"""
+        fig = go.Figure()
+        
+        colors = px.colors.qualitative.Set3
+        series = SeriesQuery(filtered_data, 'Year').series(None, None, metrics, max_points)
+        
+        if view_type == "Line Chart":
+            for i, metric in enumerate(metrics):
+                x, y = series[metric]
+                fig.add_trace(go.Scatter(
+                    x=x,
+                    y=y,
+                    name=metric.replace('_', ' '),
+                    line=dict(color=colors[i % len(colors)], width=3),
+                    mode='lines+markers' if len(x) <= 100 else 'lines'
+                ))
+        
+        elif view_type == "Bar Chart":
+            for metric in metrics:
+                x, y = series[metric]
+                fig.add_trace(go.Bar(
+                    x=x,
+                    y=y,
+                    name=metric.replace('_', ' '),
+                    marker_color=colors[metrics.index(metric) % len(colors)]
+                ))
+            fig.update_layout(barmode='group')
+        
+        else:  # Area Chart
+            for metric in metrics:
+                x, y = series[metric]
+                fig.add_trace(go.Scatter(
+                    x=x,
+                    y=y,
+                    name=metric.replace('_', ' '),
+                    fill='tozeroy',
+                    mode='lines'
+                ))
+        
+        fig.update_layout(
+            title=f"Financial Inclusion Trends ({year_range[0]}-{year_range[1]})",
+            xaxis_title="Year",
+            yaxis_title="Percentage (%)",
+            hovermode="x unified",
+            height=500
+        )
+        return fig
     
+    @profiled('figure.forecasts')
+    def forecasts_figure(self, forecast_type, scenarios, show_ci, warn=st.warning):
+        """Forecasts page chart; warn receives messages about skipped uncertainty bands"""
+        fig = go.Figure()
+        
+        # Colors for scenarios
+        color_map = {"Base": "#078930", "Optimistic": "#10B981", "Pessimistic": "#EF4444"}
+        
+        # Historical data (2012-2024)
+        if forecast_type != "Comparison":
+            historical_metric = "Digital_Payments" if forecast_type == "Digital Payment Usage" else "Account_Ownership"
+            fig.add_trace(go.Scatter(
+                x=self.historical_data['Year'],
+                y=self.historical_data[historical_metric],
+                name=f"Historical {forecast_type}",
+                line=dict(color='#6B7280', width=2, dash='dot'),
+                mode='lines'
+            ))
+        
+        # Add forecasts
+        forecast_years = [2025, 2026, 2027]
+        
+        if forecast_type == "Digital Payment Usage":
+            forecast_df = self.usage_forecast[self.usage_forecast['Type'] == 'Forecast']
+            for scenario in scenarios:
+                values = forecast_df[scenario].values
+                fig.add_trace(go.Scatter(
+                    x=forecast_years,
+                    y=values,
+                    name=f"Digital - {scenario}",
+                    line=dict(color=color_map[scenario], width=3),
+                    mode='lines+markers'
+                ))
+        
+        elif forecast_type == "Account Access":
+            forecast_df = self.access_forecast[self.access_forecast['Type'] == 'Forecast']
+            for scenario in scenarios:
+                values = forecast_df[scenario].values
+                fig.add_trace(go.Scatter(
+                    x=forecast_years,
+                    y=values,
+                    name=f"Access - {scenario}",
+                    line=dict(color=color_map[scenario], width=3),
+                    mode='lines+markers'
+                ))
+        
+        else:  # Comparison
+            # Digital payments
+            usage_df = self.usage_forecast[self.usage_forecast['Type'] == 'Forecast']
+            for scenario in scenarios:
+                values = usage_df[scenario].values
+                fig.add_trace(go.Scatter(
+                    x=forecast_years,
+                    y=values,
+                    name=f"Digital - {scenario}",
+                    line=dict(color=color_map[scenario], width=3, dash='solid'),
+                    mode='lines+markers'
+                ))
+            
+            # Account access
+            access_df = self.access_forecast[self.access_forecast['Type'] == 'Forecast']
+            for scenario in scenarios:
+                values = access_df[scenario].values
+                fig.add_trace(go.Scatter(
+                    x=forecast_years,
+                    y=values,
+                    name=f"Access - {scenario}",
+                    line=dict(color=color_map[scenario], width=3, dash='dash'),
+                    mode='lines+markers'
+                ))
+        
+        # Monte Carlo uncertainty around the Base scenario
+        if show_ci:
+            band_specs = []
+            if forecast_type in ["Digital Payment Usage", "Comparison"]:
+                band_specs.append(("Digital", "Digital_Payments", "USAGE", self.usage_forecast,
+                                   "rgba(7, 137, 48, {opacity})"))
+            if forecast_type in ["Account Access", "Comparison"]:
+                band_specs.append(("Access", "Account_Ownership", "ACCESS", self.access_forecast,
+                                   "rgba(59, 130, 246, {opacity})"))
+            
+            for label, metric, pillar, forecast, color in band_specs:
+                try:
+                    bands = self.uncertainty_bands(metric, pillar, forecast[forecast['Type'] == 'Forecast'])
+                    self.add_uncertainty_traces(fig, label, bands, color)
+                except Exception as e:
+                    warn(f"⚠️ Could not compute uncertainty range for {label}: {e}")
+        
+        # Add target lines
+        fig.add_hline(y=60, line_dash="dash", line_color="#F59E0B",
+                     annotation_text="60% Target")
+        fig.add_hline(y=65, line_dash="dot", line_color="#8B5CF6",
+                     annotation_text="65% Target")
+        
+        fig.update_layout(
+            title=f"Ethiopia Financial Inclusion Forecasts",
+            xaxis_title="Year",
+            yaxis_title="Percentage (%)",
+            hovermode="x unified",
+            height=500
+        )
+        return fig
+    
+    def forecasts_table(self, forecast_type):
+        """Forecast rows shown (and downloadable) on the forecasts page"""
+        if forecast_type == "Digital Payment Usage":
+            forecast_df = self.usage_forecast[self.usage_forecast['Type'] == 'Forecast']
+        elif forecast_type == "Account Access":
+            forecast_df = self.access_forecast[self.access_forecast['Type'] == 'Forecast']
+        else:
+            # Show both
+            usage_df = self.usage_forecast[self.usage_forecast['Type'] == 'Forecast'].copy()
+            access_df = self.access_forecast[self.access_forecast['Type'] == 'Forecast'].copy()
+            usage_df['Type'] = 'Digital Payments'
+            access_df['Type'] = 'Account Access'
+            forecast_df = pd.concat([usage_df, access_df])
+        return forecast_df
+    
+    @profiled('figure.group_forecast')
+    def group_forecast_figure(self, aggregates, dimension, group, indicator):
+        """One group's observed values and reconciled forecast, against the national forecast"""
+        fig = go.Figure()
+        rows = aggregates.select(dimension, group, indicator)
+        observed = rows[rows['observations'] > 0]
+        
+        fig.add_trace(go.Scatter(
+            x=observed['Year'],
+            y=observed['observed'],
+            name=f"{group} - Observed",
+            marker=dict(color='#6B7280', size=8),
+            mode='markers'
+        ))
+        fig.add_trace(go.Scatter(
+            x=rows['Year'],
+            y=rows['trend'],
+            name=f"{group} - Trend",
+            line=dict(color='#3B82F6', width=2, dash='dot'),
+            mode='lines'
+        ))
+        forecast = rows[rows['Type'] == 'Forecast']
+        fig.add_trace(go.Scatter(
+            x=forecast['Year'],
+            y=forecast['forecast'],
+            name=f"{group} - Forecast",
+            line=dict(color='#078930', width=3),
+            mode='lines+markers'
+        ))
+        
+        if dimension != NATIONAL:
+            national = aggregates.select(NATIONAL, NATIONAL, indicator)
+            national = national[national['Type'] == 'Forecast']
+            fig.add_trace(go.Scatter(
+                x=national['Year'],
+                y=national['forecast'],
+                name="National - Forecast",
+                line=dict(color='#F59E0B', width=2, dash='dash'),
+                mode='lines+markers'
+            ))
+        
+        fig.update_layout(
+            title=f"{indicator}: {group}" if dimension == NATIONAL else f"{indicator}: {group} ({dimension})",
+            xaxis_title="Year",
+            yaxis_title="Value",
+            hovermode="x unified",
+            height=450
+        )
+        return fig
+    
+    def group_forecast_table(self, aggregates, dimension, indicator):
+        """Forecast rows of every group of one level for one indicator"""
+        rows = aggregates.level(dimension, indicator)
+        columns = ['group', 'Year', 'trend', 'event_impact', 'forecast', 'weight']
+        return rows[rows['Type'] == 'Forecast'][columns].reset_index(drop=True)
+    
+    @profiled('model.projection_scenarios')
+    def projection_scenarios(self, base_growth, opt_boost, pess_drag):
+        """Scenario trajectories to 2030 and target years for one slider position"""
+        # Get current values from forecasts
+        current_digital = 45.0  # Default
+        current_access = 49.0   # Default
+        
+        # Try to get actual 2024 values
+        if 2024 in self.historical_data['Year'].values:
+            current_digital = self.historical_data[self.historical_data['Year'] == 2024]['Digital_Payments'].values[0]
+            current_access = self.historical_data[self.historical_data['Year'] == 2024]['Account_Ownership'].values[0]
+        
+        # Generate projections to 2030
+        years = list(range(2024, 2031))
+        
+        # Every slider combination is precomputed once per starting value; this is a lookup
+        digital_grid = projection_grid(float(current_digital), tuple(years), (60,))
+        access_grid = projection_grid(float(current_access), tuple(years), (65,))
+        
+        return {
+            'years': years,
+            'digital': digital_grid.scenarios(base_growth, opt_boost, pess_drag),
+            'access': access_grid.scenarios(base_growth, opt_boost, pess_drag),
+            'digital_targets': digital_grid.target_years(60, base_growth, opt_boost, pess_drag),
+            'access_targets': access_grid.target_years(65, base_growth, opt_boost, pess_drag)
+        }
+    
+    @profiled('figure.projection')
+    def projection_figure(self, years, scenarios, label, targets):
+        """Projection chart of one indicator with its two target lines"""
+        fig = go.Figure()
+        colors = {'Base': '#078930', 'Optimistic': '#10B981', 'Pessimistic': '#EF4444'}
+        
+        for scenario, rates in scenarios.items():
+            fig.add_trace(go.Scatter(
+                x=years,
+                y=rates,
+                name=scenario,
+                line=dict(color=colors[scenario], width=3),
+                mode='lines+markers'
+            ))
+        
+        # Add target lines
+        fig.add_hline(y=targets[0], line_dash="dash", line_color="#F59E0B",
+                      annotation_text=f"{targets[0]}% Target")
+        fig.add_hline(y=targets[1], line_dash="dot", line_color="#8B5CF6",
+                      annotation_text=f"{targets[1]}% Target")
+        
+        fig.update_layout(
+            title=f"{label} Projections ({years[0]}-{years[-1]})",
+            xaxis_title="Year",
+            yaxis_title="Percentage (%)",
+            height=450
+        )
+        return fig
+    
+    def event_timeline(self):
+        """Compiled event contributions of the loaded events (None without impact links), shared across sessions"""
+        def compile():
+            summary = impact_summary_from_links(self.unified_data, self.impact_data)
+            if summary.empty:
+                return None
+            model = EventImpactModel(summary)
+            start = pd.Timestamp(year=summary['event_date'].min().year, month=1, day=1)
+            timeline = model.compile_timeline(start, WHAT_IF_END)
+            freeze(timeline.matrix)
+            return freeze(timeline)
+        
+        return self.data_loader.cache.get(('event_timeline', self.versions(['unified', 'impact'])), compile)
+    
+    def event_scenario(self, timeline, active_events):
+        """This session's EventScenario, moved to active_events one event toggle at a time"""
+        state = st.session_state.get('what_if_scenario')
+        version = self.versions(['unified', 'impact'])
+        if state is None or state[0] != version:
+            scenario = timeline.scenario(active_events)
+            st.session_state['what_if_scenario'] = (version, scenario)
+            return scenario
+        
+        scenario = state[1]
+        scenario.sync(active_events)
+        return scenario
+    
+    @profiled('figure.what_if')
+    def what_if_figure(self, timeline, totals, active_events, indicator):
+        """Stacked contributions of the active events to one indicator, against all events"""
+        fig = go.Figure()
+        colors = px.colors.qualitative.Set3
+        
+        # Only active events linked to this indicator get a trace; the rest are zero throughout
+        linked = {timeline.event_ids[i] for i in
+                  timeline.matrix.events_affecting(timeline.matrix.indicator_index(indicator))}
+        contributions = timeline.indicator_contributions(
+            indicator, [event_id for event_id in active_events if event_id in linked]
+        )
+        for i, event_name in enumerate(contributions.columns):
+            fig.add_trace(go.Scatter(
+                x=timeline.months,
+                y=contributions.iloc[:, i] * 100,
+                name=event_name,
+                stackgroup='events',
+                line=dict(width=0.5, color=colors[i % len(colors)]),
+                mode='lines'
+            ))
+        
+        row = timeline.indicators.index(indicator)
+        fig.add_trace(go.Scatter(
+            x=timeline.months,
+            y=timeline.contributions[:, row, :].sum(axis=0) * 100,
+            name='All events',
+            line=dict(color='#6B7280', width=2, dash='dash'),
+            mode='lines'
+        ))
+        fig.add_trace(go.Scatter(
+            x=timeline.months,
+            y=totals[row] * 100,
+            name='Selected events',
+            line=dict(color='#078930', width=3),
+            mode='lines'
+        ))
+        
+        fig.update_layout(
+            title=f"Event Impact on {indicator}",
+            xaxis_title="Month",
+            yaxis_title="Impact (%)",
+            hovermode="x unified",
+            height=500
+        )
+        return fig
+    
+    @profiled('figure.impact_matrix')
+    def impact_matrix_figure(self, timeline, active_events):
+        """Heatmap of each active event's base impact on the indicators it is linked to"""
+        matrix = timeline.matrix
+        event_ids = np.flatnonzero(timeline.mask(active_events))
+        indicator_ids = np.unique(matrix.indicator_ids[np.isin(matrix.event_ids, event_ids)])
+        table = matrix.dense(event_ids, indicator_ids) * 100
+        
+        fig = go.Figure(go.Heatmap(
+            z=table.values,
+            x=list(table.columns),
+            y=[timeline.event_names[i] for i in event_ids],
+            colorscale='RdBu',
+            zmid=0,
+            colorbar=dict(title='Impact (%)'),
+            hovertemplate='%{y}<br>%{x}: %{z:.2f}%<extra></extra>'
+        ))
+        fig.update_layout(
+            title="Event-Indicator Impact Matrix",
+            xaxis_title="Indicator",
+            yaxis_title="Event",
+            height=max(400, 150 + 25 * len(event_ids))
+        )
+        return fig
+    
+    def projection_table(self, projection):
+        """Downloadable table of every projection scenario"""
+        projection_df = pd.DataFrame({'Year': projection['years']})
+        for scenario in ['Base', 'Optimistic', 'Pessimistic']:
+            projection_df[f'Digital_{scenario}'] = projection['digital'][scenario]
+            projection_df[f'Access_{scenario}'] = projection['access'][scenario]
+        return projection_df
+    
+    @profiled('page.overview')
     def overview_page(self):
         """Render overview page"""
         st.markdown('<div class="ethiopia-flag"></div>', unsafe_allow_html=True)
@@ -301,39 +1077,18 @@ class EthiopiaDashboard:
             
             # Historical Trend 2012-2024
             st.markdown('<h3 class="sub-header">📊 Historical Trends (2012-2024)</h3>', unsafe_allow_html=True)
-            
-            fig = go.Figure()
-            
-            metrics = ['Account_Ownership', 'Digital_Payments', 'Mobile_Money']
-            colors = ['#078930', '#3B82F6', '#F59E0B']
-            
-            for metric, color in zip(metrics, colors):
-                fig.add_trace(go.Scatter(
-                    x=self.historical_data['Year'],
-                    y=self.historical_data[metric],
-                    name=metric.replace('_', ' '),
-                    line=dict(color=color, width=3),
-                    mode='lines+markers'
-                ))
-            
-            fig.update_layout(
-                title="Financial Inclusion Metrics (2012-2024)",
-                xaxis_title="Year",
-                yaxis_title="Percentage (%)",
-                hovermode="x unified",
-                height=400
-            )
-            
+            fig = self.cached_figure('overview', 'historical_trends', {}, self.overview_figure)
             st.plotly_chart(fig, width='stretch')
         
         # Forecast Summary
         st.markdown('<h3 class="sub-header">📈 Forecast Summary (2025-2027)</h3>', unsafe_allow_html=True)
+        overview_tables = self.overview_tables()
         
         col1, col2 = st.columns(2)
         
         with col1:
             st.markdown("**Digital Payment Usage Forecast:**")
-            usage_display = self.usage_forecast[self.usage_forecast['Type'] == 'Forecast'][['Year', 'Base', 'Optimistic', 'Pessimistic']]
+            usage_display = overview_tables['usage_forecast']
             st.dataframe(
                 usage_display.style.format({
                     'Base': '{:.1f}%',
@@ -345,7 +1100,7 @@ class EthiopiaDashboard:
         
         with col2:
             st.markdown("**Account Access Forecast:**")
-            access_display = self.access_forecast[self.access_forecast['Type'] == 'Forecast'][['Year', 'Base', 'Optimistic', 'Pessimistic']]
+            access_display = overview_tables['access_forecast']
             st.dataframe(
                 access_display.style.format({
                     'Base': '{:.1f}%',
@@ -359,17 +1114,18 @@ class EthiopiaDashboard:
         st.markdown('<h3 class="sub-header">📋 Detailed Forecast Components</h3>', unsafe_allow_html=True)
         st.dataframe(self.forecast_summary, width='stretch')
     
+    @profiled('page.trends')
     def trends_page(self):
         """Render trends analysis page"""
         st.markdown('<div class="ethiopia-flag"></div>', unsafe_allow_html=True)
         st.markdown('<h1 class="main-header">📈 Ethiopia FI Trends Analysis</h1>', unsafe_allow_html=True)
         
+        query = self.trends_query()
         col1, col2 = st.columns([3, 1])
         
         with col2:
             # Year range selector
-            min_year = int(self.historical_data['Year'].min())
-            max_year = int(self.historical_data['Year'].max())
+            min_year, max_year = (int(year) for year in query.bounds())
             
             year_range = st.slider(
                 "Select Year Range:",
@@ -393,69 +1149,36 @@ class EthiopiaDashboard:
             )
         
         # Filter data
-        filtered_data = self.historical_data[
-            (self.historical_data['Year'] >= year_range[0]) & 
-            (self.historical_data['Year'] <= year_range[1])
-        ]
+        filtered_data = self.trends_data(year_range)
         
         with col1:
-            # Create visualization
-            fig = go.Figure()
-            
-            colors = px.colors.qualitative.Set3
-            
-            if view_type == "Line Chart":
-                for i, metric in enumerate(metrics):
-                    fig.add_trace(go.Scatter(
-                        x=filtered_data['Year'],
-                        y=filtered_data[metric],
-                        name=metric.replace('_', ' '),
-                        line=dict(color=colors[i % len(colors)], width=3),
-                        mode='lines+markers'
-                    ))
-            
-            elif view_type == "Bar Chart":
-                for metric in metrics:
-                    fig.add_trace(go.Bar(
-                        x=filtered_data['Year'],
-                        y=filtered_data[metric],
-                        name=metric.replace('_', ' '),
-                        marker_color=colors[metrics.index(metric) % len(colors)]
-                    ))
-                fig.update_layout(barmode='group')
-            
-            else:  # Area Chart
-                for metric in metrics:
-                    fig.add_trace(go.Scatter(
-                        x=filtered_data['Year'],
-                        y=filtered_data[metric],
-                        name=metric.replace('_', ' '),
-                        fill='tozeroy',
-                        mode='lines'
-                    ))
-            
-            fig.update_layout(
-                title=f"Financial Inclusion Trends ({year_range[0]}-{year_range[1]})",
-                xaxis_title="Year",
-                yaxis_title="Percentage (%)",
-                hovermode="x unified",
-                height=500
+            fig = self.cached_figure(
+                'trends', 'trends',
+                {'year_range': year_range, 'metrics': metrics, 'view_type': view_type},
+                lambda: self.trends_figure(filtered_data, year_range, metrics, view_type)
             )
-            
             st.plotly_chart(fig, width='stretch')
         
-        # Data table
+        # Data table, a page at a time
         st.markdown('<h3 class="sub-header">📊 Historical Data</h3>', unsafe_allow_html=True)
-        st.dataframe(filtered_data, width='stretch', height=300)
+        pages = query.page_count(year_range[0], year_range[1], TRENDS_PAGE_SIZE)
+        page = 1
+        if pages > 1:
+            page = st.number_input("Page:", min_value=1, max_value=pages, value=1, step=1)
+            st.caption(f"{len(filtered_data):,} rows, {TRENDS_PAGE_SIZE} per page")
+        st.dataframe(query.page(year_range[0], year_range[1], page - 1, TRENDS_PAGE_SIZE),
+                     width='stretch', height=300)
         
-        # Download button
+        # Download button; the full-resolution CSV is built only when clicked, and is held
+        # in memory in full (st.download_button takes a complete payload)
         st.download_button(
             label="📥 Download Historical Data",
-            data=filtered_data.to_csv(index=False),
+            data=lambda: query.csv_bytes(year_range[0], year_range[1]),
             file_name=f"ethiopia_fi_trends_{year_range[0]}_{year_range[1]}.csv",
             mime="text/csv"
         )
     
+    @profiled('page.forecasts')
     def forecasts_page(self):
         """Render forecasts page"""
         st.markdown('<div class="ethiopia-flag"></div>', unsafe_allow_html=True)
@@ -481,105 +1204,18 @@ class EthiopiaDashboard:
             show_ci = st.checkbox("Show Uncertainty Range", value=True)
         
         with col1:
-            # Create forecast visualization
-            fig = go.Figure()
-            
-            # Colors for scenarios
-            color_map = {"Base": "#078930", "Optimistic": "#10B981", "Pessimistic": "#EF4444"}
-            
-            # Historical data (2012-2024)
-            if forecast_type != "Comparison":
-                historical_metric = "Digital_Payments" if forecast_type == "Digital Payment Usage" else "Account_Ownership"
-                fig.add_trace(go.Scatter(
-                    x=self.historical_data['Year'],
-                    y=self.historical_data[historical_metric],
-                    name=f"Historical {forecast_type}",
-                    line=dict(color='#6B7280', width=2, dash='dot'),
-                    mode='lines'
-                ))
-            
-            # Add forecasts
-            forecast_years = [2025, 2026, 2027]
-            
-            if forecast_type == "Digital Payment Usage":
-                forecast_df = self.usage_forecast[self.usage_forecast['Type'] == 'Forecast']
-                for scenario in scenarios:
-                    values = forecast_df[scenario].values
-                    fig.add_trace(go.Scatter(
-                        x=forecast_years,
-                        y=values,
-                        name=f"Digital - {scenario}",
-                        line=dict(color=color_map[scenario], width=3),
-                        mode='lines+markers'
-                    ))
-            
-            elif forecast_type == "Account Access":
-                forecast_df = self.access_forecast[self.access_forecast['Type'] == 'Forecast']
-                for scenario in scenarios:
-                    values = forecast_df[scenario].values
-                    fig.add_trace(go.Scatter(
-                        x=forecast_years,
-                        y=values,
-                        name=f"Access - {scenario}",
-                        line=dict(color=color_map[scenario], width=3),
-                        mode='lines+markers'
-                    ))
-            
-            else:  # Comparison
-                # Digital payments
-                usage_df = self.usage_forecast[self.usage_forecast['Type'] == 'Forecast']
-                for scenario in scenarios:
-                    values = usage_df[scenario].values
-                    fig.add_trace(go.Scatter(
-                        x=forecast_years,
-                        y=values,
-                        name=f"Digital - {scenario}",
-                        line=dict(color=color_map[scenario], width=3, dash='solid'),
-                        mode='lines+markers'
-                    ))
-                
-                # Account access
-                access_df = self.access_forecast[self.access_forecast['Type'] == 'Forecast']
-                for scenario in scenarios:
-                    values = access_df[scenario].values
-                    fig.add_trace(go.Scatter(
-                        x=forecast_years,
-                        y=values,
-                        name=f"Access - {scenario}",
-                        line=dict(color=color_map[scenario], width=3, dash='dash'),
-                        mode='lines+markers'
-                    ))
-            
-            # Add target lines
-            fig.add_hline(y=60, line_dash="dash", line_color="#F59E0B",
-                         annotation_text="60% Target")
-            fig.add_hline(y=65, line_dash="dot", line_color="#8B5CF6",
-                         annotation_text="65% Target")
-            
-            fig.update_layout(
-                title=f"Ethiopia Financial Inclusion Forecasts",
-                xaxis_title="Year",
-                yaxis_title="Percentage (%)",
-                hovermode="x unified",
-                height=500
+            fig = self.cached_figure(
+                'forecasts', 'forecasts',
+                {'forecast_type': forecast_type, 'scenarios': scenarios, 'show_ci': show_ci},
+                lambda warn: self.forecasts_figure(forecast_type, scenarios, show_ci, warn=warn),
+                warn=st.warning
             )
-            
             st.plotly_chart(fig, width='stretch')
         
         # Forecast details table
         st.markdown('<h3 class="sub-header">📋 Forecast Details</h3>', unsafe_allow_html=True)
         
-        if forecast_type == "Digital Payment Usage":
-            forecast_df = self.usage_forecast[self.usage_forecast['Type'] == 'Forecast']
-        elif forecast_type == "Account Access":
-            forecast_df = self.access_forecast[self.access_forecast['Type'] == 'Forecast']
-        else:
-            # Show both
-            usage_df = self.usage_forecast[self.usage_forecast['Type'] == 'Forecast'].copy()
-            access_df = self.access_forecast[self.access_forecast['Type'] == 'Forecast'].copy()
-            usage_df['Type'] = 'Digital Payments'
-            access_df['Type'] = 'Account Access'
-            forecast_df = pd.concat([usage_df, access_df])
+        forecast_df = self.forecasts_table(forecast_type)
         
         st.dataframe(forecast_df, width='stretch')
         
@@ -590,7 +1226,34 @@ class EthiopiaDashboard:
             file_name="ethiopia_fi_forecasts.csv",
             mime="text/csv"
         )
+        
+        # Drill-down by group: every group was forecast when the data loaded, so switching is a lookup
+        aggregates = self.group_aggregates
+        if aggregates is not None and len(aggregates):
+            st.markdown('<h3 class="sub-header">🗺️ Forecasts by Group</h3>', unsafe_allow_html=True)
+            
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                dimension = st.selectbox(
+                    "Group by:", aggregates.levels,
+                    format_func=lambda level: level.replace(' x ', ' × ').replace('_', ' ').title()
+                )
+            with col2:
+                group = st.selectbox("Group:", aggregates.groups(dimension))
+            with col3:
+                indicator = st.selectbox("Indicator:", aggregates.indicators(dimension, group))
+            
+            fig = self.cached_figure(
+                'forecasts', 'group_forecast',
+                {'dimension': dimension, 'group': group, 'indicator': indicator},
+                lambda: self.group_forecast_figure(aggregates, dimension, group, indicator)
+            )
+            st.plotly_chart(fig, width='stretch')
+            
+            st.caption("Group forecasts add up to the national forecast, weighted by each group's observations.")
+            st.dataframe(self.group_forecast_table(aggregates, dimension, indicator), width='stretch')
     
+    @profiled('page.projections')
     def projections_page(self):
         """Render projections page"""
         st.markdown('<div class="ethiopia-flag"></div>', unsafe_allow_html=True)
@@ -602,119 +1265,51 @@ class EthiopiaDashboard:
         with col1:
             base_growth = st.slider(
                 "Base Annual Growth Rate (%):",
-                min_value=1.0,
-                max_value=10.0,
+                min_value=BASE_GROWTH_RANGE[0],
+                max_value=BASE_GROWTH_RANGE[1],
                 value=3.5,
-                step=0.1
+                step=BASE_GROWTH_RANGE[2]
             )
         
         with col2:
             opt_boost = st.slider(
                 "Optimistic Boost (% points):",
-                min_value=0.5,
-                max_value=5.0,
+                min_value=OPT_BOOST_RANGE[0],
+                max_value=OPT_BOOST_RANGE[1],
                 value=1.8,
-                step=0.1
+                step=OPT_BOOST_RANGE[2]
             )
         
         with col3:
             pess_drag = st.slider(
                 "Pessimistic Drag (% points):",
-                min_value=0.5,
-                max_value=5.0,
+                min_value=PESS_DRAG_RANGE[0],
+                max_value=PESS_DRAG_RANGE[1],
                 value=2.2,
-                step=0.1
+                step=PESS_DRAG_RANGE[2]
             )
         
-        # Get current values from forecasts
-        current_digital = 45.0  # Default
-        current_access = 49.0   # Default
-        
-        # Try to get actual 2024 values
-        if 2024 in self.historical_data['Year'].values:
-            current_digital = self.historical_data[self.historical_data['Year'] == 2024]['Digital_Payments'].values[0]
-            current_access = self.historical_data[self.historical_data['Year'] == 2024]['Account_Ownership'].values[0]
-        
-        # Generate projections to 2030
-        years = list(range(2024, 2031))
-        
-        # Create projections
-        digital_scenarios = {}
-        access_scenarios = {}
-        
-        for scenario_name, modifier in [('Base', 0), ('Optimistic', opt_boost), ('Pessimistic', -pess_drag)]:
-            # Digital payments projection
-            digital_rates = [current_digital]
-            for i in range(1, len(years)):
-                growth = (base_growth + modifier) / 100
-                new_rate = digital_rates[-1] * (1 + growth)
-                digital_rates.append(min(new_rate, 100))
-            digital_scenarios[scenario_name] = digital_rates
-            
-            # Account access projection
-            access_rates = [current_access]
-            for i in range(1, len(years)):
-                growth = (base_growth + modifier) / 100
-                new_rate = access_rates[-1] * (1 + growth)
-                access_rates.append(min(new_rate, 100))
-            access_scenarios[scenario_name] = access_rates
+        projection = self.projection_scenarios(base_growth, opt_boost, pess_drag)
+        slider_state = {'base_growth': base_growth, 'opt_boost': opt_boost, 'pess_drag': pess_drag}
+        years = projection['years']
+        digital_scenarios = projection['digital']
+        access_scenarios = projection['access']
         
         # Create visualizations
         tab1, tab2 = st.tabs(["Digital Payment Usage", "Account Access"])
         
         with tab1:
-            fig1 = go.Figure()
-            colors = {'Base': '#078930', 'Optimistic': '#10B981', 'Pessimistic': '#EF4444'}
-            
-            for scenario, rates in digital_scenarios.items():
-                fig1.add_trace(go.Scatter(
-                    x=years,
-                    y=rates,
-                    name=scenario,
-                    line=dict(color=colors[scenario], width=3),
-                    mode='lines+markers'
-                ))
-            
-            # Add target lines
-            fig1.add_hline(y=60, line_dash="dash", line_color="#F59E0B",
-                          annotation_text="60% Target")
-            fig1.add_hline(y=70, line_dash="dot", line_color="#8B5CF6",
-                          annotation_text="70% Target")
-            
-            fig1.update_layout(
-                title="Digital Payment Usage Projections (2024-2030)",
-                xaxis_title="Year",
-                yaxis_title="Percentage (%)",
-                height=450
+            fig1 = self.cached_figure(
+                'projections', 'digital', slider_state,
+                lambda: self.projection_figure(years, digital_scenarios, "Digital Payment Usage", targets=(60, 70))
             )
-            
             st.plotly_chart(fig1, width='stretch')
         
         with tab2:
-            fig2 = go.Figure()
-            
-            for scenario, rates in access_scenarios.items():
-                fig2.add_trace(go.Scatter(
-                    x=years,
-                    y=rates,
-                    name=scenario,
-                    line=dict(color=colors[scenario], width=3),
-                    mode='lines+markers'
-                ))
-            
-            # Add target lines
-            fig2.add_hline(y=65, line_dash="dash", line_color="#F59E0B",
-                          annotation_text="65% Target")
-            fig2.add_hline(y=75, line_dash="dot", line_color="#8B5CF6",
-                          annotation_text="75% Target")
-            
-            fig2.update_layout(
-                title="Account Access Projections (2024-2030)",
-                xaxis_title="Year",
-                yaxis_title="Percentage (%)",
-                height=450
+            fig2 = self.cached_figure(
+                'projections', 'access', slider_state,
+                lambda: self.projection_figure(years, access_scenarios, "Account Access", targets=(65, 75))
             )
-            
             st.plotly_chart(fig2, width='stretch')
         
         # Target analysis
@@ -724,38 +1319,26 @@ class EthiopiaDashboard:
         
         with col4:
             st.markdown("**Digital Payments (60% Target):**")
+            target_years = projection['digital_targets']
             for scenario, rates in digital_scenarios.items():
-                achieved = False
-                for i, year in enumerate(years):
-                    if rates[i] >= 60:
-                        st.success(f"✅ **{scenario}**: {year} ({rates[i]:.1f}%)")
-                        achieved = True
-                        break
-                if not achieved:
+                year = target_years[scenario]
+                if year is not None:
+                    st.success(f"✅ **{scenario}**: {year} ({rates[years.index(year)]:.1f}%)")
+                else:
                     st.warning(f"⚠️ **{scenario}**: {rates[-1]:.1f}% in 2030")
         
         with col5:
             st.markdown("**Account Access (65% Target):**")
+            target_years = projection['access_targets']
             for scenario, rates in access_scenarios.items():
-                achieved = False
-                for i, year in enumerate(years):
-                    if rates[i] >= 65:
-                        st.success(f"✅ **{scenario}**: {year} ({rates[i]:.1f}%)")
-                        achieved = True
-                        break
-                if not achieved:
+                year = target_years[scenario]
+                if year is not None:
+                    st.success(f"✅ **{scenario}**: {year} ({rates[years.index(year)]:.1f}%)")
+                else:
                     st.warning(f"⚠️ **{scenario}**: {rates[-1]:.1f}% in 2030")
         
         # Create downloadable projections
-        projection_data = []
-        for i, year in enumerate(years):
-            row = {'Year': year}
-            for scenario in ['Base', 'Optimistic', 'Pessimistic']:
-                row[f'Digital_{scenario}'] = digital_scenarios[scenario][i]
-                row[f'Access_{scenario}'] = access_scenarios[scenario][i]
-            projection_data.append(row)
-        
-        projection_df = pd.DataFrame(projection_data)
+        projection_df = self.projection_table(projection)
         
         # Download button
         st.download_button(
@@ -765,9 +1348,155 @@ class EthiopiaDashboard:
             mime="text/csv"
         )
 
+    @profiled('page.what_if')
+    def what_if_page(self):
+        """Render what-if event analysis page"""
+        st.markdown('<div class="ethiopia-flag"></div>', unsafe_allow_html=True)
+        st.markdown('<h1 class="main-header">🧪 What-If Event Analysis</h1>', unsafe_allow_html=True)
+        
+        timeline = self.event_timeline()
+        if timeline is None or not timeline.event_ids:
+            st.info("No events with numeric impact links found. Add impact_sheet_new.csv to data/raw to enable this page.")
+            return
+        
+        labels = {
+            event_id: f"{name} ({date:%Y-%m})" if date is not None else name
+            for event_id, name, date in zip(timeline.event_ids, timeline.event_names, timeline.event_dates)
+        }
+        
+        col1, col2 = st.columns([2, 1])
+        
+        with col1:
+            active_events = st.multiselect(
+                "Active Events:",
+                options=timeline.event_ids,
+                default=timeline.event_ids,
+                format_func=lambda event_id: labels[event_id]
+            )
+        
+        with col2:
+            indicator = st.selectbox("Indicator:", timeline.indicators)
+        
+        # Only the events switched since the last rerun are added or removed
+        scenario = self.event_scenario(timeline, active_events)
+        
+        fig = self.cached_figure(
+            'what_if', 'contributions',
+            {'indicator': indicator, 'active_events': sorted(active_events)},
+            lambda: self.what_if_figure(timeline, scenario.totals, scenario.active_events, indicator)
+        )
+        st.plotly_chart(fig, width='stretch')
+        
+        # End-of-window impact with and without the switched-off events
+        row = timeline.indicators.index(indicator)
+        selected_impact = scenario.totals[row, -1] * 100
+        all_impact = timeline.contributions[:, row, -1].sum() * 100
+        
+        col3, col4, col5 = st.columns(3)
+        with col3:
+            st.metric(f"Selected Events ({timeline.months[-1]})", f"{selected_impact:.2f}%",
+                      delta=f"{selected_impact - all_impact:.2f}% vs all events")
+        with col4:
+            st.metric(f"All Events ({timeline.months[-1]})", f"{all_impact:.2f}%")
+        with col5:
+            st.metric("Active Events", f"{len(active_events)} / {len(timeline.event_ids)}")
+        
+        if active_events:
+            st.markdown('<h3 class="sub-header">🔗 Event-Indicator Impact Matrix</h3>', unsafe_allow_html=True)
+            fig = self.cached_figure(
+                'what_if', 'impact_matrix',
+                {'active_events': sorted(active_events)},
+                lambda: self.impact_matrix_figure(timeline, active_events)
+            )
+            st.plotly_chart(fig, width='stretch')
+        
+        results = scenario.results().rename_axis('Month').reset_index()
+        st.download_button(
+            label="📥 Download What-If Impacts",
+            data=results.to_csv(index=False),
+            file_name="ethiopia_fi_what_if_impacts.csv",
+            mime="text/csv"
+        )
+
+def profiling_panel(rerun_start):
+    """Debug sidebar panel: switch span recording on or off and show this rerun's timings"""
+    st.sidebar.markdown("---")
+    with st.sidebar.expander("🔧 Debug: Profiling", expanded=PROFILER.enabled):
+        enabled = st.checkbox(
+            "Record timing spans", value=PROFILER.enabled,
+            help="Applies to the whole server process; memory tracing slows every page while on"
+        )
+        if enabled != PROFILER.enabled:
+            if enabled:
+                PROFILER.enable()
+            else:
+                PROFILER.disable()
+            st.rerun()
+        
+        if not PROFILER.enabled:
+            st.caption("Off. Set ETHIOPIA_FI_PROFILE=1 to record from startup.")
+            return
+        
+        # Script reruns run on their own thread, so this picks out this session's spans
+        records = PROFILER.to_frame(since_s=rerun_start, thread=threading.get_ident())
+        if records.empty:
+            st.caption("No spans recorded in this rerun yet; interact with a page.")
+        else:
+            top_level = records[records['depth'] == 0]['wall_s'].sum()
+            st.caption(f"This rerun: {len(records)} spans, {top_level * 1e3:.0f} ms in top-level spans")
+            st.dataframe(PROFILER.summary(records).round(1), width='stretch', hide_index=True)
+        
+        st.download_button(
+            label="📥 Spans (JSON)",
+            data=PROFILER.to_json(),
+            file_name="ethiopia_fi_profile.json",
+            mime="application/json"
+        )
+        st.download_button(
+            label="📥 Chrome Trace",
+            data=PROFILER.to_chrome_trace(),
+            file_name="ethiopia_fi_profile_trace.json",
+            mime="application/json",
+            help="Open in chrome://tracing or ui.perfetto.dev"
+        )
+        if st.button("Clear recorded spans"):
+            PROFILER.clear()
+            st.rerun()
+
+def data_freshness_panel(dashboard):
+    """Sidebar status of the background loads: served version, age of each dataset and load messages"""
+    datasets = dashboard.datasets
+    status = datasets.status()
+    icons = {'ready': '🟢', 'refreshing': '🔄', 'loading': '⏳', 'pending': '⚪', 'failed': '🔴'}
+    
+    st.sidebar.markdown("---")
+    st.sidebar.markdown("### 🔄 Data Freshness")
+    version = hashlib.blake2b(repr(dashboard.data_version).encode(), digest_size=4).hexdigest()
+    interval = f"every {datasets.refresh_seconds}s" if datasets.refresh_seconds else "on demand"
+    st.sidebar.caption(f"Data version: `{version}` | Checked {interval}")
+    
+    lines = []
+    for row in status.itertuples():
+        age = f"{row.age_s:.0f}s ago" if pd.notna(row.age_s) else "not loaded"
+        line = f"{icons.get(row.state, '')} {row.dataset}: {age}"
+        if row.error:
+            line += f" ({row.error})"
+        lines.append(line)
+    st.sidebar.caption("\n\n".join(lines))
+    
+    with st.sidebar.expander("Load messages"):
+        for name, entry in datasets.entries.items():
+            for level, message in entry.messages:
+                getattr(st, level, st.info)(message)
+    
+    if st.sidebar.button("Refresh data now"):
+        refreshed = datasets.refresh(list(datasets.entries))
+        st.sidebar.info(f"Reloading {len(refreshed)} datasets in the background")
+
 def main():
     """Main application function"""
-    dashboard = EthiopiaDashboard()
+    rerun_start = time.perf_counter() - PROFILER.origin
+    dashboard = EthiopiaDashboard(datasets=get_datasets())
     
     # Sidebar navigation
     st.sidebar.markdown('<div class="ethiopia-flag"></div>', unsafe_allow_html=True)
@@ -775,9 +1504,15 @@ def main():
     
     page = st.sidebar.radio(
         "Select Page:",
-        ["📊 Overview", "📈 Trends", "🔮 Forecasts", "🎯 Projections"]
+        ["📊 Overview", "📈 Trends", "🔮 Forecasts", "🎯 Projections", "🧪 What-If Events"]
     )
     
+    # Wait only for the datasets this page reads; the others keep loading in the background
+    pending = dashboard.datasets.pending(PAGE_DATASETS[page])
+    if pending:
+        with st.spinner(f"Loading {', '.join(pending)}..."):
+            dashboard.datasets.wait(pending)
+    
     # Page routing
     if page == "📊 Overview":
         dashboard.overview_page()
@@ -787,6 +1522,8 @@ def main():
         dashboard.forecasts_page()
     elif page == "🎯 Projections":
         dashboard.projections_page()
+    elif page == "🧪 What-If Events":
+        dashboard.what_if_page()
     
     # Sidebar information
     st.sidebar.markdown("---")
@@ -803,6 +1540,29 @@ def main():
     - Target tracking
     """)
     
+    data_freshness_panel(dashboard)
+    
+    # Data cache statistics
+    cache_stats = dashboard.data_loader.cache.stats()
+    st.sidebar.markdown("---")
+    st.sidebar.markdown("### ⚡ Data Cache")
+    st.sidebar.caption(
+        f"Hits: {cache_stats['hits']} | Misses: {cache_stats['misses']} | "
+        f"Hit rate: {cache_stats['hit_rate']:.0%}\n\n"
+        f"{cache_stats['entries']} datasets, "
+        f"{cache_stats['bytes'] / 1024 ** 2:.1f} / {cache_stats['max_bytes'] / 1024 ** 2:.0f} MB"
+    )
+    
+    figure_stats = dashboard.figure_cache.stats()
+    st.sidebar.markdown("### 🖼️ Figure Cache")
+    st.sidebar.caption(
+        f"Hits: {figure_stats['hits']} | Misses: {figure_stats['misses']} | "
+        f"Hit rate: {figure_stats['hit_rate']:.0%}\n\n"
+        f"{figure_stats['entries']} figures, "
+        f"{figure_stats['bytes'] / 1024 ** 2:.1f} / {figure_stats['max_bytes'] / 1024 ** 2:.0f} MB | "
+        f"Evictions: {figure_stats['evictions']}"
+    )
+    
     # File uploader for data
     st.sidebar.markdown("---")
     st.sidebar.markdown("### 📁 Upload Data")
@@ -820,6 +1580,8 @@ def main():
             st.sidebar.dataframe(df.head(3), width='stretch')
         except Exception as e:
             st.sidebar.error(f"Error: {e}")
+    
+    profiling_panel(rerun_start)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,311 @@
+"""
+Headless export of the dashboard's charts and downloads
+
+Renders every page's figures and CSV downloads for a list of scenario
+configurations without a Streamlit session. Data is loaded once and
+shared by all configurations, which are rendered in parallel threads.
+
+Run from the project root:
+    python -m dashboard.batch_export configs.json --output reports/batch --workers 4
+
+configs.json is a list of objects; any widget left out keeps the
+dashboard's default:
+
+    [
+        {"name": "baseline"},
+        {"name": "fast_growth",
+         "projections": {"base_growth": 6.0, "opt_boost": 2.5},
+         "forecasts": {"forecast_type": "Comparison",
+                       "scenarios": ["Base", "Optimistic", "Pessimistic"]}},
+        {"name": "no_telebirr", "pages": ["what_if"],
+         "what_if": {"events": ["EVT_0001", "EVT_0003"]}}
+    ]
+"""
+import argparse
+import copy
+import json
+import logging
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+import pandas as pd
+from streamlit import config as st_config, logger as st_logger
+
+# Streamlit calls made by the app have no session here; keep their bare-mode warnings quiet
+st_config.set_option('global.showWarningOnDirectExecution', False)
+st_logger.set_log_level(logging.ERROR)
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from dashboard.app import EthiopiaDashboard, EthiopiaDataLoader
+from src.data_cache import DataCache
+from src.profiling import PROFILER, span
+
+try:
+    import kaleido  # noqa: F401 - plotly uses it for static images
+    PNG_AVAILABLE = True
+except ImportError:
+    PNG_AVAILABLE = False
+
+PAGES = ['overview', 'trends', 'forecasts', 'projections', 'what_if']
+
+# Widget defaults of each page
+DEFAULT_CONFIG = {
+    'pages': PAGES,
+    'trends': {
+        'year_range': None,  # full historical range
+        'metrics': ['Account_Ownership', 'Digital_Payments'],
+        'view_type': 'Line Chart'
+    },
+    'forecasts': {
+        'forecast_type': 'Digital Payment Usage',
+        'scenarios': ['Base', 'Optimistic'],
+        'show_ci': True,
+        'dimension': 'national',  # group drill-down level
+        'group': None,            # first group of the level
+        'indicator': None         # first indicator of the group
+    },
+    'projections': {
+        'base_growth': 3.5,
+        'opt_boost': 1.8,
+        'pess_drag': 2.2
+    },
+    'what_if': {
+        'indicator': None,  # every indicator
+        'events': None      # every event active
+    }
+}
+
+
+def config_name(name):
+    """Configuration name or file stem made safe as a single path component (letters, digits, '.', '_' and '-')"""
+    return re.sub(r'[^A-Za-z0-9._-]+', '_', str(name)).strip('._')
+
+
+def resolve_config(config, position, taken=()):
+    """
+    Fill a configuration's missing widgets with the dashboard defaults
+
+    The name becomes the configuration's output directory, so it is
+    sanitized (no path separators or '..'); a name that is empty once
+    sanitized, or that matches one in taken (ignoring case), raises ValueError.
+    """
+    resolved = copy.deepcopy(DEFAULT_CONFIG)
+    for key, value in config.items():
+        if isinstance(value, dict) and isinstance(resolved.get(key), dict):
+            resolved[key].update(value)
+        else:
+            resolved[key] = value
+    name = config_name(resolved.get('name', f"config_{position:03d}"))
+    if not name:
+        raise ValueError(f"Configuration {position} has no usable name: {resolved['name']!r}")
+    if name.lower() in {other.lower() for other in taken}:
+        raise ValueError(f"Configuration {position} has a duplicate name: {name!r}")
+    resolved['name'] = name
+    return resolved
+
+
+def resolve_configs(configs):
+    """resolve_config for a list of configurations, which must have distinct names"""
+    resolved = []
+    for position, config in enumerate(configs):
+        resolved.append(resolve_config(config, position, [other['name'] for other in resolved]))
+    return resolved
+
+
+def page_outputs(dashboard, config, warn):
+    """Yield (page, file stem, figure or DataFrame) for every chart and download of the configured pages"""
+    pages = config['pages']
+
+    if 'overview' in pages:
+        yield 'overview', 'overview_historical_trends', dashboard.overview_figure()
+        for name, table in dashboard.overview_tables().items():
+            yield 'overview', f"overview_{name}", table
+
+    if 'trends' in pages:
+        options = config['trends']
+        year_range = options['year_range'] or tuple(int(year) for year in dashboard.trends_query().bounds())
+        filtered_data = dashboard.trends_data(year_range)
+        yield 'trends', 'trends', dashboard.trends_figure(
+            filtered_data, year_range, options['metrics'], options['view_type']
+        )
+        yield 'trends', f"ethiopia_fi_trends_{year_range[0]}_{year_range[1]}", filtered_data
+
+    if 'forecasts' in pages:
+        options = config['forecasts']
+        yield 'forecasts', 'forecasts', dashboard.forecasts_figure(
+            options['forecast_type'], options['scenarios'], options['show_ci'], warn=warn
+        )
+        yield 'forecasts', 'ethiopia_fi_forecasts', dashboard.forecasts_table(options['forecast_type'])
+
+        aggregates = dashboard.group_aggregates
+        if aggregates is not None and len(aggregates):
+            dimension = options['dimension']
+            group = options['group'] or aggregates.groups(dimension)[0]
+            indicator = options['indicator'] or aggregates.indicators(dimension, group)[0]
+            yield 'forecasts', f"forecasts_{dimension}_{indicator}", dashboard.group_forecast_figure(
+                aggregates, dimension, group, indicator
+            )
+            table = dashboard.group_forecast_table(aggregates, dimension, indicator)
+            yield 'forecasts', f"ethiopia_fi_group_forecasts_{dimension}_{indicator}", table
+
+    if 'projections' in pages:
+        options = config['projections']
+        projection = dashboard.projection_scenarios(
+            options['base_growth'], options['opt_boost'], options['pess_drag']
+        )
+        years = projection['years']
+        yield 'projections', 'projections_digital', dashboard.projection_figure(
+            years, projection['digital'], "Digital Payment Usage", targets=(60, 70)
+        )
+        yield 'projections', 'projections_access', dashboard.projection_figure(
+            years, projection['access'], "Account Access", targets=(65, 75)
+        )
+        yield 'projections', f"ethiopia_fi_projections_{years[0]}_{years[-1]}", dashboard.projection_table(projection)
+
+    timeline = dashboard.event_timeline() if 'what_if' in pages else None
+    if timeline is not None:
+        options = config['what_if']
+        active_events = options['events'] if options['events'] is not None else timeline.event_ids
+        indicators = [options['indicator']] if options['indicator'] else timeline.indicators
+        totals = timeline.totals(active_events)
+        for indicator in indicators:
+            yield 'what_if', f"what_if_{indicator}", dashboard.what_if_figure(
+                timeline, totals, active_events, indicator
+            )
+        yield 'what_if', 'what_if_impact_matrix', dashboard.impact_matrix_figure(timeline, active_events)
+        yield 'what_if', 'ethiopia_fi_what_if_impacts', timeline.to_frame(totals).rename_axis('Month').reset_index()
+
+
+def render_config(dashboard, config, output_dir, formats):
+    """Write one configuration's outputs; returns manifest rows"""
+    config_dir = Path(output_dir) / config['name']
+    config_dir.mkdir(parents=True, exist_ok=True)
+    with open(config_dir / 'config.json', 'w') as f:
+        json.dump(config, f, indent=2)
+
+    warnings = []
+    rows = []
+    for page, stem, output in page_outputs(dashboard, config, warnings.append):
+        start = time.perf_counter()
+        # Stems carry indicator codes and dimension names from the data
+        stem = config_name(stem)
+        written = []
+        with span('export.write', config=config['name'], output=stem):
+            if isinstance(output, pd.DataFrame):
+                if 'csv' in formats:
+                    output.to_csv(config_dir / f"{stem}.csv", index=False)
+                    written.append(f"{stem}.csv")
+            else:
+                if 'html' in formats:
+                    output.write_html(config_dir / f"{stem}.html", include_plotlyjs='cdn')
+                    written.append(f"{stem}.html")
+                if 'png' in formats and PNG_AVAILABLE:
+                    output.write_image(config_dir / f"{stem}.png", width=1200, height=output.layout.height or 500)
+                    written.append(f"{stem}.png")
+        for file_name in written:
+            rows.append({
+                'config': config['name'],
+                'page': page,
+                'file': str(config_dir / file_name),
+                'seconds': time.perf_counter() - start
+            })
+
+    for message in warnings:
+        print(f"  ⚠ {config['name']}: {message}")
+    return rows
+
+
+def profiled_render(dashboard, config, output_dir, formats):
+    """render_config inside a span per configuration"""
+    with span('export.config', config=config['name']):
+        return render_config(dashboard, config, output_dir, formats)
+
+
+def run_batch(configs, output_dir, workers=4, formats=('html', 'csv', 'png'), data_loader=None):
+    """
+    Render every configuration and write a manifest of the files produced
+
+    Parameters:
+    -----------
+    configs: List of configuration dicts (see module docstring)
+    output_dir: Directory receiving one sub-directory per configuration
+    workers: Configurations rendered concurrently
+    formats: Any of 'html', 'png' (needs kaleido) and 'csv'
+    data_loader: EthiopiaDataLoader to use (a fresh one by default)
+
+    Returns (manifest DataFrame, {config name: error}) for failed configurations.
+    Raises ValueError for invalid or duplicate configuration names.
+    """
+    configs = resolve_configs(configs)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    if 'png' in formats and not PNG_AVAILABLE:
+        print("⚠ kaleido is not installed; skipping PNG output (pip install kaleido)")
+
+    # Data is read once here and shared, read-only, by every configuration
+    start = time.perf_counter()
+    with span('export.load'):
+        dashboard = EthiopiaDashboard(data_loader or EthiopiaDataLoader(cache=DataCache()))
+        # Every configuration renders from the same fully loaded snapshot
+        dashboard.load_all_data(wait=True)
+    for entry in dashboard.datasets.entries.values():
+        for level, message in entry.messages:
+            print(f"{level}: {message}")
+    print(f"✓ Loaded data in {time.perf_counter() - start:.2f}s")
+
+    rows = []
+    failures = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(profiled_render, dashboard, config, output_dir, formats): config['name']
+                   for config in configs}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                config_rows = future.result()
+                rows.extend(config_rows)
+                print(f"✓ {name}: {len(config_rows)} files")
+            except Exception as e:
+                failures[name] = f"{type(e).__name__}: {e}"
+                print(f"✗ {name}: {failures[name]}")
+
+    manifest = pd.DataFrame(rows, columns=['config', 'page', 'file', 'seconds'])
+    manifest.sort_values(['config', 'file']).to_csv(output_dir / 'manifest.csv', index=False)
+    print(f"\nRendered {len(configs) - len(failures)}/{len(configs)} configurations "
+          f"({len(manifest)} files) in {time.perf_counter() - start:.2f}s")
+    return manifest, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export dashboard charts and tables for many configurations")
+    parser.add_argument('configs', nargs='?', help="JSON file with a list of configurations (default: one default config)")
+    parser.add_argument('--output', default='reports/batch', help="Output directory")
+    parser.add_argument('--workers', type=int, default=4, help="Configurations rendered in parallel")
+    parser.add_argument('--formats', default='html,png,csv', help="Comma-separated subset of html,png,csv")
+    parser.add_argument('--profile', action='store_true',
+                        help="Record timing spans and write profile.json and profile_trace.json to the output directory")
+    args = parser.parse_args()
+    if args.profile:
+        PROFILER.enable()
+
+    configs = [{'name': 'default'}]
+    if args.configs:
+        with open(args.configs) as f:
+            configs = json.load(f)
+    try:
+        resolve_configs(configs)
+    except ValueError as e:
+        parser.error(str(e))
+
+    _, failures = run_batch(configs, args.output, workers=args.workers, formats=args.formats.split(','))
+    if args.profile:
+        print(PROFILER.summary().to_string(index=False, float_format=lambda x: f"{x:.1f}"))
+        for path in PROFILER.export(args.output):
+            print(f"✓ Saved: {path}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+"""
+Concurrent, non-blocking loading of named datasets with background refresh
+
+Each dataset is registered with a load function, the datasets it depends
+on and a version function (typically the file signature of its source):
+
+    datasets = BackgroundLoader(refresh_seconds=60)
+    datasets.register('unified', loader.load_unified_data, version=unified_signature)
+    datasets.register('historical', loader.load_historical_data, deps=('unified',))
+    datasets.start()
+    datasets.get('historical')  # waits only for unified and historical
+
+start() submits every load to a thread pool at once; a load runs as soon
+as its dependencies are ready. A dataset that has a value keeps serving
+it while a refresh is in flight, and the new version replaces it in one
+step when the reload finishes. The scheduler thread re-checks versions
+every refresh_seconds and reloads what changed, plus its dependents.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from src.profiling import span
+
+
+class DatasetLoadError(RuntimeError):
+    """A dataset that has never loaded failed to load"""
+
+
+class DatasetEntry:
+    """Served value and load state of one dataset"""
+
+    def __init__(self, name, load, deps, version):
+        self.name = name
+        self.load = load
+        self.deps = tuple(deps)
+        self.version_fn = version
+        self.value = None
+        self.version = None
+        self.loaded = False
+        self.loaded_at = None
+        self.load_seconds = None
+        self.error = None
+        self.future = None
+        self.messages = []
+
+    @property
+    def loading(self):
+        return self.future is not None and not self.future.done()
+
+    @property
+    def state(self):
+        if self.loading:
+            return 'refreshing' if self.loaded else 'loading'
+        if self.error is not None:
+            return 'failed'
+        return 'ready' if self.loaded else 'pending'
+
+
+class BackgroundLoader:
+    """Thread-pool loader serving the last loaded version of every dataset"""
+
+    def __init__(self, max_workers=None, refresh_seconds=None):
+        """
+        Initialize the loader
+
+        Parameters:
+        -----------
+        max_workers: Pool threads (default: one per registered dataset, so
+                     loads waiting on dependencies never starve the pool)
+        refresh_seconds: Interval of the background version check (None = only on refresh())
+        """
+        self.max_workers = max_workers
+        self.refresh_seconds = refresh_seconds
+        self.entries = {}
+        self._lock = threading.RLock()
+        self._local = threading.local()
+        self._pool = None
+        self._stop = threading.Event()
+        self._scheduler = None
+
+    def register(self, name, load, deps=(), version=None):
+        """
+        Add a dataset
+
+        Parameters:
+        -----------
+        name: Dataset name
+        load: Called with the values of deps, in order; returns the dataset
+        deps: Names of datasets registered earlier that load needs
+        version: Zero-argument callable identifying the current source
+                 (None: the version is that of the dependencies)
+        """
+        for dep in deps:
+            if dep not in self.entries:
+                raise ValueError(f"{name} depends on {dep}, which is not registered")
+        self.entries[name] = DatasetEntry(name, load, deps, version)
+        return self
+
+    def start(self):
+        """Submit every dataset that is neither loaded nor loading; starts the refresh scheduler"""
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers or max(1, len(self.entries)),
+                                                thread_name_prefix='dataset')
+            for entry in self.entries.values():
+                if not entry.loaded and not entry.loading:
+                    self._submit(entry)
+            if self.refresh_seconds and self._scheduler is None:
+                self._scheduler = threading.Thread(target=self._schedule, name='dataset-refresh', daemon=True)
+                self._scheduler.start()
+        return self
+
+    def stop(self):
+        """Stop the scheduler and the pool (loads in flight finish first)"""
+        self._stop.set()
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+
+    def _submit(self, entry):
+        entry.future = self._pool.submit(self._run, entry)
+
+    def _run(self, entry):
+        try:
+            dep_values, dep_versions = [], []
+            for dep in entry.deps:
+                dep_values.append(self._await(dep))
+                dep_versions.append(self.entries[dep].version)
+            # Read the version before the data, so a change during the read shows as stale next time
+            version = entry.version_fn() if entry.version_fn is not None else None
+            self._local.messages = []
+            start = time.perf_counter()
+            with span(f"dataset.{entry.name}"):
+                value = entry.load(*dep_values)
+            with self._lock:
+                entry.value = value
+                entry.version = (version, tuple(dep_versions)) if entry.deps else version
+                entry.loaded = True
+                entry.loaded_at = time.time()
+                entry.load_seconds = time.perf_counter() - start
+                entry.messages = self._local.messages
+                entry.error = None
+        except Exception as e:
+            # Keep serving the previous version; the error is shown with the dataset's status
+            with self._lock:
+                entry.error = f"{type(e).__name__}: {e}"
+        finally:
+            self._local.messages = None
+        return entry.value
+
+    def _await(self, name):
+        """Value of name after any load in flight (used for dependencies, which must be current)"""
+        entry = self.entries[name]
+        future = entry.future
+        if future is not None:
+            future.result()
+        self._check(entry)
+        return entry.value
+
+    def _check(self, entry):
+        """Raise DatasetLoadError when entry has no value because its load failed"""
+        with self._lock:
+            if not entry.loaded and entry.error is not None:
+                raise DatasetLoadError(f"{entry.name} failed to load: {entry.error}")
+
+    def notify(self, level, message):
+        """Record a status message of the load running on this thread ('success', 'warning', ...)"""
+        messages = getattr(self._local, 'messages', None)
+        if messages is None:
+            print(f"{level}: {message}")
+        else:
+            messages.append((level, message))
+
+    def get(self, name, timeout=None):
+        """
+        Served value of name; waits only when it has never been loaded
+
+        Raises DatasetLoadError when the load failed and there is no
+        earlier value to serve.
+        """
+        entry = self.entries[name]
+        self._wait(entry, timeout)
+        self._check(entry)
+        return entry.value
+
+    def _wait(self, entry, timeout=None):
+        if not entry.loaded:
+            if entry.future is None:
+                self.start()
+            entry.future.result(timeout=timeout)
+
+    def ready(self, name):
+        return self.entries[name].loaded
+
+    def pending(self, names):
+        """Those of names that have no value yet"""
+        return [name for name in names if not self.entries[name].loaded]
+
+    def wait(self, names, timeout=None):
+        """Block until every one of names has a value or has failed to load (get() raises the error)"""
+        for name in names:
+            self._wait(self.entries[name], timeout)
+
+    def snapshot(self):
+        """{name: (value, version)} of every dataset with a value, taken atomically"""
+        with self._lock:
+            return {name: (entry.value, entry.version) for name, entry in self.entries.items() if entry.loaded}
+
+    def stale(self):
+        """Datasets whose source version changed since they were loaded, plus their dependents"""
+        stale = set()
+        for name, entry in self.entries.items():
+            if not entry.loaded or entry.loading:
+                continue
+            if entry.version_fn is not None:
+                try:
+                    current = entry.version_fn()
+                except Exception:
+                    continue
+                served = entry.version[0] if entry.deps else entry.version
+                if current != served:
+                    stale.add(name)
+            if any(dep in stale for dep in entry.deps):
+                stale.add(name)
+        return [name for name in self.entries if name in stale]
+
+    def refresh(self, names=None):
+        """
+        Reload datasets in the background, keeping their current values until done
+
+        Parameters:
+        -----------
+        names: Datasets to reload (None: only the stale ones); dependents follow
+
+        Returns the names submitted.
+        """
+        with self._lock:
+            if self._pool is None:
+                self.start()
+            targets = set(self.stale() if names is None else names)
+            submitted = []
+            for name, entry in self.entries.items():
+                if name in targets or any(dep in submitted for dep in entry.deps):
+                    if not entry.loading:
+                        self._submit(entry)
+                    submitted.append(name)
+            return submitted
+
+    def _schedule(self):
+        while not self._stop.wait(self.refresh_seconds):
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"⚠ Background refresh failed: {e}")
+
+    def status(self):
+        """One row per dataset: state, version, load time and age of the served value"""
+        now = time.time()
+        rows = []
+        for name, entry in self.entries.items():
+            rows.append({
+                'dataset': name,
+                'state': entry.state,
+                'version': entry.version,
+                'loaded_at': pd.Timestamp(entry.loaded_at, unit='s') if entry.loaded_at else None,
+                'age_s': now - entry.loaded_at if entry.loaded_at else None,
+                'load_s': entry.load_seconds,
+                'error': entry.error
+            })
+        return pd.DataFrame(rows)
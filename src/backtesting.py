@@ -0,0 +1,368 @@
+"""
+Rolling-origin backtesting of the trend and event-augmented forecasters
+
+Every series is cut at every origin year, forecast from the years up to the
+origin only, and scored against the years that follow. The forecasters are
+reproduced in closed form so that all series x origins x horizons are
+evaluated in a few array passes instead of one forecaster object per cut:
+
+- trend_linear / trend_logistic: TrendForecaster.forecast
+- fixed_linear: FixedTrendForecaster.forecast (percentage series fitted as
+  decimals, predictions clipped to 0-100%)
+- event_<lag_function>: EventAugmentedForecaster.augment_forecast on top of
+  fixed_linear, with the event impacts simulated at that lag function
+
+Every series x origin cut is fitted in one trend_fitting.fit_linear_batch
+call, and each lag function is simulated once over the whole window;
+an origin only reads the 12 simulated months ending in its December, so no
+event after the origin leaks into its forecast.
+
+Series are split into chunks that run across a process pool, as in
+batch_forecast:
+
+    series = indicator_series(unified)
+    forecasts = run_backtest(series, simulate_lag_functions(summary, 2010, 2024), mapping, workers=4)
+    summarize(forecasts)               # MAE, MAPE and 95% interval coverage per model and horizon
+    best_models(forecasts)             # lowest-MAE model per indicator
+
+    python -m src.backtesting data/raw/ethiopia_fi_unified_new.csv --impact data/raw/impact_sheet_new.csv
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from src.event_impact_model import EventImpactModel, impact_summary_from_links
+from src.profiling import PROFILER, span
+from src.trend_fitting import stack_series, fit_linear_batch
+
+LAG_FUNCTIONS = ['exponential', 'linear', 'immediate']
+HORIZONS = (1, 2, 3)
+
+# Constants of the forecasters in src/forecasting.py
+Z_SCORE = 1.96
+EVENT_DECAY_RATE = 0.15
+RECENT_MONTHS = 12
+
+BACKTEST_COLUMNS = ['indicator_code', 'region', 'model', 'origin', 'horizon', 'year', 'forecast',
+                    'ci_lower', 'ci_upper', 'actual', 'error', 'abs_error', 'ape', 'covered']
+
+
+def simulate_lag_functions(impact_summary, first_year, last_year, lag_functions=LAG_FUNCTIONS):
+    """
+    Monthly simulated impacts of one impact summary under every lag function
+
+    Returns {lag_function: simulate_impacts results}, from January of
+    first_year to December of last_year.
+    """
+    simulations = {}
+    for lag_function in lag_functions:
+        with contextlib.redirect_stdout(io.StringIO()):
+            model = EventImpactModel(impact_summary, lag_function=lag_function)
+            simulations[lag_function], _ = model.simulate_impacts(f"{first_year}-01-01", f"{last_year}-12-01")
+    return simulations
+
+
+def recent_impacts(simulation, origins):
+    """
+    EventAugmentedForecaster's recent average impact (as a decimal) at each origin
+
+    simulation is one monthly column ('YYYY-MM' index); the average is over
+    the last RECENT_MONTHS months up to the origin's December, from running
+    sums so every origin costs two lookups.
+    """
+    labels = np.asarray(simulation.index.astype(str))
+    order = np.argsort(labels, kind='stable')
+    values = simulation.to_numpy(dtype=float)[order]
+    running = np.concatenate([[0.0], np.cumsum(values)])
+
+    ends = np.searchsorted(labels[order], [f"{origin}-12" for origin in origins], side='right')
+    starts = np.maximum(ends - RECENT_MONTHS, 0)
+    with np.errstate(invalid='ignore'):
+        means = (running[ends] - running[starts]) / (ends - starts)
+    return np.where(ends > starts, means, 0.0) / 100
+
+
+def event_impacts(series_keys, simulations, indicator_mapping, origins):
+    """
+    {lag_function: (series x origins) recent impacts} for the event-augmented models
+
+    Series without a simulation column get zero impact, as
+    EventAugmentedForecaster gives indicators it cannot find. Each
+    simulation column is averaged once, however many series map to it.
+    """
+    impacts = {}
+    for lag_function, simulation in simulations.items():
+        by_column = {}
+        table = np.zeros((len(series_keys), len(origins)))
+        for row, key in enumerate(series_keys):
+            column = indicator_mapping.get(key[0])
+            if column is None or column not in simulation.columns:
+                continue
+            if column not in by_column:
+                by_column[column] = recent_impacts(simulation[column], origins)
+            table[row] = by_column[column]
+        impacts[lag_function] = table
+    return impacts
+
+
+def expanding_fits(grid, values, at_origin):
+    """
+    OLS of values on year over the years up to each origin
+
+    Returns (n, slope, intercept, ss_res), each (series x origins); entry
+    [s, o] is the fit of series s on the years up to grid[at_origin[o]],
+    with the intercept on years centred at the grid mean. Every series x
+    origin cut is one row of a single trend_fitting.fit_linear_batch call.
+    """
+    trained = np.arange(len(grid))[np.newaxis, :] <= np.asarray(at_origin)[:, np.newaxis]    # (origins, grid)
+    cuts = np.where(trained[np.newaxis, :, :], values[:, np.newaxis, :], np.nan)
+    fits = fit_linear_batch(grid - grid.mean(), cuts.reshape(-1, len(grid)))
+    shape = (len(values), len(at_origin))
+    n = fits['n'].reshape(shape)
+    return n, fits['slope'].reshape(shape), fits['intercept'].reshape(shape), (fits['mse'] * fits['n']).reshape(shape)
+
+
+def backtest_chunk(task):
+    """
+    Forecasts of one chunk of series at every origin and horizon (worker entry point)
+
+    task is (series_by_key, impacts, origins, horizons) with impacts
+    {lag_function: (series x origins) recent impacts}. Returns the rows of
+    BACKTEST_COLUMNS where the target year was observed.
+    """
+    series_by_key, impacts, origins, horizons = task
+    keys, years, values = stack_series(series_by_key)
+    origins = np.asarray(origins, dtype=int)
+    horizons = np.asarray(horizons, dtype=int)
+
+    # Contiguous year grid covering observations, origins and targets
+    grid = np.arange(min(years.min(), origins.min()), max(years.max(), origins.max() + horizons.max()) + 1,
+                     dtype=float)
+    full = np.full((len(keys), len(grid)), np.nan)
+    full[:, np.searchsorted(grid, years)] = values
+    values, mask = full, np.isfinite(full)
+    centre = grid.mean()
+
+    at_origin = np.searchsorted(grid, origins)                      # (origins,)
+    targets = at_origin[:, np.newaxis] + horizons[np.newaxis, :]    # (origins, horizons)
+    target_years = grid[targets] - centre
+    actual = values[:, targets]                                     # (series, origins, horizons)
+    trained = grid[np.newaxis, :] <= origins[:, np.newaxis]         # (origins, grid)
+
+    predictions, lowers, uppers = {}, {}, {}
+
+    # TrendForecaster, linear: OLS, interval 1.96 * residual std * sqrt(1 + 1/n) (from 3 points), lower bound 0
+    n, slope, intercept, ss_res = expanding_fits(grid, values, at_origin)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        std = np.sqrt(ss_res / n)
+    linear = intercept[:, :, np.newaxis] + slope[:, :, np.newaxis] * target_years[np.newaxis, :, :]
+    width = np.where(n >= 3, Z_SCORE * std * np.sqrt(1 + 1 / np.maximum(n, 1)), np.nan)[:, :, np.newaxis]
+    predictions['trend_linear'] = linear
+    lowers['trend_linear'] = np.maximum(linear - width, 0)
+    uppers['trend_linear'] = linear + width
+
+    # TrendForecaster, logistic: logit-linear fit (L = 1) from 3 points with 2 finite logits
+    with np.errstate(invalid='ignore', divide='ignore'):
+        logits = np.log((values + 1e-10) / (1.0 - values + 1e-10))
+    logits[~np.isfinite(logits)] = np.nan
+    logit_n, logit_slope, logit_intercept, _ = expanding_fits(grid, logits, at_origin)
+    usable = (n >= 3) & (logit_n >= 2) & np.isfinite(logit_slope)
+    with np.errstate(over='ignore', invalid='ignore', divide='ignore'):
+        # L / (1 + exp(-k (t - t0))) with k = -slope and t0 = -intercept / k on calendar years, as
+        # TrendForecaster evaluates it (the curve is not shift-invariant, so years are not centred here)
+        k = -logit_slope[:, :, np.newaxis]
+        t0 = np.where(k != 0, -(logit_intercept - logit_slope * centre)[:, :, np.newaxis] / k, 0.0)
+
+        def logistic(t):
+            return 1.0 / (1 + np.exp(-k * (t + centre - t0)))
+
+        fitted = logistic((grid - centre)[np.newaxis, np.newaxis, :])            # (series, origins, grid)
+        in_sample = mask[:, np.newaxis, :] & trained[np.newaxis, :, :]
+        residuals = np.where(in_sample, values[:, np.newaxis, :] - fitted, 0.0)
+        deviations = np.where(in_sample, residuals - (residuals.sum(axis=2) / n)[:, :, np.newaxis], 0.0)
+        logistic_std = np.sqrt((deviations * deviations).sum(axis=2) / n)
+        forecast = logistic(target_years[np.newaxis, :, :])
+    width = np.where(n >= 3, Z_SCORE * logistic_std * np.sqrt(1 + 1 / np.maximum(n, 1)), np.nan)[:, :, np.newaxis]
+    predictions['trend_logistic'] = np.where(usable[:, :, np.newaxis], forecast, np.nan)
+    lowers['trend_logistic'] = np.maximum(forecast - width, 0)
+    uppers['trend_logistic'] = np.minimum(forecast + width, 1)
+
+    # FixedTrendForecaster: the same OLS on decimals (series with a value above 1 are percentages)
+    running_max = np.maximum.accumulate(np.where(mask, np.abs(values), 0.0), axis=1)[:, at_origin]
+    scale = np.where(running_max > 1, 100.0, 1.0)[:, :, np.newaxis]
+    decimal = np.clip(linear / scale, 0, 1)
+    width = np.where(n >= 3, Z_SCORE * std, np.nan)[:, :, np.newaxis] / scale
+    predictions['fixed_linear'] = decimal * scale
+    lowers['fixed_linear'] = np.clip(decimal - width, 0, 1) * scale
+    uppers['fixed_linear'] = np.clip(decimal + width, 0, 1) * scale
+
+    # EventAugmentedForecaster on the fixed trend: recent impact decaying 15% a year, clipped to 0-100%;
+    # the interval is shifted by the same impact
+    decay = (1 - EVENT_DECAY_RATE) ** horizons
+    for lag_function, recent in impacts.items():
+        shift = recent[:, :, np.newaxis] * decay[np.newaxis, np.newaxis, :]
+        model = f"event_{lag_function}"
+        predictions[model] = np.clip(decimal + shift, 0, 1) * scale
+        lowers[model] = np.clip(np.clip(decimal - width, 0, 1) + shift, 0, 1) * scale
+        uppers[model] = np.clip(np.clip(decimal + width, 0, 1) + shift, 0, 1) * scale
+
+    # Rows: observed targets of fitted series
+    fitted_linear = np.isfinite(slope)[:, :, np.newaxis] & np.isfinite(actual)
+    codes = np.array([key[0] for key in keys], dtype=object)
+    regions = np.array([key[1] for key in keys], dtype=object)
+    tables = []
+    for model, prediction in predictions.items():
+        valid = fitted_linear & np.isfinite(prediction)
+        s, o, h = np.nonzero(valid)
+        tables.append(pd.DataFrame({
+            'indicator_code': codes[s],
+            'region': regions[s],
+            'model': model,
+            'origin': origins[o],
+            'horizon': horizons[h],
+            'year': origins[o] + horizons[h],
+            'forecast': prediction[s, o, h],
+            'ci_lower': lowers[model][s, o, h],
+            'ci_upper': uppers[model][s, o, h],
+            'actual': actual[s, o, h]
+        }))
+    return score(pd.concat(tables, ignore_index=True))
+
+
+def score(table):
+    """Add error, abs_error, ape (absolute % error, NaN when actual is 0) and covered (NaN without an interval)"""
+    table['error'] = table['forecast'] - table['actual']
+    table['abs_error'] = table['error'].abs()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        table['ape'] = np.where(table['actual'] != 0, table['abs_error'] / table['actual'].abs() * 100, np.nan)
+    has_interval = table['ci_lower'].notna() & table['ci_upper'].notna()
+    inside = (table['actual'] >= table['ci_lower']) & (table['actual'] <= table['ci_upper'])
+    table['covered'] = inside.astype(float).where(has_interval)
+    return table[BACKTEST_COLUMNS]
+
+
+def default_origins(series_by_key, min_train=2, max_horizon=max(HORIZONS)):
+    """Every year at which some series has min_train observations and one within max_horizon after it"""
+    origins = set()
+    for series in series_by_key.values():
+        years = np.sort(np.asarray(series.index, dtype=int))
+        if len(years) <= min_train:
+            continue
+        for year in range(years[min_train - 1], years[-1]):
+            if ((years > year) & (years <= year + max_horizon)).any():
+                origins.add(year)
+    return sorted(origins)
+
+
+def run_backtest(series_by_key, simulations=None, indicator_mapping=None, origins=None, horizons=HORIZONS,
+                 workers=1, chunk_size=None):
+    """
+    Rolling-origin forecasts of every series by every model
+
+    Parameters:
+    -----------
+    series_by_key: {(indicator_code, region): pd.Series indexed by year}, as from
+                   batch_forecast.indicator_series
+    simulations: {lag_function: monthly simulated impacts}, as from
+                 simulate_lag_functions (None for the trend models only)
+    indicator_mapping: {indicator_code: simulation column} for the event models
+    origins: Origin years (None for every year some series can be scored from)
+    horizons: Years ahead to forecast from each origin
+    workers: Worker processes (1 = run in this process)
+    chunk_size: Series per worker call (None = a few chunks per worker)
+
+    Returns one row per (series, model, origin, horizon) with an observed
+    target year: BACKTEST_COLUMNS.
+    """
+    series_by_key = {key: series.dropna() for key, series in series_by_key.items() if len(series.dropna())}
+    keys = list(series_by_key)
+    if not keys:
+        return pd.DataFrame(columns=BACKTEST_COLUMNS)
+    origins = list(origins) if origins is not None else default_origins(series_by_key)
+    impacts = event_impacts(keys, simulations or {}, indicator_mapping or {}, origins)
+
+    workers = workers or os.cpu_count() or 1
+    chunk_size = chunk_size or max(1, -(-len(keys) // (workers * 4)))
+    tasks = []
+    for first in range(0, len(keys), chunk_size):
+        chunk = keys[first:first + chunk_size]
+        tasks.append(({key: series_by_key[key] for key in chunk},
+                      {lag: table[first:first + chunk_size] for lag, table in impacts.items()},
+                      origins, list(horizons)))
+
+    with span('backtest.run', series=len(keys), origins=len(origins), workers=workers):
+        if workers == 1 or len(tasks) <= 1:
+            tables = [backtest_chunk(task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+                tables = list(pool.map(backtest_chunk, tasks))
+
+    forecasts = pd.concat(tables, ignore_index=True)
+    return forecasts.sort_values(['indicator_code', 'region', 'model', 'origin', 'horizon'],
+                                 kind='stable', ignore_index=True)
+
+
+def summarize(forecasts, by=('model', 'horizon')):
+    """MAE, MAPE (%), bias and 95% interval coverage of backtest forecasts per group"""
+    return forecasts.groupby(list(by)).agg(
+        forecasts=('error', 'size'),
+        mae=('abs_error', 'mean'),
+        mape=('ape', 'mean'),
+        bias=('error', 'mean'),
+        coverage=('covered', 'mean')
+    ).reset_index()
+
+
+def best_models(forecasts, metric='mae'):
+    """The model with the lowest metric for each (indicator_code, region), over all origins and horizons"""
+    scores = summarize(forecasts, by=('indicator_code', 'region', 'model'))
+    best = scores.sort_values(['indicator_code', 'region', metric, 'model'])
+    return best.groupby(['indicator_code', 'region'], sort=False).head(1).reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit("usage: python -m src.backtesting <unified.csv> [--impact impact_sheet.csv] [--workers N] "
+                 "[--output DIR] [--profile DIR]")
+    from src.batch_forecast import indicator_series
+    from src.indicator_catalog import IndicatorCatalog
+
+    args = sys.argv[1:]
+    n_workers = int(args[args.index('--workers') + 1]) if '--workers' in args else None
+    output_dir = args[args.index('--output') + 1] if '--output' in args else 'reports/backtest'
+    impact_path = args[args.index('--impact') + 1] if '--impact' in args else None
+    profile_dir = args[args.index('--profile') + 1] if '--profile' in args else None
+    if profile_dir:
+        PROFILER.enable()
+
+    start = time.perf_counter()
+    unified = pd.read_csv(args[0])
+    series = indicator_series(unified)
+    simulations, mapping = None, None
+    if impact_path:
+        summary = impact_summary_from_links(unified, pd.read_csv(impact_path))
+        years = [year for values in series.values() for year in values.index]
+        simulations = simulate_lag_functions(summary, min(years) - 1, max(years))
+        columns = set().union(*(simulation.columns for simulation in simulations.values()))
+        mapping = IndicatorCatalog.build(unified).simulation_mapping(columns)
+        print(f"✓ {len(summary)} impact links simulated under {len(simulations)} lag functions")
+
+    forecasts = run_backtest(series, simulations, mapping, workers=n_workers)
+    print(f"✓ {len(forecasts)} forecasts of {len(series)} series in {time.perf_counter() - start:.2f}s\n")
+
+    os.makedirs(output_dir, exist_ok=True)
+    outputs = {'backtest_forecasts.csv': forecasts, 'backtest_summary.csv': summarize(forecasts),
+               'backtest_best_models.csv': best_models(forecasts)}
+    print(outputs['backtest_summary.csv'].to_string(index=False, float_format=lambda x: f"{x:.3f}"))
+    for name, table in outputs.items():
+        table.to_csv(os.path.join(output_dir, name), index=False)
+        print(f"✓ Saved: {os.path.join(output_dir, name)}")
+    if profile_dir:
+        for path in PROFILER.export(profile_dir, prefix='backtest_profile'):
+            print(f"✓ Saved: {path}")
@@ -0,0 +1,326 @@
+"""
+Batch forecasting of every indicator series across a process pool
+
+The trends of every (indicator_code, region) series are fitted in one
+batched pass (src/trend_fitting.py). Each series is then an independent
+task: a worker evaluates its trend, adds event impacts from the simulation
+results when the indicator is mapped to a simulation column, and returns
+its rows of the combined forecast table. Tasks are timed individually and a failing
+series is recorded in the task report instead of aborting the run.
+
+    python -m src.batch_forecast data/raw/ethiopia_fi_unified_new.csv --workers 4
+
+--category ACCESS forecasts only the indicators the indicator catalog puts
+in that category (--catalog PATH keeps the catalog on disk between runs).
+--profile DIR also writes the run's timing spans (JSON and Chrome trace).
+--group region,gender forecasts every (indicator, region, gender) cell at
+once instead and writes the forecasts of every group, reconciled to the
+national totals (src/hierarchical_forecast.py).
+"""
+import argparse
+import contextlib
+import io
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from src.data_cache import file_signature
+from src.forecasting import EventAugmentedForecaster
+from src.hierarchical_forecast import forecast_groups
+from src.indicator_catalog import IndicatorCatalog
+from src.trend_fitting import fit_series, predict_batch
+from src.yearly_aggregates import OBSERVATION_TYPES
+from src.profiling import PROFILER, span
+
+NATIONAL = 'national'
+FORECAST_YEARS = [2025, 2026, 2027]
+FORECAST_COLUMNS = ['indicator_code', 'region', 'Year', 'Type', 'trend', 'event_impact',
+                    'forecast', 'ci_lower', 'ci_upper']
+
+
+def indicator_series(unified_df, regional=True, min_points=2, group_column='region'):
+    """
+    Yearly mean series for every indicator, nationally and per region
+
+    Parameters:
+    -----------
+    unified_df: Unified dataset (observation rows are used)
+    regional: Also build one series per group when the group column exists
+    min_points: Skip series with fewer yearly observations
+    group_column: Column the series are split by ('region', 'gender', 'location', ...)
+
+    Returns {(indicator_code, group): pd.Series indexed by year}.
+    """
+    record_type = unified_df['record_type'].astype(str).str.lower()
+    rows = unified_df[record_type.isin(OBSERVATION_TYPES)]
+
+    obs = pd.DataFrame({
+        'indicator_code': rows['indicator_code'].astype(str),
+        'year': pd.to_datetime(rows['observation_date'], errors='coerce').dt.year,
+        'value': pd.to_numeric(rows['value_numeric'], errors='coerce')
+    })
+    if regional and group_column in rows.columns:
+        obs['region'] = rows[group_column].fillna(NATIONAL).astype(str)
+    else:
+        obs['region'] = NATIONAL
+    obs = obs.dropna()
+    obs['year'] = obs['year'].astype(int)
+
+    means = obs.groupby(['indicator_code', 'region', 'year'])['value'].mean()
+    if regional and (obs['region'] != NATIONAL).any():
+        # National series pools every region's observations
+        national = obs.groupby(['indicator_code', 'year'])['value'].mean()
+        national.index = pd.MultiIndex.from_arrays(
+            [national.index.get_level_values(0), [NATIONAL] * len(national), national.index.get_level_values(1)],
+            names=['indicator_code', 'region', 'year']
+        )
+        means = pd.concat([means[means.index.get_level_values('region') != NATIONAL], national])
+
+    series = {}
+    for (code, region), group in means.groupby(level=['indicator_code', 'region'], sort=True):
+        if len(group) >= min_points:
+            series[(code, region)] = group.droplevel(['indicator_code', 'region']).sort_index()
+    return series
+
+
+def trend_forecast(series, fit, forecast_years=FORECAST_YEARS, model_type='linear'):
+    """
+    Fitted trend over the series' years and forecast_years, as TrendForecaster.forecast
+
+    fit is the series' row of trend_fitting.fit_series. Returns (years,
+    predictions, ci_lower, ci_upper); the 95% interval needs 3 points and
+    is None otherwise.
+    """
+    if not np.isfinite(fit['slope']):
+        raise ValueError(f"Could not fit a {model_type} trend to {len(series)} points")
+
+    historical_years = np.asarray(series.index, dtype=float)
+    years = np.concatenate([historical_years, np.asarray(forecast_years, dtype=float)])
+    fits = {name: np.array([value], dtype=float) for name, value in fit.items()}
+    predictions = predict_batch(fits, years, kind=model_type)[0]
+
+    ci_lower = ci_upper = None
+    if len(series) >= 3:
+        residuals = series.to_numpy(dtype=float) - predictions[:len(series)]
+        margin = 1.96 * np.std(residuals) * np.sqrt(1 + 1 / len(series))
+        ci_lower = np.maximum(predictions - margin, 0)
+        ci_upper = np.minimum(predictions + margin, 1 if model_type == 'logistic' else np.inf)
+    return years, predictions, ci_lower, ci_upper
+
+
+def forecast_series(series, forecast_years=FORECAST_YEARS, model_type='linear', simulation=None, fit=None):
+    """
+    Trend forecast of one series plus event impacts from its simulation column
+
+    Parameters:
+    -----------
+    series: pd.Series of values indexed by year
+    forecast_years: Years to forecast
+    model_type: 'linear' or 'logistic'
+    simulation: Optional pd.Series of simulated monthly impacts (in %) for this indicator
+    fit: The series' row of trend_fitting.fit_series (fitted here when None)
+
+    Returns a DataFrame with Year, Type, trend, event_impact, forecast, ci_lower, ci_upper.
+    """
+    if fit is None:
+        fit = fit_series({0: series}, kind=model_type).iloc[0]
+    years, predictions, ci_lower, ci_upper = trend_forecast(series, fit, forecast_years, model_type)
+
+    # Impacts come back as decimals; percentage series take them in points
+    event_impact = np.zeros(len(years))
+    if simulation is not None:
+        impacts = EventAugmentedForecaster(simulation.to_frame('impact')).estimate_future_impacts(
+            'impact', list(forecast_years)
+        )
+        scale = 100 if np.nanmax(np.abs(series.values)) > 1 else 1
+        event_impact = np.array([impacts.get(year, 0) * scale for year in years])
+
+    ci_lower = ci_lower if ci_lower is not None else np.full(len(years), np.nan)
+    ci_upper = ci_upper if ci_upper is not None else np.full(len(years), np.nan)
+
+    return pd.DataFrame({
+        'Year': years.astype(int),
+        'Type': np.where(np.isin(years, list(forecast_years)), 'Forecast', 'Historical'),
+        'trend': predictions,
+        'event_impact': event_impact,
+        'forecast': predictions + event_impact,
+        'ci_lower': np.asarray(ci_lower, dtype=float) + event_impact,
+        'ci_upper': np.asarray(ci_upper, dtype=float) + event_impact
+    })
+
+
+def run_task(task):
+    """Worker entry point: forecast one series, timing it and capturing any error"""
+    key, series, simulation, forecast_years, model_type, fit = task
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    result = {'key': key, 'table': None, 'status': 'ok', 'error': None, 'traceback': None}
+
+    try:
+        # The forecasters print progress; keep worker output out of the console
+        with contextlib.redirect_stdout(io.StringIO()):
+            result['table'] = forecast_series(series, forecast_years, model_type, simulation, fit)
+    except Exception as e:
+        result['status'] = 'failed'
+        result['error'] = f"{type(e).__name__}: {e}"
+        result['traceback'] = traceback.format_exc()
+
+    result['wall_s'] = time.perf_counter() - wall_start
+    result['cpu_s'] = time.process_time() - cpu_start
+    result['pid'] = os.getpid()
+    result['start'] = wall_start  # monotonic clock, comparable across processes on one machine
+    return result
+
+
+def run_tasks(tasks):
+    """Run a chunk of tasks in one worker call to amortise inter-process overhead"""
+    return [run_task(task) for task in tasks]
+
+
+def run_batch_forecasts(series_by_key, simulation_results=None, indicator_mapping=None,
+                        forecast_years=FORECAST_YEARS, model_type='linear', workers=None, chunk_size=None,
+                        verbose=True):
+    """
+    Forecast many indicator series in parallel and collect one table
+
+    Parameters:
+    -----------
+    series_by_key: {(indicator_code, region): pd.Series} as from indicator_series
+    simulation_results: Monthly simulated impacts (EventImpactModel.simulate_impacts)
+    indicator_mapping: {indicator_code: simulation_results column} for event augmentation
+    forecast_years: Years to forecast
+    model_type: 'linear' or 'logistic'
+    workers: Worker processes (None = CPU count, 1 = run in this process)
+    chunk_size: Series sent to a worker per call (None = a few chunks per worker)
+    verbose: Print one line per finished task
+
+    Returns (forecast_table, task_report). Failed series appear in the
+    report with their error and are absent from the forecast table.
+    """
+    indicator_mapping = indicator_mapping or {}
+    with span('forecast.fit', series=len(series_by_key)):
+        # One batched fit for every series; workers only evaluate their row
+        fits = fit_series(series_by_key, kind=model_type) if series_by_key else None
+    tasks = []
+    for position, (key, series) in enumerate(series_by_key.items()):
+        column = indicator_mapping.get(key[0])
+        simulation = None
+        if simulation_results is not None and column in simulation_results.columns:
+            simulation = simulation_results[column]  # ship only the column this task needs
+        tasks.append((key, series, simulation, list(forecast_years), model_type, fits.iloc[position]))
+
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    results = []
+
+    def collect(result):
+        results.append(result)
+        if PROFILER.enabled and result.get('start') is not None:
+            # Worker timings become spans on the worker's own lane of the trace
+            PROFILER.add_record('forecast.task', result['start'] - PROFILER.origin, result['wall_s'],
+                                result['cpu_s'], depth=1, pid=result['pid'], thread=result['pid'],
+                                thread_name=f"worker {result['pid']}", indicator_code=result['key'][0],
+                                region=result['key'][1], status=result['status'])
+        if verbose:
+            code, region = result['key']
+            mark = '✓' if result['status'] == 'ok' else '✗'
+            detail = f"{result['wall_s']:.3f}s" if result['status'] == 'ok' else result['error']
+            print(f"  {mark} {code} [{region}]: {detail}")
+
+    with span('forecast.batch', tasks=len(tasks), workers=workers):
+        if workers == 1 or len(tasks) <= 1:
+            for task in tasks:
+                collect(run_task(task))
+        else:
+            # A few chunks per worker keeps the pool balanced without a round trip per series
+            chunk_size = chunk_size or max(1, len(tasks) // (workers * 4))
+            chunks = [tasks[i:i + chunk_size] for i in range(0, len(tasks), chunk_size)]
+            with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+                futures = {pool.submit(run_tasks, chunk): chunk for chunk in chunks}
+                for future in as_completed(futures):
+                    try:
+                        for result in future.result():
+                            collect(result)
+                    except Exception as e:
+                        # The worker itself died (e.g. killed or out of memory)
+                        for task in futures[future]:
+                            collect({'key': task[0], 'table': None, 'status': 'failed',
+                                     'error': f"{type(e).__name__}: {e}", 'traceback': None,
+                                     'wall_s': np.nan, 'cpu_s': np.nan, 'pid': None})
+
+    total = time.perf_counter() - start
+    results.sort(key=lambda r: r['key'])
+
+    tables = []
+    for result in results:
+        if result['table'] is not None:
+            table = result['table']
+            table.insert(0, 'region', result['key'][1])
+            table.insert(0, 'indicator_code', result['key'][0])
+            tables.append(table)
+    forecast_table = pd.concat(tables, ignore_index=True) if tables else pd.DataFrame(columns=FORECAST_COLUMNS)
+
+    task_report = pd.DataFrame([{
+        'indicator_code': r['key'][0],
+        'region': r['key'][1],
+        'status': r['status'],
+        'wall_s': r['wall_s'],
+        'cpu_s': r['cpu_s'],
+        'pid': r['pid'],
+        'error': r['error']
+    } for r in results])
+
+    if verbose:
+        failed = (task_report['status'] != 'ok').sum() if len(task_report) else 0
+        print(f"\nForecast {len(tasks) - failed}/{len(tasks)} series with {workers} worker(s) in {total:.2f}s")
+
+    return forecast_table, task_report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Forecast every indicator series of the unified dataset")
+    parser.add_argument('path', help="Unified dataset CSV")
+    parser.add_argument('--workers', type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument('--output', default='batch_forecasts.csv', help="Forecast table CSV")
+    parser.add_argument('--category', help="Only the indicators the indicator catalog puts in this category")
+    parser.add_argument('--catalog', help="Indicator catalog CSV kept between runs (with --category)")
+    parser.add_argument('--group', help="Comma-separated columns to forecast every group of, e.g. region,gender")
+    parser.add_argument('--profile', help="Directory for the run's timing spans (JSON and Chrome trace)")
+    args = parser.parse_args()
+    if args.profile:
+        PROFILER.enable()
+
+    with span('load.unified', path=args.path):
+        unified = pd.read_csv(args.path)
+    if args.group:
+        # One vectorized pass over every cell instead of one task per series
+        group_columns = args.group.split(',')
+        with span('forecast.groups', dimensions=len(group_columns)):
+            aggregates = forecast_groups(unified, group_columns)
+        aggregates.table.to_csv(args.output, index=False)
+        print(f"✓ Forecast {len(aggregates)} group series over {', '.join(aggregates.levels)}")
+    else:
+        with span('aggregate.indicator_series'):
+            series = indicator_series(unified)
+        if args.category:
+            build = lambda: IndicatorCatalog.build(unified)
+            catalog = (IndicatorCatalog.cached(args.catalog, [file_signature(args.path)], build) if args.catalog
+                       else build())
+            codes = set(catalog.codes(args.category))
+            series = {key: values for key, values in series.items() if key[0] in codes}
+            print(f"✓ {len(codes)} {args.category.upper()} indicators in the catalog; {len(series)} series to forecast")
+        table, report = run_batch_forecasts(series, workers=args.workers)
+        table.to_csv(args.output, index=False)
+        report.to_csv(os.path.splitext(args.output)[0] + '_tasks.csv', index=False)
+    print(f"✓ Saved: {args.output}")
+    if args.profile:
+        for path in PROFILER.export(args.profile, prefix='batch_forecast_profile'):
+            print(f"✓ Saved: {path}")
+
+
+if __name__ == "__main__":
+    main()
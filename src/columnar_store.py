@@ -0,0 +1,146 @@
+"""
+Columnar (Parquet) storage for the unified dataset and forecast tables
+
+Every table keeps its CSV as the canonical file; a Parquet copy with the
+same stem sits next to it. Readers prefer the Parquet copy and fall back
+to the CSV when it is absent, or older than the CSV (the CSV was edited
+after the copy was written). Convert an existing data directory, or
+refresh its stale copies, with:
+
+    python -m src.columnar_store data/
+"""
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+from src.date_parsing import parse_dates
+
+try:
+    import pyarrow.parquet as pq
+    COLUMNAR_AVAILABLE = True
+except ImportError:  # pragma: no cover - pyarrow is in requirements.txt
+    pq = None
+    COLUMNAR_AVAILABLE = False
+
+# Columns parsed to datetime64 and stored as categoricals wherever they appear
+DATE_COLUMNS = ['observation_date', 'period_start', 'period_end', 'event_date']
+CATEGORY_COLUMNS = ['indicator_code', 'record_type']
+
+
+def columnar_path(path):
+    """Parquet sibling of a CSV path"""
+    return Path(path).with_suffix('.parquet')
+
+
+def is_stale(path):
+    """True when the CSV was modified after its Parquet copy was written"""
+    csv_path = Path(path).with_suffix('.csv')
+    parquet_path = columnar_path(path)
+    if not (csv_path.exists() and parquet_path.exists()):
+        return False
+    return csv_path.stat().st_mtime_ns > parquet_path.stat().st_mtime_ns
+
+
+def resolve_source(path):
+    """The file read_table will actually read: Parquet if present and up to date, else the CSV"""
+    parquet_path = columnar_path(path)
+    if COLUMNAR_AVAILABLE and parquet_path.exists() and not is_stale(path):
+        return parquet_path
+    return Path(path)
+
+
+def apply_schema(df):
+    """Parse date columns (whatever their layout) and make low-cardinality code columns categorical"""
+    df = df.copy()
+    for col in DATE_COLUMNS:
+        if col in df.columns and not pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = parse_dates(df[col])
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+    return df
+
+
+def write_table(df, path, columnar=True, **csv_kwargs):
+    """
+    Write df as CSV and, in columnar mode, as a typed Parquet copy
+
+    Parameters:
+    -----------
+    df: DataFrame to write
+    path: CSV path; the Parquet copy uses the same stem
+    columnar: Also write the Parquet copy (skipped if pyarrow is missing)
+    csv_kwargs: Passed to DataFrame.to_csv (e.g. index=False)
+
+    A kept index is written to both files as an ordinary first column
+    (named 'index' when it has no name), so read_table returns the same
+    columns whichever copy it reads; read_csv(..., index_col=0) still
+    gets it back as the index.
+    """
+    path = Path(path)
+    if csv_kwargs.pop('index', True):
+        df = df.reset_index()
+    df.to_csv(path, index=False, **csv_kwargs)
+    if columnar and COLUMNAR_AVAILABLE:
+        typed = apply_schema(df)
+        typed.to_parquet(columnar_path(path), engine='pyarrow', index=False)
+    return path
+
+
+def read_table(path, columns=None, **csv_kwargs):
+    """
+    Read a table, preferring its Parquet copy over the CSV
+
+    Parameters:
+    -----------
+    path: CSV path (or a .parquet path directly)
+    columns: Only read these columns; names not present in the file are ignored
+    csv_kwargs: Passed to pd.read_csv when falling back to the CSV
+    """
+    source = resolve_source(path)
+
+    if source.suffix == '.parquet':
+        if columns is not None:
+            available = pq.read_schema(source).names
+            columns = [col for col in columns if col in available]
+        return pd.read_parquet(source, columns=columns, engine='pyarrow')
+
+    if columns is not None:
+        wanted = set(columns)
+        csv_kwargs['usecols'] = lambda col: col in wanted
+    return apply_schema(pd.read_csv(source, **csv_kwargs))
+
+
+def convert_directory(data_dir, overwrite=False):
+    """
+    One-shot conversion of every CSV under data_dir to a Parquet copy
+
+    Parameters:
+    -----------
+    data_dir: Directory searched recursively for *.csv files
+    overwrite: Rewrite Parquet copies that already exist (stale copies are always rewritten)
+    """
+    converted = []
+    for csv_path in sorted(Path(data_dir).rglob('*.csv')):
+        parquet_path = columnar_path(csv_path)
+        if parquet_path.exists() and not overwrite and not is_stale(csv_path):
+            print(f"  Skipped (up to date): {parquet_path}")
+            continue
+        try:
+            df = apply_schema(pd.read_csv(csv_path))
+            df.to_parquet(parquet_path, engine='pyarrow', index=False)
+            converted.append(parquet_path)
+            print(f"✓ Converted: {csv_path} -> {parquet_path.name}")
+        except Exception as e:
+            print(f"✗ Error converting {csv_path}: {e}")
+    return converted
+
+
+if __name__ == "__main__":
+    if not COLUMNAR_AVAILABLE:
+        sys.exit("pyarrow is required for columnar storage (pip install pyarrow)")
+    target = sys.argv[1] if len(sys.argv) > 1 else "data"
+    overwrite = "--overwrite" in sys.argv
+    converted = convert_directory(target, overwrite=overwrite)
+    print(f"\nConverted {len(converted)} file(s)")
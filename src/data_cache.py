@@ -0,0 +1,155 @@
+import sys
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import pandas as pd
+
+from src.columnar_store import columnar_path, read_table
+
+
+def file_signature(path):
+    """Identify a file version by resolved path, modification time and size"""
+    path = Path(path).resolve()
+    stat = path.stat()
+    return (str(path), stat.st_mtime_ns, stat.st_size)
+
+
+def table_signature(path):
+    """
+    Identify a table version by its CSV and its Parquet copy, whichever exist
+
+    An edit to either file changes the signature, including a CSV edited
+    after its Parquet copy was written (read_table then reads the CSV).
+    """
+    paths = [Path(path).with_suffix('.csv'), columnar_path(path)]
+    return tuple(file_signature(p) for p in paths if p.exists())
+
+
+def estimate_size(value):
+    """Approximate in-memory size of a cached value in bytes"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if hasattr(value, 'to_plotly_json'):
+        # Plotly figures: the size of what gets sent to the browser
+        return len(value.to_json())
+    if hasattr(value, 'nbytes'):
+        return int(value.nbytes)
+    if isinstance(value, tuple):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class DataCache:
+    """Process-wide LRU cache for parsed datasets, bounded by memory"""
+
+    def __init__(self, max_bytes=512 * 1024 ** 2):
+        """
+        Initialize the cache
+
+        Parameters:
+        -----------
+        max_bytes: Memory cap; least recently used entries are evicted beyond it
+        """
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.current_bytes = 0
+        self._entries = OrderedDict()  # key -> (value, size)
+        self._versions = {}            # source name -> latest key for it
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    def get(self, key, loader, source=None):
+        """
+        Return the cached value for key, calling loader() once on a miss
+
+        Parameters:
+        -----------
+        key: Hashable cache key (include a file signature to track changes)
+        loader: Zero-argument callable producing the value
+        source: Optional name grouping versions of the same dataset; when a
+                new key arrives for a source, older versions are dropped
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # Concurrent sessions missing on the same key wait for one parse
+        with key_lock:
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return self._entries[key][0]
+                self.misses += 1
+
+            value = loader()
+            size = estimate_size(value)
+
+            with self._lock:
+                if source is not None:
+                    stale_key = self._versions.get(source)
+                    if stale_key is not None and stale_key != key:
+                        self._remove(stale_key)
+                    self._versions[source] = key
+
+                self._entries[key] = (value, size)
+                self.current_bytes += size
+                self._evict()
+                self._key_locks.pop(key, None)
+
+        return value
+
+    def read_csv(self, path, **kwargs):
+        """pd.read_csv through the cache, re-parsing only when the file changes"""
+        signature = file_signature(path)
+        key = ('csv', signature, tuple(sorted(kwargs.items())))
+        return self.get(key, lambda: pd.read_csv(path, **kwargs), source=('csv', signature[0]))
+
+    def read_table(self, path, columns=None):
+        """columnar_store.read_table through the cache, keyed on the CSV and its Parquet copy"""
+        signature = table_signature(path)
+        projection = tuple(columns) if columns is not None else None
+        key = ('table', signature, projection)
+        return self.get(key, lambda: read_table(path, columns=columns),
+                        source=('table', str(Path(path).resolve()), projection))
+
+    def stats(self):
+        """Hit/miss counters and current memory use"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes
+            }
+
+    def clear(self):
+        """Drop every entry (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+            self.current_bytes = 0
+
+    def _remove(self, key):
+        if key in self._entries:
+            _, size = self._entries.pop(key)
+            self.current_bytes -= size
+
+    def _evict(self):
+        # Always keep the most recent entry, even if it alone exceeds the cap
+        while self.current_bytes > self.max_bytes and len(self._entries) > 1:
+            _, (_, size) = self._entries.popitem(last=False)
+            self.current_bytes -= size
+            self.evictions += 1
@@ -0,0 +1,162 @@
+"""
+Vectorized date parsing for the impact sheet and unified dataset
+
+Dates arrive as Timestamps, ISO strings or a handful of day-first and
+year-month layouts. EventImpactModel._parse_date used to try each format
+on one value at a time inside a try/except, once per impact row. Here a
+whole column is parsed at once:
+
+- only its distinct values are parsed, then broadcast back to the rows;
+- the column's format is detected once, from a sample of those values,
+  and the whole column is parsed with it in one call;
+- values it does not fit are tried against the other DATE_FORMATS, then
+  as ISO 8601 timestamps, in bulk, and only what is left goes through pandas' flexible parser one value at
+  a time, as _parse_date always did. Timestamps and datetimes are
+  converted together.
+
+The result is a datetime64[ns] array (NaT where a value cannot be parsed)
+that downstream code uses as it is. A value parses to the same date as
+with _parse_date: the formats never match the same string, so trying the
+detected one first does not change which one wins.
+
+    dates = parse_dates(impact_summary['event_date'])
+    df = normalize_dates(df, ['observation_date', 'period_start'])
+"""
+import warnings
+
+import numpy as np
+import pandas as pd
+
+# Layouts tried in bulk, in _parse_date's order; anything else goes to the flexible parser
+DATE_FORMATS = ['%Y-%m-%d', '%Y/%m/%d', '%d-%m-%Y', '%d/%m/%Y', '%Y-%m']
+
+# Bulk pass for ISO timestamps with a time part, which the layouts above do not match
+ISO_FORMAT = 'ISO8601'
+
+# Distinct values a column's format is detected from
+DETECT_SAMPLE = 200
+
+NAT = np.datetime64('NaT', 'ns')
+
+
+def detect_format(values, sample_size=DETECT_SAMPLE):
+    """
+    The DATE_FORMATS entry that parses most of a sample of distinct strings
+
+    Returns None when no format parses any of them (ties go to the
+    earlier format).
+    """
+    sample = [value for value in pd.unique(np.asarray(values, dtype=object)) if isinstance(value, str)]
+    sample = pd.Series(sample[:sample_size], dtype=object)
+    best, best_count = None, 0
+    for fmt in DATE_FORMATS:
+        count = int(pd.to_datetime(sample, format=fmt, errors='coerce').notna().sum())
+        if count > best_count:
+            best, best_count = fmt, count
+        if best_count == len(sample):
+            break
+    return best
+
+
+def _flexible(value):
+    """One value through pandas' flexible parser (NaT on failure, UTC for zoned values)"""
+    try:
+        parsed = pd.Timestamp(pd.to_datetime(value))
+    except Exception:
+        return NAT
+    if parsed is pd.NaT:
+        return NAT
+    if parsed.tzinfo is not None:
+        parsed = parsed.tz_convert(None)
+    return parsed.to_datetime64().astype('datetime64[ns]')
+
+
+def parse_dates(values, fmt=None):
+    """
+    datetime64[ns] array of a column of dates
+
+    Parameters:
+    -----------
+    values: Series, array or list of strings, Timestamps, datetimes or missing values
+    fmt: Format to try first (detected from the values when None)
+    """
+    if isinstance(values, (pd.Series, pd.Index, np.ndarray)) and pd.api.types.is_datetime64_any_dtype(values):
+        if isinstance(getattr(values, 'dtype', None), pd.DatetimeTZDtype):
+            values = pd.DatetimeIndex(values).tz_convert(None)
+        return np.asarray(values, dtype='datetime64[ns]')
+
+    codes, uniques = pd.factorize(np.asarray(values, dtype=object))
+    uniques = np.asarray(uniques, dtype=object)
+    parsed = np.full(len(uniques), NAT)
+
+    is_text = np.array([isinstance(value, str) for value in uniques], dtype=bool)
+    pending = np.flatnonzero(is_text)
+    if len(pending):
+        first = fmt or detect_format(uniques[pending])
+        formats = ([first] if first else []) + [f for f in DATE_FORMATS if f != first] + [ISO_FORMAT]
+        for f in formats:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', FutureWarning)
+                attempt = pd.to_datetime(pd.Series(uniques[pending], dtype=object), format=f, errors='coerce')
+            if not pd.api.types.is_datetime64_dtype(attempt):
+                continue  # zoned or mixed-offset timestamps: left to the flexible parser
+            attempt = attempt.to_numpy(dtype='datetime64[ns]')
+            ok = ~np.isnat(attempt)
+            parsed[pending[ok]] = attempt[ok]
+            pending = pending[~ok]
+            if not len(pending):
+                break
+
+    # Timestamps and datetimes in one call; any it drops (mixed time zones) are retried below
+    others = np.flatnonzero(~is_text)
+    if len(others):
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', FutureWarning)
+                bulk = pd.DatetimeIndex(pd.to_datetime(pd.Series(uniques[others], dtype=object), errors='coerce'))
+            if bulk.tz is not None:
+                bulk = bulk.tz_convert(None)
+            parsed[others] = bulk.to_numpy(dtype='datetime64[ns]')
+            pending = np.concatenate([pending, others[np.isnat(parsed[others])]])
+        except (TypeError, ValueError):
+            pending = np.concatenate([pending, others])
+
+    # What is left one distinct value at a time, as _parse_date always did
+    for i in pending.astype(np.int64):
+        parsed[i] = _flexible(uniques[i])
+
+    result = np.full(len(codes), NAT)
+    present = codes >= 0
+    result[present] = parsed[codes[present]]
+    return result
+
+
+def parse_date(value):
+    """One date as a Timestamp, or None when it cannot be parsed"""
+    parsed = parse_dates([value])[0]
+    return None if np.isnat(parsed) else pd.Timestamp(parsed)
+
+
+def normalize_dates(df, columns, formats=None):
+    """
+    Copy of df with its date columns parsed to datetime64 (other columns are shared)
+
+    Parameters:
+    -----------
+    df: DataFrame to normalize
+    columns: Date columns; those missing from df or already datetime64 are left alone
+    formats: Optional {column: format} dict; formats detected here are added
+             to it, so later chunks of the same file skip detection
+    """
+    todo = [col for col in columns if col in df.columns and not pd.api.types.is_datetime64_any_dtype(df[col])]
+    if not todo:
+        return df
+    df = df.copy(deep=False)
+    for col in todo:
+        fmt = formats.get(col) if formats is not None else None
+        if fmt is None:
+            fmt = detect_format(df[col])
+            if formats is not None and fmt is not None:
+                formats[col] = fmt
+        df[col] = parse_dates(df[col], fmt=fmt)
+    return df
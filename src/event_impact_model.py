@@ -0,0 +1,787 @@
+import pandas as pd
+import numpy as np
+
+from src.date_parsing import parse_date, parse_dates
+from src.event_matrix import EventIndicatorMatrix
+from src.profiling import profiled
+
+# Simulation resolutions: pandas frequency, period label format and step name
+RESOLUTIONS = {
+    'monthly': ('MS', '%Y-%m', 'months'),
+    'weekly': ('W-MON', '%Y-%m-%d', 'weeks'),
+    'daily': ('D', '%Y-%m-%d', 'days')
+}
+
+# Contributions at or below this magnitude are left out of the breakdown
+BREAKDOWN_THRESHOLD = 0.001
+
+# Upper bound on impacts x steps evaluated at once; longer windows are simulated in chunks
+MAX_CHUNK_CELLS = 1_000_000
+
+
+def simulation_periods(start_date, end_date, resolution='monthly'):
+    """
+    Simulation dates and their labels at a resolution
+
+    Returns (dates, labels, step name); monthly labels are 'YYYY-MM',
+    weekly (Monday) and daily labels 'YYYY-MM-DD'.
+    """
+    if resolution not in RESOLUTIONS:
+        raise ValueError(f"Unknown resolution '{resolution}'; expected one of {list(RESOLUTIONS)}")
+    freq, label_format, step_name = RESOLUTIONS[resolution]
+    dates = pd.date_range(start=pd.to_datetime(start_date).normalize(),
+                          end=pd.to_datetime(end_date).normalize(), freq=freq)
+    return dates, [d.strftime(label_format) for d in dates], step_name
+
+
+def month_positions(dates):
+    """
+    Dates as fractional months (year * 12 + month, plus the elapsed share of the month)
+
+    The first of a month is a whole number, so lag curves, which are
+    defined in months, can be evaluated at any date.
+    """
+    dates = pd.DatetimeIndex(dates)
+    return np.asarray(dates.year * 12 + dates.month + (dates.day - 1) / dates.days_in_month, dtype=float)
+
+
+def impact_curve(base_impact, lag_months, months_since_event, lag_function='exponential'):
+    """
+    Evaluate the lag curve of an event impact as a NumPy array operation
+
+    Parameters:
+    -----------
+    base_impact: Maximum impact (at peak), scalar or array
+    lag_months: Time to reach maximum impact, scalar or array
+    months_since_event: Months since event occurred, scalar or array
+    lag_function: Type of lag function ('exponential', 'linear', 'immediate')
+
+    All array arguments are broadcast against each other, so an
+    (impacts, 1) column of impacts and lags against an (impacts, months)
+    grid of offsets evaluates every impact at every month in one pass.
+    """
+    base_impact = np.asarray(base_impact, dtype=float)
+    lag_months = np.asarray(lag_months, dtype=float)
+    months_since_event = np.asarray(months_since_event, dtype=float)
+
+    with np.errstate(over='ignore', invalid='ignore'):
+        if lag_function == 'exponential':
+            # Gradual decay after the peak (2-year half-life). exp((lag - t) / 24) is split into a
+            # per-impact and a per-offset factor, so no exp runs over the full broadcast shape
+            values = np.asarray((base_impact * np.exp(lag_months / 24)) * np.exp(-months_since_event / 24))
+
+            # Exponential build-up before the peak, evaluated only where it applies
+            building = np.broadcast_to(months_since_event < lag_months, values.shape)
+            if building.any():
+                base, lag, months = (np.broadcast_to(a, values.shape)[building]
+                                     for a in (base_impact, lag_months, months_since_event))
+                values[building] = base * (1 - np.exp(-months / np.maximum(lag / 3, 0.1)))
+
+        elif lag_function == 'linear':
+            # Linear build-up and plateau
+            build_up = base_impact * (months_since_event / np.maximum(lag_months, 0.1))
+            values = np.where(months_since_event < lag_months, build_up, base_impact)
+
+        else:  # immediate
+            values = np.array(np.broadcast_to(base_impact, np.broadcast(base_impact, months_since_event).shape))
+
+    before = months_since_event < 0
+    if np.any(before):
+        values = np.where(before, 0.0, values)
+    return values
+
+
+class EventImpactModel:
+    """Model to simulate how events affect indicators over time"""
+
+    def __init__(self, impact_summary, lag_function='exponential', group_column=None):
+        """
+        Initialize the impact model
+
+        Parameters:
+        -----------
+        impact_summary: DataFrame with event-impact relationships
+        lag_function: Type of lag function ('exponential', 'linear', 'immediate')
+        group_column: Optional impact_summary column naming the group (e.g. region)
+                      an impact applies to; impacts without one apply to every group
+        """
+        self.impact_summary = impact_summary
+        self.lag_function = lag_function
+        self.group_column = group_column
+        self.events = {}
+        self.timeline = None
+        self._process_events()
+
+    def _parse_date(self, date_value):
+        """Safely parse one date value (None when it cannot be parsed)"""
+        return parse_date(date_value)
+
+    def _process_events(self):
+        """Process events and their impacts"""
+        print(f"Processing {len(self.impact_summary)} impact records...")
+
+        # Parse the whole event_date column at once rather than row by row
+        if 'event_date' in self.impact_summary.columns:
+            event_dates = parse_dates(self.impact_summary['event_date'])
+        else:
+            event_dates = np.full(len(self.impact_summary), np.datetime64('NaT', 'ns'))
+
+        for row, event_date in zip(self.impact_summary.to_dict('records'), event_dates):
+            event_id = row['parent_id']
+            event_date = None if np.isnat(event_date) else pd.Timestamp(event_date)
+
+            # Get event name - handle multiple possible column names
+            event_name = None
+            for col in ['event_name', 'indicator_event', 'event']:
+                if col in row and pd.notna(row[col]):
+                    event_name = str(row[col])
+                    break
+            if not event_name:
+                event_name = f"Event_{event_id}"
+
+            # Get indicator code
+            indicator_code = None
+            for col in ['indicator_code', 'indicator_impact', 'indicator']:
+                if col in row and pd.notna(row[col]):
+                    indicator_code = str(row[col])
+                    break
+            if not indicator_code:
+                continue  # Skip if no indicator code
+
+            if event_id not in self.events:
+                self.events[event_id] = {
+                    'name': event_name,
+                    'date': event_date,
+                    'impacts': []
+                }
+
+            # Get lag months with fallback
+            lag_months = row.get('lag_months')
+            if pd.isna(lag_months) or lag_months is None:
+                lag_months = 6  # Default 6 months
+
+            try:
+                lag_months = float(lag_months)
+            except:
+                lag_months = 6.0
+
+            impact = {
+                'indicator': indicator_code,
+                'impact': row.get('final_impact', 0),
+                'lag': lag_months,
+                'evidence': row.get('evidence_basis', 'Unknown'),
+                'comparable_country': row.get('comparable_country', None)
+            }
+            if self.group_column:
+                group = row.get(self.group_column)
+                impact['group'] = None if group is None or pd.isna(group) else str(group)
+            self.events[event_id]['impacts'].append(impact)
+
+        print(f"Processed {len(self.events)} unique events")
+
+        # Print event summary
+        print("\nEvent Summary:")
+        for event_id, event_data in list(self.events.items())[:5]:  # Show first 5
+            print(f"  {event_data['name']} ({event_data['date']}): {len(event_data['impacts'])} impacts")
+
+        if len(self.events) > 5:
+            print(f"  ... and {len(self.events) - 5} more events")
+
+    def _get_impact_at_time(self, base_impact, lag_months, months_since_event):
+        """
+        Calculate impact at a given time after event
+
+        Parameters:
+        -----------
+        base_impact: Maximum impact (at peak)
+        lag_months: Time to reach maximum impact
+        months_since_event: Months since event occurred
+        """
+        return float(impact_curve(base_impact, lag_months, months_since_event, self.lag_function))
+
+    def _impact_arrays(self, indicators):
+        """
+        Flatten the events dict into aligned impact arrays
+
+        Returns one entry per (event, impact) pair, in the same order
+        simulate_impacts has always visited them: events in insertion
+        order, impacts in the order they were appended.
+        """
+        event_pos, event_names = [], []
+        impact_indicators, base_impacts, lags, groups = [], [], [], []
+
+        # Every event date in one pass (dates edited in as strings included); undated events are skipped
+        dates = parse_dates([event_data['date'] for event_data in self.events.values()])
+
+        for pos, event_data in enumerate(self.events.values()):
+            if np.isnat(dates[pos]):
+                continue
+
+            for impact in event_data['impacts']:
+                indicator = impact['indicator']
+                if indicator not in indicators:
+                    continue
+
+                base_impact = impact.get('impact')
+                lag = impact.get('lag')
+                # Non-numeric impacts and missing lags contribute nothing
+                if not isinstance(base_impact, (int, float, np.number)) \
+                        or not isinstance(lag, (int, float, np.number)):
+                    base_impact, lag = 0.0, 0.0
+
+                event_pos.append(pos)
+                event_names.append(event_data['name'])
+                impact_indicators.append(indicator)
+                base_impacts.append(float(base_impact))
+                lags.append(float(lag))
+                groups.append(impact.get('group'))
+
+        event_pos = np.array(event_pos, dtype=np.int64)
+        event_dates = pd.DatetimeIndex(dates[event_pos])
+        return {
+            'event_pos': event_pos,
+            'event_name': np.array(event_names, dtype=object),
+            'event_month': np.asarray(event_dates.year * 12 + event_dates.month, dtype=np.int64),
+            'event_time': month_positions(event_dates),
+            'indicator': np.array(impact_indicators, dtype=object),
+            'impact': np.array(base_impacts, dtype=float),
+            'lag': np.array(lags, dtype=float),
+            'group': np.array(groups, dtype=object)
+        }
+
+    def _all_indicators(self):
+        """Every indicator with at least one impact"""
+        indicators = []
+        for event_data in self.events.values():
+            for impact in event_data['impacts']:
+                indicators.append(impact['indicator'])
+        return list(set(indicators))
+
+    def _event_table(self):
+        """Ids, names and dates of every event, in insertion order"""
+        return (list(self.events.keys()),
+                [event_data['name'] for event_data in self.events.values()],
+                [event_data['date'] for event_data in self.events.values()])
+
+    def _dated_event_count(self):
+        """Number of events with a parsed date"""
+        return sum(1 for event_data in self.events.values() if event_data['date'] is not None)
+
+    def impact_matrix(self, indicators=None):
+        """
+        Sparse event x indicator matrix of each event's summed base impacts
+
+        Event ids are positions in self.events, the event axis of
+        compile_timeline(); links of undated events, which are never
+        simulated, are left out.
+        """
+        if indicators is None:
+            indicators = sorted(self._all_indicators())
+        arrays = self._impact_arrays(set(indicators))
+        indicator_ids = {indicator: i for i, indicator in enumerate(indicators)}
+        return EventIndicatorMatrix.from_pairs(
+            self._event_table()[0], indicators, arrays['event_pos'],
+            [indicator_ids[ind] for ind in arrays['indicator']], arrays['impact'], agg='sum'
+        )
+
+    def _impact_chunks(self, arrays, date_range, resolution):
+        """
+        Yield (step slice, impacts x steps values) over the simulation steps
+
+        Lag curves are evaluated at most MAX_CHUNK_CELLS at a time. At
+        monthly resolution an event counts from the start of its month; at
+        finer resolutions from its exact day.
+        """
+        # offsets[i, t]: months between impact i's event and simulation step t
+        sim_positions = month_positions(date_range)
+        event_positions = arrays['event_month'] if resolution == 'monthly' else arrays['event_time']
+
+        chunk = max(1, MAX_CHUNK_CELLS // max(len(event_positions), 1))
+        for first in range(0, len(date_range), chunk):
+            window = slice(first, min(first + chunk, len(date_range)))
+            yield window, impact_curve(
+                arrays['impact'][:, np.newaxis],
+                arrays['lag'][:, np.newaxis],
+                sim_positions[np.newaxis, window] - event_positions[:, np.newaxis],
+                self.lag_function
+            )
+
+    @profiled('model.simulate_impacts')
+    def simulate_impacts(self, start_date, end_date, indicators=None, resolution='monthly', sparse=False):
+        """
+        Simulate impacts over time
+
+        Parameters:
+        -----------
+        start_date: Start date for simulation
+        end_date: End date for simulation
+        indicators: List of indicators to simulate (None for all)
+        resolution: 'monthly', 'weekly' or 'daily' simulation steps
+        sparse: Return the breakdown as an ImpactBreakdown instead of a DataFrame
+
+        Every (event, impact) pair is evaluated against every simulation
+        step as one impacts x steps array (in chunks of steps for long
+        windows), then summed per indicator. Lags stay in months: at monthly
+        resolution an event counts from the start of its month, as it always
+        has; at finer resolutions from its exact day.
+        """
+        # Ensure dates are datetime
+        start_date = pd.to_datetime(start_date)
+        end_date = pd.to_datetime(end_date)
+
+        # Generate date range
+        date_range, simulation_dates, step_name = simulation_periods(start_date, end_date, resolution)
+
+        # Get unique indicators
+        if indicators is None:
+            indicators = self._all_indicators()
+
+        print(f"\nSimulating impacts for {len(indicators)} indicators")
+        print(f"Time period: {start_date.strftime('%Y-%m')} to {end_date.strftime('%Y-%m')}")
+        print(f"Number of simulation {step_name}: {len(date_range)}")
+
+        events_with_dates = self._dated_event_count()
+        print(f"Processing {events_with_dates} events with valid dates")
+
+        arrays = self._impact_arrays(set(indicators))
+
+        indicator_ids = {indicator: i for i, indicator in enumerate(indicators)}
+        row_ids = np.array([indicator_ids[ind] for ind in arrays['indicator']], dtype=np.int64)
+        totals = np.zeros((len(indicators), len(date_range)))
+        # Significant contributions as (impact row, step, value) triplets
+        rows, steps, contributions = [], [], []
+
+        for window, values in self._impact_chunks(arrays, date_range, resolution):
+            # Sum contributions per indicator; np.add.at accumulates rows in
+            # event order, so totals match the sequential loop bit for bit
+            np.add.at(totals[:, window], row_ids, values)
+
+            significant_rows, significant_steps = np.nonzero(np.abs(values) > BREAKDOWN_THRESHOLD)
+            contributions.append(values[significant_rows, significant_steps])
+            rows.append(significant_rows.astype(np.int32))
+            steps.append((significant_steps + window.start).astype(np.int32))
+
+        results_df = pd.DataFrame(
+            {indicator: totals[i] for i, indicator in enumerate(indicators)},
+            index=simulation_dates
+        )
+
+        rows = np.concatenate(rows or [np.zeros(0, dtype=np.int32)])
+        steps = np.concatenate(steps or [np.zeros(0, dtype=np.int32)])
+        contributions = np.concatenate(contributions or [np.zeros(0)])
+        breakdown = ImpactBreakdown.from_contributions(arrays, indicators, simulation_dates, rows, steps, contributions,
+                                                       time_name='month' if resolution == 'monthly' else 'date')
+        del rows, steps, contributions
+
+        print(f"\nSimulation completed. Results shape: {results_df.shape}")
+        print(f"Total impact magnitude: {results_df.abs().sum().sum():.4f}")
+
+        return results_df, breakdown if sparse else breakdown.to_frame()
+
+    @profiled('model.simulate_group_impacts')
+    def simulate_group_impacts(self, start_date, end_date, groups, indicators=None, resolution='monthly'):
+        """
+        Simulate impacts separately for every group of the model's group_column
+
+        Parameters:
+        -----------
+        start_date: Start date for simulation
+        end_date: End date for simulation
+        groups: Groups to simulate (e.g. every region of the unified dataset)
+        indicators: List of indicators to simulate (None for all)
+        resolution: 'monthly', 'weekly' or 'daily' simulation steps
+
+        Impacts without a group are evaluated once and added to every group;
+        the others only to their own group (impacts on groups not listed are
+        left out). Returns a step x (group, indicator) DataFrame: each group's
+        block is shaped like simulate_impacts' results.
+        """
+        date_range, simulation_dates, step_name = simulation_periods(start_date, end_date, resolution)
+        if indicators is None:
+            indicators = self._all_indicators()
+        groups = [str(group) for group in groups]
+
+        print(f"\nSimulating impacts for {len(indicators)} indicators x {len(groups)} groups")
+        print(f"Number of simulation {step_name}: {len(date_range)}")
+
+        arrays = self._impact_arrays(set(indicators))
+        indicator_ids = {indicator: i for i, indicator in enumerate(indicators)}
+        group_ids = {group: g for g, group in enumerate(groups)}
+        row_ids = np.array([indicator_ids[ind] for ind in arrays['indicator']], dtype=np.int64)
+        impact_groups = np.array([-1 if group is None else group_ids.get(group, -2) for group in arrays['group']],
+                                 dtype=np.int64)
+        shared = impact_groups == -1
+        own = impact_groups >= 0
+
+        shared_totals = np.zeros((len(indicators), len(date_range)))
+        totals = np.zeros((len(groups), len(indicators), len(date_range)))
+        for window, values in self._impact_chunks(arrays, date_range, resolution):
+            np.add.at(shared_totals[:, window], row_ids[shared], values[shared])
+            np.add.at(totals[:, :, window], (impact_groups[own], row_ids[own]), values[own])
+        totals += shared_totals[np.newaxis, :, :]
+
+        columns = pd.MultiIndex.from_product([groups, list(indicators)], names=['group', 'indicator'])
+        results_df = pd.DataFrame(totals.reshape(len(groups) * len(indicators), len(date_range)).T,
+                                  index=simulation_dates, columns=columns)
+        print(f"Simulation completed. Results shape: {results_df.shape}")
+        return results_df
+
+    def get_cumulative_impact(self, event_names=None):
+        """Calculate cumulative impact of events"""
+        if event_names is None:
+            event_names = list(self.events.keys())
+
+        cumulative = {}
+        for event_id in event_names:
+            if event_id in self.events:
+                event_data = self.events[event_id]
+                impacts = event_data['impacts']
+                if impacts:
+                    total_impact = sum([abs(imp['impact']) for imp in impacts])
+                    cumulative[event_id] = {
+                        'event_name': event_data['name'],
+                        'event_date': event_data['date'],
+                        'total_impact': total_impact,
+                        'num_indicators': len(impacts),
+                        'avg_impact': total_impact / len(impacts)
+                    }
+                else:
+                    cumulative[event_id] = {
+                        'event_name': event_data['name'],
+                        'event_date': event_data['date'],
+                        'total_impact': 0,
+                        'num_indicators': 0,
+                        'avg_impact': 0
+                    }
+
+        return pd.DataFrame(cumulative).T
+
+    @profiled('model.compile_timeline')
+    def compile_timeline(self, start_date, end_date, indicators=None):
+        """
+        Precompute every event's contribution over a monthly grid
+
+        The (event x indicator x month) tensor is kept on the model, so
+        what_if() on any subset of events is a masked sum rather than a
+        new simulation.
+        """
+        self.timeline = EventTimeline(self, start_date, end_date, indicators)
+        return self.timeline
+
+    def what_if(self, active_events, start_date=None, end_date=None):
+        """
+        Impact of a subset of events, from the compiled timeline
+
+        Parameters:
+        -----------
+        active_events: Event ids (parent_id) to switch on
+        start_date, end_date: Simulation window; the timeline is recompiled
+                              when it was compiled for a different window
+
+        Returns a month x indicator DataFrame like simulate_impacts' results.
+        """
+        timeline = getattr(self, 'timeline', None)
+        if start_date is not None and end_date is not None:
+            months = [d.strftime('%Y-%m') for d in pd.date_range(
+                pd.to_datetime(start_date), pd.to_datetime(end_date), freq='MS')]
+            if timeline is None or timeline.months != months:
+                timeline = self.compile_timeline(start_date, end_date)
+        elif timeline is None:
+            raise ValueError("compile_timeline() first, or pass start_date and end_date")
+        return timeline.to_frame(timeline.totals(active_events))
+
+
+class ImpactBreakdown:
+    """
+    Sparse (COO) store of per-event contributions
+
+    Each significant (event, indicator, step) contribution is one entry of
+    four parallel arrays: integer event, indicator and time ids into the
+    label lists, and its float value. Memory grows with the number of
+    contributions above the threshold, about 20 bytes each, not with the
+    tuple keys of a dict, so weekly and daily simulations stay small.
+
+    Entries are kept in the order simulate_impacts has always reported
+    them (event, then step, then impact), and to_frame() gives the
+    (event, indicator, month) MultiIndex DataFrame it used to return.
+    """
+
+    def __init__(self, event_names, indicators, periods, event_ids, indicator_ids, time_ids, values,
+                 time_name='month'):
+        self.event_names = np.asarray(event_names, dtype=object)
+        self.indicators = np.asarray(indicators, dtype=object)
+        self.periods = np.asarray(periods, dtype=object)
+        self.event_ids = np.asarray(event_ids, dtype=np.int32)
+        self.indicator_ids = np.asarray(indicator_ids, dtype=np.int32)
+        self.time_ids = np.asarray(time_ids, dtype=np.int32)
+        self.values = np.asarray(values, dtype=float)
+        self.time_name = time_name
+
+    @classmethod
+    def from_contributions(cls, arrays, indicators, periods, rows, steps, values, time_name='month'):
+        """
+        Breakdown of significant contributions of _impact_arrays rows
+
+        Parameters:
+        -----------
+        arrays: EventImpactModel._impact_arrays output the rows refer to
+        indicators: Indicator labels (simulation columns)
+        periods: Step labels
+        rows, steps, values: Impact row, step and value of each contribution
+        time_name: Name of the time level in to_frame()
+        """
+        # Labels are factorised per impact row, then gathered per contribution
+        row_names, event_names = pd.factorize(arrays['event_name'])
+        indicator_index = {indicator: i for i, indicator in enumerate(indicators)}
+        row_indicators = np.array([indicator_index[ind] for ind in arrays['indicator']], dtype=np.int64)
+
+        # Visit order of the original loop: event, then step, then impact
+        order = np.lexsort((rows, steps, arrays['event_pos'][rows]))
+        rows, steps, values = rows[order], steps[order], values[order]
+
+        # Impact rows sharing an event name and indicator repeat keys at the
+        # same step; those keep the last value at the position of the first,
+        # as a dict assignment would. Other rows' contributions are unique.
+        _, key_ids, key_counts = np.unique(row_names * len(indicators) + row_indicators,
+                                           return_inverse=True, return_counts=True)
+        shared = np.flatnonzero((key_counts[key_ids] > 1)[rows])
+        if len(shared):
+            keys = key_ids[rows[shared]].astype(np.int64) * len(periods) + steps[shared]
+            by_key = np.argsort(keys, kind='stable')
+            starts = np.flatnonzero(np.diff(keys[by_key], prepend=-1))
+            first = by_key[starts]
+            values[shared[first]] = values[shared[by_key[np.append(starts[1:], len(keys)) - 1]]]
+            keep = np.ones(len(rows), dtype=bool)
+            keep[shared] = False
+            keep[shared[first]] = True
+            rows, steps, values = rows[keep], steps[keep], values[keep]
+
+        return cls(np.asarray(event_names, dtype=object), indicators, periods,
+                   row_names[rows], row_indicators[rows], steps, values, time_name=time_name)
+
+    def __len__(self):
+        return len(self.values)
+
+    @property
+    def nbytes(self):
+        """Memory held by the id and value arrays"""
+        return self.event_ids.nbytes + self.indicator_ids.nbytes + self.time_ids.nbytes + self.values.nbytes
+
+    def select(self, event=None, indicator=None):
+        """Breakdown restricted to one event name and/or indicator"""
+        keep = np.ones(len(self), dtype=bool)
+        if event is not None:
+            keep &= np.isin(self.event_ids, np.flatnonzero(self.event_names == event))
+        if indicator is not None:
+            keep &= np.isin(self.indicator_ids, np.flatnonzero(self.indicators == indicator))
+        return ImpactBreakdown(self.event_names, self.indicators, self.periods, self.event_ids[keep],
+                               self.indicator_ids[keep], self.time_ids[keep], self.values[keep], self.time_name)
+
+    def pivot(self, indicator):
+        """Step x event-name DataFrame of each event's contribution to one indicator (zeros where absent)"""
+        part = self.select(indicator=indicator)
+        table = np.zeros((len(self.periods), len(self.event_names)))
+        table[part.time_ids, part.event_ids] = part.values
+        present = np.unique(part.event_ids)
+        return pd.DataFrame(table[:, present], index=self.periods, columns=self.event_names[present])
+
+    def to_frame(self):
+        """(event, indicator, time) MultiIndex DataFrame with an 'impact' column"""
+        if len(self) == 0:
+            return pd.DataFrame()
+        keys = ['event', 'indicator', self.time_name]
+        breakdown = pd.DataFrame({
+            'event': self.event_names[self.event_ids],
+            'indicator': self.indicators[self.indicator_ids],
+            self.time_name: self.periods[self.time_ids],
+            'impact': self.values
+        })
+        return breakdown.set_index(keys)[['impact']]
+
+
+def signed_impact_estimates(links):
+    """
+    Numeric impact_estimate of every impact link, signed by its impact_direction
+
+    '15%' is read as 0.15; estimates that are not numbers are NaN.
+    """
+    estimate = links['impact_estimate'].astype(str).str.strip()
+    is_percent = estimate.str.endswith('%')
+    impact = pd.to_numeric(estimate.str.rstrip('%'), errors='coerce')
+    impact = impact.where(~is_percent, impact / 100)
+    direction = links.get('impact_direction', pd.Series('', index=links.index)).astype(str).str.lower()
+    return impact * np.where(direction.isin(['negative', 'decrease']), -1.0, 1.0)
+
+
+def impact_summary_from_links(unified_df, impact_df, group_columns=()):
+    """
+    EventImpactModel input from unified-dataset events and the impact sheet
+
+    Joins links to their events on parent_id and signs numeric impact
+    estimates ('15%' is read as 0.15) by impact_direction, as the event
+    impact notebook's create_impact_summary does. Links without a numeric
+    estimate are dropped instead of given random magnitude-based defaults.
+    Those of group_columns the impact sheet has (e.g. region) are carried
+    through, for a model with a group_column.
+    """
+    columns = ['parent_id', 'event_name', 'event_date', 'indicator_code', 'lag_months', 'final_impact']
+    if unified_df is None or impact_df is None or 'indicator_code' not in impact_df.columns:
+        return pd.DataFrame(columns=columns)
+
+    events = unified_df[unified_df['record_type'].astype(str).str.lower() == 'event']
+    event_columns = ['record_id', 'observation_date'] + (['indicator'] if 'indicator' in events.columns else [])
+    joined = impact_df.merge(events[event_columns], left_on='parent_id', right_on='record_id',
+                             how='inner', suffixes=('_impact', '_event'))
+
+    name_column = 'indicator_event' if 'indicator_event' in joined.columns else 'indicator'
+    names = joined[name_column] if name_column in joined.columns else joined['parent_id']
+
+    summary = pd.DataFrame({
+        'parent_id': joined['parent_id'],
+        'event_name': names.fillna(joined['parent_id']).astype(str),
+        'event_date': pd.to_datetime(joined['observation_date'], errors='coerce'),
+        'indicator_code': joined['indicator_code'],
+        'lag_months': pd.to_numeric(joined['lag_months'], errors='coerce') if 'lag_months' in joined else np.nan,
+        'final_impact': signed_impact_estimates(joined)
+    })
+    for col in group_columns:
+        if col in impact_df.columns:
+            summary[col] = joined[col]
+    return summary.dropna(subset=['event_date', 'indicator_code', 'final_impact']).reset_index(drop=True)
+
+
+class EventTimeline:
+    """
+    Per-event impact contributions over a fixed monthly grid
+
+    Every event's lag curves are evaluated once into a dense
+    (event x indicator x month) tensor. The impact of any subset of events
+    is a masked sum over the event axis, and switching one event on or off
+    adds or subtracts a single (indicator x month) slice. The same links
+    are kept as a sparse EventIndicatorMatrix (matrix), which says which
+    events touch an indicator without scanning the tensor.
+    """
+
+    def __init__(self, model, start_date, end_date, indicators=None):
+        """
+        Evaluate every event of a model over the simulation months
+
+        Parameters:
+        -----------
+        model: EventImpactModel whose events are compiled
+        start_date: First simulation month
+        end_date: Last simulation month
+        indicators: Indicators to keep (None for every indicator with an impact)
+        """
+        date_range = pd.date_range(start=pd.to_datetime(start_date), end=pd.to_datetime(end_date), freq='MS')
+        self.months = [d.strftime('%Y-%m') for d in date_range]
+
+        if indicators is None:
+            indicators = sorted(model._all_indicators())
+        self.indicators = list(indicators)
+        self.event_ids, self.event_names, self.event_dates = model._event_table()
+
+        # Same (event, impact) arrays and lag curves as simulate_impacts
+        arrays = model._impact_arrays(set(self.indicators))
+        sim_months = np.asarray(date_range.year * 12 + date_range.month, dtype=np.int64)
+        months_since = sim_months[np.newaxis, :] - arrays['event_month'][:, np.newaxis]
+        values = impact_curve(
+            arrays['impact'][:, np.newaxis],
+            arrays['lag'][:, np.newaxis],
+            months_since,
+            model.lag_function
+        )
+
+        indicator_ids = {indicator: i for i, indicator in enumerate(self.indicators)}
+        rows = np.array([indicator_ids[ind] for ind in arrays['indicator']], dtype=np.int64)
+        self.contributions = np.zeros((len(self.event_ids), len(self.indicators), len(self.months)))
+        np.add.at(self.contributions, (arrays['event_pos'], rows), values)
+
+        # Which events touch which indicators, for figures that skip the rest
+        self.matrix = EventIndicatorMatrix.from_pairs(self.event_ids, self.indicators, arrays['event_pos'], rows,
+                                                      arrays['impact'], agg='sum')
+
+        self._event_index = {event_id: i for i, event_id in enumerate(self.event_ids)}
+
+    def event_index(self, event_id):
+        """Position of an event on the tensor's event axis"""
+        return self._event_index[event_id]
+
+    def mask(self, active_events=None):
+        """Boolean event mask of a subset of event ids (all events when None)"""
+        if active_events is None:
+            return np.ones(len(self.event_ids), dtype=bool)
+        mask = np.zeros(len(self.event_ids), dtype=bool)
+        mask[[self._event_index[event_id] for event_id in active_events]] = True
+        return mask
+
+    def totals(self, active_events=None):
+        """(indicator x month) impact of a subset of events, as a masked reduction"""
+        return self.contributions[self.mask(active_events)].sum(axis=0)
+
+    def to_frame(self, totals):
+        """Month x indicator DataFrame, shaped like simulate_impacts' results"""
+        return pd.DataFrame(totals.T, index=self.months, columns=self.indicators)
+
+    def indicator_contributions(self, indicator, active_events=None):
+        """Month x event-name DataFrame of each active event's contribution to one indicator"""
+        mask = self.mask(active_events)
+        column = self.indicators.index(indicator)
+        names = [name for name, active in zip(self.event_names, mask) if active]
+        return pd.DataFrame(self.contributions[mask, column, :].T, index=self.months, columns=names)
+
+    def scenario(self, active_events=None):
+        """A toggleable set of active events over this timeline"""
+        return EventScenario(self, active_events)
+
+    @property
+    def nbytes(self):
+        """Memory held by the contribution tensor"""
+        return self.contributions.nbytes
+
+
+class EventScenario:
+    """Active events and their running impact totals"""
+
+    def __init__(self, timeline, active_events=None):
+        self.timeline = timeline
+        self.active = timeline.mask(active_events)
+        self.totals = timeline.totals(active_events)
+
+    def set_active(self, event_id, active=True):
+        """Switch one event on or off; updates totals by that event's slice only"""
+        i = self.timeline.event_index(event_id)
+        if self.active[i] == bool(active):
+            return self
+        self.active[i] = bool(active)
+        if active:
+            self.totals += self.timeline.contributions[i]
+        else:
+            self.totals -= self.timeline.contributions[i]
+        return self
+
+    def toggle(self, event_id):
+        """Flip one event"""
+        return self.set_active(event_id, not self.active[self.timeline.event_index(event_id)])
+
+    def sync(self, active_events):
+        """Apply the toggles needed to reach a new set of active events; returns the events changed"""
+        target = self.timeline.mask(active_events)
+        changed = [self.timeline.event_ids[i] for i in np.flatnonzero(target != self.active)]
+        for event_id in changed:
+            self.toggle(event_id)
+        return changed
+
+    def refresh(self):
+        """Recompute totals from the mask, dropping rounding drift from many toggles"""
+        self.totals = self.timeline.contributions[self.active].sum(axis=0)
+        return self
+
+    @property
+    def active_events(self):
+        """Ids of the active events, in timeline order"""
+        return [event_id for event_id, active in zip(self.timeline.event_ids, self.active) if active]
+
+    def results(self):
+        """Month x indicator DataFrame of the active events' impact"""
+        return self.timeline.to_frame(self.totals)
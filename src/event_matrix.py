@@ -0,0 +1,210 @@
+"""
+Sparse event x indicator impact matrix
+
+The event impact notebook used to build its event-indicator matrix by
+filtering the whole impact summary once per event (and that slice once per
+indicator) into a dict of dicts, then a dense DataFrame that is mostly
+zeros. EventIndicatorMatrix is built in one pass instead: events and
+indicators are factorised to integer ids, (event, indicator) pairs are
+aggregated with np.unique/np.bincount, and only the pairs that have a
+link are stored.
+
+Entries are sorted by event, so one event's impacts are a contiguous slice
+(CSR); a permutation sorted by indicator gives every indicator's events as
+a slice too (CSC). Both lookups cost the size of their answer, not the size
+of the summary.
+
+    matrix = EventIndicatorMatrix.from_summary(impact_summary)
+    matrix.event_impacts('Telebirr Launch')     # indicator -> impact
+    matrix.indicator_events('ACC_OWNERSHIP')    # event -> impact
+    matrix.to_dense()                           # the notebook's event_matrix
+"""
+import numpy as np
+import pandas as pd
+
+# Labels given to links without an event name or indicator; the latter are left out of the matrix
+UNKNOWN_EVENT = 'Unknown_Event'
+UNKNOWN_INDICATOR = 'UNKNOWN'
+
+# Older summaries name the event and indicator columns after the joined sheets
+FALLBACK_COLUMNS = {'event_name': 'indicator_event', 'indicator_code': 'indicator_impact'}
+
+
+class EventIndicatorMatrix:
+    """Impacts of linked (event, indicator) pairs, indexed by integer event and indicator ids"""
+
+    def __init__(self, events, indicators, event_ids, indicator_ids, values):
+        """
+        Store entries sorted by (event, indicator) and index them both ways
+
+        Parameters:
+        -----------
+        events: Event labels; event_ids index into them
+        indicators: Indicator labels; indicator_ids index into them
+        event_ids, indicator_ids, values: One entry per (event, indicator) pair
+        """
+        self.events = np.asarray(events, dtype=object)
+        self.indicators = np.asarray(indicators, dtype=object)
+
+        order = np.lexsort((indicator_ids, event_ids))
+        self.event_ids = np.asarray(event_ids, dtype=np.int32)[order]
+        self.indicator_ids = np.asarray(indicator_ids, dtype=np.int32)[order]
+        self.values = np.asarray(values, dtype=float)[order]
+
+        # Row pointers: event i's entries are [event_offsets[i], event_offsets[i + 1])
+        self.event_offsets = np.searchsorted(self.event_ids, np.arange(len(self.events) + 1))
+        # Entries in indicator order (events ascending within each), with their own pointers
+        self.by_indicator = np.argsort(self.indicator_ids, kind='stable').astype(np.int32)
+        self.indicator_offsets = np.searchsorted(self.indicator_ids[self.by_indicator],
+                                                 np.arange(len(self.indicators) + 1))
+
+        self._event_index = {event: i for i, event in enumerate(self.events)}
+        self._indicator_index = {indicator: j for j, indicator in enumerate(self.indicators)}
+
+    @classmethod
+    def from_pairs(cls, events, indicators, event_ids, indicator_ids, values, agg='mean'):
+        """
+        Aggregate repeated (event, indicator) pairs in one pass
+
+        Every linked pair is kept, even when its links cancel out: links
+        with different lags still move the indicator over time.
+
+        Parameters:
+        -----------
+        events, indicators: Labels the ids index into
+        event_ids, indicator_ids, values: One entry per impact link
+        agg: 'mean' (the notebook matrix) or 'sum' (total base impact, as the simulation adds links)
+        """
+        if agg not in ('mean', 'sum'):
+            raise ValueError(f"Unknown aggregation '{agg}'; expected 'mean' or 'sum'")
+        event_ids = np.asarray(event_ids, dtype=np.int64)
+        indicator_ids = np.asarray(indicator_ids, dtype=np.int64)
+        values = np.asarray(values, dtype=float)
+
+        n_indicators = max(len(indicators), 1)
+        keys, key_ids = np.unique(event_ids * n_indicators + indicator_ids, return_inverse=True)
+        totals = np.bincount(key_ids, weights=values, minlength=len(keys))
+        if agg == 'mean':
+            totals /= np.bincount(key_ids, minlength=len(keys))
+
+        return cls(events, indicators, keys // n_indicators, keys % n_indicators, totals)
+
+    @classmethod
+    def from_summary(cls, impact_summary, event_column='event_name', indicator_column='indicator_code',
+                     value_column='final_impact', agg='mean'):
+        """
+        Matrix of an impact summary, cleaned as the notebook's robust builder cleans it
+
+        Missing event names become UNKNOWN_EVENT, non-numeric impacts 0, and
+        links without an indicator (or with UNKNOWN_INDICATOR) are dropped,
+        though their events are kept. Events and indicators are numbered in
+        order of first appearance.
+        """
+        event_column = cls._column(impact_summary, event_column)
+        indicator_column = cls._column(impact_summary, indicator_column)
+
+        event_ids, events = pd.factorize(impact_summary[event_column].fillna(UNKNOWN_EVENT))
+        indicator_codes = impact_summary[indicator_column].fillna(UNKNOWN_INDICATOR)
+        linked = (indicator_codes != UNKNOWN_INDICATOR).to_numpy()
+        indicator_ids, indicators = pd.factorize(indicator_codes[linked])
+        values = pd.to_numeric(impact_summary[value_column], errors='coerce').fillna(0).to_numpy()[linked]
+
+        return cls.from_pairs(np.asarray(events, dtype=object), np.asarray(indicators, dtype=object),
+                              event_ids[linked], indicator_ids, values, agg=agg)
+
+    @staticmethod
+    def _column(frame, column):
+        """column, or its fallback when only that is present"""
+        if column not in frame.columns and FALLBACK_COLUMNS.get(column) in frame.columns:
+            print(f"Warning: Missing column '{column}', using '{FALLBACK_COLUMNS[column]}'")
+            return FALLBACK_COLUMNS[column]
+        return column
+
+    def __len__(self):
+        return len(self.values)
+
+    @property
+    def shape(self):
+        return len(self.events), len(self.indicators)
+
+    @property
+    def nbytes(self):
+        """Memory held by the entry and index arrays"""
+        return (self.event_ids.nbytes + self.indicator_ids.nbytes + self.values.nbytes + self.by_indicator.nbytes
+                + self.event_offsets.nbytes + self.indicator_offsets.nbytes)
+
+    def event_index(self, event):
+        """Id of an event label"""
+        return self._event_index[event]
+
+    def indicator_index(self, indicator):
+        """Id of an indicator label"""
+        return self._indicator_index[indicator]
+
+    def event_entries(self, event_id):
+        """Entry positions of one event (by id), in indicator order"""
+        return np.arange(self.event_offsets[event_id], self.event_offsets[event_id + 1])
+
+    def indicator_entries(self, indicator_id):
+        """Entry positions of one indicator (by id), in event order"""
+        return self.by_indicator[self.indicator_offsets[indicator_id]:self.indicator_offsets[indicator_id + 1]]
+
+    def events_affecting(self, indicator_id):
+        """Ids of the events with an impact on one indicator (by id), ascending"""
+        return self.event_ids[self.indicator_entries(indicator_id)]
+
+    def event_impacts(self, event):
+        """Series of one event's impacts, indexed by indicator"""
+        entries = self.event_entries(self._event_index[event])
+        return pd.Series(self.values[entries], index=self.indicators[self.indicator_ids[entries]], name=event)
+
+    def indicator_events(self, indicator):
+        """Series of the impacts on one indicator, indexed by event"""
+        entries = self.indicator_entries(self._indicator_index[indicator])
+        return pd.Series(self.values[entries], index=self.events[self.event_ids[entries]], name=indicator)
+
+    def event_totals(self):
+        """Sum of absolute impacts per event id"""
+        return np.bincount(self.event_ids, weights=np.abs(self.values), minlength=len(self.events))
+
+    def dense(self, event_ids=None, indicator_ids=None):
+        """
+        Event x indicator DataFrame of a block of the matrix (zeros where absent)
+
+        Only entries inside the block are scattered, so a heatmap of a few
+        events never materialises the whole matrix.
+        """
+        event_ids = np.arange(len(self.events)) if event_ids is None else np.asarray(event_ids, dtype=np.int64)
+        indicator_ids = (np.arange(len(self.indicators)) if indicator_ids is None
+                         else np.asarray(indicator_ids, dtype=np.int64))
+        rows = np.full(len(self.events), -1)
+        rows[event_ids] = np.arange(len(event_ids))
+        columns = np.full(len(self.indicators), -1)
+        columns[indicator_ids] = np.arange(len(indicator_ids))
+
+        inside = (rows[self.event_ids] >= 0) & (columns[self.indicator_ids] >= 0)
+        table = np.zeros((len(event_ids), len(indicator_ids)))
+        table[rows[self.event_ids[inside]], columns[self.indicator_ids[inside]]] = self.values[inside]
+        return pd.DataFrame(table, index=self.events[event_ids], columns=self.indicators[indicator_ids])
+
+    def to_dense(self, sort_by_total=True):
+        """
+        Full event x indicator DataFrame, as the notebook's robust builder returned it
+
+        Events are sorted by their summed absolute impact (largest first)
+        when sort_by_total is set.
+        """
+        event_matrix = self.dense()
+        if sort_by_total and not event_matrix.empty:
+            event_matrix['total_impact'] = event_matrix.abs().sum(axis=1)
+            event_matrix = event_matrix.sort_values('total_impact', ascending=False)
+            event_matrix = event_matrix.drop('total_impact', axis=1)
+        return event_matrix
+
+    def to_frame(self):
+        """Long DataFrame of the entries: event, indicator, impact"""
+        return pd.DataFrame({
+            'event': self.events[self.event_ids],
+            'indicator': self.indicators[self.indicator_ids],
+            'impact': self.values
+        })
@@ -0,0 +1,82 @@
+"""
+Cache of built Plotly figures shared by every dashboard session
+
+Figures are keyed by (page, figure name, data version, widget state).
+Widget-independent figures are therefore built once per dataset version
+instead of on every rerun. A new data version does not drop the figures
+of the previous one: sessions still reading that version keep hitting
+them, and they age out of the LRU. Figures are stored as their Plotly
+JSON, and every caller gets its own go.Figure rebuilt from it without
+validation: the JSON was validated when the figure was first built, and
+validating it again costs more than building the figure from scratch.
+"""
+import json
+
+import plotly.graph_objects as go
+
+from src.data_cache import DataCache
+
+
+def hashable_key(value):
+    """Hashable, order-independent form of a widget-state value"""
+    if isinstance(value, dict):
+        return tuple(sorted((key, hashable_key(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(hashable_key(item) for item in value)
+    if isinstance(value, set):
+        return tuple(sorted(hashable_key(item) for item in value))
+    return value
+
+
+class FigureCache:
+    """Memory-bounded LRU of built figures, keyed by data version"""
+
+    def __init__(self, max_bytes=64 * 1024 ** 2):
+        """
+        Initialize the cache
+
+        Parameters:
+        -----------
+        max_bytes: Cap on the serialized size of cached figures
+        """
+        self._figures = DataCache(max_bytes=max_bytes)
+
+    def get(self, page, name, data_version, widget_state, build, warn=None):
+        """
+        Return the cached figure, calling build() once on a miss
+
+        Parameters:
+        -----------
+        page: Page the figure belongs to
+        name: Figure name within the page
+        data_version: Identifier of the data the figure is built from
+        widget_state: Dict of the widget values the figure depends on
+        build: Zero-argument callable returning a go.Figure; with warn, it
+               takes the function to report warnings through instead
+        warn: Receives the warnings build reported, on every call and not
+              only the one that built the figure
+
+        Every call returns a new go.Figure, which the caller may modify
+        (its later changes are not validated).
+        """
+        key = (page, name, data_version, hashable_key(widget_state))
+
+        def serialize():
+            if warn is None:
+                return build().to_json(), ()
+            messages = []
+            figure = build(messages.append)
+            return figure.to_json(), tuple(messages)
+
+        figure_json, messages = self._figures.get(key, serialize)
+        for message in messages:
+            warn(message)
+        return go.Figure(json.loads(figure_json), _validate=False)
+
+    def stats(self):
+        """Hit/miss counters and memory use"""
+        return self._figures.stats()
+
+    def clear(self):
+        """Drop every cached figure"""
+        self._figures.clear()
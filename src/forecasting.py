@@ -0,0 +1,328 @@
+"""
+Trend and event-augmented forecasters from the forecasting notebook
+"""
+import numpy as np
+from sklearn.linear_model import LinearRegression
+from sklearn.metrics import mean_squared_error, mean_absolute_error
+
+
+class TrendForecaster:
+    """Models for trend-based forecasting"""
+    
+    def __init__(self):
+        self.models = {}
+        self.forecasts = {}
+    
+    def fit_linear(self, series, name="target"):
+        """Fit linear regression model"""
+        if len(series) < 2:
+            print(f"Warning: Not enough data for linear regression ({len(series)} points)")
+            return None
+        
+        years = np.array(series.index).reshape(-1, 1)
+        values = series.values
+        
+        model = LinearRegression()
+        model.fit(years, values)
+        
+        # Calculate metrics
+        predictions = model.predict(years)
+        mse = mean_squared_error(values, predictions)
+        mae = mean_absolute_error(values, predictions)
+        r2 = model.score(years, values)
+        
+        self.models[f"{name}_linear"] = {
+            'model': model,
+            'type': 'linear',
+            'mse': mse,
+            'mae': mae,
+            'r2': r2
+        }
+        
+        print(f"Linear model for {name}:")
+        print(f"  Slope: {model.coef_[0]:.4f} (annual change)")
+        print(f"  R²: {r2:.3f}")
+        print(f"  MSE: {mse:.6f}")
+        
+        return model
+    
+    def fit_logistic(self, series, name="target", carrying_capacity=1.0):
+        """Fit logistic growth model (S-curve)"""
+        if len(series) < 3:
+            print(f"Warning: Not enough data for logistic model ({len(series)} points)")
+            return None
+        
+        years = np.array(series.index)
+        values = series.values
+        
+        # Logistic growth: y = L / (1 + exp(-k*(t - t0)))
+        # L = carrying capacity, k = growth rate, t0 = inflection point
+        
+        # Simple approximation for sparse data
+        # We'll use linear regression on logit transform
+        epsilon = 1e-10
+        transformed = np.log((values + epsilon) / (carrying_capacity - values + epsilon))
+        
+        valid_mask = np.isfinite(transformed)
+        if valid_mask.sum() < 2:
+            print(f"Warning: Cannot fit logistic model for {name}")
+            return None
+        
+        model = LinearRegression()
+        model.fit(years[valid_mask].reshape(-1, 1), transformed[valid_mask])
+        
+        k = -model.coef_[0]  # Growth rate
+        t0 = -model.intercept_ / k if k != 0 else 0
+        
+        self.models[f"{name}_logistic"] = {
+            'model': model,
+            'type': 'logistic',
+            'k': k,
+            't0': t0,
+            'L': carrying_capacity
+        }
+        
+        print(f"Logistic model for {name}:")
+        print(f"  Growth rate (k): {k:.4f}")
+        print(f"  Carrying capacity: {carrying_capacity}")
+        
+        return model
+    
+    def forecast(self, series, model_type='linear', forecast_years=[2025, 2026, 2027], name="target"):
+        """Generate forecasts"""
+        
+        key = f"{name}_{model_type}"
+        if key not in self.models:
+            print(f"Model {key} not found. Fitting first...")
+            if model_type == 'linear':
+                self.fit_linear(series, name)
+            elif model_type == 'logistic':
+                self.fit_logistic(series, name)
+        
+        if key not in self.models:
+            return None
+        
+        model_info = self.models[key]
+        historical_years = np.array(series.index)
+        forecast_years_arr = np.array(forecast_years).reshape(-1, 1)
+        all_years = np.concatenate([historical_years, forecast_years])
+        
+        if model_type == 'linear':
+            linear_model = model_info['model']
+            historical_pred = linear_model.predict(historical_years.reshape(-1, 1))
+            forecast_pred = linear_model.predict(forecast_years_arr)
+        
+        elif model_type == 'logistic':
+            # Logistic predictions
+            L = model_info['L']
+            k = model_info['k']
+            t0 = model_info['t0']
+            
+            def logistic_predict(t):
+                return L / (1 + np.exp(-k * (t - t0)))
+            
+            historical_pred = logistic_predict(historical_years)
+            forecast_pred = logistic_predict(forecast_years)
+        
+        # Combine historical and forecast
+        all_predictions = np.concatenate([historical_pred, forecast_pred])
+        
+        # Calculate confidence intervals
+        if len(series) >= 3:
+            residuals = series.values - historical_pred
+            std_error = np.std(residuals)
+            
+            # 95% confidence interval
+            z_score = 1.96
+            ci_upper = all_predictions + z_score * std_error * np.sqrt(1 + 1/len(series))
+            ci_lower = all_predictions - z_score * std_error * np.sqrt(1 + 1/len(series))
+            
+            # Ensure bounds are reasonable
+            ci_lower = np.maximum(ci_lower, 0)
+            ci_upper = np.minimum(ci_upper, 1 if model_type == 'logistic' else np.inf)
+        else:
+            ci_lower = ci_upper = None
+        
+        # Store forecasts
+        self.forecasts[key] = {
+            'years': all_years,
+            'predictions': all_predictions,
+            'forecast_years': forecast_years,
+            'forecast_values': forecast_pred,
+            'ci_lower': ci_lower,
+            'ci_upper': ci_upper,
+            'model_type': model_type,
+            'historical_data': series.values,
+            'historical_years': historical_years
+        }
+        
+        return self.forecasts[key]
+
+
+class FixedTrendForecaster:
+    """Trend forecaster with proper percentage handling"""
+    
+    def __init__(self):
+        self.models = {}
+        self.forecasts = {}
+    
+    def fit_linear(self, series, name="target"):
+        """Fit linear regression model with percentage handling"""
+        if len(series) < 2:
+            print(f"Warning: Not enough data for linear regression ({len(series)} points)")
+            return None
+        
+        series_values = series.values.copy()
+        max_val = np.max(np.abs(series_values))
+        
+        # Detect and convert percentages
+        if max_val > 1:
+            print(f"  Converting percentages to decimals (max={max_val:.1f}%)")
+            series_values = series_values / 100
+            was_percentage = True
+        else:
+            print(f"  Using decimal values (max={max_val:.3f})")
+            was_percentage = False
+        
+        years = np.array(series.index).reshape(-1, 1)
+        model = LinearRegression()
+        model.fit(years, series_values)
+        
+        predictions = model.predict(years)
+        r2 = model.score(years, series_values)
+        
+        self.models[f"{name}_linear"] = {
+            'model': model,
+            'r2': r2,
+            'was_percentage': was_percentage,
+            'slope_per_year': model.coef_[0] * 100,
+            'intercept': model.intercept_
+        }
+        
+        print(f"  R²: {r2:.3f}")
+        print(f"  Annual change: {model.coef_[0]*100:+.3f} percentage points")
+        return model
+    
+    def forecast(self, series, forecast_years=[2025, 2026, 2027], name="target"):
+        """Generate forecasts with proper scaling"""
+        
+        key = f"{name}_linear"
+        if key not in self.models:
+            print(f"Fitting model for {name}...")
+            self.fit_linear(series, name)
+        
+        if key not in self.models:
+            return None
+        
+        model_info = self.models[key]
+        model = model_info['model']
+        
+        # Prepare years
+        hist_years = np.array(series.index)
+        forecast_years_arr = np.array(forecast_years)
+        all_years = np.concatenate([hist_years, forecast_years_arr])
+        
+        # Make predictions
+        hist_pred = model.predict(hist_years.reshape(-1, 1))
+        forecast_pred = model.predict(forecast_years_arr.reshape(-1, 1))
+        all_predictions = np.concatenate([hist_pred, forecast_pred])
+        
+        # Clip to 0-100% range
+        all_predictions = np.clip(all_predictions, 0, 1)
+        
+        # Confidence intervals
+        if len(series) >= 3:
+            series_values = series.values / 100 if model_info['was_percentage'] else series.values
+            residuals = series_values - hist_pred
+            std_error = np.std(residuals)
+            
+            ci_upper = all_predictions + 1.96 * std_error
+            ci_lower = all_predictions - 1.96 * std_error
+            ci_lower = np.clip(ci_lower, 0, 1)
+            ci_upper = np.clip(ci_upper, 0, 1)
+        else:
+            ci_lower = ci_upper = None
+        
+        forecast_data = {
+            'years': all_years,
+            'predictions': all_predictions,
+            'forecast_years': forecast_years,
+            'forecast_values': forecast_pred,
+            'ci_lower': ci_lower,
+            'ci_upper': ci_upper,
+            'model_type': 'linear',
+            'was_percentage': model_info['was_percentage']
+        }
+        
+        self.forecasts[key] = forecast_data
+        return forecast_data
+
+
+class EventAugmentedForecaster:
+    """Combine trend forecasts with event impacts"""
+    
+    def __init__(self, simulation_results):
+        self.simulation_results = simulation_results
+    
+    def estimate_future_impacts(self, indicator_name, forecast_years=[2025, 2026, 2027]):
+        """Estimate future impacts based on historical simulation data"""
+        
+        if indicator_name not in self.simulation_results.columns:
+            print(f"  ⚠ Indicator '{indicator_name}' not found in simulation results")
+            return {year: 0 for year in forecast_years}
+        
+        data = self.simulation_results[indicator_name]
+        
+        # Check if we have non-zero impacts
+        if (data == 0).all():
+            print(f"  ⚠ No non-zero impacts for '{indicator_name}'")
+            return {year: 0 for year in forecast_years}
+        
+        # Get recent impacts (last 12 months)
+        recent_data = data.tail(12)
+        recent_avg = recent_data.mean() / 100  # Convert to decimal
+        
+        print(f"  Recent average impact: {recent_avg*100:.2f}%")
+        
+        # Estimate future impacts with decay
+        impacts = {}
+        decay_rate = 0.15  # 15% decay per year
+        
+        for i, year in enumerate(forecast_years):
+            if i == 0:
+                impacts[year] = recent_avg * (1 - decay_rate)
+            else:
+                impacts[year] = impacts[forecast_years[i-1]] * (1 - decay_rate)
+        
+        return impacts
+    
+    def augment_forecast(self, trend_forecast, indicator_name, forecast_years=[2025, 2026, 2027]):
+        """Augment trend forecast with event impacts"""
+        
+        if trend_forecast is None:
+            return None
+        
+        # Estimate future event impacts
+        event_impacts = self.estimate_future_impacts(indicator_name, forecast_years)
+        
+        # Apply impacts to trend forecast
+        trend_years = trend_forecast['years']
+        trend_predictions = trend_forecast['predictions']
+        augmented_predictions = trend_predictions.copy()
+        
+        for i, year in enumerate(trend_years):
+            if year in forecast_years:
+                impact = event_impacts.get(year, 0)
+                augmented_predictions[i] += impact
+        
+        # Ensure values stay within 0-100%
+        augmented_predictions = np.clip(augmented_predictions, 0, 1)
+        
+        return {
+            'years': trend_years,
+            'trend_predictions': trend_predictions,
+            'augmented_predictions': augmented_predictions,
+            'event_impacts': event_impacts,
+            'forecast_years': forecast_years,
+            'model_type': 'event_augmented'
+        }
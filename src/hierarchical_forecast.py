@@ -0,0 +1,309 @@
+"""
+Forecasts by group (region, gender, urban/rural) reconciled to national totals
+
+Disaggregating every indicator by region, gender and location multiplies
+the number of series by 50-100x, too many for one forecaster per series.
+Here every bottom-level cell (indicator x region x gender ...) is fitted at
+once:
+
+- observations are summed and counted per (indicator, cell, year) into two
+  (cells x years) matrices in one groupby;
+- trends are fitted to all cells with trend_fitting's batch fits, and
+  event impacts for each cell are read from one per-group simulation
+  (EventImpactModel.simulate_group_impacts), with the same 12-month
+  average and yearly decay as EventAugmentedForecaster;
+- every aggregate (national, each region, each gender, ...) is the
+  weighted mean of the cell forecasts below it, weighted by the cells'
+  observation counts or by given population weights. Aggregates therefore
+  add up: the national forecast is the weighted mean of the regional ones.
+
+Observed values of an aggregate pool the observations of its cells, as
+batch_forecast.indicator_series pools regions into its national series.
+Cells with too few observations to fit carry no weight in the forecasts.
+
+All levels are kept in one long table (GroupAggregates), with a row index
+per (dimension, group, indicator), so drilling down to another group is a
+lookup rather than a new fit.
+
+    aggregates = forecast_groups(unified_df, ['region', 'gender'])
+    aggregates.select('region', 'Amhara', 'ACC_OWNERSHIP')
+    aggregates.select('national', 'national', 'ACC_OWNERSHIP')
+"""
+import numpy as np
+import pandas as pd
+
+from src.trend_fitting import fit_linear_batch, fit_logistic_batch, predict_batch
+from src.yearly_aggregates import observation_rows
+
+# Disaggregation columns of the unified dataset, in drill-down order
+GROUP_COLUMNS = ['region', 'gender', 'location']
+
+# Level and group label of the national totals (as in batch_forecast)
+NATIONAL = 'national'
+
+# Group of observations that are not disaggregated on a dimension
+UNALLOCATED = 'unallocated'
+
+FORECAST_YEARS = [2025, 2026, 2027]
+
+# Yearly decay of event impacts after the simulation window (EventAugmentedForecaster)
+IMPACT_DECAY = 0.15
+
+AGGREGATE_COLUMNS = ['dimension', 'group', 'indicator_code', 'Year', 'Type', 'observed', 'observations',
+                     'trend', 'event_impact', 'forecast', 'weight']
+
+
+def group_cells(unified_df, dimensions):
+    """
+    Yearly observation sums and counts of every (indicator, cell)
+
+    Parameters:
+    -----------
+    unified_df: Unified dataset (observation rows are used)
+    dimensions: Group columns; a missing value, or a missing column, is UNALLOCATED
+
+    Returns (cells, years, sums, counts): cells is a DataFrame with
+    indicator_code and one column per dimension, sums and counts are
+    (cells x years) matrices.
+    """
+    rows = unified_df.assign(**{
+        col: unified_df[col].fillna(UNALLOCATED).astype(str) if col in unified_df.columns else UNALLOCATED
+        for col in dimensions
+    })
+    obs = observation_rows(rows, extra_columns=list(dimensions))
+    obs['year'] = obs['year'].astype(int)
+
+    keys = ['indicator_code'] + list(dimensions)
+    totals = obs.groupby(keys + ['year'], sort=True)['value'].agg(['sum', 'count']).reset_index()
+
+    cell_ids, cells = pd.factorize(pd.MultiIndex.from_frame(totals[keys]), sort=True)
+    year_ids, years = pd.factorize(totals['year'], sort=True)
+    sums = np.zeros((len(cells), len(years)))
+    counts = np.zeros((len(cells), len(years)), dtype=np.int64)
+    sums[cell_ids, year_ids] = totals['sum'].to_numpy()
+    counts[cell_ids, year_ids] = totals['count'].to_numpy()
+
+    return cells.to_frame(index=False, name=keys), np.asarray(years, dtype=int), sums, counts
+
+
+def yearly_impacts(simulation, forecast_years, decay=IMPACT_DECAY):
+    """
+    Yearly event impacts (in %) of every simulation column
+
+    The average of the last 12 simulated months, decayed by `decay` a year,
+    as EventAugmentedForecaster.estimate_future_impacts. Returns a
+    (columns x forecast_years) matrix.
+    """
+    recent = simulation.tail(12).mean().to_numpy(dtype=float)
+    steps = np.arange(1, len(forecast_years) + 1)
+    return recent[:, np.newaxis] * (1 - decay) ** steps[np.newaxis, :]
+
+
+def cell_impacts(cells, means, forecast_years, simulation_results, impact_dimension=None, indicator_mapping=None):
+    """
+    (cells x forecast_years) event impacts, in the units of each cell's series
+
+    simulation_results has indicator columns (one simulation for every
+    cell) or (group, indicator) columns from simulate_group_impacts, whose
+    groups are the values of impact_dimension.
+    """
+    indicator_mapping = indicator_mapping or {}
+    impacts = np.zeros((len(cells), len(forecast_years)))
+    if simulation_results is None or simulation_results.empty:
+        return impacts
+
+    yearly = yearly_impacts(simulation_results, forecast_years)
+    columns = {column: i for i, column in enumerate(simulation_results.columns)}
+    codes = cells['indicator_code'].to_numpy(dtype=object)
+    if isinstance(simulation_results.columns, pd.MultiIndex):
+        groups = cells[impact_dimension].to_numpy(dtype=object)
+        keys = [(group, indicator_mapping.get(code, code)) for group, code in zip(groups, codes)]
+    else:
+        keys = [indicator_mapping.get(code, code) for code in codes]
+    source = np.array([columns.get(key, -1) for key in keys], dtype=np.int64)
+
+    simulated = source >= 0
+    impacts[simulated] = yearly[source[simulated]]
+    # Impacts come back as decimals; percentage series take them in points
+    scale = np.where(np.abs(np.nan_to_num(means)).max(axis=1, initial=0) > 1, 100.0, 1.0)
+    return impacts / 100 * scale[:, np.newaxis]
+
+
+class GroupAggregates:
+    """Historical and forecast values of every group at every level, with a row index per series"""
+
+    def __init__(self, table, dimensions):
+        """
+        Index a long aggregate table
+
+        Parameters:
+        -----------
+        table: DataFrame with AGGREGATE_COLUMNS
+        dimensions: Group columns the table was built from
+        """
+        self.table = table.reset_index(drop=True)
+        self.dimensions = list(dimensions)
+        self._rows = self.table.groupby(['dimension', 'group', 'indicator_code'], sort=False).indices
+        self._groups = {}
+        for dimension, group, _ in self._rows:
+            self._groups.setdefault(dimension, {}).setdefault(group, None)
+
+    def __len__(self):
+        """Number of (dimension, group, indicator) series"""
+        return len(self._rows)
+
+    @property
+    def levels(self):
+        """Dimensions present in the table, national first"""
+        return list(self._groups)
+
+    def groups(self, dimension):
+        """Groups of one level, in table order"""
+        return list(self._groups.get(dimension, {}))
+
+    def indicators(self, dimension, group):
+        """Indicator codes with a series for one group"""
+        return [code for (d, g, code) in self._rows if d == dimension and g == group]
+
+    def select(self, dimension, group, indicator_code):
+        """Rows of one group's series, by year"""
+        positions = self._rows.get((dimension, group, indicator_code))
+        if positions is None:
+            return self.table.iloc[0:0]
+        return self.table.iloc[positions]
+
+    def level(self, dimension, indicator_code):
+        """Rows of every group of one level for one indicator"""
+        return self.table[(self.table['dimension'] == dimension) & (self.table['indicator_code'] == indicator_code)]
+
+    def coherence_gap(self):
+        """
+        Largest gap between a level's weighted group forecasts and the national forecast
+
+        Groups are weighted by their 'weight' column; for reconciled
+        forecasts the gap is rounding error.
+        """
+        forecasts = self.table.dropna(subset=['forecast'])
+        weighted = forecasts.assign(weighted=forecasts['forecast'] * forecasts['weight'])
+        totals = weighted.groupby(['dimension', 'indicator_code', 'Year'])[['weighted', 'weight']].sum()
+        totals = totals['weighted'] / totals['weight']
+        national = totals.xs(NATIONAL, level='dimension')
+        gap = (totals - national.reindex(totals.droplevel('dimension').index).to_numpy()).abs().max()
+        return float(gap) if np.isfinite(gap) else 0.0
+
+
+def aggregate_level(cells, labels, weights, sums, counts, trend, event_impact):
+    """
+    Weighted cell forecasts and pooled observations of one level's groups
+
+    Returns (group keys DataFrame, weight, observed, observations, trend,
+    event_impact), one row per (indicator, group).
+    """
+    keys = pd.DataFrame({'indicator_code': cells['indicator_code'].to_numpy(), 'group': labels})
+    group_ids, groups = pd.factorize(pd.MultiIndex.from_frame(keys), sort=True)
+    n = len(groups)
+
+    def total(values):
+        out = np.zeros((n,) + values.shape[1:])
+        np.add.at(out, group_ids, values)
+        return out
+
+    weight = total(weights)
+    pooled_counts = total(counts)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        observed = total(sums) / pooled_counts
+        trend = total(weights[:, np.newaxis] * trend) / weight[:, np.newaxis]
+        event_impact = total(weights[:, np.newaxis] * event_impact) / weight[:, np.newaxis]
+    groups = groups.to_frame(index=False, name=['indicator_code', 'group'])
+    return groups, weight, observed, pooled_counts, trend, event_impact
+
+
+def forecast_groups(unified_df, dimensions=None, forecast_years=FORECAST_YEARS, model_type='linear',
+                    simulation_results=None, impact_dimension=None, indicator_mapping=None, weights=None,
+                    min_points=2, carrying_capacity=1.0):
+    """
+    Fit every bottom-level cell and reconcile the forecasts bottom-up
+
+    Parameters:
+    -----------
+    unified_df: Unified dataset (observation rows are used)
+    dimensions: Group columns (None = those of GROUP_COLUMNS in unified_df)
+    forecast_years: Years to forecast
+    model_type: 'linear' or 'logistic'
+    simulation_results: Monthly simulated impacts, with indicator columns or
+                        (group, indicator) columns from simulate_group_impacts
+    impact_dimension: The dimension whose values are the simulation's groups
+    indicator_mapping: {indicator_code: simulation indicator} when they differ
+    weights: Optional DataFrame with some of the dimension columns and a
+             'weight' column (e.g. adult population per region); cells are
+             weighted by their observation counts when None
+    min_points: Cells with fewer observed years carry no weight
+    carrying_capacity: L for logistic fits
+
+    Returns a GroupAggregates with the national level, one level per
+    dimension and, for several dimensions, the bottom-level cells.
+    """
+    if dimensions is None:
+        dimensions = [col for col in GROUP_COLUMNS if col in unified_df.columns]
+    dimensions = list(dimensions)
+    cells, observed_years, sums, counts = group_cells(unified_df, dimensions)
+
+    forecast_years = [int(year) for year in forecast_years]
+    years = np.array(sorted(set(observed_years) | set(forecast_years)), dtype=int)
+    columns = np.searchsorted(years, observed_years)
+    full_sums = np.zeros((len(cells), len(years)))
+    full_counts = np.zeros((len(cells), len(years)), dtype=np.int64)
+    full_sums[:, columns] = sums
+    full_counts[:, columns] = counts
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+    if model_type == 'logistic':
+        fits = fit_logistic_batch(observed_years, means, carrying_capacity)
+    else:
+        fits = fit_linear_batch(observed_years, means)
+    trend = predict_batch(fits, years, kind=model_type)
+
+    is_forecast = np.isin(years, forecast_years)
+    event_impact = np.zeros_like(trend)
+    event_impact[:, is_forecast] = cell_impacts(cells, means, [y for y in years if y in forecast_years],
+                                                simulation_results, impact_dimension, indicator_mapping)
+
+    # Cell weights: observation counts, or the given weights of the cell's groups
+    if weights is None:
+        cell_weights = counts.sum(axis=1).astype(float)
+    else:
+        on = [col for col in dimensions if col in weights.columns]
+        cell_weights = cells[on].merge(weights[on + ['weight']], on=on, how='left')['weight'].fillna(0).to_numpy()
+    fitted = (np.isfinite(means).sum(axis=1) >= min_points) & np.isfinite(trend).all(axis=1)
+    cell_weights = np.where(fitted, cell_weights, 0.0)
+    trend = np.where(fitted[:, np.newaxis], trend, 0.0)
+
+    levels = [(NATIONAL, np.full(len(cells), NATIONAL, dtype=object))]
+    levels += [(dimension, cells[dimension].to_numpy(dtype=object)) for dimension in dimensions]
+    if len(dimensions) > 1:
+        labels = cells[dimensions].astype(str).agg(' / '.join, axis=1).to_numpy(dtype=object)
+        levels.append((' x '.join(dimensions), labels))
+
+    frames = []
+    for dimension, labels in levels:
+        groups, weight, observed, observations, level_trend, level_impact = aggregate_level(
+            cells, labels, cell_weights, full_sums, full_counts, trend, event_impact
+        )
+        n_groups, n_years = len(groups), len(years)
+        frames.append(pd.DataFrame({
+            'dimension': dimension,
+            'group': np.repeat(groups['group'].to_numpy(dtype=object), n_years),
+            'indicator_code': np.repeat(groups['indicator_code'].to_numpy(dtype=object), n_years),
+            'Year': np.tile(years, n_groups),
+            'Type': np.tile(np.where(is_forecast, 'Forecast', 'Historical'), n_groups),
+            'observed': observed.ravel(),
+            'observations': observations.ravel().astype(np.int64),
+            'trend': level_trend.ravel(),
+            'event_impact': level_impact.ravel(),
+            'forecast': (level_trend + level_impact).ravel(),
+            'weight': np.repeat(weight, n_years)
+        }))
+
+    table = pd.concat(frames, ignore_index=True)
+    return GroupAggregates(table, dimensions)
@@ -0,0 +1,282 @@
+"""
+Incremental re-simulation of event impacts when impact links change
+
+Appending rows to impact_sheet_new.csv used to mean simulating every event
+again. Instead, each event's link rows are hashed per parent_id and the
+monthly contribution of every one of its impacts is cached on disk:
+
+    simulation_cache/
+        simulation_cache.json   settings, per-event hashes and row labels
+        contributions.npy       float64 (impact rows x months), events stacked in header order
+
+An update simulates only added and modified events, drops removed ones and
+rebuilds just the indicator columns they touch; the other columns of
+simulation_results.csv are written back as the text they were read as, so
+only rebuilt columns are formatted, and the file is not touched when no
+column changed. Totals are summed impact by
+impact in the model's event order, so every column matches what
+EventImpactModel.simulate_impacts returns for the full impact summary up
+to the last bit of rounding (NumPy's vectorised exp can differ by one ulp
+between array shapes).
+
+    simulator = IncrementalSimulator('data/processed/simulation_cache', '2020-01-01', '2024-12-01')
+    results, changes = simulator.update(impact_summary, results_path='data/processed/simulation_results.csv')
+
+Events are hashed on the rows of impact_summary, the input actually
+simulated, so any value filled in while building it must be the same
+from one run to the next.
+"""
+import contextlib
+import hashlib
+import io
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.data_cache import file_signature
+from src.event_impact_model import EventImpactModel, impact_curve
+
+CACHE_FORMAT_VERSION = 1
+HEADER_NAME = 'simulation_cache.json'
+ARRAY_NAME = 'contributions.npy'
+
+
+def event_hashes(rows, key='parent_id'):
+    """
+    Content hash of every event's rows, keyed by str(parent_id)
+
+    Column order is ignored; row order within an event is not, since it
+    decides the order impacts are summed in.
+    """
+    if rows is None or rows.empty:
+        return {}
+    frame = rows[sorted(rows.columns, key=str)]
+    row_hashes = pd.util.hash_pandas_object(frame, index=False).to_numpy()
+    groups = frame.groupby(frame[key].astype(str), sort=False).indices
+    return {
+        event_id: hashlib.blake2b(row_hashes[positions].tobytes(), digest_size=16).hexdigest()
+        for event_id, positions in groups.items()
+    }
+
+
+def event_order(impact_summary, key='parent_id'):
+    """Event ids in the order EventImpactModel visits them (first appearance)"""
+    return list(pd.unique(impact_summary[key].astype(str)))
+
+
+def event_contributions(impact_summary, event_ids, dates, lag_function='exponential'):
+    """
+    Per-impact monthly contributions of the given events
+
+    Returns {event_id: {'indicators': every indicator the event links to,
+    'row_indicators': indicator of each contribution row, 'values':
+    (rows x months) array}}. Undated events have indicators but no rows.
+    """
+    rows = impact_summary[impact_summary['parent_id'].astype(str).isin(set(event_ids))]
+    with contextlib.redirect_stdout(io.StringIO()):
+        model = EventImpactModel(rows, lag_function=lag_function)
+    arrays = model._impact_arrays(set(model._all_indicators()))
+
+    sim_months = np.asarray(dates.year * 12 + dates.month, dtype=np.int64)
+    values = impact_curve(
+        arrays['impact'][:, np.newaxis],
+        arrays['lag'][:, np.newaxis],
+        sim_months[np.newaxis, :] - arrays['event_month'][:, np.newaxis],
+        lag_function
+    )
+
+    contributions = {}
+    for pos, (event_id, event_data) in enumerate(model.events.items()):
+        mask = arrays['event_pos'] == pos
+        contributions[str(event_id)] = {
+            'indicators': list(dict.fromkeys(impact['indicator'] for impact in event_data['impacts'])),
+            'row_indicators': arrays['indicator'][mask].tolist(),
+            'values': values[mask]
+        }
+    return contributions
+
+
+class IncrementalSimulator:
+    """Cached per-event contributions over a fixed monthly window"""
+
+    def __init__(self, cache_dir, start_date, end_date, lag_function='exponential'):
+        """
+        Open (or start) the contribution cache
+
+        Parameters:
+        -----------
+        cache_dir: Directory holding the cache files
+        start_date, end_date: Simulation window (monthly, inclusive)
+        lag_function: Lag curve, as for EventImpactModel
+
+        A cache written for another window or lag function is ignored, so
+        the first update after such a change simulates every event.
+        """
+        self.cache_dir = Path(cache_dir)
+        self.start_date = pd.to_datetime(start_date)
+        self.end_date = pd.to_datetime(end_date)
+        self.lag_function = lag_function
+        self.dates = pd.date_range(start=self.start_date, end=self.end_date, freq='MS')
+        self.months = [d.strftime('%Y-%m') for d in self.dates]
+        self.events = {}
+        self.contributions = {}
+        self.results_signature = None
+        self._load()
+
+    def settings(self):
+        """Everything a cached contribution depends on besides the event itself"""
+        return {
+            'format_version': CACHE_FORMAT_VERSION,
+            'lag_function': self.lag_function,
+            'start_date': self.months[0] if self.months else None,
+            'end_date': self.months[-1] if self.months else None
+        }
+
+    def _load(self):
+        header_path = self.cache_dir / HEADER_NAME
+        if not header_path.exists():
+            return
+        try:
+            with open(header_path) as f:
+                header = json.load(f)
+            if header['settings'] != self.settings():
+                print(f"⚠ Simulation cache in {self.cache_dir} was built with {header['settings']}; ignoring it")
+                return
+            matrix = np.load(self.cache_dir / ARRAY_NAME)
+            offset = 0
+            for event_id, entry in header['events'].items():
+                n_rows = len(entry['row_indicators'])
+                self.events[event_id] = entry
+                self.contributions[event_id] = matrix[offset:offset + n_rows]
+                offset += n_rows
+            signature = header.get('results_signature')
+            self.results_signature = tuple(signature) if signature else None
+        except Exception as e:
+            print(f"⚠ Could not load simulation cache from {self.cache_dir}: {e}")
+            self.events, self.contributions, self.results_signature = {}, {}, None
+
+    def save(self):
+        """Write the header and the stacked contribution matrix"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        blocks = [self.contributions[event_id] for event_id in self.events]
+        matrix = np.concatenate(blocks) if blocks else np.zeros((0, len(self.months)))
+        np.save(self.cache_dir / ARRAY_NAME, matrix)
+        with open(self.cache_dir / HEADER_NAME, 'w') as f:
+            json.dump({
+                'settings': self.settings(),
+                'events': self.events,
+                'results_signature': list(self.results_signature) if self.results_signature else None
+            }, f, indent=2)
+
+    def diff(self, hashes):
+        """Added, removed, modified and unchanged event ids against the cache"""
+        return {
+            'added': [event_id for event_id in hashes if event_id not in self.events],
+            'removed': [event_id for event_id in self.events if event_id not in hashes],
+            'modified': [event_id for event_id, digest in hashes.items()
+                         if event_id in self.events and self.events[event_id]['hash'] != digest],
+            'unchanged': [event_id for event_id, digest in hashes.items()
+                          if event_id in self.events and self.events[event_id]['hash'] == digest]
+        }
+
+    def totals(self, order, indicators):
+        """Monthly totals of the given indicators, summed impact by impact in event order"""
+        indicator_ids = {indicator: i for i, indicator in enumerate(indicators)}
+        blocks, row_ids = [], []
+        for event_id in order:
+            entry = self.events.get(event_id)
+            if entry is None:
+                continue
+            keep = [i for i, indicator in enumerate(entry['row_indicators']) if indicator in indicator_ids]
+            if keep:
+                blocks.append(self.contributions[event_id][keep])
+                row_ids.extend(indicator_ids[entry['row_indicators'][i]] for i in keep)
+
+        totals = np.zeros((len(indicators), len(self.months)))
+        if blocks:
+            # np.add.at accumulates rows in order, as simulate_impacts does
+            np.add.at(totals, np.array(row_ids, dtype=np.int64), np.concatenate(blocks))
+        return pd.DataFrame({indicator: totals[i] for i, indicator in enumerate(indicators)}, index=self.months)
+
+    def update(self, impact_summary, links=None, results_path=None):
+        """
+        Bring the cache (and optionally the results file) up to date with impact_summary
+
+        Parameters:
+        -----------
+        impact_summary: EventImpactModel input for every event
+        links: Rows whose changes mark an event as modified; defaults to
+               impact_summary itself. Only pass other rows if impact_summary
+               is a deterministic function of them
+        results_path: simulation_results.csv to patch (CSV only); columns
+                      untouched by the changes are kept from the existing file
+
+        Returns (results DataFrame, changes dict with the added, removed,
+        modified and unchanged event ids and the rebuilt indicators).
+        """
+        hashes = event_hashes(links if links is not None else impact_summary)
+        changes = self.diff(hashes)
+
+        affected = set()
+        for event_id in changes['removed'] + changes['modified']:
+            affected.update(self.events[event_id]['indicators'])
+        for event_id in changes['removed']:
+            del self.events[event_id]
+            del self.contributions[event_id]
+
+        recompute = changes['added'] + changes['modified']
+        if recompute:
+            computed = event_contributions(impact_summary, recompute, self.dates, self.lag_function)
+            empty = {'indicators': [], 'row_indicators': [], 'values': np.zeros((0, len(self.months)))}
+            for event_id in recompute:
+                # Events whose links no longer reach the summary keep their hash but no rows
+                entry = computed.get(event_id, empty)
+                self.events[event_id] = {
+                    'hash': hashes[event_id],
+                    'indicators': entry['indicators'],
+                    'row_indicators': entry['row_indicators']
+                }
+                self.contributions[event_id] = entry['values']
+                affected.update(entry['indicators'])
+
+        order = event_order(impact_summary)
+        indicators = list(dict.fromkeys(
+            indicator for event_id in order if event_id in self.events
+            for indicator in self.events[event_id]['indicators']
+        ))
+
+        existing = None
+        if results_path is not None and Path(results_path).exists() and self.results_signature is not None \
+                and file_signature(results_path) == self.results_signature:
+            # Read as text, so kept columns are written back without formatting them again
+            existing = pd.read_csv(results_path, index_col=0, dtype=str)
+
+        if existing is not None:
+            rebuild = [indicator for indicator in indicators if indicator in affected or indicator not in existing.columns]
+            kept = [column for column in existing.columns if column in indicators]
+            results = existing[kept].astype(float)
+            rebuilt = self.totals(order, rebuild)
+            for indicator in rebuild:
+                results[indicator] = rebuilt[indicator].values
+        else:
+            rebuild = indicators
+            results = self.totals(order, indicators)
+
+        if results_path is not None:
+            if existing is None:
+                results.to_csv(results_path)
+            elif rebuild or kept != list(existing.columns):
+                text = existing[kept].copy()
+                for indicator in rebuild:
+                    text[indicator] = results[indicator].to_numpy().astype(str)
+                text.to_csv(results_path)
+            self.results_signature = file_signature(results_path)
+        self.save()
+
+        changes['indicators'] = rebuild
+        print(f"✓ Re-simulated {len(recompute)} of {len(hashes)} events "
+              f"({len(changes['added'])} added, {len(changes['modified'])} modified, "
+              f"{len(changes['removed'])} removed); {len(rebuild)} of {len(indicators)} indicator columns rebuilt")
+        return results, changes
@@ -0,0 +1,268 @@
+"""
+Catalog of indicator codes: category and canonical series of every code
+
+Indicator selection used to loop over every code in Python, testing each
+against keyword lists, and did so again in every notebook and run. The
+catalog is built in one pass over the unified dataset's codes with
+vectorised string matching and stored next to the processed data:
+
+    code                 category  access  usage  series             series_rank  rows
+    ACC_OWNERSHIP        ACCESS    True    False  Account_Ownership  0            423
+    USG_DIGITAL_PAYMENT  USAGE     False   True   Digital_Payments   0            397
+
+- category: the pillar most of the code's rows carry, when reference_codes.csv
+  lists it as a pillar; otherwise ACCESS or USAGE by keyword, else OTHER
+- access / usage: the keyword matches prepare_historical_data selected on
+  (a code may match both)
+- series / series_rank: the dashboard series the code measures, and which
+  pattern matched (0 = the primary source; higher ranks fill its gaps)
+
+    catalog = IndicatorCatalog.cached('data/processed/indicator_catalog.csv', source,
+                                      lambda: IndicatorCatalog.build(unified, reference_codes))
+    catalog.flagged('access'), catalog.series_codes('Account_Ownership')
+"""
+import json
+import re
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.columnar_store import COLUMNAR_AVAILABLE, read_table, write_table
+
+# Bump when the rules below change, so catalogs cached on disk are rebuilt
+CATALOG_VERSION = 1
+
+ACCESS_KEYWORDS = ['ACC', 'ACCOUNT', 'OWNERSHIP', 'BANK', 'MM', 'MOBILE']
+USAGE_KEYWORDS = ['USG', 'USAGE', 'DIGITAL', 'PAYMENT', 'TRANSACTION']
+
+# Dashboard series and the code patterns that measure them, most direct first
+CANONICAL_SERIES = {
+    'Account_Ownership': [r'^ACC_OWNERSHIP$', r'^ACC_BANK_ACCOUNT$', r'ACCOUNT_OWNERSHIP'],
+    'Digital_Payments': [r'^USG_DIGITAL_PAYMENT$', r'DIGITAL_PAYMENT'],
+    'ATM_Penetration': [r'^ACC_ATM_DENSITY$', r'ATM_(?:PER|DENSITY|PEN)'],
+    'Agent_Banking': [r'AGENT'],
+    'Mobile_Money': [r'^ACC_MM_ACCOUNT$', r'MM_ACCOUNT|MOBILE_MONEY']
+}
+
+SERIES_PATTERN = '|'.join(f"(?:{pattern})" for patterns in CANONICAL_SERIES.values() for pattern in patterns)
+
+CATALOG_COLUMNS = ['code', 'category', 'access', 'usage', 'series', 'series_rank', 'rows']
+
+
+def string_values(values):
+    """values as a string Series; Arrow-backed when pyarrow is installed, so regexes run in C"""
+    values = pd.Series(values, dtype=object).astype(str)
+    return values.astype('string[pyarrow]') if COLUMNAR_AVAILABLE else values
+
+
+def contains(strings, pattern, case=True):
+    """Boolean array of strings.str.contains(pattern) (strings from string_values)"""
+    return strings.str.contains(pattern, case=case, regex=True).to_numpy(dtype=bool, na_value=False)
+
+
+def matches_any(values, keywords, case=True):
+    """
+    Boolean array: which values contain any of the keywords (plain substrings)
+
+    Each distinct value is tested once, with a single regex alternation,
+    so a column of millions of rows costs one pass over its unique values.
+    """
+    value_ids, uniques = pd.factorize(pd.Series(values).astype(str))
+    pattern = '|'.join(re.escape(keyword) for keyword in keywords)
+    return contains(string_values(uniques), pattern, case=case)[value_ids]
+
+
+def reference_pillars(reference_codes):
+    """Upper-cased pillar codes listed in reference_codes.csv (None when not given)"""
+    if reference_codes is None or not {'field', 'code'} <= set(reference_codes.columns):
+        return None
+    pillars = reference_codes.loc[reference_codes['field'] == 'pillar', 'code']
+    return set(pillars.dropna().astype(str).str.upper())
+
+
+class IndicatorCatalog:
+    """Category, keyword flags and canonical series of every indicator code"""
+
+    def __init__(self, table, source=None):
+        self.table = table.reset_index(drop=True)
+        self.source = source
+
+    @classmethod
+    def build(cls, unified_df=None, reference_codes=None, codes=None, source=None):
+        """
+        Classify every indicator code in one pass
+
+        Parameters:
+        -----------
+        unified_df: Unified dataset; its indicator_code (and pillar, when
+                    present) columns are read
+        reference_codes: reference_codes.csv as a DataFrame (validates pillars)
+        codes: Extra codes to classify (e.g. columns of a streamed yearly table)
+        source: Identifier of the inputs, stored with the catalog
+        """
+        frames = []
+        if unified_df is not None and 'indicator_code' in unified_df.columns:
+            # Integer ids per row (-1 = missing); everything below works on the unique values
+            code_ids, uniques = pd.factorize(unified_df['indicator_code'], sort=True)
+            present = code_ids >= 0
+            code_ids = code_ids[present]
+            counts = np.bincount(code_ids, minlength=len(uniques))
+
+            pillar = np.full(len(uniques), None, dtype=object)
+            if 'pillar' in unified_df.columns:
+                pillar_ids, pillar_names = pd.factorize(unified_df['pillar'].to_numpy()[present])
+                names = pd.Index(pillar_names.astype(str)).str.upper()
+                # Upper-casing can merge names; count per merged, alphabetically sorted pillar
+                merged_ids, merged_names = pd.factorize(names, sort=True)
+                valid = pillar_ids >= 0
+                if valid.any():
+                    pairs = code_ids[valid] * len(merged_names) + merged_ids[pillar_ids[valid]]
+                    table = np.bincount(pairs, minlength=len(uniques) * len(merged_names))
+                    table = table.reshape(len(uniques), len(merged_names))
+                    # Most frequent pillar per code (ties: alphabetical)
+                    modal = table.argmax(axis=1)
+                    has = table.max(axis=1) > 0
+                    pillar[has] = np.asarray(merged_names, dtype=object)[modal[has]]
+            frames.append(pd.DataFrame({'code': pd.Index(uniques).astype(str).to_numpy(dtype=object),
+                                        'pillar': pillar, 'rows': counts}))
+        if codes is not None:
+            extra = pd.Index([str(code) for code in codes]).unique()
+            if frames:
+                extra = extra.difference(frames[0]['code'])
+            frames.append(pd.DataFrame({'code': np.asarray(extra, dtype=object), 'pillar': None, 'rows': 0}))
+
+        table = (pd.concat(frames, ignore_index=True) if frames
+                 else pd.DataFrame({'code': pd.Series(dtype=object), 'pillar': None, 'rows': 0}))
+        upper = string_values(table['code']).str.upper()
+
+        table['access'] = matches_any(upper, ACCESS_KEYWORDS)
+        table['usage'] = matches_any(upper, USAGE_KEYWORDS)
+
+        valid = reference_pillars(reference_codes)
+        has_pillar = table['pillar'].notna().to_numpy()
+        if valid is not None:
+            has_pillar &= table['pillar'].isin(valid).to_numpy()
+        keyword_category = np.where(table['access'], 'ACCESS', np.where(table['usage'], 'USAGE', 'OTHER'))
+        table['category'] = np.where(has_pillar, table['pillar'], keyword_category)
+
+        # One pass finds the codes any series pattern matches; patterns are then ranked on those alone
+        series = np.full(len(table), None, dtype=object)
+        series_rank = np.full(len(table), -1, dtype=np.int64)
+        candidates = np.flatnonzero(contains(upper, SERIES_PATTERN))
+        candidate_codes = upper.iloc[candidates]
+        for name, patterns in CANONICAL_SERIES.items():
+            for rank, pattern in enumerate(patterns):
+                match = candidates[contains(candidate_codes, pattern) & pd.isna(series[candidates])]
+                series[match] = name
+                series_rank[match] = rank
+        table['series'] = series
+        table['series_rank'] = series_rank
+
+        table['rows'] = table['rows'].astype(np.int64)
+        return cls(table[CATALOG_COLUMNS], source=source)
+
+    def __len__(self):
+        return len(self.table)
+
+    def codes(self, category=None):
+        """Codes of one category (all when None), in catalog order"""
+        table = self.table if category is None else self.table[self.table['category'] == category.upper()]
+        return table['code'].tolist()
+
+    def flagged(self, flag):
+        """Codes matching the 'access' or 'usage' keywords"""
+        return self.table.loc[self.table[flag], 'code'].tolist()
+
+    def series_codes(self, series):
+        """Codes measuring a dashboard series, primary source first"""
+        matches = self.table[self.table['series'] == series]
+        return matches.sort_values(['series_rank', 'code'])['code'].tolist()
+
+    def canonical_table(self, yearly):
+        """
+        The dashboard series present in a wide yearly table (Year plus code columns)
+
+        Each series takes its best-ranked code's values; years that code
+        does not cover are filled from the next ones. Series without any
+        code in the table are left out.
+        """
+        canonical = pd.DataFrame(index=yearly.index)
+        for series in CANONICAL_SERIES:
+            values = None
+            for code in self.series_codes(series):
+                if code in yearly.columns:
+                    values = yearly[code] if values is None else values.combine_first(yearly[code])
+            if values is not None:
+                canonical[series] = values
+        return canonical
+
+    def simulation_mapping(self, columns):
+        """{code: simulation column} for codes whose own column, or their series' primary column, was simulated"""
+        columns = set(columns)
+        primary = {}
+        for series in CANONICAL_SERIES:
+            simulated = [code for code in self.series_codes(series) if code in columns]
+            if simulated:
+                primary[series] = simulated[0]
+        mapping = {}
+        for code, series in zip(self.table['code'], self.table['series']):
+            if code in columns:
+                mapping[code] = code
+            elif series in primary:
+                mapping[code] = primary[series]
+        return mapping
+
+    def save(self, path):
+        """Persist the catalog (CSV + Parquet) and a JSON header with its source"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_table(self.table, path, index=False)
+        with open(path.with_suffix('.json'), 'w') as f:
+            json.dump({'version': CATALOG_VERSION, 'source': self.source}, f, indent=2)
+
+    @classmethod
+    def load(cls, path):
+        """Load a persisted catalog, or None if there is none (or it is from older rules)"""
+        path = Path(path)
+        header_path = path.with_suffix('.json')
+        if not header_path.exists():
+            return None
+        try:
+            with open(header_path) as f:
+                header = json.load(f)
+            if header.get('version') != CATALOG_VERSION:
+                return None
+            table = read_table(path)
+            table['code'] = table['code'].astype(str)
+            table['category'] = table['category'].astype(str)
+            table['series'] = table['series'].astype(object).where(table['series'].notna(), None)
+            for flag in ['access', 'usage']:
+                table[flag] = table[flag].astype(bool)
+            return cls(table[CATALOG_COLUMNS], source=header.get('source'))
+        except Exception as e:
+            print(f"⚠ Could not load indicator catalog from {path}: {e}")
+            return None
+
+    @classmethod
+    def cached(cls, path, source, build):
+        """
+        The catalog stored at path if it was built from source, else build() saved there
+
+        Parameters:
+        -----------
+        path: Catalog CSV path (a .json header sits next to it)
+        source: JSON-serialisable identifier of the inputs (e.g. file signatures)
+        build: Zero-argument callable returning a new IndicatorCatalog
+        """
+        source = json.loads(json.dumps(source))
+        catalog = cls.load(path)
+        if catalog is not None and catalog.source == source:
+            return catalog
+        catalog = build()
+        catalog.source = source
+        try:
+            catalog.save(path)
+        except OSError as e:
+            print(f"⚠ Could not save indicator catalog to {path}: {e}")
+        return catalog
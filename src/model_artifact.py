@@ -0,0 +1,382 @@
+"""
+Versioned, memory-mappable artifact for EventImpactModel
+
+An artifact is a directory holding one .npy file per numeric array and a
+model_config.json header (the notebook's model_config.json keys plus the
+format version, string tables and array manifest):
+
+    models/event_impact_model/
+        model_config.json
+        event_date.npy      datetime64[ns], one per event (NaT if unknown)
+        impact_event.npy    int32, event position of each impact
+        impact_indicator.npy int32, index into the header's indicator table
+        impact.npy          float64
+        lag.npy             float64
+        evidence.npy        int32, index into the evidence table (-1 if missing)
+        comparable_country.npy int32, index into the country table (-1 if missing)
+
+Arrays are opened with np.load(mmap_mode='r'), so loading never unpickles
+anything and processes reading the same artifact share its pages. Convert
+existing pickles (a one-off that does unpickle them) with:
+
+    python -m src.model_artifact models/event_impact_model.pkl
+"""
+import argparse
+import json
+import pickle
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.date_parsing import parse_dates
+from src.event_impact_model import EventImpactModel, month_positions
+
+ARTIFACT_FORMAT = 'event-impact-model'
+FORMAT_VERSION = 1
+HEADER_NAME = 'model_config.json'
+
+# name -> dtype of every array in a version 1 artifact
+ARRAY_DTYPES = {
+    'event_date': 'datetime64[ns]',
+    'impact_event': 'int32',
+    'impact_indicator': 'int32',
+    'impact': 'float64',
+    'lag': 'float64',
+    'evidence': 'int32',
+    'comparable_country': 'int32'
+}
+
+
+def _as_number(value):
+    """Float of a numeric impact or lag, None otherwise"""
+    if isinstance(value, (int, float, np.number)) and not isinstance(value, bool):
+        return float(value)
+    return None
+
+
+def _string_index(values):
+    """(table of distinct non-missing strings, int32 positions with -1 for missing)"""
+    table = []
+    positions = {}
+    index = np.full(len(values), -1, dtype=np.int32)
+    for i, value in enumerate(values):
+        if value is None or (isinstance(value, float) and np.isnan(value)):
+            continue
+        value = str(value)
+        if value not in positions:
+            positions[value] = len(table)
+            table.append(value)
+        index[i] = positions[value]
+    return table, index
+
+
+def model_arrays(model):
+    """
+    Flatten a model's events dict into the artifact's arrays and string tables
+
+    Impacts and lags that are not numeric are stored as 0.0, which is what
+    simulate_impacts uses for them.
+    """
+    event_ids = list(model.events.keys())
+    event_dates = parse_dates([event_data['date'] for event_data in model.events.values()])
+    impact_event, indicators, impacts, lags, evidence, countries = [], [], [], [], [], []
+
+    for pos, event_data in enumerate(model.events.values()):
+        for impact in event_data['impacts']:
+            value, lag = _as_number(impact.get('impact')), _as_number(impact.get('lag'))
+            if value is None or lag is None:
+                value, lag = 0.0, 0.0
+            impact_event.append(pos)
+            indicators.append(impact['indicator'])
+            impacts.append(value)
+            lags.append(lag)
+            evidence.append(impact.get('evidence'))
+            countries.append(impact.get('comparable_country'))
+
+    indicator_table, indicator_index = _string_index(indicators)
+    evidence_table, evidence_index = _string_index(evidence)
+    country_table, country_index = _string_index(countries)
+
+    arrays = {
+        'event_date': np.array(event_dates, dtype='datetime64[ns]'),
+        'impact_event': np.array(impact_event, dtype=np.int32),
+        'impact_indicator': indicator_index,
+        'impact': np.array(impacts, dtype=np.float64),
+        'lag': np.array(lags, dtype=np.float64),
+        'evidence': evidence_index,
+        'comparable_country': country_index
+    }
+    tables = {
+        'event_ids': [event_id.item() if isinstance(event_id, np.generic) else event_id for event_id in event_ids],
+        'event_names': [event_data['name'] for event_data in model.events.values()],
+        'indicators': indicator_table,
+        'evidence': evidence_table,
+        'comparable_countries': country_table
+    }
+    return arrays, tables
+
+
+def save_artifact(model, path, **metadata):
+    """
+    Write a model as an artifact directory
+
+    Parameters:
+    -----------
+    model: EventImpactModel to save
+    path: Artifact directory (created if missing)
+    metadata: Extra header entries (e.g. converted_from)
+    """
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    arrays, tables = model_arrays(model)
+
+    manifest = {}
+    for name, array in arrays.items():
+        np.save(path / f"{name}.npy", array, allow_pickle=False)
+        manifest[name] = {'file': f"{name}.npy", 'dtype': str(array.dtype), 'shape': list(array.shape)}
+
+    header = {
+        'lag_function': model.lag_function,
+        'num_events': len(tables['event_ids']),
+        'created_at': pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'format': ARTIFACT_FORMAT,
+        'format_version': FORMAT_VERSION,
+        'num_impacts': len(arrays['impact']),
+        **tables,
+        'arrays': manifest,
+        **metadata
+    }
+    with open(path / HEADER_NAME, 'w') as f:
+        json.dump(header, f, indent=2)
+    return path
+
+
+class ModelArtifact:
+    """A loaded artifact: its header and (memory-mapped) arrays"""
+
+    def __init__(self, path, mmap=True):
+        """
+        Open an artifact directory
+
+        Parameters:
+        -----------
+        path: Artifact directory written by save_artifact
+        mmap: Map arrays read-only instead of reading them into memory
+        """
+        self.path = Path(path)
+        with open(self.path / HEADER_NAME) as f:
+            self.header = json.load(f)
+
+        if self.header.get('format') != ARTIFACT_FORMAT:
+            raise ValueError(f"{self.path} is not an event impact model artifact")
+        version = self.header.get('format_version')
+        if version is None or version > FORMAT_VERSION:
+            raise ValueError(f"Unsupported artifact version {version} (this reader supports up to {FORMAT_VERSION})")
+
+        self.arrays = {}
+        for name, dtype in ARRAY_DTYPES.items():
+            entry = self.header['arrays'][name]
+            array = np.load(self.path / entry['file'], mmap_mode='r' if mmap else None, allow_pickle=False)
+            if str(array.dtype) != dtype or list(array.shape) != entry['shape']:
+                raise ValueError(f"{entry['file']} does not match the header ({array.dtype}, {array.shape})")
+            self.arrays[name] = array
+
+    @property
+    def lag_function(self):
+        return self.header['lag_function']
+
+    def impact_summary(self):
+        """One row per impact with the columns EventImpactModel reads"""
+        arrays = self.arrays
+        event_pos = np.asarray(arrays['impact_event'])
+        event_ids = np.array(self.header['event_ids'], dtype=object)
+        event_names = np.array(self.header['event_names'], dtype=object)
+
+        def lookup(table, index):
+            values = np.array(table + [None], dtype=object)
+            return values[np.asarray(index)]  # -1 picks the trailing None
+
+        return pd.DataFrame({
+            'parent_id': event_ids[event_pos],
+            'event_name': event_names[event_pos],
+            'event_date': pd.to_datetime(np.asarray(arrays['event_date'])[event_pos]),
+            'indicator_code': lookup(self.header['indicators'], arrays['impact_indicator']),
+            'lag_months': np.asarray(arrays['lag']),
+            'final_impact': np.asarray(arrays['impact']),
+            'evidence_basis': lookup(self.header['evidence'], arrays['evidence']),
+            'comparable_country': lookup(self.header['comparable_countries'], arrays['comparable_country'])
+        })
+
+    def event_dates(self):
+        """Event dates as Timestamps, None where unknown"""
+        dates = pd.DatetimeIndex(np.asarray(self.arrays['event_date']))
+        return [None if pd.isna(date) else date for date in dates]
+
+    def events(self):
+        """The model's events dict, as _process_events builds it"""
+        events = [
+            {'name': name, 'date': date, 'impacts': []}
+            for name, date in zip(self.header['event_names'], self.event_dates())
+        ]
+
+        # Plain lists: iterating pandas columns row by row is several times slower
+        impacts_by_event = [event_data['impacts'] for event_data in events]
+        indicators = self.header['indicators']
+        evidence_table = self.header['evidence'] + ['Unknown']
+        country_table = self.header['comparable_countries'] + [None]
+        for pos, indicator, impact, lag, evidence, country in zip(
+                self.arrays['impact_event'].tolist(), self.arrays['impact_indicator'].tolist(),
+                self.arrays['impact'].tolist(), self.arrays['lag'].tolist(),
+                self.arrays['evidence'].tolist(), self.arrays['comparable_country'].tolist()):
+            impacts_by_event[pos].append({
+                'indicator': indicators[indicator],
+                'impact': impact,
+                'lag': lag,
+                'evidence': evidence_table[evidence],
+                'comparable_country': country_table[country]
+            })
+        return dict(zip(self.header['event_ids'], events))
+
+    def impact_arrays(self, indicators):
+        """EventImpactModel._impact_arrays computed straight from the arrays"""
+        indicator_names = np.array(self.header['indicators'], dtype=object)
+        impact_event = np.asarray(self.arrays['impact_event'])
+        impact_indicator = np.asarray(self.arrays['impact_indicator'])
+        dates = pd.DatetimeIndex(np.asarray(self.arrays['event_date']))
+
+        keep = np.isin(indicator_names, list(indicators))[impact_indicator] & ~dates.isna()[impact_event]
+        event_pos = impact_event[keep].astype(np.int64)
+        event_months = np.asarray(dates.year * 12 + dates.month)
+        return {
+            'event_pos': event_pos,
+            'event_name': np.array(self.header['event_names'], dtype=object)[event_pos],
+            'event_month': event_months[event_pos].astype(np.int64),
+            'event_time': month_positions(dates)[event_pos],
+            'indicator': indicator_names[impact_indicator[keep]],
+            'impact': np.asarray(self.arrays['impact'])[keep],
+            'lag': np.asarray(self.arrays['lag'])[keep]
+        }
+
+    def to_model(self):
+        """A working EventImpactModel backed by this artifact"""
+        return ArtifactModel(self)
+
+
+class ArtifactModel(EventImpactModel):
+    """
+    EventImpactModel that simulates directly from an artifact's arrays
+
+    The events dict and impact_summary DataFrame are only built when first
+    accessed; simulate_impacts and compile_timeline never need them. Once
+    events has been built (and possibly edited), the model behaves exactly
+    like one constructed from an impact summary.
+    """
+
+    def __init__(self, artifact):
+        self.artifact = artifact
+        self.lag_function = artifact.lag_function
+        self.timeline = None
+        self._events = None
+        self._impact_summary = None
+
+    @property
+    def events(self):
+        if self._events is None:
+            self._events = self.artifact.events()
+        return self._events
+
+    @events.setter
+    def events(self, value):
+        self._events = value
+
+    @property
+    def impact_summary(self):
+        if self._impact_summary is None:
+            self._impact_summary = self.artifact.impact_summary()
+        return self._impact_summary
+
+    @impact_summary.setter
+    def impact_summary(self, value):
+        self._impact_summary = value
+
+    def _impact_arrays(self, indicators):
+        if self._events is not None:
+            return super()._impact_arrays(indicators)
+        return self.artifact.impact_arrays(indicators)
+
+    def _all_indicators(self):
+        if self._events is not None:
+            return super()._all_indicators()
+        return list(set(self.artifact.header['indicators']))
+
+    def _event_table(self):
+        if self._events is not None:
+            return super()._event_table()
+        return (list(self.artifact.header['event_ids']), list(self.artifact.header['event_names']),
+                self.artifact.event_dates())
+
+    def _dated_event_count(self):
+        if self._events is not None:
+            return super()._dated_event_count()
+        return int((~np.isnat(np.asarray(self.artifact.arrays['event_date']))).sum())
+
+
+def load_model(path, mmap=True):
+    """Load an artifact directory as a (lazily materialized) EventImpactModel"""
+    return ModelArtifact(path, mmap=mmap).to_model()
+
+
+class _ModelUnpickler(pickle.Unpickler):
+    """Resolve the notebook's __main__.EventImpactModel to the src class"""
+
+    def find_class(self, module, name):
+        if module == '__main__' and name == 'EventImpactModel':
+            return EventImpactModel
+        return super().find_class(module, name)
+
+
+def convert_pickle(pickle_path, output_path=None):
+    """
+    Convert a pickled or joblib-dumped EventImpactModel to an artifact
+
+    Unpickling runs code from the file, so only convert files you trust.
+    The artifact is written next to the input (same stem) by default, and
+    its header extends the model_config.json found beside the input.
+    """
+    pickle_path = Path(pickle_path)
+    output_path = Path(output_path) if output_path else pickle_path.with_suffix('')
+
+    if pickle_path.suffix == '.joblib':
+        import joblib
+        import __main__
+        # joblib has no find_class hook; expose the class where the notebook defined it
+        if not hasattr(__main__, 'EventImpactModel'):
+            __main__.EventImpactModel = EventImpactModel
+        model = joblib.load(pickle_path)
+    else:
+        with open(pickle_path, 'rb') as f:
+            model = _ModelUnpickler(f).load()
+
+    # Keep the notebook's model_config.json entries (e.g. created_at) when it sits next to the pickle
+    metadata = {}
+    config_path = pickle_path.parent / HEADER_NAME
+    if config_path.exists():
+        with open(config_path) as f:
+            metadata = json.load(f)
+
+    save_artifact(model, output_path, **metadata, converted_from=pickle_path.name)
+    print(f"✓ Converted: {pickle_path} -> {output_path} ({len(model.events)} events)")
+    return output_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert a pickled EventImpactModel to a model artifact")
+    parser.add_argument('pickle_path', help="models/event_impact_model.pkl or .joblib")
+    parser.add_argument('--output', help="Artifact directory (default: input path without its suffix)")
+    args = parser.parse_args()
+    convert_pickle(args.pickle_path, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+"""
+Monte Carlo forecast uncertainty for trend + event forecasts
+
+Each draw samples the linear trend parameters from their OLS sampling
+distribution, every event's final_impact and lag_months around its
+estimate, and residual noise. All draws in a chunk are evaluated as one
+years x events x draws array, and peak memory is set by chunk_size rather
+than n_draws. 100k draws of 3 years with 30 events take about 0.3 s, a
+third of it drawing the 2 x events x draws random impacts and lags.
+"""
+import numpy as np
+import pandas as pd
+
+from src.event_impact_model import impact_curve, signed_impact_estimates
+from src.trend_fitting import fit_linear_batch
+
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def fit_trend_distribution(years, values):
+    """
+    OLS fit of values on year with the covariance of its estimates
+
+    Returns (beta, cov, sigma, year0) where beta = [intercept, slope] on
+    years centred at year0 and sigma is the residual standard error. The
+    fit is trend_fitting.fit_linear_batch; on centred years X'X is diagonal.
+    """
+    years = np.asarray(years, dtype=float)
+    values = np.asarray(values, dtype=float)
+    year0 = years.mean()
+    n = len(years)
+    sxx = ((years - year0) ** 2).sum()
+
+    if sxx > 0:
+        fit = fit_linear_batch(years - year0, values[np.newaxis, :])
+        beta = np.array([fit['intercept'][0], fit['slope'][0]])
+        ss_res = fit['mse'][0] * n
+    else:
+        # A single distinct year has no slope (lstsq's minimum-norm solution)
+        beta = np.array([values.mean(), 0.0])
+        ss_res = ((values - values.mean()) ** 2).sum()
+
+    dof = n - 2
+    sigma2 = ss_res / dof if dof > 0 else 0.0
+    cov = sigma2 * np.diag([1 / n, 1 / sxx if sxx > 0 else 0.0])
+
+    return beta, cov, np.sqrt(sigma2), year0
+
+
+def events_from_impact_links(unified_df, impact_df, pillar=None):
+    """
+    Event dates, signed impacts and lags for the Monte Carlo engine
+
+    Parameters:
+    -----------
+    unified_df: Unified dataset (event rows supply record_id and observation_date)
+    impact_df: Impact links (parent_id, impact_estimate, impact_direction, lag_months)
+    pillar: Keep only links of this pillar (e.g. 'ACCESS', 'USAGE')
+
+    Estimates are read as impact_summary_from_links reads them ('15%' is 0.15).
+    """
+    columns = ['event_date', 'final_impact', 'lag_months']
+    if unified_df is None or impact_df is None:
+        return pd.DataFrame(columns=columns)
+
+    links = impact_df
+    if pillar is not None and 'pillar' in links.columns:
+        links = links[links['pillar'].astype(str).str.upper() == pillar.upper()]
+
+    events = unified_df[unified_df['record_type'].astype(str).str.lower() == 'event']
+    joined = links.merge(
+        events[['record_id', 'observation_date']],
+        left_on='parent_id', right_on='record_id', how='inner'
+    )
+
+    result = pd.DataFrame({
+        'event_date': pd.to_datetime(joined['observation_date'], errors='coerce'),
+        'final_impact': signed_impact_estimates(joined),
+        'lag_months': pd.to_numeric(joined['lag_months'], errors='coerce').fillna(6.0)
+    })
+    return result.dropna().reset_index(drop=True)
+
+
+class MonteCarloForecaster:
+    """Sample forecast paths for one indicator series"""
+
+    def __init__(self, years, values, events=None, lag_function='exponential',
+                 impact_sd=0.25, lag_sd=0.25, bounds=None, impact_scale=None):
+        """
+        Initialize the forecaster
+
+        Parameters:
+        -----------
+        years, values: Historical observations (NaNs are dropped)
+        events: DataFrame with event_date, final_impact and lag_months
+        lag_function: Event lag curve ('exponential', 'linear', 'immediate')
+        impact_sd: Relative standard deviation of event impact magnitudes
+        lag_sd: Relative standard deviation of event lag months
+        bounds: Optional (low, high) clip applied to every draw, e.g. (0, 100)
+        impact_scale: Factor applied to final_impact; by default 100 for
+                      percentage series (values above 1) and 1 otherwise,
+                      as forecast_series scales event impacts
+        """
+        years = np.asarray(years, dtype=float)
+        values = np.asarray(values, dtype=float)
+        valid = np.isfinite(years) & np.isfinite(values)
+        if valid.sum() < 2:
+            raise ValueError(f"Need at least 2 observations, got {valid.sum()}")
+
+        self.beta, self.cov, self.sigma, self.year0 = fit_trend_distribution(years[valid], values[valid])
+        self.lag_function = lag_function
+        self.impact_sd = impact_sd
+        self.lag_sd = lag_sd
+        self.bounds = bounds
+
+        # Impacts come as decimals; percentage series take them in points
+        if impact_scale is None:
+            impact_scale = 100 if np.abs(values[valid]).max() > 1 else 1
+        self.impact_scale = impact_scale
+
+        if events is None or len(events) == 0:
+            self.event_months = np.zeros(0)
+            self.event_impacts = np.zeros(0)
+            self.event_lags = np.zeros(0)
+        else:
+            dates = pd.to_datetime(events['event_date'])
+            self.event_months = (dates.dt.year * 12 + dates.dt.month).to_numpy(dtype=float)
+            self.event_impacts = events['final_impact'].to_numpy(dtype=float) * impact_scale
+            self.event_lags = events['lag_months'].to_numpy(dtype=float)
+
+    def _simulate_chunk(self, rng, n, forecast_years):
+        """Draw n paths over forecast_years as an (n, years) array"""
+        years = np.asarray(forecast_years, dtype=float)
+
+        # Trend parameters from their joint sampling distribution
+        params = rng.multivariate_normal(self.beta, self.cov, size=n, method='eigh')
+        paths = params[:, [0]] + params[:, [1]] * (years - self.year0)
+
+        # Residual noise around the trend
+        if self.sigma > 0:
+            paths += rng.normal(0.0, self.sigma, size=paths.shape)
+
+        if len(self.event_impacts):
+            # Draws run along the last axis so NumPy's inner loops are n long, not len(years)
+            shape = (len(self.event_impacts), n)
+            impacts = self.event_impacts[:, np.newaxis] * (1 + self.impact_sd * rng.standard_normal(shape))
+            lags = np.maximum(self.event_lags[:, np.newaxis] * (1 + self.lag_sd * rng.standard_normal(shape)), 0.0)
+
+            # Evaluate each event at mid-year (July) of every forecast year: (years, events, n)
+            months_since = (years * 12 + 7)[:, np.newaxis] - self.event_months[np.newaxis, :]
+            contributions = impact_curve(
+                impacts[np.newaxis, :, :], lags[np.newaxis, :, :],
+                months_since[:, :, np.newaxis], self.lag_function
+            )
+            paths += contributions.sum(axis=1).T
+
+        if self.bounds is not None:
+            np.clip(paths, self.bounds[0], self.bounds[1], out=paths)
+
+        return paths
+
+    def simulate(self, forecast_years, n_draws=10000, chunk_size=25000, seed=None):
+        """
+        Sample n_draws forecast paths
+
+        Parameters:
+        -----------
+        forecast_years: Years to forecast
+        n_draws: Number of Monte Carlo draws
+        chunk_size: Draws evaluated per vectorized pass (bounds peak memory)
+        seed: Seed for reproducible draws
+
+        Returns an (n_draws, len(forecast_years)) array.
+        """
+        rng = np.random.default_rng(seed)
+        draws = np.empty((n_draws, len(forecast_years)))
+        for start in range(0, n_draws, chunk_size):
+            stop = min(start + chunk_size, n_draws)
+            draws[start:stop] = self._simulate_chunk(rng, stop - start, forecast_years)
+        return draws
+
+    def percentile_bands(self, forecast_years, percentiles=DEFAULT_PERCENTILES, center=None, **kwargs):
+        """
+        Percentile bands per forecast year
+
+        Parameters:
+        -----------
+        forecast_years: Years to forecast
+        percentiles: Percentiles to report (columns p5, p25, ...)
+        center: Optional central path (e.g. the Base scenario); bands are
+                shifted so their median follows it
+        kwargs: Passed to simulate (n_draws, chunk_size, seed)
+        """
+        draws = self.simulate(forecast_years, **kwargs)
+        bands = np.percentile(draws, percentiles, axis=0)
+        mean = draws.mean(axis=0)
+
+        if center is not None:
+            shift = np.asarray(center, dtype=float) - np.median(draws, axis=0)
+            bands = bands + shift
+            mean = mean + shift
+            if self.bounds is not None:
+                bands = np.clip(bands, self.bounds[0], self.bounds[1])
+
+        result = pd.DataFrame({'Year': list(forecast_years)})
+        for p, band in zip(percentiles, bands):
+            result[f"p{p:g}"] = band
+        result['mean'] = mean
+        return result
+
+
+def monte_carlo_bands(series_by_indicator, forecast_years, events_by_indicator=None, **kwargs):
+    """
+    Percentile bands for several indicators as one long table
+
+    Parameters:
+    -----------
+    series_by_indicator: {indicator: pd.Series of values indexed by year}
+    forecast_years: Years to forecast
+    events_by_indicator: {indicator: events DataFrame}
+    kwargs: Passed to MonteCarloForecaster.percentile_bands
+    """
+    events_by_indicator = events_by_indicator or {}
+    tables = []
+    for indicator, series in series_by_indicator.items():
+        forecaster = MonteCarloForecaster(
+            series.index, series.values, events=events_by_indicator.get(indicator)
+        )
+        bands = forecaster.percentile_bands(forecast_years, **kwargs)
+        bands.insert(0, 'indicator', indicator)
+        tables.append(bands)
+    return pd.concat(tables, ignore_index=True) if tables else pd.DataFrame()
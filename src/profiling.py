@@ -0,0 +1,232 @@
+"""
+Named timing spans for the dashboard and the model pipeline
+
+Stages are wrapped in spans:
+
+    with span('load.unified', path=str(path)):
+        ...
+
+or decorated with @profiled('model.simulate_impacts'). Each span records
+wall time, CPU time of its thread and, when memory tracing is on, the peak
+traced allocation reached while it ran, nested spans included. tracemalloc
+is process-wide, so spans overlapping on other threads share that peak. Records are viewable as a summary table and exportable as JSON
+or as a Chrome trace (chrome://tracing, Perfetto).
+
+Profiling is off by default. Set ETHIOPIA_FI_PROFILE=1 or call
+PROFILER.enable(). While it is off, span() returns a shared no-op context
+manager and profiled() wrappers cost one flag check per call.
+"""
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+import pandas as pd
+
+_NULL_SPAN = nullcontext()
+
+RECORD_COLUMNS = ['name', 'start_s', 'wall_s', 'cpu_s', 'peak_bytes', 'depth', 'pid', 'thread', 'thread_name', 'args']
+
+
+class Profiler:
+    """Thread-safe collector of timing spans"""
+
+    def __init__(self, enabled=False, memory=True, max_records=100_000):
+        """
+        Initialize the profiler
+
+        Parameters:
+        -----------
+        enabled: Start recording immediately
+        memory: Trace allocations with tracemalloc to report per-span peaks
+                (slows allocation-heavy code noticeably while enabled)
+        max_records: Oldest records are dropped beyond this many
+        """
+        self.enabled = False
+        self.memory = memory
+        self.records = deque(maxlen=max_records)
+        self.origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._started_tracing = False
+        if enabled:
+            self.enable(memory)
+
+    def enable(self, memory=None):
+        """Start recording spans (and tracing memory if requested)"""
+        if memory is not None:
+            self.memory = memory
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self.enabled = True
+
+    def disable(self):
+        """Stop recording; records are kept until clear()"""
+        self.enabled = False
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def clear(self):
+        """Drop every record"""
+        with self._lock:
+            self.records.clear()
+
+    def span(self, name, **attrs):
+        """Context manager timing one named stage; attrs are stored with the record"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return self._span(name, attrs)
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextmanager
+    def _span(self, name, attrs):
+        stack = self._stack()
+        tracing = self.memory and tracemalloc.is_tracing()
+        frame = {'start_bytes': 0, 'max_bytes': 0}
+        if tracing:
+            # reset_peak() is global: fold the peak so far into the enclosing span first
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                stack[-1]['max_bytes'] = max(stack[-1]['max_bytes'], peak)
+            tracemalloc.reset_peak()
+            frame['start_bytes'] = frame['max_bytes'] = current
+        stack.append(frame)
+
+        start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - start
+            cpu = time.thread_time() - cpu_start
+            stack.pop()
+
+            peak_bytes = None
+            if tracing and tracemalloc.is_tracing():
+                _, peak = tracemalloc.get_traced_memory()
+                frame['max_bytes'] = max(frame['max_bytes'], peak)
+                peak_bytes = frame['max_bytes'] - frame['start_bytes']
+                if stack:
+                    stack[-1]['max_bytes'] = max(stack[-1]['max_bytes'], frame['max_bytes'])
+
+            thread = threading.current_thread()
+            self.add_record(name, start - self.origin, wall, cpu, peak_bytes, depth=len(stack),
+                            thread=thread.ident, thread_name=thread.name, **attrs)
+
+    def add_record(self, name, start_s, wall_s, cpu_s=None, peak_bytes=None, depth=0,
+                   pid=None, thread=None, thread_name=None, **attrs):
+        """Store a span measured elsewhere (e.g. in a worker process); start_s is relative to origin"""
+        record = {
+            'name': name,
+            'start_s': start_s,
+            'wall_s': wall_s,
+            'cpu_s': cpu_s,
+            'peak_bytes': peak_bytes,
+            'depth': depth,
+            'pid': pid if pid is not None else os.getpid(),
+            'thread': thread if thread is not None else threading.get_ident(),
+            'thread_name': thread_name,
+            'args': attrs
+        }
+        with self._lock:
+            self.records.append(record)
+
+    def to_frame(self, since_s=None, thread=None):
+        """Records as a DataFrame, optionally only those starting after since_s or from one thread"""
+        with self._lock:
+            records = list(self.records)
+        frame = pd.DataFrame(records, columns=RECORD_COLUMNS)
+        if since_s is not None:
+            frame = frame[frame['start_s'] >= since_s]
+        if thread is not None:
+            frame = frame[frame['thread'] == thread]
+        return frame.reset_index(drop=True)
+
+    def summary(self, records=None):
+        """Calls, total/mean/max wall time, CPU time and largest peak per span name"""
+        records = self.to_frame() if records is None else records
+        if records.empty:
+            return pd.DataFrame(columns=['name', 'calls', 'total_ms', 'mean_ms', 'max_ms', 'cpu_ms', 'peak_kb'])
+        grouped = records.groupby('name')
+        summary = pd.DataFrame({
+            'calls': grouped.size(),
+            'total_ms': grouped['wall_s'].sum() * 1e3,
+            'mean_ms': grouped['wall_s'].mean() * 1e3,
+            'max_ms': grouped['wall_s'].max() * 1e3,
+            'cpu_ms': grouped['cpu_s'].sum(min_count=1) * 1e3,
+            'peak_kb': grouped['peak_bytes'].max() / 1024
+        })
+        return summary.sort_values('total_ms', ascending=False).reset_index()
+
+    def to_json(self):
+        """Every record as a JSON string"""
+        return json.dumps({'records': self.to_frame().to_dict(orient='records')}, indent=2, default=str)
+
+    def to_chrome_trace(self):
+        """Records in Chrome trace event format (complete events, microseconds)"""
+        records = self.to_frame()
+        events = []
+        for (pid, thread), name in records.groupby(['pid', 'thread'])['thread_name'].first().items():
+            events.append({'ph': 'M', 'name': 'thread_name', 'pid': int(pid), 'tid': int(thread),
+                           'args': {'name': name or str(thread)}})
+        for record in records.to_dict(orient='records'):
+            args = dict(record['args'])
+            if pd.notna(record['cpu_s']):
+                args['cpu_ms'] = record['cpu_s'] * 1e3
+            if pd.notna(record['peak_bytes']):
+                args['peak_kb'] = record['peak_bytes'] / 1024
+            events.append({
+                'name': record['name'],
+                'cat': record['name'].split('.')[0],
+                'ph': 'X',
+                'ts': record['start_s'] * 1e6,
+                'dur': record['wall_s'] * 1e6,
+                'pid': int(record['pid']),
+                'tid': int(record['thread']),
+                'args': args
+            })
+        return json.dumps({'traceEvents': events, 'displayTimeUnit': 'ms'}, default=str)
+
+    def export(self, output_dir, prefix='profile'):
+        """Write <prefix>.json (records) and <prefix>_trace.json (Chrome trace) to output_dir"""
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        paths = (output_dir / f"{prefix}.json", output_dir / f"{prefix}_trace.json")
+        paths[0].write_text(self.to_json())
+        paths[1].write_text(self.to_chrome_trace())
+        return paths
+
+
+PROFILER = Profiler(enabled=os.environ.get('ETHIOPIA_FI_PROFILE') == '1')
+
+
+def span(name, **attrs):
+    """PROFILER.span: time a named stage"""
+    return PROFILER.span(name, **attrs)
+
+
+def profiled(name=None):
+    """Decorator running a function inside a span (named after the function by default)"""
+    def decorate(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not PROFILER.enabled:
+                return func(*args, **kwargs)
+            with PROFILER._span(span_name, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
@@ -0,0 +1,129 @@
+"""
+Compounded growth projections for the dashboard's scenario sliders
+
+Every slider position is known in advance (fixed min, max and step), so
+the trajectories for the whole slider grid are computed once per starting
+value as arrays. A slider interaction then reads three rows and the
+precomputed target-achievement years instead of re-running the loops.
+"""
+from functools import lru_cache
+
+import numpy as np
+
+SCENARIOS = ['Base', 'Optimistic', 'Pessimistic']
+
+# (min, max, step) of each projections_page slider
+BASE_GROWTH_RANGE = (1.0, 10.0, 0.1)
+OPT_BOOST_RANGE = (0.5, 5.0, 0.1)
+PESS_DRAG_RANGE = (0.5, 5.0, 0.1)
+
+NOT_REACHED = 0
+
+
+def slider_values(min_value, max_value, step):
+    """All positions of a slider, rounded to the step's decimals like the widget"""
+    decimals = max(0, -int(np.floor(np.log10(step))))
+    n = int(round((max_value - min_value) / step)) + 1
+    return np.round(min_value + step * np.arange(n), decimals)
+
+
+def slider_index(value, min_value, step):
+    """Grid position of a slider value"""
+    return int(round((value - min_value) / step))
+
+
+def compound_trajectories(start_value, growth_pct, n_years, cap=100):
+    """
+    Compound start_value at each growth rate, capped every year
+
+    Parameters:
+    -----------
+    start_value: Value in the first year
+    growth_pct: Array of annual growth rates in percent (any shape)
+    n_years: Years in the trajectory, including the first
+    cap: Upper bound applied after each year's growth
+
+    Returns an array of shape growth_pct.shape + (n_years,). The per-year
+    cap is applied as the recurrence runs, so results match the original
+    year-by-year loop exactly.
+    """
+    growth = np.asarray(growth_pct, dtype=float) / 100
+    trajectories = np.empty(growth.shape + (n_years,))
+    trajectories[..., 0] = start_value
+    for i in range(1, n_years):
+        trajectories[..., i] = np.minimum(trajectories[..., i - 1] * (1 + growth), cap)
+    return trajectories
+
+
+def first_hit_years(trajectories, years, target):
+    """First year each trajectory reaches target (NOT_REACHED if never), as int16"""
+    reached = trajectories >= target
+    first = reached.argmax(axis=-1)
+    return np.where(reached.any(axis=-1), np.asarray(years)[first], NOT_REACHED).astype(np.int16)
+
+
+class ProjectionGrid:
+    """Trajectories and target years for every slider combination of one indicator"""
+
+    def __init__(self, start_value, years, targets=()):
+        """
+        Precompute the grid
+
+        Parameters:
+        -----------
+        start_value: Indicator value in the first projection year
+        years: Projection years (first year = start_value)
+        targets: Target levels to precompute achievement years for
+        """
+        self.years = np.asarray(years)
+        self.base_values = slider_values(*BASE_GROWTH_RANGE)
+        self.boost_values = slider_values(*OPT_BOOST_RANGE)
+        self.drag_values = slider_values(*PESS_DRAG_RANGE)
+
+        # Same arithmetic as the widget path: (base_growth + modifier) / 100
+        n_years = len(self.years)
+        self.trajectories = {
+            'Base': compound_trajectories(start_value, self.base_values, n_years),
+            'Optimistic': compound_trajectories(
+                start_value, self.base_values[:, np.newaxis] + self.boost_values[np.newaxis, :], n_years),
+            'Pessimistic': compound_trajectories(
+                start_value, self.base_values[:, np.newaxis] + (-self.drag_values)[np.newaxis, :], n_years)
+        }
+        self.hit_years = {
+            target: {name: first_hit_years(values, self.years, target)
+                     for name, values in self.trajectories.items()}
+            for target in targets
+        }
+
+    def _positions(self, base_growth, opt_boost, pess_drag):
+        b = slider_index(base_growth, BASE_GROWTH_RANGE[0], BASE_GROWTH_RANGE[2])
+        o = slider_index(opt_boost, OPT_BOOST_RANGE[0], OPT_BOOST_RANGE[2])
+        p = slider_index(pess_drag, PESS_DRAG_RANGE[0], PESS_DRAG_RANGE[2])
+        return {'Base': (b,), 'Optimistic': (b, o), 'Pessimistic': (b, p)}
+
+    def scenarios(self, base_growth, opt_boost, pess_drag):
+        """{scenario: trajectory array} for one slider position"""
+        positions = self._positions(base_growth, opt_boost, pess_drag)
+        return {name: self.trajectories[name][positions[name]] for name in SCENARIOS}
+
+    def target_years(self, target, base_growth, opt_boost, pess_drag):
+        """{scenario: first year reaching target, or None} for one slider position"""
+        positions = self._positions(base_growth, opt_boost, pess_drag)
+        result = {}
+        for name in SCENARIOS:
+            year = int(self.hit_years[target][name][positions[name]])
+            result[name] = year if year != NOT_REACHED else None
+        return result
+
+    @property
+    def nbytes(self):
+        """Memory held by the precomputed arrays"""
+        arrays = list(self.trajectories.values())
+        arrays += [a for hits in self.hit_years.values() for a in hits.values()]
+        return sum(a.nbytes for a in arrays)
+
+
+@lru_cache(maxsize=32)
+def projection_grid(start_value, years, targets=()):
+    """Memoized ProjectionGrid (years and targets must be tuples)"""
+    return ProjectionGrid(start_value, years, targets)
@@ -0,0 +1,189 @@
+"""
+Range queries, downsampling and paging over a time-indexed table
+
+The Trends page used to mask the whole historical table on every rerun and
+hand every row to Plotly, st.dataframe and to_csv. SeriesQuery keeps the
+table sorted on its Year (or date) column once, so that:
+
+- a range is two binary searches and a positional slice (no mask over
+  every row);
+- charts get at most max_points per series, picked by Largest-Triangle-
+  Three-Buckets (LTTB), which keeps the peaks and troughs a plain stride
+  would drop;
+- tables are served a page at a time;
+- the full-resolution CSV is encoded a chunk of rows at a time, streamed
+  to a file by write_csv. st.download_button only takes a complete
+  payload, so the dashboard's download (csv_bytes) still holds the whole
+  encoded CSV in memory; it is just built without a full-table string.
+
+    query = SeriesQuery(historical, 'Year')
+    rows = query.range(2015, 2024)
+    x, y = downsample(rows['Year'], rows['Account_Ownership'], max_points=800)
+    query.page(2015, 2024, page=0, page_size=500)
+    query.csv_bytes(2015, 2024)
+"""
+import io
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_MAX_POINTS = 1000
+DEFAULT_PAGE_SIZE = 500
+CSV_CHUNK_ROWS = 50_000
+
+
+def lttb(x, y, max_points):
+    """
+    Positions of the points Largest-Triangle-Three-Buckets keeps
+
+    Parameters:
+    -----------
+    x: Sorted, finite x values (numbers; datetimes as int64)
+    y: Finite y values
+    max_points: Points to keep (first and last are always kept)
+
+    The interior is cut into max_points - 2 buckets; from each, the point
+    forming the largest triangle with the point kept before it and the
+    mean of the next bucket is kept. Returns every position when there
+    are no more than max_points points.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if max_points >= n or max_points < 3:
+        return np.arange(n)
+
+    # Bucket b covers [edges[b], edges[b + 1]); the last "bucket" is the final point
+    edges = (np.arange(max_points - 1) * (n - 2) / (max_points - 2)).astype(np.int64) + 1
+    edges[-1] = n - 1
+    edges = np.append(edges, n)
+
+    # Bucket means from running sums
+    sum_x = np.concatenate([[0.0], np.cumsum(x)])
+    sum_y = np.concatenate([[0.0], np.cumsum(y)])
+    sizes = np.diff(edges)
+    mean_x = (sum_x[edges[1:]] - sum_x[edges[:-1]]) / sizes
+    mean_y = (sum_y[edges[1:]] - sum_y[edges[:-1]]) / sizes
+
+    kept = np.empty(max_points, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(max_points - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        px, py = x[previous], y[previous]
+        areas = np.abs((px - mean_x[bucket + 1]) * (y[start:end] - py)
+                       - (px - x[start:end]) * (mean_y[bucket + 1] - py))
+        previous = start + int(np.argmax(areas))
+        kept[bucket + 1] = previous
+    return kept
+
+
+def downsample(x, y, max_points=DEFAULT_MAX_POINTS):
+    """
+    (x, y) of one series reduced to at most max_points by LTTB
+
+    Series already within max_points are returned whole, gaps included;
+    longer ones drop their missing values before they are reduced.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=float)
+    if len(y) <= max_points:
+        return x, y
+    present = np.isfinite(y)
+    x, y = x[present], y[present]
+    numeric_x = x.astype('datetime64[ns]').astype(np.int64) if np.issubdtype(x.dtype, np.datetime64) else x
+    kept = lttb(numeric_x, y, max_points)
+    return x[kept], y[kept]
+
+
+class SeriesQuery:
+    """A table sorted on its key column, sliced by binary search"""
+
+    def __init__(self, frame, key='Year'):
+        """
+        Sort the table once (stable, so rows sharing a key keep their order)
+
+        Parameters:
+        -----------
+        frame: DataFrame with a key column of years or dates
+        key: Column ranges are taken over
+        """
+        if not frame[key].is_monotonic_increasing:
+            frame = frame.sort_values(key, kind='stable')
+        self.frame = frame.reset_index(drop=True)
+        self.key = key
+        self.keys = self.frame[key].to_numpy()
+
+    def __len__(self):
+        return len(self.frame)
+
+    def bounds(self):
+        """Smallest and largest key (None, None when empty)"""
+        if len(self.keys) == 0:
+            return None, None
+        return self.keys[0], self.keys[-1]
+
+    def positions(self, start=None, end=None):
+        """Row positions [first, stop) of keys within [start, end] (None = unbounded)"""
+        first = 0 if start is None else int(np.searchsorted(self.keys, self._key(start), side='left'))
+        stop = len(self.keys) if end is None else int(np.searchsorted(self.keys, self._key(end), side='right'))
+        return first, max(first, stop)
+
+    def _key(self, value):
+        """A bound in the key column's type"""
+        if np.issubdtype(self.keys.dtype, np.datetime64):
+            return np.datetime64(pd.Timestamp(value), 'ns')
+        return value
+
+    def range(self, start=None, end=None):
+        """Rows with start <= key <= end"""
+        first, stop = self.positions(start, end)
+        return self.frame.iloc[first:stop]
+
+    def count(self, start=None, end=None):
+        first, stop = self.positions(start, end)
+        return stop - first
+
+    def page_count(self, start=None, end=None, page_size=DEFAULT_PAGE_SIZE):
+        return max(1, -(-self.count(start, end) // page_size))
+
+    def page(self, start=None, end=None, page=0, page_size=DEFAULT_PAGE_SIZE):
+        """One page of the rows in range (page numbers from 0)"""
+        first, stop = self.positions(start, end)
+        page_start = min(first + page * page_size, stop)
+        return self.frame.iloc[page_start:min(page_start + page_size, stop)]
+
+    def series(self, start, end, columns, max_points=DEFAULT_MAX_POINTS):
+        """{column: (x, y)} of each column in range, downsampled to max_points"""
+        rows = self.range(start, end)
+        return {column: downsample(rows[self.key], rows[column], max_points) for column in columns}
+
+    def csv_chunks(self, start=None, end=None, chunk_rows=CSV_CHUNK_ROWS):
+        """CSV of the rows in range as a sequence of strings, the header in the first"""
+        first, stop = self.positions(start, end)
+        if first == stop:
+            yield self.frame.iloc[0:0].to_csv(index=False)
+            return
+        for chunk_start in range(first, stop, chunk_rows):
+            chunk = self.frame.iloc[chunk_start:min(chunk_start + chunk_rows, stop)]
+            yield chunk.to_csv(index=False, header=chunk_start == first)
+
+    def write_csv(self, target, start=None, end=None, chunk_rows=CSV_CHUNK_ROWS):
+        """Write the rows in range as CSV to a path or binary file, a chunk at a time"""
+        if isinstance(target, (str, bytes)) or hasattr(target, '__fspath__'):
+            with open(target, 'wb') as f:
+                self.write_csv(f, start, end, chunk_rows)
+            return target
+        for chunk in self.csv_chunks(start, end, chunk_rows):
+            target.write(chunk.encode('utf-8'))
+        return target
+
+    def csv_bytes(self, start=None, end=None, chunk_rows=CSV_CHUNK_ROWS):
+        """
+        UTF-8 CSV of the rows in range as one bytes object
+
+        The rows are encoded chunk by chunk (no full-table string), but the
+        result is the whole file in memory, as st.download_button needs.
+        Use write_csv to stream a large range to disk instead.
+        """
+        return self.write_csv(io.BytesIO(), start, end, chunk_rows).getvalue()
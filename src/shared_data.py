@@ -0,0 +1,53 @@
+"""
+Read-only views of process-wide data for per-session use
+
+The dashboard loads each dataset once per process and every browser
+session reads the same objects. A session must never be able to change
+what the others see, and must not pay for a private copy either, so:
+
+- pandas runs in copy-on-write mode. A frame derived from a shared one
+  (column selection, slice, shallow copy) shares its memory until it is
+  written to; only the written blocks are copied, into the writer's frame.
+- Sessions get session_view(value), a shallow copy, never the shared
+  object itself. Adding or overwriting columns on it stays in the session.
+- Shared NumPy arrays (and the array attributes of shared model objects)
+  are frozen: an in-place write raises instead of leaking across sessions.
+
+    enable_copy_on_write()
+    view = session_view(shared_frame)   # costs an object header, not the data
+"""
+import numpy as np
+import pandas as pd
+
+
+def enable_copy_on_write():
+    """Switch pandas to copy-on-write for the whole process"""
+    pd.set_option('mode.copy_on_write', True)
+
+
+def freeze(value):
+    """Make a shared NumPy array, or the array attributes of an object, read-only (in place)"""
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif hasattr(value, '__dict__'):
+        for attribute in vars(value).values():
+            if isinstance(attribute, np.ndarray):
+                attribute.flags.writeable = False
+    return value
+
+
+def session_view(value):
+    """
+    A per-session handle on a shared value that shares its memory
+
+    DataFrames and Series become shallow copies (protected by copy-on-write,
+    which must be enabled); arrays become read-only views; anything else,
+    including None, is returned as it is.
+    """
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy(deep=False)
+    if isinstance(value, np.ndarray):
+        view = value.view()
+        view.flags.writeable = False
+        return view
+    return value
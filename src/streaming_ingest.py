@@ -0,0 +1,220 @@
+"""
+Chunked, bounded-memory ingestion of the unified dataset
+
+The unified file is read a chunk at a time. Each chunk is filtered to
+observation rows (optionally to a set of indicator codes) and folded into
+running per-(indicator, year) and per-(indicator, region, year) sums and
+counts; event rows are kept as they are. Peak memory is one chunk plus
+aggregates whose size depends on the number of indicators, regions and
+years, not on the number of rows in the file.
+
+    python -m src.streaming_ingest data/raw/ethiopia_fi_unified_new.csv --chunk-size 100000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.columnar_store import COLUMNAR_AVAILABLE, DATE_COLUMNS, resolve_source, pq
+from src.date_parsing import normalize_dates
+from src.yearly_aggregates import YearlyAggregateStore, observation_rows
+
+NATIONAL = 'national'
+DEFAULT_CHUNK_ROWS = 100_000
+
+# Parsed as strings in every chunk so dtypes do not drift between chunks
+STRING_COLUMNS = ['record_id', 'record_type', 'indicator_code', 'region']
+
+
+def iter_chunks(path, chunk_size=DEFAULT_CHUNK_ROWS, columns=None):
+    """
+    Yield the unified dataset as DataFrames of at most chunk_size rows
+
+    Parameters:
+    -----------
+    path: CSV path; its Parquet copy is read batch by batch when present
+    chunk_size: Rows per chunk
+    columns: Only read these columns; names not present in the file are ignored
+    """
+    source = resolve_source(path)
+
+    if source.suffix == '.parquet' and COLUMNAR_AVAILABLE:
+        parquet_file = pq.ParquetFile(source)
+        if columns is not None:
+            columns = [col for col in columns if col in parquet_file.schema_arrow.names]
+        for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
+        return
+
+    usecols = None
+    if columns is not None:
+        wanted = set(columns)
+        usecols = lambda col: col in wanted
+    dtype = {col: str for col in STRING_COLUMNS}
+    yield from pd.read_csv(source, chunksize=chunk_size, usecols=usecols, dtype=dtype)
+
+
+class StreamingIngest:
+    """Yearly and per-indicator aggregates built from one chunked pass"""
+
+    def __init__(self, indicator_codes=None, regional=True, keep_record_types=('event',)):
+        """
+        Initialize empty aggregates
+
+        Parameters:
+        -----------
+        indicator_codes: Only aggregate these indicators (all when None)
+        regional: Also aggregate per region when a region column exists
+        keep_record_types: record_type values whose rows are kept whole
+                           (events are needed to join impact links)
+        """
+        self.indicator_codes = set(indicator_codes) if indicator_codes is not None else None
+        self.regional = regional
+        self.keep_record_types = {t.lower() for t in keep_record_types}
+
+        self.store = YearlyAggregateStore()
+        self.regional_table = pd.DataFrame(
+            {'sum': pd.Series(dtype=float), 'count': pd.Series(dtype=np.int64)},
+            index=pd.MultiIndex.from_arrays([[], [], []], names=['indicator_code', 'region', 'year'])
+        )
+        self.kept = []
+        # Date formats detected on the first chunk, reused for the rest of the file
+        self.date_formats = {}
+        self.rows_read = 0
+        self.observations = 0
+        self.chunks = 0
+        self.seconds = 0.0
+
+    def update(self, chunk):
+        """Fold one chunk of unified-dataset rows into the aggregates"""
+        start = time.perf_counter()
+        chunk = normalize_dates(chunk, DATE_COLUMNS, self.date_formats)
+        has_region = self.regional and 'region' in chunk.columns
+
+        rows = chunk
+        if has_region:
+            rows = chunk.assign(region=chunk['region'].fillna(NATIONAL).astype(str))
+        obs = observation_rows(rows, extra_columns=['region'] if has_region else ())
+        if self.indicator_codes is not None:
+            obs = obs[obs['indicator_code'].isin(self.indicator_codes)]
+        obs = obs.assign(year=obs['year'].astype(np.int64))
+
+        self.store.add_observations(obs[['indicator_code', 'year', 'value']], len(chunk))
+        if has_region:
+            regional = obs[obs['region'] != NATIONAL]
+            if not regional.empty:
+                sums = regional.groupby(['indicator_code', 'region', 'year'])['value'].agg(['sum', 'count'])
+                self.regional_table = self.regional_table.add(sums, fill_value=0)
+                self.regional_table['count'] = self.regional_table['count'].astype(np.int64)
+
+        if self.keep_record_types:
+            record_type = chunk['record_type'].astype(str).str.lower()
+            kept = chunk[record_type.isin(self.keep_record_types)]
+            if not kept.empty:
+                self.kept.append(kept)
+
+        self.rows_read += len(chunk)
+        self.observations += len(obs)
+        self.chunks += 1
+        self.seconds += time.perf_counter() - start
+        return self
+
+    def ingest(self, path, chunk_size=DEFAULT_CHUNK_ROWS, columns=None):
+        """Stream a whole file through update()"""
+        for chunk in iter_chunks(path, chunk_size=chunk_size, columns=columns):
+            self.update(chunk)
+        return self
+
+    def yearly_means(self):
+        """Wide Year x indicator_code table of national means (as YearlyAggregateStore.yearly_means)"""
+        return self.store.yearly_means()
+
+    def yearly_table(self, indicator_codes=None):
+        """Year-indexed table of national means, as prepare_historical_data's yearly_access/yearly_usage"""
+        table = self.store.table
+        if indicator_codes is not None:
+            table = table[table.index.get_level_values('indicator_code').isin(list(indicator_codes))]
+        if table.empty:
+            return pd.DataFrame()
+        means = (table['sum'] / table['count']).unstack('indicator_code')
+        means.index = means.index.astype(np.int64)
+        return means.sort_index()
+
+    def indicator_series(self, min_points=2):
+        """
+        {(indicator_code, region): pd.Series indexed by year}, as batch_forecast.indicator_series
+
+        National series pool every region's observations; regional series
+        are only present when the file has a region column.
+        """
+        series = {}
+        national = self.store.table['sum'] / self.store.table['count']
+        for code, group in national.groupby(level='indicator_code', sort=True):
+            if len(group) >= min_points:
+                series[(code, NATIONAL)] = group.droplevel('indicator_code').sort_index()
+
+        regional = self.regional_table['sum'] / self.regional_table['count']
+        for (code, region), group in regional.groupby(level=['indicator_code', 'region'], sort=True):
+            if len(group) >= min_points:
+                series[(code, region)] = group.droplevel(['indicator_code', 'region']).sort_index()
+        return dict(sorted(series.items()))
+
+    def indicator_summary(self):
+        """Observations, year coverage and overall mean of every indicator"""
+        table = self.store.table.reset_index()
+        if table.empty:
+            return pd.DataFrame(columns=['indicator_code', 'observations', 'years', 'first_year', 'last_year', 'mean'])
+        grouped = table.groupby('indicator_code')
+        summary = pd.DataFrame({
+            'observations': grouped['count'].sum(),
+            'years': grouped['year'].nunique(),
+            'first_year': grouped['year'].min(),
+            'last_year': grouped['year'].max(),
+            'mean': grouped['sum'].sum() / grouped['count'].sum()
+        })
+        return summary.reset_index()
+
+    def kept_rows(self):
+        """The rows kept whole (events by default) as one DataFrame"""
+        if not self.kept:
+            return pd.DataFrame(columns=['record_id', 'record_type', 'indicator_code',
+                                         'observation_date', 'value_numeric'])
+        return pd.concat(self.kept, ignore_index=True)
+
+    @property
+    def nbytes(self):
+        """Memory held by the aggregates and kept rows"""
+        frames = [self.store.table, self.regional_table] + self.kept
+        return int(sum(frame.memory_usage(index=True, deep=True).sum() for frame in frames))
+
+    def summary(self):
+        """Counters of the pass so far"""
+        return {
+            'rows_read': self.rows_read,
+            'observations': self.observations,
+            'kept_rows': sum(len(frame) for frame in self.kept),
+            'indicators': self.store.table.index.get_level_values('indicator_code').nunique(),
+            'chunks': self.chunks,
+            'seconds': self.seconds,
+            'aggregate_bytes': self.nbytes
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aggregate the unified dataset in one chunked pass")
+    parser.add_argument('path', help="Unified dataset CSV (its Parquet copy is used when present)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_ROWS, help="Rows per chunk")
+    parser.add_argument('--output', help="Write the yearly means table to this CSV")
+    args = parser.parse_args()
+
+    ingest = StreamingIngest().ingest(args.path, chunk_size=args.chunk_size)
+    for name, value in ingest.summary().items():
+        print(f"  {name}: {value:,.2f}" if isinstance(value, float) else f"  {name}: {value:,}")
+    if args.output:
+        ingest.yearly_means().to_csv(args.output, index=False)
+        print(f"✓ Saved yearly means to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
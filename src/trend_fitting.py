@@ -0,0 +1,149 @@
+"""
+Closed-form trend fits for many short series at once
+
+Series are stacked into a (series x years) matrix padded with NaN for
+missing years. Every statistic is a masked row reduction, so thousands
+of 3-10 point series are fitted in a handful of NumPy passes instead of
+one LinearRegression object per series. Results match
+TrendForecaster.fit_linear / fit_logistic (see tests/test_trend_fitting.py).
+"""
+import numpy as np
+import pandas as pd
+
+FIT_COLUMNS = ['n', 'slope', 'intercept', 'r2', 'mse', 'mae']
+
+
+def stack_series(series_by_key):
+    """
+    Stack {key: pd.Series indexed by year} into a NaN-padded matrix
+
+    Returns (keys, years, values) with values of shape (len(keys), len(years)).
+    """
+    keys = list(series_by_key)
+    years = np.array(sorted({year for series in series_by_key.values() for year in series.index}), dtype=float)
+    values = np.full((len(keys), len(years)), np.nan)
+
+    positions = {year: i for i, year in enumerate(years)}
+    for row, key in enumerate(keys):
+        series = series_by_key[key]
+        columns = [positions[float(year)] for year in series.index]
+        values[row, columns] = pd.to_numeric(series, errors='coerce').to_numpy(dtype=float)
+
+    return keys, years, values
+
+
+def fit_linear_batch(years, values):
+    """
+    Ordinary least squares of every row of values on years
+
+    Parameters:
+    -----------
+    years: 1-D array of the matrix's column years
+    values: (series x years) matrix, NaN where a series has no observation
+
+    Returns a dict of arrays (n, slope, intercept, r2, mse, mae), one entry
+    per series. Rows with fewer than 2 points, or a single distinct year,
+    get NaN. Constant series get slope 0 and R² 1.0, as sklearn reports.
+    """
+    years = np.asarray(years, dtype=float)
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    mask = np.isfinite(values)
+    n = mask.sum(axis=1)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        x = np.where(mask, years[np.newaxis, :], 0.0)
+        y = np.where(mask, values, 0.0)
+        x_mean = x.sum(axis=1) / n
+        y_mean = y.sum(axis=1) / n
+
+        # Centre per row before forming the sums (years ~2000 lose precision otherwise)
+        dx = np.where(mask, years[np.newaxis, :] - x_mean[:, np.newaxis], 0.0)
+        dy = np.where(mask, values - y_mean[:, np.newaxis], 0.0)
+        sxx = (dx * dx).sum(axis=1)
+        sxy = (dx * dy).sum(axis=1)
+        syy = (dy * dy).sum(axis=1)
+
+        slope = sxy / sxx
+        intercept = y_mean - slope * x_mean
+
+        residuals = np.where(mask, dy - slope[:, np.newaxis] * dx, 0.0)
+        ss_res = (residuals * residuals).sum(axis=1)
+        mse = ss_res / n
+        mae = np.abs(residuals).sum(axis=1) / n
+
+        r2 = 1 - ss_res / syy
+
+        # Constant series fit exactly; the masked mean can be off by an ulp, so set them outright
+        constant = np.where(mask, values, -np.inf).max(axis=1) == np.where(mask, values, np.inf).min(axis=1)
+        slope[constant] = 0.0
+        intercept[constant] = y_mean[constant]
+        r2[constant] = 1.0
+        mse[constant] = 0.0
+        mae[constant] = 0.0
+
+    invalid = (n < 2) | ~(sxx > 0)
+    results = {'n': n, 'slope': slope, 'intercept': intercept, 'r2': r2, 'mse': mse, 'mae': mae}
+    for name in FIT_COLUMNS[1:]:
+        results[name] = np.where(invalid, np.nan, results[name])
+    return results
+
+
+def fit_logistic_batch(years, values, carrying_capacity=1.0):
+    """
+    Logit-linear fit of every row, as in TrendForecaster.fit_logistic
+
+    The logit transform log(y / (L - y)) is regressed on year; the growth
+    rate is k = -slope and the inflection year t0 = -intercept / k.
+    Returns the fit_linear_batch statistics (on the logit scale) plus k,
+    t0 and L. Rows with fewer than 3 observations or 2 finite logits get NaN.
+    """
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    epsilon = 1e-10
+    with np.errstate(invalid='ignore', divide='ignore'):
+        transformed = np.log((values + epsilon) / (carrying_capacity - values + epsilon))
+    transformed[~np.isfinite(transformed)] = np.nan
+
+    results = fit_linear_batch(years, transformed)
+    too_short = np.isfinite(values).sum(axis=1) < 3
+    for name in FIT_COLUMNS[1:]:
+        results[name] = np.where(too_short, np.nan, results[name])
+
+    k = -results['slope']
+    with np.errstate(invalid='ignore', divide='ignore'):
+        t0 = np.where(k != 0, -results['intercept'] / k, 0.0)
+    results['k'] = k
+    results['t0'] = np.where(np.isfinite(k), t0, np.nan)
+    results['L'] = np.full(len(k), carrying_capacity, dtype=float)
+    return results
+
+
+def predict_batch(fits, years, kind='linear'):
+    """Evaluate fitted trends at years as a (series x years) matrix"""
+    years = np.asarray(years, dtype=float)[np.newaxis, :]
+    if kind == 'logistic':
+        k = fits['k'][:, np.newaxis]
+        t0 = fits['t0'][:, np.newaxis]
+        with np.errstate(over='ignore'):
+            # Far from t0 exp overflows to inf and the curve is 0, as it should be
+            return fits['L'][:, np.newaxis] / (1 + np.exp(-k * (years - t0)))
+    return fits['intercept'][:, np.newaxis] + fits['slope'][:, np.newaxis] * years
+
+
+def fit_series(series_by_key, kind='linear', carrying_capacity=1.0):
+    """
+    Fit every series in {key: pd.Series} and return one row of statistics per key
+
+    Parameters:
+    -----------
+    series_by_key: Series indexed by year, e.g. from batch_forecast.indicator_series
+    kind: 'linear' or 'logistic'
+    carrying_capacity: L for logistic fits
+    """
+    keys, years, values = stack_series(series_by_key)
+    if kind == 'logistic':
+        fits = fit_logistic_batch(years, values, carrying_capacity)
+    else:
+        fits = fit_linear_batch(years, values)
+
+    index = pd.MultiIndex.from_tuples(keys) if keys and isinstance(keys[0], tuple) else pd.Index(keys)
+    return pd.DataFrame(fits, index=index)
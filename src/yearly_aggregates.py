@@ -0,0 +1,184 @@
+"""
+Incremental per-(indicator_code, year) aggregates of the unified dataset
+
+The store keeps running sums and counts of value_numeric for every
+indicator and year, so yearly means never need a pass over the full
+history. Rows appended to the unified file are folded in by update() in
+O(new rows); sync() checks the rows it has already ingested are unchanged
+by hashing a fixed-size sample of them (evenly spaced rows plus the last
+ones before the appended block), so a sync costs O(new rows) too. The
+store is persisted next to the processed data.
+"""
+import hashlib
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.columnar_store import read_table, write_table
+from src.date_parsing import parse_dates
+
+# record_type values that carry indicator observations
+OBSERVATION_TYPES = {'observation', 'indicator', 'data'}
+
+# Columns the aggregates are built from (and fingerprinted on)
+SOURCE_COLUMNS = ['record_type', 'indicator_code', 'observation_date', 'value_numeric']
+
+# Ingested rows checked by prefix_fingerprint: evenly spaced ones, and the last ones seen
+SAMPLE_ROWS = 64
+TAIL_ROWS = 64
+
+
+def as_text(values):
+    """Column as str values; categoricals convert their categories only, not every row"""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.rename_categories(values.cat.categories.astype(str)).astype(object).fillna('nan')
+    return values.astype(str)
+
+
+def observation_rows(df, extra_columns=()):
+    """Filter observation rows and derive their year (extra_columns are carried through)"""
+    record_type = df['record_type']
+    if isinstance(record_type.dtype, pd.CategoricalDtype):
+        # One test per category, broadcast through the codes
+        is_observation = record_type.cat.categories.astype(str).str.lower().isin(OBSERVATION_TYPES)
+        codes = record_type.cat.codes.to_numpy()
+        mask = np.where(codes >= 0, is_observation[codes], False)
+    else:
+        mask = record_type.astype(str).str.lower().isin(OBSERVATION_TYPES).to_numpy()
+    columns = ['indicator_code', 'observation_date', 'value_numeric'] + list(extra_columns)
+    rows = df.loc[mask, columns]
+
+    dates = rows['observation_date']
+    if not pd.api.types.is_datetime64_any_dtype(dates):
+        dates = pd.Series(parse_dates(dates), index=dates.index)
+
+    obs = pd.DataFrame({
+        'indicator_code': as_text(rows['indicator_code']).to_numpy(),
+        'year': dates.dt.year.to_numpy(),
+        'value': pd.to_numeric(rows['value_numeric'], errors='coerce').to_numpy()
+    })
+    for col in extra_columns:
+        obs[col] = rows[col].to_numpy()
+    return obs.dropna()
+
+
+def check_positions(n_rows):
+    """Positions of the ingested rows prefix_fingerprint hashes (at most SAMPLE_ROWS + TAIL_ROWS)"""
+    if n_rows == 0:
+        return np.zeros(0, dtype=np.int64)
+    spaced = np.linspace(0, n_rows - 1, min(SAMPLE_ROWS, n_rows)).astype(np.int64)
+    tail = np.arange(max(n_rows - TAIL_ROWS, 0), n_rows)
+    return np.union1d(spaced, tail)
+
+
+def prefix_fingerprint(df, n_rows):
+    """
+    Digest of a sample of df's first n_rows rows, used to check a file was only appended to
+
+    value_numeric is digested as float64 and every other column as text, so
+    a re-read that infers int instead of float, or object instead of a
+    string dtype, gives the same digest. Rewrites of the file (re-sorted,
+    rows dropped or edited in place) shift or change the sampled rows; an
+    edit to a single row between samples goes unnoticed.
+    """
+    sample = df.iloc[check_positions(n_rows)]
+    digest = hashlib.blake2b(str(n_rows).encode(), digest_size=16)
+    for col in SOURCE_COLUMNS:
+        if col == 'value_numeric':
+            digest.update(pd.to_numeric(sample[col], errors='coerce').to_numpy(dtype=float).tobytes())
+        else:
+            digest.update('\x1f'.join('' if pd.isna(value) else str(value) for value in sample[col]).encode())
+    return digest.hexdigest()
+
+
+class YearlyAggregateStore:
+    """Running sums and counts of observations per indicator and year"""
+
+    def __init__(self):
+        self.table = pd.DataFrame(
+            {'sum': pd.Series(dtype=float), 'count': pd.Series(dtype=np.int64)},
+            index=pd.MultiIndex.from_arrays([[], []], names=['indicator_code', 'year'])
+        )
+        self.rows_seen = 0
+        self.prefix_hash = prefix_fingerprint(pd.DataFrame(columns=SOURCE_COLUMNS), 0)
+
+    def update(self, new_rows):
+        """
+        Fold new unified-dataset rows into the aggregates
+
+        Parameters:
+        -----------
+        new_rows: DataFrame with record_type, indicator_code, observation_date
+                  and value_numeric columns (only unseen rows)
+        """
+        return self.add_observations(observation_rows(new_rows), len(new_rows))
+
+    def add_observations(self, obs, n_rows=0):
+        """Fold filtered observations (indicator_code, year, value columns) from n_rows source rows"""
+        if not obs.empty:
+            obs = obs.assign(year=obs['year'].astype(np.int64))
+            chunk = obs.groupby(['indicator_code', 'year'])['value'].agg(['sum', 'count'])
+            self.table = self.table.add(chunk, fill_value=0)
+            self.table['count'] = self.table['count'].astype(np.int64)
+        self.rows_seen += n_rows
+        return self
+
+    def sync(self, df):
+        """
+        Bring the store up to date with the full unified frame
+
+        Only rows past rows_seen are aggregated. If the frame is shorter than
+        what was ingested, or the sampled ingested rows changed (see
+        prefix_fingerprint), the file was rewritten rather than appended to
+        and the store is rebuilt.
+        """
+        appended = len(df) >= self.rows_seen and prefix_fingerprint(df, self.rows_seen) == self.prefix_hash
+        if not appended:
+            self.__init__()
+
+        if len(df) > self.rows_seen:
+            self.update(df.iloc[self.rows_seen:])
+            self.prefix_hash = prefix_fingerprint(df, self.rows_seen)
+            return True
+        return not appended
+
+    def yearly_means(self):
+        """Wide Year x indicator_code table of mean values"""
+        if self.table.empty:
+            return pd.DataFrame({'Year': pd.Series(dtype=np.int64)})
+        means = (self.table['sum'] / self.table['count']).unstack('indicator_code')
+        means.columns.name = None
+        means.index = means.index.astype(np.int64)
+        return means.rename_axis('Year').reset_index()
+
+    def save(self, path):
+        """Persist aggregates (CSV + Parquet) and a small JSON header"""
+        path = Path(path)
+        write_table(self.table.reset_index(), path, index=False)
+        with open(path.with_suffix('.json'), 'w') as f:
+            json.dump({'rows_seen': self.rows_seen, 'prefix_hash': self.prefix_hash}, f, indent=2)
+
+    @classmethod
+    def load(cls, path):
+        """Load a persisted store, or return an empty one if none exists"""
+        path = Path(path)
+        store = cls()
+        header_path = path.with_suffix('.json')
+        if not header_path.exists():
+            return store
+        try:
+            with open(header_path) as f:
+                header = json.load(f)
+            table = read_table(path)
+            table['indicator_code'] = table['indicator_code'].astype(str)
+            store.table = table.set_index(['indicator_code', 'year'])[['sum', 'count']]
+            store.table['count'] = store.table['count'].astype(np.int64)
+            store.rows_seen = int(header['rows_seen'])
+            # Headers from before the prefix digest have none, so the store is rebuilt once
+            store.prefix_hash = header.get('prefix_hash')
+        except Exception as e:
+            print(f"⚠ Could not load yearly aggregates from {path}: {e}")
+            store = cls()
+        return store
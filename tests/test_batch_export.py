@@ -0,0 +1,40 @@
+from pathlib import Path
+
+import pandas as pd
+import plotly.graph_objects as go
+import pytest
+
+from dashboard import batch_export
+from dashboard.batch_export import render_config, resolve_configs
+
+
+def test_config_names_cannot_leave_the_output_directory():
+    names = [config['name'] for config in resolve_configs([{'name': '../../etc'}, {'name': 'fast growth/v2'}, {}])]
+    assert names == ['etc', 'fast_growth_v2', 'config_002']
+
+
+@pytest.mark.parametrize('configs', [
+    [{'name': 'baseline'}, {'name': 'Baseline'}],
+    [{'name': 'a/b'}, {'name': 'a_b'}],
+    [{'name': '..'}]
+])
+def test_duplicate_or_empty_names_are_rejected(configs):
+    with pytest.raises(ValueError):
+        resolve_configs(configs)
+
+
+def test_output_stems_from_indicator_codes_stay_in_the_config_directory(tmp_path, monkeypatch):
+    def page_outputs(dashboard, config, warn):
+        yield 'what_if', 'what_if_../../../escaped', go.Figure()
+        yield 'forecasts', 'ethiopia_fi_group_forecasts_region_ACC/MM', pd.DataFrame({'Year': [2025]})
+
+    monkeypatch.setattr(batch_export, 'page_outputs', page_outputs)
+    config = resolve_configs([{'name': 'baseline'}])[0]
+    rows = render_config(None, config, tmp_path / 'out', formats={'html', 'csv'})
+
+    config_dir = tmp_path / 'out' / 'baseline'
+    assert sorted(path.name for path in config_dir.iterdir()) == [
+        'config.json', 'ethiopia_fi_group_forecasts_region_ACC_MM.csv', 'what_if_.._.._.._escaped.html'
+    ]
+    assert all(Path(row['file']).parent == config_dir for row in rows)
+    assert not (tmp_path / 'escaped.html').exists()
@@ -0,0 +1,55 @@
+import contextlib
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from benchmarks.suite import DEFAULT_SCALES, SCALES, build_cases, compare, merge_runs
+
+BASELINE = Path(__file__).resolve().parent.parent / 'benchmarks' / 'baseline.json'
+
+
+@pytest.fixture(scope='module')
+def baseline():
+    with open(BASELINE) as f:
+        return json.load(f)
+
+
+def document(*results):
+    return {'results': [{'case': case, 'scale': 'small', 'best_ms': best_ms} for case, best_ms in results]}
+
+
+def test_baseline_covers_every_case_at_the_default_scales(baseline, tmp_path):
+    with contextlib.redirect_stdout(io.StringIO()):
+        cases = build_cases(tmp_path, {'rows': 2_000, 'events': 5, 'indicators': 3, 'months': 24})
+    recorded = {(result['case'], result['scale']) for result in baseline['results']}
+    assert {(case, scale) for case in cases for scale in DEFAULT_SCALES} <= recorded
+
+
+def test_baseline_records_its_commit_and_scales(baseline):
+    assert baseline.get('commit')
+    for result in baseline['results']:
+        assert result['scale_rows'] == SCALES[result['scale']]['rows']
+
+
+def test_compare_flags_only_slowdowns_past_the_threshold_and_delta():
+    table = compare(
+        document(('slow', 20.0), ('noise', 1.5), ('steady', 10.0), ('added', 5.0)),
+        document(('slow', 10.0), ('noise', 1.0), ('steady', 9.0)),
+        threshold=0.25, min_delta_ms=1.0
+    )
+    assert dict(zip(table['case'], table['status'])) == {
+        'slow': 'REGRESSION', 'noise': 'ok', 'steady': 'ok', 'added': 'new'
+    }
+
+
+def test_merge_runs_keeps_the_median_best_time():
+    runs = [document(('load', best_ms), ('fit', 2.0)) for best_ms in (30.0, 24.0, 33.0)]
+    for run in runs:
+        for result in run['results']:
+            result['median_ms'] = result['best_ms'] + 1
+    merged = merge_runs(runs)
+    assert [(r['case'], r['best_ms'], r['median_ms'], r['runs']) for r in merged['results']] == [
+        ('load', 30.0, 31.0, 3), ('fit', 2.0, 3.0, 3)
+    ]
@@ -0,0 +1,32 @@
+import pandas as pd
+import pytest
+
+from src.columnar_store import columnar_path, read_table, write_table
+
+
+def table(index):
+    return pd.DataFrame({
+        'indicator_code': ['ACC', 'USG', 'ACC'],
+        'observation_date': ['2021-01-01', '15/06/2022', '2023-03'],
+        'value_numeric': [46.5, 21.0, 49.0],
+        'source': ['Findex', 'GSMA', 'NBE']
+    }, index=index)
+
+
+@pytest.mark.parametrize('index, kwargs', [
+    (pd.RangeIndex(3), {}),
+    (pd.Index(['E1', 'E2', 'E3'], name='event'), {}),
+    (pd.RangeIndex(3), {'index': False})
+])
+def test_csv_and_parquet_copies_read_back_alike(tmp_path, index, kwargs):
+    path = write_table(table(index), tmp_path / 'table.csv', **kwargs)
+    from_parquet = read_table(path)
+    columnar_path(path).unlink()
+    from_csv = read_table(path)
+    pd.testing.assert_frame_equal(from_parquet, from_csv)
+
+
+def test_kept_index_is_the_first_column_of_both_copies(tmp_path):
+    path = write_table(table(pd.Index(['E1', 'E2', 'E3'], name='event')), tmp_path / 'table.csv')
+    assert list(read_table(path).columns) == ['event', 'indicator_code', 'observation_date', 'value_numeric', 'source']
+    assert list(pd.read_csv(path, index_col=0).index) == ['E1', 'E2', 'E3']
@@ -0,0 +1,46 @@
+import contextlib
+import io
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_date_parsing import LegacyModel, make_sheet, legacy_column, check_events
+from src.date_parsing import detect_format, parse_dates, parse_date, normalize_dates
+from src.event_impact_model import EventImpactModel
+
+
+def quiet(func, *args):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args)
+
+
+def test_parse_dates_matches_per_value_parsing():
+    dates = make_sheet(2_000)['event_date']
+    np.testing.assert_array_equal(parse_dates(dates), legacy_column(dates))
+
+
+def test_parse_dates_edge_values():
+    values = ['2021-03-04', '04/03/2021', '2021-03', '2021-03-04T10:30:00', 'not a date', None, np.nan,
+              pd.Timestamp('2020-01-02'), 'March 4, 2021']
+    np.testing.assert_array_equal(parse_dates(values), legacy_column(values))
+    assert parse_date('bad') is None
+    assert parse_date('2021/03/04') == pd.Timestamp('2021-03-04')
+
+
+def test_detect_format_picks_the_majority_layout():
+    assert detect_format(['05/01/2020', '17/02/2021', '2020-01-01']) == '%d/%m/%Y'
+    assert detect_format(['nothing', 'here']) is None
+
+
+def test_normalize_dates_records_detected_formats():
+    df = pd.DataFrame({'observation_date': ['01/02/2020', '15/03/2021'], 'value': [1, 2]})
+    formats = {}
+    normalized = normalize_dates(df, ['observation_date', 'period_start'], formats)
+    assert formats == {'observation_date': '%d/%m/%Y'}
+    assert normalized['observation_date'].tolist() == [pd.Timestamp('2020-02-01'), pd.Timestamp('2021-03-15')]
+    assert df['observation_date'].dtype == object
+
+
+def test_model_builds_the_same_events_as_per_row_parsing():
+    sheet = make_sheet(1_000)
+    check_events(quiet(LegacyModel, sheet), quiet(EventImpactModel, sheet))
@@ -0,0 +1,56 @@
+import contextlib
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.bench_event_impact import impact_at_time, make_impact_summary, simulate_impacts_loop
+from src.event_impact_model import EventImpactModel, impact_curve, impact_summary_from_links
+
+LAG_FUNCTIONS = ['exponential', 'linear', 'immediate']
+
+
+def quiet(func, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args, **kwargs)
+
+
+@pytest.mark.parametrize('lag_function', LAG_FUNCTIONS)
+def test_impact_curve_matches_scalar_lag_curve(lag_function):
+    impacts = np.array([-3.5, 0.0, 2.0, 12.5])
+    lags = np.array([0, 3, 6, 24])
+    months = np.arange(-5, 120)
+    grid = impact_curve(impacts[:, np.newaxis], lags[:, np.newaxis], months[np.newaxis, :], lag_function)
+    expected = [[impact_at_time(impact, lag, month, lag_function) for month in months]
+                for impact, lag in zip(impacts, lags)]
+    np.testing.assert_allclose(grid, expected, rtol=1e-12, atol=1e-12)
+
+
+@pytest.mark.parametrize('lag_function', LAG_FUNCTIONS)
+def test_simulate_impacts_matches_original_loop(lag_function):
+    model = quiet(EventImpactModel, make_impact_summary(20), lag_function=lag_function)
+    results, breakdown = quiet(model.simulate_impacts, '2004-01-01', '2031-12-01')
+    loop_results, loop_breakdown = simulate_impacts_loop(model, '2004-01-01', '2031-12-01', list(results.columns))
+    pd.testing.assert_frame_equal(results, loop_results, check_exact=False, rtol=1e-12, atol=1e-12)
+    pd.testing.assert_frame_equal(breakdown, loop_breakdown, check_exact=False, rtol=1e-12, atol=1e-12)
+
+
+def test_impact_summary_from_links_parses_and_signs_estimates():
+    unified = pd.DataFrame({
+        'record_id': ['E1', 'E2'],
+        'record_type': ['event', 'event'],
+        'indicator': ['Launch', 'Outage'],
+        'observation_date': ['2021-05-01', '2022-01-01']
+    })
+    links = pd.DataFrame({
+        'parent_id': ['E1', 'E1', 'E2', 'E3'],
+        'indicator_code': ['ACC', 'USG', 'USG', 'ACC'],
+        'impact_estimate': ['15%', '2.5', 'n/a', '1'],
+        'impact_direction': ['increase', 'negative', 'increase', 'increase'],
+        'lag_months': [6, 12, 3, 3]
+    })
+    summary = impact_summary_from_links(unified, links)
+    assert summary['parent_id'].tolist() == ['E1', 'E1']
+    assert summary['final_impact'].tolist() == [0.15, -2.5]
+    assert summary['event_name'].tolist() == ['Launch', 'Launch']
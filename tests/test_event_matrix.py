@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.bench_event_matrix import loop_matrix, make_summary
+from src.event_matrix import EventIndicatorMatrix, UNKNOWN_EVENT
+
+
+@pytest.fixture(scope='module')
+def summary():
+    return make_summary(60, 5, 15)
+
+
+def test_to_dense_matches_loop_build(summary):
+    matrix = EventIndicatorMatrix.from_summary(summary)
+    pd.testing.assert_frame_equal(matrix.to_dense(), loop_matrix(summary), check_exact=False, rtol=1e-12)
+
+
+def test_lookups_match_dense_rows_and_columns(summary):
+    matrix = EventIndicatorMatrix.from_summary(summary)
+    dense = matrix.dense()
+    for event in matrix.events[:10]:
+        impacts = matrix.event_impacts(event)
+        np.testing.assert_allclose(impacts.to_numpy(), dense.loc[event, impacts.index].to_numpy())
+    for code in matrix.indicators[:10]:
+        events = matrix.indicator_events(code)
+        np.testing.assert_allclose(events.to_numpy(), dense.loc[events.index, code].to_numpy())
+
+
+def test_from_pairs_aggregates_repeated_links():
+    matrix = EventIndicatorMatrix.from_pairs(['E1', 'E2'], ['A', 'B'], [0, 0, 1, 1], [0, 0, 1, 1],
+                                             [1.0, 3.0, 2.0, -2.0])
+    assert matrix.to_frame()['impact'].tolist() == [2.0, 0.0]
+    summed = EventIndicatorMatrix.from_pairs(['E1'], ['A'], [0, 0], [0, 0], [1.0, 3.0], agg='sum')
+    assert summed.values.tolist() == [4.0]
+    with pytest.raises(ValueError):
+        EventIndicatorMatrix.from_pairs(['E1'], ['A'], [0], [0], [1.0], agg='max')
+
+
+def test_from_summary_keeps_events_without_indicators():
+    summary = pd.DataFrame({'event_name': ['E1', None, 'E2'], 'indicator_code': ['A', 'A', None],
+                            'final_impact': ['0.5', 'bad', 1.0]})
+    matrix = EventIndicatorMatrix.from_summary(summary)
+    assert list(matrix.events) == ['E1', UNKNOWN_EVENT, 'E2'] and list(matrix.indicators) == ['A']
+    assert matrix.dense().to_dict() == {'A': {'E1': 0.5, UNKNOWN_EVENT: 0.0, 'E2': 0.0}}
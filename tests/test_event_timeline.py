@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from benchmarks.bench_event_impact import make_impact_summary
+from benchmarks.bench_event_timeline import START_DATE, END_DATE, quiet, check_parity, resimulate
+from src.event_impact_model import EventImpactModel
+
+
+@pytest.fixture(scope='module')
+def summary():
+    return make_impact_summary(30)
+
+
+@pytest.fixture
+def model(summary):
+    return quiet(EventImpactModel, summary)
+
+
+def test_what_if_matches_simulate_impacts(model, summary):
+    model.compile_timeline(START_DATE, END_DATE)
+    check_parity(model, summary, np.random.default_rng(0))
+
+
+def test_scenario_toggles_match_resimulation(model, summary):
+    timeline = model.compile_timeline(START_DATE, END_DATE)
+    scenario = timeline.scenario()
+    off = timeline.event_ids[::3]
+    for event_id in off:
+        scenario.toggle(event_id)
+    assert scenario.active_events == [event_id for event_id in timeline.event_ids if event_id not in off]
+    expected = resimulate(summary, scenario.active_events, timeline.indicators)
+    np.testing.assert_allclose(scenario.results().to_numpy(), expected[timeline.indicators].to_numpy(),
+                               rtol=1e-9, atol=1e-12)
+
+
+def test_scenario_sync_returns_changed_events(model):
+    timeline = model.compile_timeline(START_DATE, END_DATE)
+    scenario = timeline.scenario()
+    target = timeline.event_ids[:5]
+    changed = scenario.sync(target)
+    assert set(changed) == set(timeline.event_ids[5:])
+    assert scenario.sync(target) == []
+    np.testing.assert_allclose(scenario.totals, timeline.totals(target), atol=1e-12)
@@ -0,0 +1,65 @@
+import time
+
+import numpy as np
+import plotly.graph_objects as go
+
+from src.figure_cache import FigureCache
+
+
+def line_figure(warn=None):
+    if warn is not None:
+        warn('band skipped')
+    return go.Figure(go.Scatter(x=[2025, 2026], y=[1, 2], name='Base'))
+
+
+def test_every_caller_gets_its_own_figure():
+    cache = FigureCache()
+    first = cache.get('forecasts', 'chart', 'v1', {'scenarios': ['Base']}, line_figure)
+    first.update_layout(title='changed by one session')
+    second = cache.get('forecasts', 'chart', 'v1', {'scenarios': ['Base']}, line_figure)
+    assert second.layout.title.text is None
+    assert cache.stats()['hits'] == 1
+
+
+def test_warnings_are_replayed_on_hits():
+    cache = FigureCache()
+    messages = []
+    for _ in range(2):
+        cache.get('forecasts', 'chart', 'v1', {}, line_figure, warn=messages.append)
+    assert messages == ['band skipped', 'band skipped']
+
+
+def test_new_data_version_keeps_older_figures():
+    cache = FigureCache()
+    cache.get('overview', 'chart', 'v1', {}, line_figure)
+    cache.get('overview', 'chart', 'v2', {}, line_figure)
+    cache.get('overview', 'chart', 'v1', {}, line_figure)
+    assert cache.stats()['entries'] == 2 and cache.stats()['hits'] == 1
+
+
+def scenario_figure():
+    fig = go.Figure()
+    for i in range(8):
+        fig.add_trace(go.Scatter(x=list(range(2012, 2031)), y=np.linspace(0, i, 19), name=f"Scenario {i}",
+                                 mode='lines+markers', line=dict(width=3, dash='dash')))
+    fig.add_hline(y=60, line_dash='dot', annotation_text='Target')
+    fig.update_layout(title='Forecasts', height=500, hovermode='x unified', template='plotly_white')
+    return fig
+
+
+def best_s(func, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def test_hit_costs_less_than_building_the_figure():
+    cache = FigureCache()
+    expected = cache.get('forecasts', 'chart', 'v1', {}, scenario_figure)
+    hit = cache.get('forecasts', 'chart', 'v1', {}, scenario_figure)
+    assert hit.to_dict() == expected.to_dict() == scenario_figure().to_dict()
+    hit_s = best_s(lambda: cache.get('forecasts', 'chart', 'v1', {}, scenario_figure))
+    assert hit_s < best_s(scenario_figure)
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.bench_hierarchical_forecast import (DIMENSIONS, FORECAST_YEARS, make_inputs, quiet,
+                                                    loop_simulations, loop_forecasts, check_cells, check_national)
+from src.batch_forecast import NATIONAL
+from src.event_impact_model import EventImpactModel
+from src.hierarchical_forecast import forecast_groups
+
+
+@pytest.fixture(scope='module')
+def inputs():
+    unified, summary, groups = make_inputs(5_000, 6, 10)
+    start = pd.Timestamp(year=summary['event_date'].min().year, month=1, day=1)
+    model = quiet(EventImpactModel, summary, group_column='region')
+    grouped = quiet(model.simulate_group_impacts, start, '2024-12-01', groups)
+    return unified, summary, groups, start, grouped
+
+
+def test_group_simulation_matches_one_model_per_group(inputs):
+    _, summary, groups, start, grouped = inputs
+    for group, expected in loop_simulations(summary, groups, start, '2024-12-01').items():
+        np.testing.assert_allclose(grouped[group][expected.columns].to_numpy(), expected.to_numpy(),
+                                   rtol=1e-12, atol=1e-12)
+
+
+def test_forecast_groups_cells_are_coherent_and_match_forecast_series(inputs):
+    unified, summary, groups, start, grouped = inputs
+    aggregates = forecast_groups(unified, DIMENSIONS, FORECAST_YEARS, simulation_results=grouped,
+                                 impact_dimension='region')
+    simulations = loop_simulations(summary, groups, start, '2024-12-01')
+    assert check_cells(aggregates, loop_forecasts(unified, simulations)) > 0
+    check_national(unified, aggregates)
+    assert aggregates.coherence_gap() < 1e-9
+    assert aggregates.levels[0] == NATIONAL and set(DIMENSIONS) <= set(aggregates.levels)
+
+
+def test_select_returns_empty_rows_for_unknown_series(inputs):
+    aggregates = forecast_groups(inputs[0], ['region'], FORECAST_YEARS)
+    assert aggregates.select('region', 'nowhere', 'IND_000').empty
+    assert aggregates.coherence_gap() < 1e-9
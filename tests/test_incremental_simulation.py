@@ -0,0 +1,35 @@
+import pandas as pd
+
+from benchmarks.bench_event_impact import make_impact_summary
+from benchmarks.bench_incremental_simulation import START_DATE, END_DATE, quiet, edit_summary, check
+from src.incremental_simulation import IncrementalSimulator
+
+
+def test_update_matches_full_simulation_after_edits(tmp_path):
+    summary = make_impact_summary(40)
+    edited = edit_summary(summary, 3)
+    results_path = tmp_path / 'simulation_results.csv'
+
+    results, _ = quiet(IncrementalSimulator(tmp_path / 'cache', START_DATE, END_DATE).update,
+                       summary, results_path=results_path)
+    check(results, summary)
+
+    # A fresh simulator reads the cache back from disk, as the next notebook run would
+    simulator = IncrementalSimulator(tmp_path / 'cache', START_DATE, END_DATE)
+    results, changes = quiet(simulator.update, edited, results_path=results_path)
+    assert len(changes['added']) == 3 and len(changes['modified']) == 1 and len(changes['removed']) == 1
+    check(results, edited)
+    check(pd.read_csv(results_path, index_col=0), edited)
+
+
+def test_unchanged_summary_leaves_results_file_alone(tmp_path):
+    summary = make_impact_summary(20)
+    results_path = tmp_path / 'simulation_results.csv'
+    quiet(IncrementalSimulator(tmp_path / 'cache', START_DATE, END_DATE).update, summary, results_path=results_path)
+    written = results_path.stat().st_mtime_ns
+
+    simulator = IncrementalSimulator(tmp_path / 'cache', START_DATE, END_DATE)
+    results, changes = quiet(simulator.update, summary, results_path=results_path)
+    assert not (changes['added'] or changes['modified'] or changes['removed'])
+    assert results_path.stat().st_mtime_ns == written
+    check(results, summary)
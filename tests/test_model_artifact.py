@@ -0,0 +1,46 @@
+import contextlib
+import io
+import pickle
+
+import pandas as pd
+import pytest
+
+from benchmarks.bench_event_impact import make_impact_summary
+from src.event_impact_model import EventImpactModel
+from src.model_artifact import save_artifact, load_model, convert_pickle
+
+START_DATE = '2015-01-01'
+END_DATE = '2027-12-01'
+
+
+def quiet(func, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args, **kwargs)
+
+
+@pytest.fixture(scope='module')
+def model():
+    return quiet(EventImpactModel, make_impact_summary(25))
+
+
+def check_same_model(expected_model, actual_model):
+    expected, expected_breakdown = quiet(expected_model.simulate_impacts, START_DATE, END_DATE)
+    actual, actual_breakdown = quiet(actual_model.simulate_impacts, START_DATE, END_DATE)
+    pd.testing.assert_frame_equal(actual[expected.columns], expected)
+    pd.testing.assert_frame_equal(actual_breakdown, expected_breakdown)
+
+
+@pytest.mark.parametrize('mmap', [True, False])
+def test_artifact_round_trip_simulates_identically(model, tmp_path, mmap):
+    save_artifact(model, tmp_path / 'model')
+    loaded = load_model(tmp_path / 'model', mmap=mmap)
+    check_same_model(model, loaded)
+    assert list(loaded.events) == list(model.events)
+
+
+def test_convert_pickle_matches_the_pickled_model(model, tmp_path):
+    with open(tmp_path / 'model.pkl', 'wb') as f:
+        pickle.dump(model, f)
+    output = quiet(convert_pickle, tmp_path / 'model.pkl')
+    assert output == tmp_path / 'model'
+    check_same_model(model, load_model(output))
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+
+from src.monte_carlo import MonteCarloForecaster
+
+YEARS = [2014, 2017, 2021, 2024]
+FORECAST_YEARS = [2025, 2026, 2027]
+
+
+def make_events(n_events=30, seed=42):
+    """Decimal impacts (0.05 is 5%), as events_from_impact_links returns them"""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'event_date': pd.to_datetime('2022-01-01') + pd.to_timedelta(rng.integers(0, 1000, n_events), unit='D'),
+        'final_impact': rng.choice([-1, 1], n_events) * rng.uniform(0.02, 0.15, n_events),
+        'lag_months': rng.uniform(3, 24, n_events)
+    })
+
+
+def band_width(forecaster):
+    bands = forecaster.percentile_bands(FORECAST_YEARS, n_draws=20000, seed=0)
+    return (bands['p95'] - bands['p5']).to_numpy()
+
+
+def test_event_uncertainty_widens_percentage_bands():
+    values = [22.0, 35.0, 46.0, 49.0]
+    without = band_width(MonteCarloForecaster(YEARS, values, bounds=(0, 100)))
+    with_events = band_width(MonteCarloForecaster(YEARS, values, events=make_events(), bounds=(0, 100)))
+    assert (with_events > without * 1.05).all()
+
+
+def test_impacts_are_scaled_to_the_series_units():
+    events = make_events()
+    percent = MonteCarloForecaster(YEARS, [22.0, 35.0, 46.0, 49.0], events=events)
+    share = MonteCarloForecaster(YEARS, [0.22, 0.35, 0.46, 0.49], events=events)
+    assert percent.impact_scale == 100 and share.impact_scale == 1
+    np.testing.assert_allclose(percent.event_impacts, share.event_impacts * 100)
+    np.testing.assert_allclose(band_width(percent), band_width(share) * 100, rtol=1e-9)
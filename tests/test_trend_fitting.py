@@ -0,0 +1,95 @@
+import contextlib
+import io
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.bench_trend_fit import make_series, per_series_linear, per_series_logistic, batched, check_parity
+from src.batch_forecast import forecast_series, run_batch_forecasts
+from src.forecasting import TrendForecaster, FixedTrendForecaster
+from src.trend_fitting import stack_series, fit_linear_batch, fit_logistic_batch, predict_batch, fit_series
+
+
+@pytest.fixture(scope='module')
+def series():
+    return make_series(200)
+
+
+def quiet(func, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()), warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        return func(*args, **kwargs)
+
+
+def test_fit_linear_batch_matches_linear_regression(series):
+    check_parity(quiet(per_series_linear, series, TrendForecaster), batched(series), series)
+
+
+def test_fit_linear_batch_matches_percentage_forecaster(series):
+    check_parity(quiet(per_series_linear, series, FixedTrendForecaster), batched(series, percent_scale=True), series)
+
+
+def test_fit_logistic_batch_matches_logit_regression(series):
+    check_parity(quiet(per_series_logistic, series), quiet(batched, series, 'logistic'), series)
+
+
+def test_fit_linear_batch_short_and_constant_rows():
+    years = np.array([2020, 2021, 2022])
+    fits = fit_linear_batch(years, [[0.5, np.nan, np.nan], [0.3, 0.3, 0.3], [np.nan, np.nan, np.nan]])
+    assert fits['n'].tolist() == [1, 3, 0]
+    assert np.isnan(fits['slope'][0]) and np.isnan(fits['slope'][2])
+    assert fits['slope'][1] == 0.0 and fits['r2'][1] == 1.0 and fits['intercept'][1] == 0.3
+
+
+def test_fit_logistic_batch_needs_three_points():
+    fits = fit_logistic_batch([2020, 2021, 2022], [[0.2, 0.4, np.nan], [0.2, 0.4, 0.6]])
+    assert np.isnan(fits['k'][0])
+    assert np.isfinite(fits['k'][1]) and fits['L'][1] == 1.0
+
+
+@pytest.mark.parametrize('kind', ['linear', 'logistic'])
+def test_predict_batch_matches_trend_forecaster(series, kind):
+    shares = {key: values for key, values in series.items() if values.max() < 1 and values.nunique() > 1}
+    keys, years, values = stack_series(shares)
+    fits = fit_logistic_batch(years, values) if kind == 'logistic' else fit_linear_batch(years, values)
+    forecast_years = [2025, 2026, 2027]
+    predicted = predict_batch(fits, forecast_years, kind=kind)
+    for row, key in enumerate(keys):
+        expected = quiet(TrendForecaster().forecast, shares[key], model_type=kind, forecast_years=forecast_years)
+        np.testing.assert_allclose(predicted[row], expected['forecast_values'], rtol=1e-8, atol=1e-9)
+
+
+def test_fit_series_indexes_rows_by_key(series):
+    keyed = {(key, 'national'): values for key, values in list(series.items())[:5]}
+    fits = fit_series(keyed)
+    assert list(fits.index) == list(keyed)
+    assert list(fits.columns) == ['n', 'slope', 'intercept', 'r2', 'mse', 'mae']
+
+
+@pytest.mark.parametrize('kind', ['linear', 'logistic'])
+def test_forecast_series_matches_trend_forecaster(series, kind):
+    for key, values in list(series.items())[:40]:
+        if values.nunique() == 1 or (kind == 'logistic' and values.max() > 1):
+            continue
+        expected = quiet(TrendForecaster().forecast, values, model_type=kind)
+        table = forecast_series(values, model_type=kind)
+        np.testing.assert_allclose(table['Year'], expected['years'])
+        np.testing.assert_allclose(table['trend'], expected['predictions'], rtol=1e-8, atol=1e-9)
+        np.testing.assert_allclose(table[['ci_lower', 'ci_upper']].to_numpy(),
+                                   np.column_stack([expected['ci_lower'], expected['ci_upper']]),
+                                   rtol=1e-8, atol=1e-9)
+
+
+def test_run_batch_forecasts_reports_unfittable_series(series):
+    keyed = {(key, 'national'): values for key, values in list(series.items())[:10]}
+    keyed[('SHORT', 'national')] = pd.Series([0.4], index=[2020])
+    table, report = run_batch_forecasts(keyed, workers=1, verbose=False)
+    failed = report.set_index('indicator_code').loc['SHORT']
+    assert failed['status'] == 'failed' and 'Could not fit' in failed['error']
+    assert set(table['indicator_code']) == {key[0] for key in keyed} - {'SHORT'}
+    for (code, _), values in list(keyed.items())[:10]:
+        expected = forecast_series(values)
+        actual = table[table['indicator_code'] == code].reset_index(drop=True)
+        np.testing.assert_allclose(actual['forecast'], expected['forecast'])
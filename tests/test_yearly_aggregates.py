@@ -0,0 +1,74 @@
+import pandas as pd
+
+from src import yearly_aggregates
+from src.yearly_aggregates import YearlyAggregateStore
+
+
+def unified(values):
+    return pd.DataFrame({
+        'record_type': 'observation',
+        'indicator_code': ['A', 'A', 'B', 'B'][:len(values)],
+        'observation_date': ['2020-01-01', '2021-01-01', '2020-06-01', '2021-06-01'][:len(values)],
+        'value_numeric': values
+    })
+
+
+def test_sync_folds_in_appended_rows(tmp_path):
+    store = YearlyAggregateStore()
+    assert store.sync(unified([1, 2, 3]))
+    store.save(tmp_path / 'aggregates.csv')
+
+    store = YearlyAggregateStore.load(tmp_path / 'aggregates.csv')
+    assert not store.sync(unified([1, 2, 3]))
+    assert store.sync(unified([1, 2, 3, 4]))
+    assert store.rows_seen == 4
+    assert store.yearly_means().set_index('Year')['B'].tolist() == [3.0, 4.0]
+
+
+def test_sync_rebuilds_when_an_earlier_row_changes():
+    store = YearlyAggregateStore()
+    store.sync(unified([1, 2, 3, 4]))
+    assert store.sync(unified([10, 2, 3, 4]))
+    assert store.yearly_means().set_index('Year')['A'].tolist() == [10.0, 2.0]
+
+
+def test_sync_ignores_a_reread_with_other_dtypes():
+    store = YearlyAggregateStore()
+    store.sync(unified([1, 2, 3, 4]))
+    assert not store.sync(unified([1.0, 2.0, 3.0, 4.0]))
+
+
+def test_sync_rebuilds_when_the_file_is_reordered():
+    store = YearlyAggregateStore()
+    store.sync(unified([1, 2, 3, 4]))
+    reordered = unified([1, 2, 3, 4]).iloc[[2, 3, 0, 1]].reset_index(drop=True)
+    assert store.sync(reordered)
+    assert store.rows_seen == 4
+
+
+def test_sync_checks_a_bounded_sample_of_ingested_rows(monkeypatch):
+    rows = 10_000
+    big = pd.DataFrame({
+        'record_type': 'observation',
+        'indicator_code': ['A', 'B'] * (rows // 2),
+        'observation_date': ['2020-01-01', '2021-01-01'] * (rows // 2),
+        'value_numeric': range(rows)
+    })
+    store = YearlyAggregateStore()
+    store.sync(big.iloc[:rows - 10])
+
+    checked = []
+    positions = yearly_aggregates.check_positions
+    monkeypatch.setattr(yearly_aggregates, 'check_positions', lambda n: checked.append(positions(n)) or checked[-1])
+    assert store.sync(big)
+    assert store.rows_seen == rows
+    assert max(len(p) for p in checked) <= yearly_aggregates.SAMPLE_ROWS + yearly_aggregates.TAIL_ROWS
+    assert store.yearly_means().set_index('Year').loc[2020, 'A'] == (rows - 2) / 2
+
+
+def test_categorical_columns_aggregate_like_text():
+    frame = unified([1, 2, 3, 4]).assign(record_type=['observation', 'Observation', 'event', None])
+    typed = frame.astype({'record_type': 'category', 'indicator_code': 'category'})
+    expected = YearlyAggregateStore().update(frame).yearly_means()
+    pd.testing.assert_frame_equal(YearlyAggregateStore().update(typed).yearly_means(), expected)
+    assert expected.set_index('Year')['A'].tolist() == [1.0, 2.0]